@@ -0,0 +1,124 @@
+"""
+compact_memory.py - measures the memory BaseList.compact() saves on VMDR detections.
+
+Builds Detection objects from synthetic host list detection XML, parsed with the same
+iterparse_xml and VMDRHost.from_dict path get_hld uses, in batches of 10,000 (400 hosts
+of 25 detections each), until the requested number of records is held. Prints the growth
+in resident memory per record, values included, and the size of one record object.
+
+Linux only, since resident memory is read from /proc/self/statm. Run each mode in its own
+process, from the repository root:
+
+    python -m benchmarks.compact_memory dataclass 1000000
+    python -m benchmarks.compact_memory compact-dense 1000000
+    python -m benchmarks.compact_memory compact 1000000
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+from io import BytesIO
+
+from qualysdk.base import BaseList
+from qualysdk.base.xml_parser import iterparse_xml
+from qualysdk.vmdr.data_classes.hosts import VMDRHost
+
+HOSTS_PER_BATCH = 400
+DETECTIONS_PER_HOST = 25
+
+# Detection RESULTS of the shapes Qualys returns: plain text, HTML tables,
+# Qualys' own table markup and registry/file checks:
+RESULTS = [
+    "Vulnerable version of OpenSSL detected on port 443 over TCP.\tVersion 1.0.2k &lt; 1.1.1w",
+    "<table><tr><th>Package</th><th>Installed Version</th><th>Required Version</th></tr>"
+    + "".join(f"<tr><td>pkg{i}</td><td>1.{i}.0</td><td>1.{i}.3</td></tr>" for i in range(8))
+    + "</table>",
+    '#table cols="3"\nPackage Installed_Version Required_Version\nkernel 3.10.0 3.10.1\nopenssl 1.0.2k 1.0.2k-26',
+    "HKLM\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion CurrentBuild = 17763<br>%windir%\\system32\\ntoskrnl.exe Version is 10.0.17763.4974",
+]
+
+
+def batch_xml(hosts: int = HOSTS_PER_BATCH, detections: int = DETECTIONS_PER_HOST) -> bytes:
+    """
+    Build a host list detection response of hosts * detections detections.
+    """
+    random.seed(1)
+    out = ["<HOST_LIST_VM_DETECTION_OUTPUT><RESPONSE><HOST_LIST>"]
+    for h in range(hosts):
+        dets = "".join(
+            f"<DETECTION><UNIQUE_VULN_ID>{h * 100 + i}</UNIQUE_VULN_ID><QID>{i}</QID><TYPE>Confirmed</TYPE>"
+            f"<SEVERITY>3</SEVERITY><STATUS>Active</STATUS><FIRST_FOUND_DATETIME>2024-01-01T00:00:00Z</FIRST_FOUND_DATETIME>"
+            f"<RESULTS><![CDATA[{random.choice(RESULTS)}]]></RESULTS></DETECTION>"
+            for i in range(detections)
+        )
+        out.append(
+            f"<HOST><ID>{h + 1}</ID><IP>10.0.0.{h % 250}</IP><DETECTION_LIST>{dets}</DETECTION_LIST></HOST>"
+        )
+    out.append("</HOST_LIST></RESPONSE></HOST_LIST_VM_DETECTION_OUTPUT>")
+    return "".join(out).encode()
+
+
+def rss() -> int:
+    """
+    The resident memory of this process, in bytes.
+    """
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * 4096
+
+
+def record_size(record) -> int:
+    """
+    The size of a record object, its __dict__ (dataclass) or its sparse dict (compact).
+    """
+    size = sys.getsizeof(record)
+    if hasattr(record, "__dict__"):
+        size += sys.getsizeof(record.__dict__)
+    if getattr(record, "_sparse", None):
+        size += sys.getsizeof(record._sparse)
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "mode",
+        choices=["dataclass", "compact-dense", "compact"],
+        help="dataclass: plain Detection objects. compact-dense: compact with every field in a slot. "
+        "compact: compact with the default dense/sparse split, reusing the first batch's layout.",
+    )
+    parser.add_argument("records", type=int, nargs="?", default=1_000_000)
+    args = parser.parse_args()
+
+    data = batch_xml()
+    gc.collect()
+    base = rss()
+    start = time.perf_counter()
+
+    held = BaseList()
+    dense = None
+    while len(held) < args.records:
+        dets = BaseList(
+            d
+            for _, e in iterparse_xml(BytesIO(data), {"HOST": "HOST_LIST"})
+            for d in VMDRHost.from_dict(e).DETECTION_LIST
+        )
+        if args.mode == "compact":
+            dets = dets.compact(dense)
+            dense = type(dets[0])._dense_fields
+        elif args.mode == "compact-dense":
+            dets = dets.compact(dense=list(type(dets[0]).__dataclass_fields__))
+        held.extend(dets)
+        del dets
+
+    gc.collect()
+    used = rss() - base
+    print(
+        f"{args.mode:14s} {len(held):>9,} records  {used / len(held):6.0f} B/record RSS  "
+        f"object {record_size(held[0])} B  {time.perf_counter() - start:.0f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,12 @@ from .auth import BasicAuth, TokenAuth
 from .base.base_list import BaseList
 from .base.csv_export import write_csv, write_excel
 from .base.json_export import write_json
+from .base.arrow_export import write_parquet, write_arrow
 
 from .gav.uber import GAVUber
 from . import gav
 
-from .vmdr import query_kb, get_host_list, get_hld, get_cve_hld
+from .vmdr import query_kb, get_host_list, get_hld, get_cve_hld, iter_hld, iter_cve_hld
 from . import vmdr
 
 from . import cloud_agent
@@ -24,10 +25,20 @@ from . import pm
 from . import cert
 from . import tagging
 from . import admin
+from . import aio
 
 from .sql import db_connect
 
-from .base import DONT_EXPAND
+from .base import (
+    DONT_EXPAND,
+    LAZY_EXPAND,
+    configure_cache,
+    disable_cache,
+    enable_metrics,
+    disable_metrics,
+    configure_logging,
+    set_quiet,
+)
 
 # surprise!
 __surprise__ = b"\xe2\x9c\xa8\xe2\x9c\xa8\xe2\x9c\xa8 Have a great day!".decode("utf-8")
@@ -0,0 +1,61 @@
+"""
+Async client mode for qualysdk.
+
+Exposes awaitable versions of the read-only (get/list/query/count/lookup/search) calls of every
+module, grouped the same way as the synchronous SDK:
+
+    from qualysdk import aio
+
+    assets, patches, findings = await asyncio.gather(
+        aio.gav.get_all_assets(auth),
+        aio.pm.get_patches(auth),
+        aio.was.get_findings(auth),
+    )
+
+Generator functions such as vmdr.iter_hld are exposed as async generators. All calls share
+one bounded executor (see qualysdk.base.async_call_api.set_max_workers), each auth object's
+pooled session and the process-wide rate limiter.
+"""
+
+from inspect import isfunction, isgeneratorfunction
+from types import ModuleType, SimpleNamespace
+
+from ..base.async_call_api import async_call_api, to_async, to_async_iter, set_max_workers
+from .. import gav as _gav
+from .. import vmdr as _vmdr
+from .. import cloud_agent as _cloud_agent
+from .. import totalcloud as _totalcloud
+from .. import cs as _cs
+from .. import was as _was
+from .. import pm as _pm
+from .. import cert as _cert
+from .. import tagging as _tagging
+from .. import admin as _admin
+
+# Only calls that read data are exposed. Calls that change state in
+# Qualys should be made deliberately, one at a time:
+READ_PREFIXES = ("get_", "list_", "query_", "count_", "lookup_", "search_", "iter_")
+
+
+def _async_namespace(module: ModuleType) -> SimpleNamespace:
+    """
+    Build a namespace holding async versions of a module's read-only calls.
+    """
+    calls = {}
+    for name, func in vars(module).items():
+        if not isfunction(func) or not name.startswith(READ_PREFIXES):
+            continue
+        calls[name] = to_async_iter(func) if isgeneratorfunction(func) else to_async(func)
+    return SimpleNamespace(**calls)
+
+
+gav = _async_namespace(_gav)
+vmdr = _async_namespace(_vmdr)
+cloud_agent = _async_namespace(_cloud_agent)
+totalcloud = _async_namespace(_totalcloud)
+cs = _async_namespace(_cs)
+was = _async_namespace(_was)
+pm = _async_namespace(_pm)
+cert = _async_namespace(_cert)
+tagging = _async_namespace(_tagging)
+admin = _async_namespace(_admin)
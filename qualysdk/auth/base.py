@@ -2,17 +2,26 @@
 base.py - base authentication class for qualysdk
 """
 
+import logging
 import json
 from dataclasses import dataclass, field
+from threading import Lock
 from typing import Optional, Literal
 
+from requests import Session
+
 from .platform_picker import PlatformPicker
+from .session import build_session, mount_adapter, DEFAULT_POOL_SIZE, DEFAULT_RETRIES
 from ..exceptions import (
     InvalidCredentialsError,
     InvalidTokenError,
     InvalidAuthTypeError,
 )
 
+logger = logging.getLogger(__name__)
+
+SESSION_LOCK = Lock()
+
 
 @dataclass
 class BaseAuthentication:
@@ -43,6 +52,10 @@ class BaseAuthentication:
     auth_type: Literal["basic", "token"] = field(init=False)
     platform: Optional[str] = field(default=None, init=True)
     override_platform: Optional[dict[str, str]] = field(default=None, init=True)
+    # Pooled keep-alive transport, built on first use. See session.py.
+    _session: Optional[Session] = field(default=None, init=False, repr=False, compare=False)
+    _pool_size: int = field(default=DEFAULT_POOL_SIZE, init=False, repr=False, compare=False)
+    _retries: int = field(default=DEFAULT_RETRIES, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """
@@ -63,7 +76,7 @@ class BaseAuthentication:
                 raise ValueError(
                     f"override_platform must contain 'api_url', 'gateway_url', and 'qualysguard_url' keys. Provided keys: {list(self.override_platform.keys())}"
                 )
-            print(f"Using overridden platform URLs for {self.username}.")
+            logger.info("Using overridden platform URLs for %s.", self.username)
             self.platform = "CUSTOM"  # set platform to CUSTOM if override_platform is used
             # ensure each url starts with https://
             for key in self.override_platform:
@@ -87,6 +100,64 @@ class BaseAuthentication:
         """
         return f"Base authentication object for {self.username}"
 
+    @property
+    def session(self) -> Session:
+        """
+        The pooled, keep-alive requests.Session used for every call made with this object.
+        """
+        if self._session is None:
+            with SESSION_LOCK:
+                if self._session is None:
+                    self._session = build_session(self._pool_size, self._retries)
+        return self._session
+
+    def configure_session(
+        self, pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES
+    ) -> None:
+        """
+        Resize the connection pool and/or change the transport-level retry count.
+
+        Params:
+        ```
+        pool_size: int (default is 10) - the maximum number of keep-alive connections per host. Should be at least the number of threads making calls with this object.
+        retries: int (default is 3) - the number of times a failed connection is retried.
+        ```
+        """
+        if pool_size < 1 or retries < 0:
+            raise ValueError("pool_size must be above 0 and retries must be 0 or above.")
+        with SESSION_LOCK:
+            self._pool_size = pool_size
+            self._retries = retries
+            if self._session is not None:
+                mount_adapter(self._session, pool_size, retries)
+
+    def ensure_pool_size(self, pool_size: int) -> None:
+        """
+        Grow the connection pool to at least pool_size. Never shrinks the pool.
+
+        Called by the multithreaded functions so the pool matches their thread count.
+        """
+        if pool_size > self._pool_size:
+            self.configure_session(pool_size=pool_size, retries=self._retries)
+
+    def close(self) -> None:
+        """
+        Close the pooled session and all of its keep-alive connections.
+        A new session is built automatically on the next call.
+        """
+        with SESSION_LOCK:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __getstate__(self) -> dict:
+        """
+        Sessions hold sockets and cannot be pickled. A new one is built on first use after unpickling.
+        """
+        state = self.__dict__.copy()
+        state["_session"] = None
+        return state
+
     def validate_type(self):
         """
         Validate the authentication object.
@@ -2,15 +2,16 @@
 basic.py - contains the BasicAuth class, which handles API endpoints that require basic authentication
 """
 
+import logging
 from dataclasses import dataclass, field
 from typing import Literal, Union
 
-from requests import get
-
 from .base import BaseAuthentication
 from ..exceptions import AuthenticationError
 from .platform_picker import PlatformPicker
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class BasicAuth(BaseAuthentication):
@@ -71,7 +72,7 @@ class BasicAuth(BaseAuthentication):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        pass
+        self.close()
 
     def test_login(self, return_ratelimit: bool = False) -> Union[dict, None]:
         """
@@ -92,12 +93,11 @@ class BasicAuth(BaseAuthentication):
             "X-RateLimit-ToWait-Sec": int
         }
         """
-        if not self.override_platform:
-            print(f"Using platform: {self.platform}") if not return_ratelimit else None
-        else:
-            print(
-                f"Using overridden platform URL {self.override_platform['api_url']}"
-            ) if not return_ratelimit else None
+        if not return_ratelimit:
+            if not self.override_platform:
+                logger.info("Using platform: %s", self.platform)
+            else:
+                logger.info("Using overridden platform URL %s", self.override_platform["api_url"])
 
         url = (
             self.override_platform["api_url"]
@@ -106,7 +106,7 @@ class BasicAuth(BaseAuthentication):
         ) + "/msp/about.php"
 
         """Requires basic auth. JWT is not supported for this endpoint."""
-        r = get(url, auth=(self.username, self.password))
+        r = self.session.get(url, auth=(self.username, self.password))
 
         if r.status_code != 200:
             raise AuthenticationError(f"Failed to authenticate. Requests reporting: {r.text}")
@@ -115,7 +115,8 @@ class BasicAuth(BaseAuthentication):
             "X-RateLimit-Limit": int(r.headers["X-RateLimit-Limit"]),
             "X-Concurrency-Limit-Limit": int(r.headers["X-Concurrency-Limit-Limit"]),
         }
-        print(f"Success. Rate limit details: {rl}") if not return_ratelimit else None
+        if not return_ratelimit:
+            logger.info("Success. Rate limit details: %s", rl)
         return rl if return_ratelimit else None
 
     def get_ratelimit(self) -> dict:
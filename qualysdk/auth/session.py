@@ -0,0 +1,89 @@
+"""
+session.py - pooled, keep-alive HTTP transport used by qualysdk authentication objects.
+
+Each authentication object lazily builds one requests.Session. The session is mounted with
+an HTTPAdapter whose connection pool can be grown to match the number of threads a caller
+is about to spawn, so that every thread reuses a warm TLS connection instead of paying for
+a new handshake on each call.
+"""
+
+from http.cookiejar import DefaultCookiePolicy
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+
+
+def build_adapter(
+    pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES
+) -> HTTPAdapter:
+    """
+    Build an HTTPAdapter with a connection pool of pool_size and transport-level retries.
+
+    Only connection errors are retried for every method. 502/503/504 responses are
+    retried for idempotent methods only, since a POST to Qualys may have side effects.
+    Rate limiting (HTTP 429) is left to call_api.
+
+    Params:
+    ```
+    pool_size (int) The maximum number of connections kept alive per host.
+    retries (int) The number of transport-level retries.
+    ```
+
+    Returns:
+    ```
+    HTTPAdapter
+    ```
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0,
+        status=retries,
+        status_forcelist=(502, 503, 504),
+        backoff_factor=0.5,
+        raise_on_status=False,
+    )
+    # Qualys only ever uses 3 hosts per platform (api, gateway, qualysguard):
+    return HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+
+
+def mount_adapter(
+    session: Session, pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES
+) -> None:
+    """
+    Mount a freshly built adapter on session for both http:// and https:// URLs.
+
+    Adapters that are replaced are not closed, as other threads may still be
+    using connections from their pools. They are released once unreferenced.
+    """
+    adapter = build_adapter(pool_size, retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def build_session(pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES) -> Session:
+    """
+    Build a pooled, keep-alive requests.Session.
+
+    Cookies are never persisted on the session, so each call behaves exactly like
+    a standalone requests.request() call apart from connection reuse.
+
+    Params:
+    ```
+    pool_size (int) The maximum number of connections kept alive per host.
+    retries (int) The number of transport-level retries.
+    ```
+
+    Returns:
+    ```
+    requests.Session
+    ```
+    """
+    session = Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    mount_adapter(session, pool_size, retries)
+    return session
@@ -2,15 +2,16 @@
 token.py - contains the TokenAuth class, which handles API endpoints that require JWT authentication
 """
 
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from requests import post
-
 from .basic import BasicAuth
 from ..exceptions import AuthenticationError
 from .platform_picker import PlatformPicker
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class TokenAuth(BasicAuth):
@@ -67,13 +68,13 @@ class TokenAuth(BasicAuth):
 
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-        print(f"Generating token for {self.username} on {self.platform} platform.")
+        logger.info("Generating token for %s on %s platform.", self.username, self.platform)
 
-        r = post(url, headers=headers, data=payload)
+        r = self.session.post(url, headers=headers, data=payload)
 
         if r.status_code != 201:
             raise AuthenticationError(f"Failed to generate token. Requests reporting: {r.text}")
-        print("Success.")
+        logger.info("Success.")
         self.generated_on = datetime.now()
         return r.text
 
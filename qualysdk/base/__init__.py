@@ -2,12 +2,17 @@
 Basic functionality / helpers for qualysdk.
 """
 
+from .log_config import configure_logging, set_quiet
 from .call_api import call_api
+from .response_cache import configure_cache, disable_cache, ResponseCache
+from .metrics import enable_metrics, disable_metrics, get_metrics, MetricsRegistry
+from .compact import compact_class, CompactRecord
 from .call_schema import CALL_SCHEMA
 from .xml_parser import xml_parser
 from .base_list import BaseList
 from .csv_export import write_csv, write_excel
 from .json_export import write_json
+from .arrow_export import write_parquet, write_arrow
 
 
 class DONT_EXPAND:
@@ -19,3 +24,15 @@ class DONT_EXPAND:
     """
 
     flag = False
+
+
+class LAZY_EXPAND:
+    """
+    This singleton class is used to
+    indicate that expensive conversions
+    (i.e. HTML cleanup of detection results
+    and KB entries) should be deferred until
+    the field is first read.
+    """
+
+    flag = False
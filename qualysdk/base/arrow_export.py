@@ -0,0 +1,378 @@
+"""
+arrow_export.py - contains write_parquet and write_arrow, which stream SDK dataclasses
+to typed, compressed Parquet and Arrow IPC files in record batches.
+
+pyarrow is an optional dependency. Install it with: pip install qualysdk[arrow]
+"""
+
+import logging
+import re
+from dataclasses import fields, is_dataclass
+from datetime import datetime, timezone
+from itertools import chain, islice
+from json import dumps
+from operator import attrgetter
+from types import UnionType
+from typing import Any, Callable, Iterable, Iterator, Literal, Union, get_args, get_origin
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from .serializable_mixin import _process_value
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 10000
+
+INT_RE = re.compile(r"[+-]?\d+")
+FLOAT_RE = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required to write Parquet/Arrow files. "
+            "Install it with: pip install qualysdk[arrow]"
+        )
+
+
+def _to_text(value: Any) -> str:
+    """
+    Convert a value to a string column value. Nested dataclasses, dicts
+    and lists are written as JSON, everything else (i.e. IP addresses) with str().
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (tuple, set)):
+        value = list(value)
+    if isinstance(value, (dict, list)) or hasattr(value, "to_dict"):
+        return dumps(_process_value(value), default=str)
+    return str(value)
+
+
+def _to_int(value: Any) -> int:
+    if type(value) is int:
+        return value
+    if type(value) is bool or (type(value) is str and INT_RE.fullmatch(value.strip())):
+        return int(value)
+    raise ValueError
+
+
+def _to_float(value: Any) -> float:
+    if type(value) in (int, float, bool) or (
+        type(value) is str and FLOAT_RE.fullmatch(value.strip())
+    ):
+        return float(value)
+    raise ValueError
+
+
+def _to_bool(value: Any) -> bool:
+    if type(value) is bool:
+        return value
+    if type(value) is int and value in (0, 1):
+        return bool(value)
+    if type(value) is str and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    raise ValueError
+
+
+def _to_utc(value: Any) -> datetime:
+    if type(value) is not datetime:
+        raise ValueError
+    return value.astimezone(timezone.utc) if value.tzinfo else value
+
+
+def _to_naive(value: Any) -> datetime:
+    if type(value) is not datetime:
+        raise ValueError
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _to_int_list(value: Any) -> list:
+    if not isinstance(value, (list, tuple, set)):
+        raise ValueError
+    return [None if item is None else _to_int(item) for item in value]
+
+
+def _to_text_list(value: Any) -> list:
+    if not isinstance(value, (list, tuple, set)):
+        raise ValueError
+    return [None if item is None else _to_text(item) for item in value]
+
+
+# Column kinds, in the order they are preferred when a field's annotation allows several:
+# kind: (converter, arrow type factory)
+COLUMN_KINDS = {
+    "list_int": (_to_int_list, lambda: pa.list_(pa.int64())),
+    "list_str": (_to_text_list, lambda: pa.list_(pa.string())),
+    "timestamp": (_to_naive, lambda: pa.timestamp("us")),
+    "timestamp_tz": (_to_utc, lambda: pa.timestamp("us", tz="UTC")),
+    "int": (_to_int, lambda: pa.int64()),
+    "float": (_to_float, lambda: pa.float64()),
+    "bool": (_to_bool, lambda: pa.bool_()),
+    "str": (_to_text, lambda: pa.string()),
+}
+
+
+def column_kinds(annotation: Any) -> list:
+    """
+    Get the column kinds a field's type annotation allows, most specific first.
+    Every field can fall back to "str".
+
+    Params:
+        annotation (Any): The type annotation of a dataclass field.
+
+    Returns:
+        list: The kinds, i.e. ["timestamp", "str"] for Union[str, datetime].
+    """
+    origin, args = get_origin(annotation), get_args(annotation)
+    kinds = []
+    if origin in (Union, UnionType):
+        for member in args:
+            if member is not type(None):
+                kinds.extend(column_kinds(member))
+    elif origin is Literal:
+        if all(type(arg) is int for arg in args):
+            kinds.append("int")
+    elif annotation is bool:
+        kinds.append("bool")
+    elif annotation is int:
+        kinds.append("int")
+    elif annotation is float:
+        kinds.append("float")
+    elif annotation is datetime:
+        kinds.extend(("timestamp", "timestamp_tz"))
+    elif isinstance(origin or annotation, type) and issubclass(
+        origin or annotation, (list, tuple, set)
+    ):
+        # BaseList[int] holds ints. Anything else (strings, dataclasses) is written as strings:
+        kinds.append("list_int" if args and args[0] is int else "list_str")
+
+    return [kind for kind in COLUMN_KINDS if kind in kinds and kind != "str"] + ["str"]
+
+
+def _convert_column(values: list, converter: Callable) -> list:
+    """
+    Convert a column's values, writing None and empty strings as nulls.
+    """
+    return [None if value is None or value == "" else converter(value) for value in values]
+
+
+def _fits(values: list, kind: str) -> bool:
+    if kind == "timestamp":
+        # Naive timestamps are only used if every datetime is naive:
+        if any(type(value) is datetime and value.tzinfo for value in values):
+            return False
+    try:
+        _convert_column(values, COLUMN_KINDS[kind][0])
+    except (ValueError, TypeError, OverflowError):
+        return False
+    return True
+
+
+class _ColumnPlan:
+    """
+    The names, getters and converters of a dataclass's columns,
+    along with the Arrow schema they are written with.
+    """
+
+    def __init__(self, cls: type, sample: list, string_fields: Iterable[str] = None):
+        self.names = tuple(f.name for f in fields(cls))
+        # Compact variants of the class (see BaseList.compact) have the same fields:
+        self.types = {cls}
+        self.check(sample)
+
+        string_fields = set(string_fields or ())
+        if unknown := string_fields - set(self.names):
+            raise ValueError(f"{cls.__name__} has no fields named {', '.join(sorted(unknown))}.")
+
+        self.getters = tuple(attrgetter(name) for name in self.names)
+        self.converters = []
+        arrow_fields = []
+        for f, getter in zip(fields(cls), self.getters):
+            if f.name in string_fields:
+                kind = "str"
+            else:
+                values = list(map(getter, sample))
+                kind = next(kind for kind in column_kinds(f.type) if _fits(values, kind))
+            converter, arrow_type = COLUMN_KINDS[kind]
+            self.converters.append(converter)
+            arrow_fields.append(pa.field(f.name, arrow_type()))
+        self.schema = pa.schema(arrow_fields)
+
+    def check(self, records: list) -> None:
+        """
+        Check that every record has the fields of the planned class.
+        """
+        for record in records:
+            if type(record) not in self.types:
+                if (
+                    not is_dataclass(record)
+                    or isinstance(record, type)
+                    or tuple(f.name for f in fields(record)) != self.names
+                ):
+                    raise ValueError(
+                        f"All records must have the same fields, got {type(record).__name__}."
+                    )
+                self.types.add(type(record))
+
+    def batch(self, records: list) -> "pa.RecordBatch":
+        """
+        Build a record batch from a list of records.
+        """
+        arrays = []
+        for name, getter, converter, arrow_field in zip(
+            self.names, self.getters, self.converters, self.schema
+        ):
+            try:
+                column = _convert_column(list(map(getter, records)), converter)
+            except (ValueError, TypeError, OverflowError):
+                raise ValueError(
+                    f"A value of {name} does not fit the {arrow_field.type} column inferred from the "
+                    f"first batch of records. Pass a larger batch_size, or string_fields=['{name}'] "
+                    "to write it as a string."
+                ) from None
+            arrays.append(pa.array(column, type=arrow_field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+def _records(data: Iterable) -> Iterator:
+    """
+    Iterate over the records in data. Lists/BaseLists yielded by an
+    iterator (i.e. the batches of vmdr.iter_hld) are flattened.
+    """
+    for item in data:
+        if isinstance(item, list):
+            yield from item
+        else:
+            yield item
+
+
+def _write_batches(
+    data: Iterable,
+    open_writer: Callable[["pa.Schema"], Any],
+    batch_size: int,
+    string_fields: Iterable[str],
+) -> int:
+    """
+    Convert data to record batches and hand them to the writer returned by open_writer,
+    which is opened with the schema inferred from the first batch.
+
+    Returns:
+        int: The number of records written.
+    """
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("batch_size must be an integer above 0.")
+
+    # A list is checked in full, so its schema fits every record. An iterator's
+    # schema is inferred from its first batch:
+    if isinstance(data, list):
+        first = list(_records(data))
+        records = iter(first)
+    else:
+        records = _records(data)
+        first = list(islice(records, batch_size))
+        records = chain(first, records)
+    if not first:
+        return 0
+
+    record = first[0]
+    if not is_dataclass(record) or isinstance(record, type):
+        raise ValueError(f"Only SDK dataclasses can be written, got {type(record).__name__}.")
+    plan = _ColumnPlan(type(record), first, string_fields)
+
+    written = 0
+    writer = open_writer(plan.schema)
+    try:
+        while batch := list(islice(records, batch_size)):
+            plan.check(batch)
+            writer.write_batch(plan.batch(batch))
+            written += len(batch)
+    finally:
+        writer.close()
+    return written
+
+
+def write_parquet(
+    data: Iterable,
+    file_path: str,
+    compression: str = "zstd",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    string_fields: Iterable[str] = None,
+    **kwargs,
+) -> None:
+    """
+    Write data to a Parquet file, batch_size records at a time.
+
+    Each column is typed from its dataclass field: datetimes are written as timestamps,
+    ints as int64, bools as booleans and lists as list columns. IP addresses, dicts and
+    nested dataclasses are written as strings (JSON for the latter two). A field whose
+    values do not fit its annotation is written as strings.
+
+    Args:
+        data (Iterable): The data to write. A BaseList, or an iterator of dataclasses or of BaseLists (i.e. vmdr.iter_hld).
+        file_path (str): The path to the file to write.
+        compression (str): The compression codec. Defaults to "zstd".
+        batch_size (int): The number of records per record batch. The schema of an iterator is inferred from its first batch. Defaults to 10000.
+        string_fields (Iterable[str]): Fields to always write as strings.
+
+    ## Kwargs:
+
+        - **kwargs: Additional keyword arguments to pass to pyarrow.parquet.ParquetWriter other than compression.
+    """
+    _require_pyarrow()
+
+    # If user path does not end in .parquet, add it:
+    if not file_path.lower().endswith(".parquet"):
+        file_path += ".parquet"
+
+    written = _write_batches(
+        data,
+        lambda schema: pq.ParquetWriter(file_path, schema, compression=compression, **kwargs),
+        batch_size,
+        string_fields,
+    )
+    if not written:
+        logger.info("No data to write.")
+        return
+    logger.info("Data written to %s.", file_path)
+
+
+def write_arrow(
+    data: Iterable,
+    file_path: str,
+    compression: Literal["lz4", "zstd", None] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    string_fields: Iterable[str] = None,
+) -> None:
+    """
+    Write data to an Arrow IPC (Feather v2) file, batch_size records at a time.
+    Columns are typed like in write_parquet.
+
+    Args:
+        data (Iterable): The data to write. A BaseList, or an iterator of dataclasses or of BaseLists (i.e. vmdr.iter_hld).
+        file_path (str): The path to the file to write.
+        compression (Literal["lz4", "zstd", None]): The buffer compression codec. Defaults to None.
+        batch_size (int): The number of records per record batch. The schema of an iterator is inferred from its first batch. Defaults to 10000.
+        string_fields (Iterable[str]): Fields to always write as strings.
+    """
+    _require_pyarrow()
+
+    # If user path does not end in .arrow, add it:
+    if not file_path.lower().endswith(".arrow"):
+        file_path += ".arrow"
+
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    written = _write_batches(
+        data,
+        lambda schema: pa.ipc.new_file(file_path, schema, options=options),
+        batch_size,
+        string_fields,
+    )
+    if not written:
+        logger.info("No data to write.")
+        return
+    logger.info("Data written to %s.", file_path)
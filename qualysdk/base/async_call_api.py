@@ -0,0 +1,188 @@
+"""
+async_call_api.py - contains async_call_api and the helpers that turn qualysdk's blocking
+functions into coroutines.
+
+Calls are run on one bounded, process-wide executor whose threads share each auth object's
+pooled session and the process-wide rate limiter. This lets a single asyncio event loop drive
+many concurrent pulls across modules with a fixed number of OS threads, while keeping the exact
+behaviour (validation, pagination, rate limiting, parsing) of the synchronous functions.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from threading import Lock
+from typing import Any, AsyncGenerator, Callable, Coroutine, Union
+
+from requests import Response
+
+from ..auth.basic import BasicAuth
+from ..auth.token import TokenAuth
+from .call_api import call_api
+
+DEFAULT_MAX_WORKERS = 32
+
+EXECUTOR: Union[ThreadPoolExecutor, None] = None
+EXECUTOR_LOCK = Lock()
+MAX_WORKERS = DEFAULT_MAX_WORKERS
+
+# Returned by next() when a bridged generator is exhausted:
+_EXHAUSTED = object()
+
+
+def _current_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared executor, creating it if needed. EXECUTOR_LOCK must be held.
+    """
+    global EXECUTOR
+    if EXECUTOR is None:
+        EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="qualysdk-async")
+    return EXECUTOR
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Get the shared executor that async calls run on, creating it on first use.
+    """
+    with EXECUTOR_LOCK:
+        return _current_executor()
+
+
+def _run_in_executor(loop: asyncio.AbstractEventLoop, func: Callable, *args) -> asyncio.Future:
+    """
+    Schedule func(*args) on the current shared executor.
+
+    The executor is looked up on every call and the job is submitted while EXECUTOR_LOCK
+    is held, so set_max_workers can never shut an executor down between the two.
+    """
+    with EXECUTOR_LOCK:
+        return loop.run_in_executor(_current_executor(), func, *args)
+
+
+def set_max_workers(max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+    """
+    Set the maximum number of async calls that can be in flight at once, across all modules.
+
+    Calls already running finish on the old executor. New calls, and the next step of
+    any running async iterator, are scheduled on the new one.
+
+    Params:
+    ```
+    max_workers (int) The maximum number of concurrent calls. Defaults to 32.
+    ```
+    """
+    global EXECUTOR, MAX_WORKERS
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError("max_workers must be an integer above 0.")
+    with EXECUTOR_LOCK:
+        MAX_WORKERS = max_workers
+        if EXECUTOR is not None:
+            EXECUTOR.shutdown(wait=False)
+            EXECUTOR = None
+
+
+def _size_pool(args: tuple, kwargs: dict) -> None:
+    """
+    Make sure the auth object's connection pool can serve every executor thread.
+    """
+    auth = kwargs.get("auth", args[0] if args else None)
+    if isinstance(auth, BasicAuth):
+        auth.ensure_pool_size(MAX_WORKERS)
+
+
+def to_async(func: Callable) -> Callable[..., Coroutine]:
+    """
+    Wrap a blocking qualysdk function so it can be awaited.
+
+    Params:
+    ```
+    func (Callable) The function to wrap. Its first argument should be an auth object.
+    ```
+
+    Returns:
+    ```
+    Callable[..., Coroutine] - a coroutine function with the same signature and docstring.
+    ```
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> Any:
+        _size_pool(args, kwargs)
+        loop = asyncio.get_running_loop()
+        return await _run_in_executor(loop, partial(func, *args, **kwargs))
+
+    return wrapper
+
+
+def to_async_iter(func: Callable) -> Callable[..., AsyncGenerator]:
+    """
+    Wrap a qualysdk generator function (i.e. vmdr.iter_hld) so it can be used with async for.
+
+    Each item is fetched on the shared executor, so the event loop is never blocked while
+    the generator waits on its worker threads.
+
+    Params:
+    ```
+    func (Callable) The generator function to wrap.
+    ```
+
+    Returns:
+    ```
+    Callable[..., AsyncGenerator] - an async generator function with the same signature and docstring.
+    ```
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> AsyncGenerator:
+        _size_pool(args, kwargs)
+        loop = asyncio.get_running_loop()
+        iterator = func(*args, **kwargs)
+        try:
+            while True:
+                # looked up per step, so set_max_workers can swap the executor mid-iteration:
+                item = await _run_in_executor(loop, next, iterator, _EXHAUSTED)
+                if item is _EXHAUSTED:
+                    break
+                yield item
+        finally:
+            await _run_in_executor(loop, iterator.close)
+
+    return wrapper
+
+
+async def async_call_api(
+    auth: Union[BasicAuth, TokenAuth],
+    module: str,
+    endpoint: str,
+    headers: dict = None,
+    params: dict = None,
+    payload: dict = None,
+    jsonbody: dict = None,
+    override_method: str = None,
+) -> Response:
+    """
+    Async counterpart to call_api. Accepts the same arguments and returns the same
+    requests.Response, without blocking the event loop.
+
+    Params:
+    ```
+    auth (Union[BasicAuth, TokenAuth]) The authentication object.
+    module (str) The module to call using the CALL_SCHEMA.
+    endpoint (str) The endpoint to call using the CALL_SCHEMA.
+    headers (dict) The headers to send.
+    payload (dict) The payload to send.
+    params (dict) The parameters to send.
+    jsonbody (dict) The JSON body to send.
+    override_method (Literal["GET", "POST", "PUT", "PATCH", "DELETE"]) The method to override the schema with.
+    ```
+    """
+    return await to_async(call_api)(
+        auth,
+        module,
+        endpoint,
+        headers=headers,
+        params=params,
+        payload=payload,
+        jsonbody=jsonbody,
+        override_method=override_method,
+    )
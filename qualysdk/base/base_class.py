@@ -1,10 +1,11 @@
 from dataclasses import dataclass, asdict
 
 from .serializable_mixin import SerializableMixin
+from .lazy_fields import LazyFieldsMixin
 
 
 @dataclass
-class BaseClass(SerializableMixin):
+class BaseClass(LazyFieldsMixin, SerializableMixin):
     """
     Base class for all data classes
     to easily define basic common methods.
@@ -4,9 +4,12 @@ Contains the BaseList class for the qualysdk package.
 The BaseList class is used to contain custom class objects in a list.
 """
 
+from dataclasses import is_dataclass
 from ipaddress import IPv4Address, IPv6Address, IPv4Network, IPv6Network
+from typing import Iterable
 
 from .serializable_mixin import SerializableMixin
+from .compact import CompactRecord, compact_class, populated_fields
 
 IP_TYPES = (IPv4Address, IPv6Address, IPv4Network, IPv6Network)
 
@@ -24,3 +27,28 @@ class BaseList(list, SerializableMixin):
     def __str__(self) -> str:
         # instead of returning "[...]", return a comma-separated string of the objects in the list
         return ", ".join(str(obj) for obj in self) if self else "[]"
+
+    def compact(self, dense: Iterable[str] = None) -> "BaseList":
+        """
+        Return a copy of the list with each dataclass record converted to its memory-compact,
+        __slots__-based variant (see qualysdk.base.compact). Other items are kept as-is.
+
+        Args:
+            dense (Iterable[str]): The fields to store in slots. If None, the fields populated in at least half of the records of each class are dense, and the rest are sparse.
+
+        Returns:
+            BaseList: The compacted records.
+        """
+        by_class = {}
+        for item in self:
+            if is_dataclass(item) and not isinstance(item, (type, CompactRecord)):
+                by_class.setdefault(type(item), []).append(item)
+
+        converters = {}
+        for cls, records in by_class.items():
+            fields = populated_fields(records) if dense is None else dense
+            converters[cls] = compact_class(cls, fields).from_record
+
+        return BaseList(
+            converters[type(item)](item) if type(item) in converters else item for item in self
+        )
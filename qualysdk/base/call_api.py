@@ -5,10 +5,11 @@ This function handles all API calls to the Qualys API. It takes in a URL, header
 Qualys uses many tricks in their API, such as using both url params and post data.
 """
 
-from requests import request, Response
+import logging
+from weakref import finalize, ref
+from requests import Response
 from typing import Literal, Union
 from datetime import datetime, timedelta
-from time import sleep
 
 from ..auth.token import TokenAuth
 from ..auth.basic import BasicAuth
@@ -17,6 +18,32 @@ from ..exceptions.Exceptions import *
 from .call_schema import CALL_SCHEMA
 from .convert_bools_and_nones import convert_bools_and_nones
 from .xml_parser import xml_parser
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .response_cache import resolve_cache
+from .metrics import record, timed, wire_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def release_on_close(response: Response, limiter: RateLimiter, key: str) -> None:
+    """
+    Hold a streamed response's concurrency slot until its body has been read and the
+    response closed, instead of freeing it once the headers arrive. The slot is also
+    freed if the response is garbage collected without being closed.
+    """
+    release = finalize(response, limiter.release, key, dict(response.headers))
+    # Held weakly, so the wrapper doesn't keep the response alive:
+    response_ref = ref(response)
+
+    def close_and_release() -> None:
+        try:
+            if (closing := response_ref()) is not None:
+                Response.close(closing)
+        finally:
+            # finalize objects only ever run once:
+            release()
+
+    response.close = close_and_release
 
 
 def call_api(
@@ -28,6 +55,8 @@ def call_api(
     payload: dict = None,
     jsonbody: dict = None,
     override_method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = None,
+    stream: bool = False,
+    use_cache: bool = None,
 ) -> Response:
     """
     Base call function for the Qualys API.
@@ -45,8 +74,14 @@ def call_api(
     params (dict) The parameters to send.
     jsonbody (dict) The JSON body to send.
     override_method (Literal["GET", "POST", "PUT", "PATCH", "DELETE"]) The method to override the schema with.
+    stream (bool) Whether to defer downloading the response body. If True, the caller reads response.raw and must close the response. The call keeps its concurrency slot until then.
+    use_cache (bool) Whether to use the response cache, if it has been enabled with configure_cache. True to opt in, False to opt out, None (the default) to only cache the endpoints in CACHEABLE_ENDPOINTS. Streamed calls are never cached.
     ```
     """
+    # Shared by every thread calling this API with the same credentials:
+    limiter = get_rate_limiter(auth)
+    limiter_key = f"{module}/{endpoint}"
+
     while True:  # loop to handle hitting the rate limit
         # check module and endpoint:
         if module.lower() not in CALL_SCHEMA.keys():
@@ -91,13 +126,6 @@ def call_api(
             case _:
                 raise ValueError(f"Invalid url_type {SCHEMA['url_type']}.")
 
-        # if token auth, check if token is not 4+ hours old:
-        if isinstance(auth, TokenAuth):
-            # check that the time delta between now and the token generation time is less than ~4 hours:
-            if (datetime.now() - auth.generated_on).seconds > 14395:
-                print("Token is 4+ hours old. Refreshing token...")
-                auth.token = auth.get_token()
-
         # check params:
         if params:
             for key in params.keys():
@@ -118,14 +146,8 @@ def call_api(
         else:
             use_json = False
 
-        # set up JWT auth header if needed:
-        if auth.auth_type == "token":
-            if not headers:
-                headers = auth.as_header()
-            else:
-                headers["Authorization"] = auth.as_header()["Authorization"]
-        # or set up the tuple for basic auth:
-        elif auth.auth_type == "basic":
+        # set up the tuple for basic auth if needed:
+        if auth.auth_type == "basic":
             auth_tuple = (auth.username, auth.password)
 
         # Make certain payloads/params requests-friendly:
@@ -219,16 +241,64 @@ def call_api(
         if params and SCHEMA.get("_xml_data") and params.get("_xml_data"):
             params = params["_xml_data"]
 
-        # and finally, make the request:
-        response = request(
-            method=(SCHEMA["method"][0] if not override_method else override_method.upper()),
-            url=url,
-            headers=headers,
-            params=params,
-            data=payload if not use_json else None,
-            json=jsonbody if use_json else None,
-            auth=(auth_tuple if auth.auth_type == "basic" else None),
-        )
+        method = SCHEMA["method"][0] if not override_method else override_method.upper()
+
+        # Serve from the response cache if it is enabled for this call:
+        cache, cache_ttl = (None, None) if stream else resolve_cache(module, endpoint, use_cache)
+        if cache:
+            cache_key = cache.key(auth.username, method, url, params, payload, jsonbody)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                record("cache_hits", 1, module, endpoint)
+                return cached
+
+        # and finally, make the request. Waits for the shared
+        # rate limit and concurrency limit first:
+        response = None
+        hold_slot = False
+        with timed("limiter_wait_seconds", module, endpoint):
+            limiter.acquire(limiter_key)
+        try:
+            # if token auth, check if token is not 4+ hours old. Done after
+            # acquiring, as the limiter may have paused this thread for a while:
+            if isinstance(auth, TokenAuth):
+                # check that the time delta between now and the token generation time is less than ~4 hours:
+                if (datetime.now() - auth.generated_on).seconds > 14395:
+                    logger.info("Token is 4+ hours old. Refreshing token...")
+                    auth.token = auth.get_token()
+
+            # set up JWT auth header if needed:
+            if auth.auth_type == "token":
+                if not headers:
+                    headers = auth.as_header()
+                else:
+                    headers["Authorization"] = auth.as_header()["Authorization"]
+
+            with timed("request_seconds", module, endpoint):
+                response = auth.session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    data=payload if not use_json else None,
+                    json=jsonbody if use_json else None,
+                    auth=(auth_tuple if auth.auth_type == "basic" else None),
+                    stream=stream,
+                )
+            # A streamed body is still downloading, so its transfer counts against the
+            # concurrency limit until the caller closes it:
+            hold_slot = stream
+        finally:
+            if hold_slot:
+                release_on_close(response, limiter, limiter_key)
+            else:
+                limiter.release(limiter_key, response.headers if response is not None else None)
+
+        # Streamed bodies are counted by the caller once they have been read:
+        if not stream:
+            record("bytes_received", wire_bytes(response), module, endpoint)
+        if response.status_code >= 400:
+            record("http_errors", 1, module, endpoint)
 
         # check for errors not related to rate limiting:
         if (
@@ -281,10 +351,9 @@ def call_api(
             if module != "pm" and int(response.headers["X-RateLimit-Remaining"]) == 0:
                 # Call API again for the X-RateLimit-ToWait-Sec header.
                 # Qualys sometimes only includes this header when the rate limit is reached and retried:
-                response = request(
-                    method=(
-                        SCHEMA["method"][0] if not override_method else override_method.upper()
-                    ),
+                response.close()
+                response = auth.session.request(
+                    method=method,
                     url=url,
                     headers=headers,
                     params=params,
@@ -300,19 +369,29 @@ def call_api(
                 else:
                     to_wait = 3601  # Default to 1h 1s if no header is present.
 
-                print(
-                    f"WARNING: You have reached the rate limit for this endpoint. qualysdk will automatically sleep for {to_wait} seconds and try again at approximately {datetime.now() + timedelta(seconds=to_wait)}."
+                logger.warning(
+                    "You have reached the rate limit for this endpoint. qualysdk will automatically pause all threads calling it for %s seconds and try again at approximately %s.",
+                    to_wait,
+                    datetime.now() + timedelta(seconds=to_wait),
                 )
-                sleep(to_wait)
-                # Go to next iteration of the loop to try again:
+                response.close()
+                record("rate_limit_pause_seconds", to_wait, module, endpoint)
+                record("retries", 1, module, endpoint)
+                limiter.pause(limiter_key, to_wait)
+                # Go to next iteration of the loop to try again. The limiter
+                # holds this and every other thread until the pause is over:
                 continue
             # Qualys does not return X-RateLimit headers for PM. Sigh...
-            elif module == "pm":
-                return response
-            else:
+            elif module != "pm":
                 # Almost at rate limit:
-                print(
-                    f"Warning: This endpoint will accept {response.headers['X-RateLimit-Remaining']} more calls before rate limiting you. qualysdk will automatically sleep once remaining calls hits 0."
+                logger.warning(
+                    "This endpoint will accept %s more calls before rate limiting you. qualysdk will automatically pause once remaining calls hits 0.",
+                    response.headers["X-RateLimit-Remaining"],
                 )
 
-        return response
+        break
+
+    if cache and response.status_code == 200:
+        cache.put(cache_key, response, cache_ttl)
+
+    return response
@@ -0,0 +1,267 @@
+"""
+compact.py - contains compact_class, which builds memory-compact, __slots__-based variants
+of the SDK's dataclasses for holding millions of records (i.e. a full estate of detections).
+"""
+
+from dataclasses import MISSING, asdict, fields, is_dataclass
+from sys import intern
+from threading import Lock
+from typing import Any, Dict, Iterable, Sequence, Tuple
+
+from .serializable_mixin import SerializableMixin
+
+# A field populated in at least this share of records is stored in its own slot
+# by BaseList.compact(). Rarer fields go to the per-record sparse dict:
+DENSE_THRESHOLD = 0.5
+
+# Strings up to this length (i.e. "Confirmed", "Active", "TCP") are interned when a record
+# is compacted, so that records share one copy of each repeated value:
+INTERN_MAX_LENGTH = 32
+
+# Class attributes of the original dataclass that are not copied to its compact variant.
+# __init__ is rebuilt, and records are only compacted after __post_init__ has run:
+_SKIPPED_ATTRIBUTES = {
+    "__init__",
+    "__post_init__",
+    "__dict__",
+    "__weakref__",
+    "__module__",
+    "__qualname__",
+    "__doc__",
+    "__slots__",
+    "__annotations__",
+    "__dataclass_params__",
+}
+
+COMPACT_CLASSES: Dict[Tuple[type, frozenset], type] = {}
+COMPACT_CLASSES_LOCK = Lock()
+
+
+def _is_default(value: Any, default: Any) -> bool:
+    """
+    Check if a value is a field's default. Equal values of the same type count,
+    so that i.e. an empty string parsed from a response matches a "" default.
+    """
+    return value is default or (type(value) is type(default) and value == default)
+
+
+class CompactRecord:
+    """
+    Base class of the classes built by compact_class.
+
+    Dense fields are stored in __slots__, so a record has no __dict__. Sparse fields
+    are stored in a dict that is only allocated for records that set at least one of
+    them, and read back through properties that fall back to the field's default.
+    """
+
+    __slots__ = ("_sparse",)
+
+    # Set on each compact class:
+    _compacts: type = None
+    _dense_fields: Tuple[str, ...] = ()
+    _sparse_defaults: Dict[str, Any] = {}
+
+    def __init__(self, **kwargs):
+        sparse = {}
+        for f in fields(self):
+            if f.name in kwargs:
+                value = kwargs.pop(f.name)
+            elif f.default is not MISSING:
+                value = f.default
+            elif f.default_factory is not MISSING:
+                value = f.default_factory()
+            else:
+                raise TypeError(f"{type(self).__name__}() missing required argument: '{f.name}'")
+
+            if f.name in self._sparse_defaults:
+                if not _is_default(value, self._sparse_defaults[f.name]):
+                    sparse[f.name] = value
+            else:
+                object.__setattr__(self, f.name, value)
+        if kwargs:
+            raise TypeError(
+                f"{type(self).__name__}() got unexpected arguments: {', '.join(kwargs)}"
+            )
+        self._sparse = sparse or None
+
+    @classmethod
+    def from_record(cls, record: Any) -> "CompactRecord":
+        """
+        Build a compact record from an instance of the original dataclass.
+
+        Params:
+            record (Any): An instance of the dataclass this class compacts.
+
+        Returns:
+            CompactRecord: The compact record.
+        """
+        self = object.__new__(cls)
+        for name in cls._dense_fields:
+            value = getattr(record, name)
+            if type(value) is str and len(value) <= INTERN_MAX_LENGTH:
+                value = intern(value)
+            object.__setattr__(self, name, value)
+
+        sparse = None
+        for name, default in cls._sparse_defaults.items():
+            value = getattr(record, name)
+            if not _is_default(value, default):
+                if type(value) is str and len(value) <= INTERN_MAX_LENGTH:
+                    value = intern(value)
+                if sparse is None:
+                    sparse = {}
+                sparse[name] = value
+        self._sparse = sparse
+        return self
+
+    def to_record(self) -> Any:
+        """
+        Convert the compact record back to an instance of the original dataclass.
+        """
+        record = object.__new__(self._compacts)
+        for f in fields(self):
+            object.__setattr__(record, f.name, getattr(self, f.name))
+        return record
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    serialized = SerializableMixin.serialized
+    dump_json = SerializableMixin.dump_json
+
+    def __reduce__(self):
+        # The class is built at runtime, so pickle it by how it was built:
+        return (
+            _rebuild_record,
+            (
+                self._compacts,
+                self._dense_fields,
+                {f.name: getattr(self, f.name) for f in fields(self)},
+            ),
+        )
+
+
+def _sparse_property(name: str, default: Any) -> property:
+    """
+    Build the property that stores a sparse field in the record's _sparse dict.
+    """
+
+    def getter(self):
+        sparse = self._sparse
+        return default if sparse is None else sparse.get(name, default)
+
+    def setter(self, value):
+        sparse = self._sparse
+        if _is_default(value, default):
+            if sparse is not None:
+                sparse.pop(name, None)
+        elif sparse is None:
+            self._sparse = {name: value}
+        else:
+            sparse[name] = value
+
+    return property(getter, setter)
+
+
+def compact_class(cls: type, dense: Iterable[str] = None) -> type:
+    """
+    Build (or get the cached) memory-compact variant of a dataclass.
+
+    The compact class stores the dense fields in __slots__ and every other field in a
+    sparse dict that is only allocated when one of them is set. It keeps the original's
+    fields (so asdict(), to_dict(), serialized() and the SQL/CSV exports work unchanged),
+    comparison and repr methods, and helper methods such as has_agent(). Records are
+    converted with CompactClass.from_record(record) and back with to_record().
+
+    Fields without a default, and fields with a default_factory, are always dense.
+
+    Params:
+        cls (type): The dataclass to compact, i.e. vmdr.data_classes.Detection.
+        dense (Iterable[str]): The fields to store in slots. If None, all fields are dense.
+
+    Returns:
+        type: The compact class, a subclass of CompactRecord.
+    """
+    if isinstance(cls, type) and issubclass(cls, CompactRecord):
+        cls = cls._compacts
+    if not is_dataclass(cls):
+        raise TypeError(f"{cls} is not a dataclass.")
+
+    all_fields = fields(cls)
+    names = {f.name for f in all_fields}
+    dense = set(names if dense is None else dense)
+    if unknown := dense - names:
+        raise ValueError(f"{cls.__name__} has no fields named {', '.join(sorted(unknown))}.")
+    dense |= {
+        f.name for f in all_fields if f.default is MISSING or f.default_factory is not MISSING
+    }
+
+    key = (cls, frozenset(dense))
+    with COMPACT_CLASSES_LOCK:
+        if key in COMPACT_CLASSES:
+            return COMPACT_CLASSES[key]
+
+        namespace = {}
+        # Copy methods (including the dataclass-generated __eq__, __lt__ and __repr__)
+        # from the dataclass and its parents other than the qualysdk.base mixins, so
+        # that the closest definition wins:
+        for klass in reversed(cls.__mro__):
+            if klass is object or klass.__module__.startswith(__package__):
+                continue
+            for attr, value in vars(klass).items():
+                if attr not in _SKIPPED_ATTRIBUTES and attr not in names:
+                    namespace[attr] = value
+
+        sparse_defaults = {}
+        for f in all_fields:
+            if f.name not in dense:
+                sparse_defaults[f.name] = f.default
+                namespace[f.name] = _sparse_property(f.name, f.default)
+
+        namespace.update(
+            __slots__=tuple(f.name for f in all_fields if f.name in dense),
+            __module__=cls.__module__,
+            __qualname__=f"Compact{cls.__qualname__}",
+            __doc__=f"Memory-compact variant of {cls.__name__}. See qualysdk.base.compact.",
+            _compacts=cls,
+            _dense_fields=tuple(f.name for f in all_fields if f.name in dense),
+            _sparse_defaults=sparse_defaults,
+        )
+        compact = type(f"Compact{cls.__name__}", (CompactRecord,), namespace)
+        COMPACT_CLASSES[key] = compact
+        return compact
+
+
+def _rebuild_record(cls: type, dense: Tuple[str, ...], values: dict) -> CompactRecord:
+    """
+    Unpickle a compact record.
+    """
+    return compact_class(cls, dense)(**values)
+
+
+def populated_fields(
+    records: Sequence[Any], threshold: float = DENSE_THRESHOLD, sample: int = 1000
+) -> set:
+    """
+    Get the fields that are set to something other than their default in at least
+    threshold of records. Used to pick the dense fields of a compact class.
+
+    Params:
+        records (Sequence[Any]): Instances of a single dataclass.
+        threshold (float): The minimum share of records a field must be populated in.
+        sample (int): The maximum number of records to inspect, spread evenly across records.
+
+    Returns:
+        set: The names of the fields.
+    """
+    if not records:
+        return set()
+    if len(records) > sample:
+        records = records[:: len(records) // sample]
+    counts = {}
+    defaults = {f.name: f.default for f in fields(records[0])}
+    for record in records:
+        for name, default in defaults.items():
+            if not _is_default(getattr(record, name), default):
+                counts[name] = counts.get(name, 0) + 1
+    return {name for name, count in counts.items() if count >= threshold * len(records)}
@@ -4,14 +4,17 @@ which wrap pandas.DataFrame.to_csv and pandas.DataFrame.to_excel
 to accurately export data to CSV and Excel files.
 """
 
+import logging
 import csv
 from typing import Literal
 
 from pandas import DataFrame
 
-from ..sql.base import prepare_dataclass
+from ..sql.base import dataclasses_to_frame
 from .base_list import BaseList
 
+logger = logging.getLogger(__name__)
+
 
 def write_csv(data: BaseList, file_path: str, **kwargs) -> None:
     """
@@ -42,7 +45,7 @@ def write_csv(data: BaseList, file_path: str, **kwargs) -> None:
         encoding="utf-8-sig",
         **kwargs,
     )
-    print(f"Data written to {file_path}.")
+    logger.info("Data written to %s.", file_path)
 
 
 def write_excel(data: BaseList, file_path: str, **kwargs) -> None:
@@ -66,7 +69,7 @@ def write_excel(data: BaseList, file_path: str, **kwargs) -> None:
 
     # Write to Excel:
     data.to_excel(file_path, index=False, **kwargs)
-    print(f"Data written to {file_path}.")
+    logger.info("Data written to %s.", file_path)
 
 
 def backend_write(
@@ -88,17 +91,13 @@ def backend_write(
     # Check that all things in the BaseList have
     # the to_dict method.
     if all(hasattr(thing, "to_dict") for thing in data):
-        data = [prepare_dataclass(thing) for thing in data]
+        data = dataclasses_to_frame(data)
     else:
         raise ValueError(
             "All items in the BaseList must have a to_dict method. Bad indexes: ",
             [i for i, thing in enumerate(data) if not hasattr(thing, "to_dict")],
         )
 
-    # Convert to DataFrame if needed:
-    if not isinstance(data, DataFrame):
-        data = DataFrame(data)
-
     # Make any datetime cols timezone unaware:
     for col in data.columns:
         if data[col].dtype in [
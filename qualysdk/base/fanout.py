@@ -0,0 +1,315 @@
+"""
+fanout.py - contains fan_out, which runs a function over many items (i.e. job IDs or patch IDs)
+on a bounded pool of threads and streams the results back as they finish or in input order.
+"""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Event, Lock
+from time import monotonic, sleep
+from typing import Any, Callable, Iterable, Iterator, Literal, Tuple, Union
+
+from requests import Response
+
+from ..auth.basic import BasicAuth
+from ..auth.token import TokenAuth
+from ..exceptions.Exceptions import RateLimitError
+from .metrics import record
+from .rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Seconds to pause when Qualys answers 429 without saying how long to wait:
+DEFAULT_RATE_LIMIT_PAUSE = 60
+# Times a single item is retried after a 429 before its error is reported:
+RATE_LIMIT_RETRIES = 3
+# Seconds between progress messages:
+PROGRESS_INTERVAL = 15
+# Seconds before the first retry of an item that raised an error, doubled on every retry after:
+RETRY_BACKOFF = 2
+# With adaptive concurrency, threads are taken away when the average call takes this many
+# times longer than the fastest average seen:
+LATENCY_BACKOFF = 2.0
+# Weight of the latest call in the average call time:
+LATENCY_SMOOTHING = 0.2
+
+
+def retry_after(response: Response) -> Union[float, None]:
+    """
+    Get the seconds to wait from a 429 response's Retry-After or
+    X-RateLimit-ToWait-Sec header, or None if it has neither.
+    """
+    for header in ("Retry-After", "X-RateLimit-ToWait-Sec"):
+        try:
+            return float(response.headers[header])
+        except (KeyError, ValueError):
+            continue
+    return None
+
+
+class AdaptiveConcurrency:
+    """
+    The number of calls fan_out keeps in flight when adaptive is True.
+
+    Starts at ceiling. Halved (down to floor) when a call is rate limited, lowered by one
+    when the average call time climbs past LATENCY_BACKOFF times the fastest average seen,
+    and raised by one after limit calls in a row finish without either. Changes are at
+    least limit calls (or 429s) apart, so a burst of 429s from one pause only counts once.
+
+    Updated from the worker threads, so every method takes the lock.
+    """
+
+    def __init__(self, ceiling: int, floor: int = 1, module: str = "", endpoint: str = ""):
+        self.ceiling = ceiling
+        self.floor = min(floor, ceiling)
+        self.limit = ceiling
+        self.module = module
+        self.endpoint = endpoint
+        self.lock = Lock()
+        self.average = None
+        self.fastest = None
+        self.since_change = 0
+
+    def _set(self, limit: int, reason: str) -> None:
+        limit = max(self.floor, min(self.ceiling, limit))
+        self.since_change = 0
+        if limit == self.limit:
+            return
+        logger.debug("Concurrency %s -> %s (%s).", self.limit, limit, reason)
+        self.limit = limit
+        record("fanout_threads", limit, self.module, self.endpoint)
+
+    def success(self, seconds: float) -> None:
+        """
+        Report a call that finished in seconds.
+        """
+        with self.lock:
+            self.average = (
+                seconds
+                if self.average is None
+                else self.average + LATENCY_SMOOTHING * (seconds - self.average)
+            )
+            self.fastest = self.average if self.fastest is None else min(self.fastest, self.average)
+            self.since_change += 1
+            if self.since_change < self.limit:
+                return
+            if self.average > self.fastest * LATENCY_BACKOFF:
+                self._set(self.limit - 1, "latency")
+            else:
+                self._set(self.limit + 1, "healthy")
+
+    def rate_limited(self) -> None:
+        """
+        Report a call that Qualys answered with 429.
+        """
+        with self.lock:
+            self.since_change += 1
+            if self.since_change >= self.limit or self.limit == self.ceiling:
+                self._set(self.limit // 2, "rate limited")
+
+
+def fan_out(
+    func: Callable[[Any], Any],
+    items: Iterable,
+    threads: int = 5,
+    auth: Union[BasicAuth, TokenAuth] = None,
+    limiter_key: str = None,
+    on_error: Literal["skip", "stop", "raise"] = "skip",
+    name: str = "FanOut",
+    ordered: bool = False,
+    retries: int = 0,
+    adaptive: bool = False,
+    cancel: Event = None,
+) -> Iterator[Tuple[Any, Any]]:
+    """
+    Call func on every item with at most threads calls running at once, yielding
+    (item, result) as each call finishes, or in the order of items if ordered is True.
+    Items are pulled from the iterable as threads free up, so a list of thousands of IDs
+    never becomes thousands of threads or pending calls.
+
+    If func raises a RateLimitError, every thread calling the same API is paused through
+    the shared rate limiter (or, without auth, the calling thread sleeps) and the item is
+    tried again. Other errors are retried retries times, waiting RETRY_BACKOFF seconds
+    (doubled each time) in between, and then handled according to on_error.
+
+    Stopping iteration early, or setting cancel, cancels every call that hasn't started.
+    Calls already running finish in the background and their results are dropped.
+
+    Params:
+    ```
+    func (Callable[[Any], Any]) Called with each item. Its return value is yielded with the item.
+    items (Iterable) The items to call func on.
+    threads (int) The maximum number of concurrent calls. Lowered to the API's concurrency limit once Qualys has reported one. Defaults to 5.
+    auth (Union[BasicAuth, TokenAuth]) The authentication object func calls the API with. Used with limiter_key to share rate limit pauses.
+    limiter_key (str) The "module/endpoint" func calls, i.e. "pm/deploymentjob". Also labels the metrics fan_out records.
+    on_error (Literal["skip", "stop", "raise"]) What to do with an item that still fails after its retries. "skip" logs it and carries on, "stop" logs it and stops scheduling items, yielding only what already finished, and "raise" cancels the rest and raises the error. Defaults to "skip".
+    name (str) The prefix of the worker thread names.
+    ordered (bool) Whether to yield results in the order of items instead of as they finish. A slow item holds back the ones after it, and no more than threads * 2 items are scheduled past it. Defaults to False.
+    retries (int) The number of times to retry an item that raised an error other than a rate limit. Defaults to 0.
+    adaptive (bool) Whether to tune the number of calls in flight between 1 and threads from call times and 429s. See AdaptiveConcurrency. Defaults to False.
+    cancel (Event) Set it from another thread to stop fan_out. Calls that haven't started are cancelled and iteration ends.
+    ```
+
+    Yields:
+    ```
+    Tuple[Any, Any] - (item, result), in the order the calls finish, or the order of items if ordered is True.
+    ```
+    """
+    if not isinstance(threads, int) or threads < 1:
+        raise ValueError("threads must be an integer greater than 0.")
+    if not isinstance(retries, int) or retries < 0:
+        raise ValueError("retries must be an integer greater than or equal to 0.")
+    if on_error not in ("skip", "stop", "raise"):
+        raise ValueError("on_error must be 'skip', 'stop' or 'raise'.")
+
+    limiter = get_rate_limiter(auth) if auth is not None and limiter_key else None
+    module, _, endpoint = (limiter_key or "").partition("/")
+    if limiter is not None:
+        bucket = limiter.buckets.get(limiter_key)
+        if bucket is not None and bucket.concurrency_limit:
+            threads = min(threads, bucket.concurrency_limit)
+    controller = (
+        AdaptiveConcurrency(threads, module=module, endpoint=endpoint) if adaptive else None
+    )
+    cancel = cancel or Event()
+    # Set when fan_out ends, to wake up retries waiting on a backoff:
+    stopped = Event()
+
+    def call(item: Any) -> Any:
+        rate_limited = 0
+        failed = 0
+        started = monotonic()
+        while True:
+            try:
+                attempt_started = monotonic()
+                result = func(item)
+            except RateLimitError as e:
+                rate_limited += 1
+                if controller is not None:
+                    controller.rate_limited()
+                if rate_limited > RATE_LIMIT_RETRIES:
+                    raise
+                to_wait = e.wait if e.wait is not None else DEFAULT_RATE_LIMIT_PAUSE
+                logger.warning(
+                    "Rate limited on %s. Pausing for %s seconds before trying %s again.",
+                    limiter_key or name,
+                    to_wait,
+                    item,
+                )
+                record("rate_limit_pause_seconds", to_wait, module, endpoint)
+                record("retries", 1, module, endpoint)
+                if limiter is not None:
+                    # The retried call waits in call_api, along with every other thread:
+                    limiter.pause(limiter_key, to_wait)
+                else:
+                    sleep(to_wait)
+            except Exception as e:
+                failed += 1
+                if failed > retries or stopped.is_set():
+                    raise
+                to_wait = RETRY_BACKOFF * 2 ** (failed - 1)
+                logger.warning(
+                    "%s - Error on %s: %s. Trying again in %s seconds (%s/%s).",
+                    name,
+                    item,
+                    e,
+                    to_wait,
+                    failed,
+                    retries,
+                )
+                record("retries", 1, module, endpoint)
+                if stopped.wait(to_wait):
+                    raise
+            else:
+                if controller is not None:
+                    controller.success(monotonic() - attempt_started)
+                record("fanout_item_seconds", monotonic() - started, module, endpoint)
+                return result
+
+    def window() -> int:
+        # Adaptive concurrency keeps exactly limit calls in flight. Otherwise one spare
+        # item is queued per thread, so no thread waits on the next submit:
+        return controller.limit if controller is not None else threads * 2
+
+    items = enumerate(items)
+    pending: dict[Future, Tuple[int, Any]] = {}
+    # Finished calls waiting for the ones before them, when ordered. None marks a failed item:
+    finished_early: dict[int, Union[Tuple[Any, Any], None]] = {}
+    next_index = 0
+    exhausted = False
+    done_count = 0
+    last_progress = monotonic()
+    executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix=name)
+
+    def submit() -> None:
+        nonlocal exhausted
+        while not exhausted and len(pending) + len(finished_early) < window():
+            try:
+                index, item = next(items)
+            except StopIteration:
+                exhausted = True
+                return
+            pending[executor.submit(call, item)] = (index, item)
+
+    try:
+        submit()
+        while pending:
+            if cancel.is_set():
+                logger.warning("%s - Cancelled with %s items in progress.", name, len(pending))
+                break
+            finished, _ = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+            stop = False
+            ready = []
+            for future in finished:
+                index, item = pending.pop(future)
+                done_count += 1
+                try:
+                    ready.append((index, (item, future.result())))
+                except Exception as e:
+                    record("fanout_errors", 1, module, endpoint)
+                    if on_error == "raise":
+                        logger.error("%s - Error on %s: %s. Cancelling the rest...", name, item, e)
+                        raise
+                    logger.error("%s - Error on %s: %s", name, item, e)
+                    stop = stop or on_error == "stop"
+                    ready.append((index, None))
+
+            if ordered:
+                finished_early.update(ready)
+                while next_index in finished_early:
+                    result = finished_early.pop(next_index)
+                    next_index += 1
+                    if result is not None:
+                        yield result
+            else:
+                for _, result in ready:
+                    if result is not None:
+                        yield result
+
+            if stop:
+                logger.error("%s - Stopping. Returning what was collected so far...", name)
+                for future in pending:
+                    future.cancel()
+                # Calls already running still finish, so their results are not lost:
+                for future in sorted(pending, key=lambda f: pending[f][0]):
+                    if not future.cancelled():
+                        try:
+                            finished_early[pending[future][0]] = (
+                                pending[future][1],
+                                future.result(),
+                            )
+                        except Exception:
+                            pass
+                for index in sorted(finished_early):
+                    if finished_early[index] is not None:
+                        yield finished_early[index]
+                break
+
+            submit()
+            if monotonic() - last_progress >= PROGRESS_INTERVAL:
+                logger.info("%s - %s items done, %s in progress.", name, done_count, len(pending))
+                last_progress = monotonic()
+    finally:
+        # Stop retries waiting on a backoff, and calls that haven't started:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,101 @@
+"""
+html_text.py - contains html_to_text, which strips the HTML that Qualys embeds in detection
+results and KB entries.
+
+Most of these values are short fragments, and many have no markup at all, so they are
+handled with a couple of regexes and html.unescape instead of building a parse tree for
+each one. On typical detection results this is about twice as fast as parsing the fragment
+with lxml.html, and unlike lxml.html it keeps whitespace-only values as they are.
+"""
+
+import re
+from html import unescape
+from warnings import catch_warnings, simplefilter
+
+from bs4 import BeautifulSoup
+
+# Markup that html.parser treats as a tag, comment, declaration or processing instruction.
+# A "<" that is not followed by one of these (i.e. "version < 2.0") is plain text:
+TAG_RE = re.compile(
+    r"""<(?:/?[a-zA-Z](?:[^>"']|"[^"]*"|'[^']*')*|!--.*?--|![^>]*|\?[^>]*)>""", re.DOTALL
+)
+
+# Anything left that html.parser might still read as markup:
+LEFTOVER_RE = re.compile(r"<[a-zA-Z/!?]")
+
+# <a href="...">...</a>, with the href in double, single or no quotes:
+LINK_RE = re.compile(
+    r"""<a\s[^>]*?\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))[^>]*>.*?</a\s*>""",
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Markup whose contents the regexes cannot handle sensibly. Such values
+# are rare, and are handed to BeautifulSoup instead:
+SLOW_PATH_RE = re.compile(
+    r"<(?:script|style|textarea|title|plaintext|xmp)\b|<!\[CDATA\[", re.IGNORECASE
+)
+
+
+def _link_href(match: re.Match) -> str:
+    return next(group for group in match.groups() if group is not None)
+
+
+def _beautifulsoup_text(value: str, links: bool) -> str:
+    """
+    The original BeautifulSoup-based conversion, used as a fallback for unusual markup.
+    """
+    with catch_warnings():
+        simplefilter("ignore")  # ignore the warning about the html.parser
+        soup = BeautifulSoup(value, "html.parser")
+        if links:
+            for a_tag in soup.find_all("a"):
+                if a_tag.has_attr("href"):
+                    a_tag.replace_with(a_tag["href"])
+        return soup.get_text()
+
+
+def html_to_text(value: str, links: bool = False) -> str:
+    """
+    Strip the tags out of an HTML string and decode its entities.
+
+    Values without any markup are returned untouched, and the rest are converted with
+    two regex passes and html.unescape. Values that use markup the regexes cannot handle,
+    such as <script> or unclosed links, are converted with BeautifulSoup.
+
+    The result is not always identical to BeautifulSoup(value, "html.parser").get_text().
+    Entities are decoded with the HTML5 rules, so "&amp" without a trailing semicolon
+    becomes "&" and "AT&T" is kept as is, and whitespace is never collapsed or dropped.
+
+    Params:
+        value (str): The HTML to convert.
+        links (bool): If True, replace each <a href="..."> element (text included) with its href,
+            like KB entries do. Defaults to False.
+
+    Returns:
+        str: The text content of value.
+    """
+    if "<" not in value:
+        return unescape(value) if "&" in value else value
+
+    if SLOW_PATH_RE.search(value):
+        return _beautifulsoup_text(value, links)
+
+    text = value
+    if links:
+        text = LINK_RE.sub(_link_href, text)
+        if re.search(r"<a\s[^>]*\bhref", text, re.IGNORECASE):
+            # A link that is not closed. html.parser nests the rest of the text in it:
+            return _beautifulsoup_text(value, links)
+
+    text = TAG_RE.sub("", text)
+    if LEFTOVER_RE.search(text):
+        # Markup the tag pattern could not close, i.e. a stray quote in an unquoted attribute:
+        return _beautifulsoup_text(value, links)
+    return unescape(text)
+
+
+def html_to_text_with_links(value: str) -> str:
+    """
+    html_to_text, replacing each link with its href. Used for KB entry fields.
+    """
+    return html_to_text(value, links=True)
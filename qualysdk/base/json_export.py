@@ -1,7 +1,10 @@
+import logging
 from json import dump
 
+logger = logging.getLogger(__name__)
+
 
 def write_json(data: dict, output: str) -> None:
     with open(output, "w") as f:
         dump(data, f, indent=2)
-    print(f"Data written to {output}.")
+    logger.info("Data written to %s.", output)
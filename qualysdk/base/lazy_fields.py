@@ -0,0 +1,150 @@
+"""
+lazy_fields.py - contains LazyFieldsMixin, which lets dataclasses defer expensive field
+conversions (HTML cleanup, nested object expansion) until the field is first read.
+"""
+
+from dataclasses import MISSING
+from threading import RLock
+from typing import Any, Callable, Iterable
+
+# Serializes group expansions, which write several fields of an instance. Re-entrant, since
+# an expander may read fields deferred by another group:
+GROUP_LOCK = RLock()
+
+
+class LazyField:
+    """
+    Non-data descriptor that stands in for a deferred field's class attribute
+    (its dataclass default, if it has one).
+
+    Since an instance's __dict__ takes precedence over a non-data descriptor, it is
+    only consulted while the field is missing from the instance, i.e. until the first
+    read converts the raw value and stores the result on the instance.
+    """
+
+    def __init__(self, name: str, default: Any = MISSING):
+        self.name = name
+        self.default = default
+
+    def __get__(self, obj, objtype=None) -> Any:
+        if obj is not None:
+            lazy = obj.__dict__.get("_lazy")
+            if lazy and self.name in lazy:
+                return obj._materialize(self.name)
+        if self.default is MISSING:
+            raise AttributeError(
+                f"'{(objtype or type(obj)).__name__}' object has no attribute '{self.name}'"
+            )
+        return self.default
+
+
+def _install_lazy_field(cls: type, name: str) -> None:
+    """
+    Install the LazyField for a deferred field on its class, if it is not there yet.
+    """
+    if not isinstance(cls.__dict__.get(name), LazyField):
+        # Shadow the dataclass default. __init__ already captured it, so this is safe:
+        setattr(cls, name, LazyField(name, getattr(cls, name, MISSING)))
+
+
+class LazyGroup:
+    """
+    A deferred conversion that reads and writes several fields at once, such as a
+    nested block that is flattened into a set of prefixed fields.
+    """
+
+    __slots__ = ("names", "expander")
+
+    def __init__(self, names: tuple, expander: Callable[[Any], None]):
+        self.names = names
+        self.expander = expander
+
+
+class LazyFieldsMixin:
+    """
+    Mixin that lets a dataclass store the raw value of a field along with the
+    function that converts it, instead of converting it in __post_init__.
+
+    The raw value is moved out of the instance __dict__, so the first read of the
+    attribute goes to a LazyField on the class, which converts the value, caches the
+    result on the instance and returns it. Every later read is a plain attribute
+    lookup. Since asdict(), comparisons, repr() and serialized() all read fields with
+    getattr, deferred fields are converted transparently when they are used.
+
+    Conversions that write several fields at once, such as the expansion of a nested
+    block, are deferred together with _defer_group.
+    """
+
+    def _defer(self, name: str, converter: Callable[[Any], Any]) -> None:
+        """
+        Defer the conversion of a field until it is first read.
+
+        Params:
+            name (str): The name of the field. Its current value is the raw value to convert.
+            converter (Callable[[Any], Any]): Called with the raw value to build the field's value.
+        """
+        _install_lazy_field(type(self), name)
+
+        lazy = self.__dict__.get("_lazy")
+        if lazy is None:
+            lazy = self.__dict__["_lazy"] = {}
+        lazy[name] = (converter, self.__dict__.pop(name))
+
+    def _defer_group(self, names: Iterable[str], expander: Callable[[Any], None]) -> None:
+        """
+        Defer a conversion that reads and writes several fields until any of them is
+        first read. At that point, the raw values of all of the fields are restored
+        and expander(self) is called to convert them in place, as it would have been
+        in __post_init__.
+
+        Params:
+            names (Iterable[str]): The names of the fields the conversion reads or writes.
+            expander (Callable[[Any], None]): Called with the instance to convert the fields.
+        """
+        names = tuple(names)
+        group = LazyGroup(names, expander)
+        for name in names:
+            self._defer(name, group)
+
+    def __setstate__(self, state: dict) -> None:
+        # copy.copy() passes the original's __dict__ as state. Give the copy its own
+        # _lazy, or materializing a field on one of them would hide it from the other:
+        self.__dict__.update(state)
+        if "_lazy" in state:
+            self.__dict__["_lazy"] = dict(state["_lazy"])
+        # An instance unpickled in another process (i.e. parsed by a worker process)
+        # may be the first deferred instance of its class there:
+        for name in state.get("_lazy", ()):
+            _install_lazy_field(type(self), name)
+
+    def _is_deferred(self, name: str) -> bool:
+        """
+        Check if a field has been deferred and not read yet.
+        """
+        return name not in self.__dict__ and name in self.__dict__.get("_lazy", ())
+
+    def _materialize(self, name: str) -> Any:
+        """
+        Convert a deferred field and store the result on the instance.
+        """
+        lazy = self.__dict__["_lazy"]
+        try:
+            converter, raw = lazy[name]
+        except KeyError:
+            # converted by another thread in the meantime:
+            return self.__dict__[name]
+
+        if isinstance(converter, LazyGroup):
+            with GROUP_LOCK:
+                if name in lazy:
+                    for member in converter.names:
+                        self.__dict__[member] = lazy[member][1]
+                    for member in converter.names:
+                        del lazy[member]
+                    converter.expander(self)
+            return self.__dict__[name]
+
+        value = self.__dict__[name] = converter(raw)
+        # Popped after the value is stored, so a concurrent read always finds one of them:
+        lazy.pop(name, None)
+        return value
@@ -0,0 +1,129 @@
+"""
+log_config.py - contains configure_logging, which controls where and how verbosely the SDK
+reports progress.
+
+Every module logs to a child of the "qualysdk" logger (i.e. "qualysdk.vmdr.base.helpers").
+Until configure_logging() is called, records propagate to the root logger as usual. While the
+application has not configured logging (the root logger has no handlers), the "qualysdk" logger
+also writes INFO and above to stdout, so the SDK prints the same progress messages it always has.
+"""
+
+import atexit
+import logging
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import List, Optional, Union
+
+LOGGER_NAME = "qualysdk"
+DEFAULT_FORMAT = "%(message)s"
+
+# The handlers and queue listener installed by configure_logging, so they can be replaced:
+INSTALLED_HANDLERS: List[logging.Handler] = []
+LISTENER: Optional[QueueListener] = None
+
+
+class _DefaultHandler(logging.StreamHandler):
+    """
+    The handler installed at import. Writes to stdout only while the root logger has no
+    handlers, so records go to the application's own handlers once it configures logging.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+        self.setFormatter(logging.Formatter(DEFAULT_FORMAT))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not logging.getLogger().handlers:
+            super().emit(record)
+
+
+def _install_default_handler() -> None:
+    """
+    Install _DefaultHandler on the "qualysdk" logger, unless it already has handlers.
+    Records still propagate, so they reach the root logger's handlers once there are any.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    if logger.handlers:
+        return
+    handler = _DefaultHandler()
+    logger.addHandler(handler)
+    INSTALLED_HANDLERS.append(handler)
+    if logger.level == logging.NOTSET:
+        logger.setLevel(logging.INFO)
+
+
+def _stop_listener() -> None:
+    global LISTENER
+    if LISTENER is not None:
+        LISTENER.stop()
+        LISTENER = None
+
+
+def configure_logging(
+    level: Union[int, str] = logging.INFO,
+    quiet: bool = False,
+    use_queue: bool = False,
+    handlers: List[logging.Handler] = None,
+    fmt: str = DEFAULT_FORMAT,
+    propagate: bool = False,
+) -> logging.Logger:
+    """
+    Configure the "qualysdk" logger, replacing any handlers installed by a previous call.
+
+    Params:
+    ```
+    level (Union[int, str]) The minimum level to log, i.e. logging.DEBUG or "WARNING". Defaults to INFO. DEBUG adds per-page details such as the kwargs sent with each host list detection call.
+    quiet (bool) Only log warnings and errors. Overrides level. Defaults to False.
+    use_queue (bool) Hand records to a background thread through a QueueHandler, so threads pulling data never wait on console or file I/O. Defaults to False.
+    handlers (List[logging.Handler]) The handlers to write records with. Defaults to a single handler writing to stdout.
+    fmt (str) The format of records written by the default handler. Defaults to "%(message)s". Add i.e. %(asctime)s or %(threadName)s for more detail.
+    propagate (bool) Whether records are also passed to the root logger's handlers. Defaults to False.
+    ```
+
+    Returns:
+    ```
+    logging.Logger - the "qualysdk" logger.
+    ```
+    """
+    global LISTENER
+    logger = logging.getLogger(LOGGER_NAME)
+
+    _stop_listener()
+    for handler in INSTALLED_HANDLERS:
+        logger.removeHandler(handler)
+    INSTALLED_HANDLERS.clear()
+
+    if handlers is None:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter(fmt))
+        handlers = [handler]
+
+    if use_queue:
+        queue = SimpleQueue()
+        LISTENER = QueueListener(queue, *handlers, respect_handler_level=True)
+        LISTENER.start()
+        handlers = [QueueHandler(queue)]
+
+    for handler in handlers:
+        logger.addHandler(handler)
+        INSTALLED_HANDLERS.append(handler)
+
+    logger.setLevel(logging.WARNING if quiet else level)
+    logger.propagate = propagate
+    return logger
+
+
+def set_quiet(quiet: bool = True) -> None:
+    """
+    Only log warnings and errors if quiet is True, or go back to logging INFO and above if it is False.
+    The handlers are left as they are.
+    """
+    logging.getLogger(LOGGER_NAME).setLevel(logging.WARNING if quiet else logging.INFO)
+
+
+# Flush any queued records before the interpreter exits:
+atexit.register(_stop_listener)
+
+# Keep printing progress to stdout unless the application already configured the logger:
+_install_default_handler()
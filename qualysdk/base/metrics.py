@@ -0,0 +1,326 @@
+"""
+metrics.py - contains the process-wide metrics registry that call_api and the threaded
+pull functions report request latency, bytes received, parse/build time, retries,
+rate limit waits and queue depths to.
+
+Metrics are disabled until enable_metrics() is called. While disabled, every hook is a
+single global lookup, so instrumented code paths cost nothing measurable.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from json import dumps
+from threading import Lock, current_thread
+from time import perf_counter, time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# name: (kind, description). Names are exported with a "qualysdk_" prefix in Prometheus format:
+METRICS_DESCRIPTIONS = {
+    "request_seconds": ("timer", "Time from sending a request to receiving its response headers."),
+    "limiter_wait_seconds": (
+        "timer",
+        "Time spent waiting on the shared rate limit and concurrency limit before a request.",
+    ),
+    "rate_limit_pause_seconds": (
+        "timer",
+        "Length of the pauses imposed when Qualys reports the rate limit was reached.",
+    ),
+    "bytes_received": ("counter", "Response body bytes read over the wire."),
+    "http_errors": ("counter", "Responses with a 4xx/5xx status code."),
+    "cache_hits": ("counter", "Calls served from the response cache."),
+    "retries": ("counter", "Calls or chunks retried after a rate limit or an error."),
+    "parse_seconds": (
+        "timer",
+        "Time spent parsing response XML, per page. Includes reading streamed responses.",
+    ),
+    "build_seconds": ("timer", "Time spent building dataclasses from parsed data, per page."),
+    "records_built": ("counter", "Dataclasses built from parsed data."),
+    "work_queue_depth": ("gauge", "Chunks or ranges left in a work queue when a worker pulls one."),
+    "output_queue_depth": ("gauge", "Parsed records waiting to be consumed by the caller."),
+    "fanout_item_seconds": (
+        "timer",
+        "Time to finish one item of a fan-out, including retries and rate limit pauses.",
+    ),
+    "fanout_errors": ("counter", "Fan-out items that failed after their retries."),
+    "fanout_threads": ("gauge", "Calls an adaptive fan-out keeps in flight, each time it changes."),
+}
+
+# (name, module, endpoint, thread):
+SeriesKey = Tuple[str, str, str, str]
+
+
+@dataclass
+class MetricEvent:
+    """
+    A single observation, as passed to the callbacks given to enable_metrics().
+    """
+
+    name: str
+    value: float
+    module: str
+    endpoint: str
+    thread: str
+    timestamp: float
+
+
+@dataclass
+class Series:
+    """
+    Running statistics of one metric for one (module, endpoint, thread).
+    """
+
+    count: int = 0
+    sum: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    last: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.last = value
+
+    def merge(self, other: "Series") -> None:
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        if other.last is not None:
+            self.last = other.last
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else None,
+            "last": self.last,
+        }
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of metric series, keyed by metric name, module, endpoint and thread.
+
+    Use enable_metrics() rather than creating one directly, so call_api and the
+    pull functions report to it.
+
+    Params:
+    ```
+    callbacks (List[Callable[[MetricEvent], None]]) Called with every observation as it is recorded, i.e. to forward metrics to another system.
+    ```
+    """
+
+    def __init__(self, callbacks: List[Callable[[MetricEvent], None]] = None):
+        self.series: Dict[SeriesKey, Series] = {}
+        self.callbacks = list(callbacks or [])
+        self.lock = Lock()
+        self.started = time()
+
+    def record(self, name: str, value: float, module: str = "", endpoint: str = "") -> None:
+        """
+        Record an observation of a metric for the calling thread.
+
+        Params:
+        ```
+        name (str) The metric name, i.e. "request_seconds". See METRICS_DESCRIPTIONS.
+        value (float) The observed value: seconds for timers, an increment for counters, the current value for gauges.
+        module (str) The module the observation belongs to, i.e. "vmdr".
+        endpoint (str) The endpoint the observation belongs to, i.e. "get_hld".
+        ```
+        """
+        thread = current_thread().name
+        key = (name, module, endpoint, thread)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = Series()
+            series.add(value)
+        if self.callbacks:
+            event = MetricEvent(name, value, module, endpoint, thread, time())
+            for callback in self.callbacks:
+                callback(event)
+
+    def reset(self) -> None:
+        """
+        Forget every recorded series.
+        """
+        with self.lock:
+            self.series.clear()
+            self.started = time()
+
+    def snapshot(self, by_thread: bool = True) -> Dict[SeriesKey, Series]:
+        """
+        Get a copy of every series. If by_thread is False, the series of all threads
+        are merged per (name, module, endpoint), with the thread set to "".
+        """
+        snapshot = {}
+        with self.lock:
+            for (name, module, endpoint, thread), series in self.series.items():
+                key = (name, module, endpoint, thread if by_thread else "")
+                merged = snapshot.setdefault(key, Series())
+                merged.merge(series)
+        return snapshot
+
+    def summary(self, by_thread: bool = False) -> dict:
+        """
+        Summarize every series as a JSON-serializable dictionary.
+
+        Params:
+        ```
+        by_thread (bool) Whether to report each thread separately. Defaults to False, merging threads per module and endpoint.
+        ```
+
+        Returns:
+        ```
+        dict - {"started": <epoch>, "elapsed_seconds": <float>, "metrics": {<name>: [{"module", "endpoint", "thread", "count", "sum", "min", "max", "mean", "last"}, ...]}}
+        ```
+        """
+        metrics = {}
+        for (name, module, endpoint, thread), series in sorted(self.snapshot(by_thread).items()):
+            row = {"module": module, "endpoint": endpoint}
+            if by_thread:
+                row["thread"] = thread
+            row.update(series.to_dict())
+            metrics.setdefault(name, []).append(row)
+        return {
+            "started": self.started,
+            "elapsed_seconds": time() - self.started,
+            "metrics": metrics,
+        }
+
+    def to_json(self, by_thread: bool = False, indent: int = 2) -> str:
+        """
+        The summary() as a JSON string.
+        """
+        return dumps(self.summary(by_thread=by_thread), indent=indent)
+
+    def to_prometheus(self, by_thread: bool = False) -> str:
+        """
+        Export every series in the Prometheus text exposition format. Timers are exported
+        as summaries (_count/_sum) plus a _max gauge, counters with a _total suffix and
+        gauges as their last value plus a _max gauge.
+
+        Params:
+        ```
+        by_thread (bool) Whether to add a thread label. Defaults to False.
+        ```
+        """
+        grouped: Dict[str, List[Tuple[str, Series]]] = {}
+        for (name, module, endpoint, thread), series in sorted(self.snapshot(by_thread).items()):
+            labels = f'module="{_escape_label(module)}",endpoint="{_escape_label(endpoint)}"'
+            if by_thread:
+                labels += f',thread="{_escape_label(thread)}"'
+            grouped.setdefault(name, []).append((labels, series))
+
+        lines = []
+        for name, rows in grouped.items():
+            kind, description = METRICS_DESCRIPTIONS.get(name, ("gauge", name))
+            metric = f"qualysdk_{name}"
+            if kind == "counter":
+                lines.append(f"# HELP {metric}_total {description}")
+                lines.append(f"# TYPE {metric}_total counter")
+                lines.extend(f"{metric}_total{{{labels}}} {series.sum}" for labels, series in rows)
+                continue
+
+            lines.append(f"# HELP {metric} {description}")
+            if kind == "timer":
+                lines.append(f"# TYPE {metric} summary")
+                for labels, series in rows:
+                    lines.append(f"{metric}_count{{{labels}}} {series.count}")
+                    lines.append(f"{metric}_sum{{{labels}}} {series.sum}")
+            else:
+                lines.append(f"# TYPE {metric} gauge")
+                lines.extend(f"{metric}{{{labels}}} {series.last}" for labels, series in rows)
+            lines.append(f"# TYPE {metric}_max gauge")
+            lines.extend(f"{metric}_max{{{labels}}} {series.max}" for labels, series in rows)
+        return "\n".join(lines) + "\n"
+
+
+METRICS: Optional[MetricsRegistry] = None
+
+
+def enable_metrics(
+    callbacks: List[Callable[[MetricEvent], None]] = None,
+) -> MetricsRegistry:
+    """
+    Enable the process-wide metrics registry. If it is already enabled, the existing
+    registry is returned and any callbacks are added to it.
+
+    Params:
+    ```
+    callbacks (List[Callable[[MetricEvent], None]]) Called with every observation as it is recorded.
+    ```
+
+    Returns:
+    ```
+    MetricsRegistry - the enabled registry.
+    ```
+    """
+    global METRICS
+    if METRICS is None:
+        METRICS = MetricsRegistry(callbacks)
+    elif callbacks:
+        METRICS.callbacks.extend(callbacks)
+    return METRICS
+
+
+def disable_metrics() -> Optional[MetricsRegistry]:
+    """
+    Disable the process-wide metrics registry, returning it so its last values can still be exported.
+    """
+    global METRICS
+    registry, METRICS = METRICS, None
+    return registry
+
+
+def get_metrics() -> Optional[MetricsRegistry]:
+    """
+    Get the process-wide metrics registry, or None if metrics are disabled.
+    """
+    return METRICS
+
+
+def record(name: str, value: float, module: str = "", endpoint: str = "") -> None:
+    """
+    Record an observation in the process-wide registry, if metrics are enabled.
+    """
+    registry = METRICS
+    if registry is not None:
+        registry.record(name, value, module, endpoint)
+
+
+@contextmanager
+def timed(name: str, module: str = "", endpoint: str = "") -> Iterator[None]:
+    """
+    Record how long the with block takes as an observation of the timer name,
+    if metrics are enabled. The block's time is recorded even if it raises.
+    """
+    if METRICS is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record(name, perf_counter() - start, module, endpoint)
+
+
+def wire_bytes(response) -> int:
+    """
+    The number of body bytes a response read over the wire (before decompression), falling back
+    to the length of its decoded content.
+    """
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return len(response.content) if getattr(response, "_content_consumed", False) else 0
@@ -0,0 +1,167 @@
+"""
+rate_limiter.py - contains the process-wide rate limit and concurrency governor used by call_api.
+
+Qualys enforces a rate limit (X-RateLimit-Limit calls per X-RateLimit-Window-Sec seconds) and a
+concurrency limit (X-Concurrency-Limit-Limit calls in flight at once) per subscription and API.
+Every thread calling the same API with the same credentials on the same platform shares one
+bucket, so when the quota runs out all of them pause together instead of one thread sleeping
+while the others keep calling.
+"""
+
+from dataclasses import dataclass
+from threading import Condition, Lock
+from time import monotonic
+from typing import Optional, Union
+
+from ..auth.basic import BasicAuth
+from ..auth.token import TokenAuth
+
+
+@dataclass
+class Bucket:
+    """
+    Token bucket and in-flight counter for a single API.
+
+    All limits stay None until Qualys reports them in a response header,
+    so APIs that do not send rate limit headers (i.e. PM) are never throttled.
+    Until the first call to an API returns, only that one call is let through,
+    so a burst of threads cannot overrun a concurrency limit nobody knows yet.
+    """
+
+    limit: Optional[int] = None
+    window: Optional[float] = None
+    tokens: Optional[float] = None
+    concurrency_limit: Optional[int] = None
+    in_flight: int = 0
+    paused_until: float = 0.0
+    last_refill: float = 0.0
+    seen: bool = False
+
+    @property
+    def rate(self) -> Optional[float]:
+        """
+        Tokens regained per second.
+        """
+        if self.limit and self.window:
+            return self.limit / self.window
+        return None
+
+    def refill(self, now: float) -> None:
+        """
+        Add the tokens regained since the last refill, capped at limit.
+        """
+        if self.tokens is not None and self.rate:
+            self.tokens = min(float(self.limit), self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def wait_time(self, now: float) -> Union[float, None]:
+        """
+        Seconds until a call can be made, 0 if one can be made now, or None
+        if it depends on another call finishing first.
+        """
+        if self.paused_until > now:
+            return self.paused_until - now
+        if not self.seen and self.in_flight:
+            return None
+        if self.concurrency_limit and self.in_flight >= self.concurrency_limit:
+            return None
+        if self.tokens is not None and self.tokens < 1 and self.rate:
+            return (1 - self.tokens) / self.rate
+        return 0
+
+
+class RateLimiter:
+    """
+    Rate limit and concurrency governor shared by every thread using one set of credentials
+    on one platform. Keeps a Bucket per API, keyed by "module/endpoint".
+
+    Use get_rate_limiter(auth) rather than creating one directly.
+    """
+
+    def __init__(self):
+        self.buckets: dict[str, Bucket] = {}
+        self.condition = Condition()
+
+    def acquire(self, key: str) -> None:
+        """
+        Block until a call to the API key can be made, then reserve a token and a concurrency slot.
+        """
+        with self.condition:
+            bucket = self.buckets.setdefault(key, Bucket(last_refill=monotonic()))
+            while True:
+                now = monotonic()
+                bucket.refill(now)
+                wait = bucket.wait_time(now)
+                if wait == 0:
+                    break
+                self.condition.wait(timeout=wait)
+            if bucket.tokens is not None:
+                bucket.tokens -= 1
+            bucket.in_flight += 1
+
+    def release(self, key: str, headers: dict = None) -> None:
+        """
+        Free the concurrency slot reserved by acquire() and update the bucket from the
+        response headers, if any.
+        """
+        with self.condition:
+            bucket = self.buckets[key]
+            bucket.in_flight -= 1
+            bucket.seen = True
+            if headers:
+                self.update(bucket, headers)
+            self.condition.notify_all()
+
+    @staticmethod
+    def update(bucket: Bucket, headers: dict) -> None:
+        """
+        Sync a bucket with the X-RateLimit-* and X-Concurrency-Limit-Limit headers of a response.
+        """
+        if "X-RateLimit-Limit" in headers:
+            bucket.limit = int(headers["X-RateLimit-Limit"])
+        if "X-RateLimit-Window-Sec" in headers:
+            bucket.window = float(headers["X-RateLimit-Window-Sec"])
+        if "X-Concurrency-Limit-Limit" in headers:
+            bucket.concurrency_limit = int(headers["X-Concurrency-Limit-Limit"])
+        if "X-RateLimit-Remaining" in headers:
+            # Qualys' count is authoritative. Calls still in flight have
+            # not been counted by Qualys yet, so reserve tokens for them:
+            bucket.tokens = float(int(headers["X-RateLimit-Remaining"]) - bucket.in_flight)
+            bucket.last_refill = monotonic()
+
+    def pause(self, key: str, seconds: float) -> None:
+        """
+        Stop every thread from calling the API key for the next seconds seconds.
+        """
+        with self.condition:
+            bucket = self.buckets.setdefault(key, Bucket(last_refill=monotonic()))
+            bucket.paused_until = max(bucket.paused_until, monotonic() + seconds)
+            self.condition.notify_all()
+
+
+LIMITERS: dict[tuple, RateLimiter] = {}
+LIMITERS_LOCK = Lock()
+
+
+def get_rate_limiter(auth: Union[BasicAuth, TokenAuth]) -> RateLimiter:
+    """
+    Get the process-wide RateLimiter for the auth object's username and platform.
+
+    Params:
+    ```
+    auth (Union[BasicAuth, TokenAuth]) The authentication object.
+    ```
+
+    Returns:
+    ```
+    RateLimiter
+    ```
+    """
+    key = (
+        auth.username,
+        auth.override_platform["api_url"] if auth.override_platform else auth.platform,
+    )
+    with LIMITERS_LOCK:
+        if key not in LIMITERS:
+            LIMITERS[key] = RateLimiter()
+        return LIMITERS[key]
@@ -0,0 +1,268 @@
+"""
+response_cache.py - contains the on-disk response cache used by call_api for slowly changing
+reference data, such as the KnowledgeBase, patch catalog and control metadata.
+
+The cache is disabled until configure_cache() is called. Once enabled, responses from the
+endpoints in CACHEABLE_ENDPOINTS are cached by default, and any other endpoint can opt in per
+call with call_api(..., use_cache=True). Any call can opt out with use_cache=False.
+"""
+
+import gzip
+import os
+from hashlib import sha256
+from json import dumps, loads
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import time
+from typing import Optional, Tuple, Union
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "qualysdk")
+DEFAULT_TTL = 86400  # 1 day
+DEFAULT_MAX_SIZE = 1024**3  # 1 GiB
+
+# Endpoints cached by default once the cache is enabled, and their TTL in seconds.
+# Each of these returns data that changes at most daily:
+CACHEABLE_ENDPOINTS = {
+    ("vmdr", "query_kb"): DEFAULT_TTL,
+    ("vmdr", "get_kb_qvs"): DEFAULT_TTL,
+    ("vmdr", "get_template_list"): DEFAULT_TTL,
+    ("pm", "get_patch_catalog"): DEFAULT_TTL,
+    ("cloudview", "get_control_metadata"): DEFAULT_TTL,
+}
+
+
+class ResponseCache:
+    """
+    Size-bounded, least recently used on-disk cache of API responses.
+
+    Each response is stored gzip-compressed in its own file, named after a hash of the
+    request. The first line of the file is a JSON header holding the response metadata
+    and expiry time, followed by the response body. A file's modification time is bumped
+    on every hit, and the least recently used files are evicted whenever the cache grows
+    past max_size bytes.
+
+    Subclass this and override get/put to plug in a different store.
+
+    Params:
+    ```
+    directory (str) The directory to store responses in. Created with owner-only permissions if it does not exist.
+    max_size (int) The maximum size of the cache on disk, in bytes. Defaults to 1 GiB.
+    default_ttl (int) The TTL in seconds for endpoints that are not in CACHEABLE_ENDPOINTS. Defaults to 1 day.
+    ```
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        max_size: int = DEFAULT_MAX_SIZE,
+        default_ttl: int = DEFAULT_TTL,
+    ):
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ValueError("max_size must be an integer above 0.")
+        if not isinstance(default_ttl, int) or default_ttl < 1:
+            raise ValueError("default_ttl must be an integer above 0.")
+
+        self.directory = directory
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.lock = Lock()
+        # Responses hold subscription data, so keep them private to the user:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        Build a cache key from the parts of a request.
+        """
+        return sha256(dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        """
+        Get the path of the file a key is stored in.
+        """
+        return os.path.join(self.directory, f"{key}.gz")
+
+    def get(self, key: str) -> Union[Response, None]:
+        """
+        Get a cached response.
+
+        Params:
+        ```
+        key (str) The cache key.
+        ```
+
+        Returns:
+        ```
+        Union[Response, None] - the cached response, or None on a miss or if the entry has expired.
+        ```
+        """
+        path = self.path(key)
+        try:
+            with gzip.open(path, "rb") as f:
+                header = loads(f.readline())
+                if header["expires"] < time():
+                    f.close()
+                    self.discard(key)
+                    return None
+                content = f.read()
+            os.utime(path)
+        except (FileNotFoundError, OSError, EOFError, ValueError, KeyError):
+            return None
+
+        response = Response()
+        response.status_code = header["status_code"]
+        response.reason = header["reason"]
+        response.url = header["url"]
+        response.encoding = header["encoding"]
+        response.headers = CaseInsensitiveDict(header["headers"])
+        response._content = content
+        response._content_consumed = True
+        return response
+
+    def put(self, key: str, response: Response, ttl: int) -> None:
+        """
+        Cache a response, evicting the least recently used entries if the cache is full.
+
+        Params:
+        ```
+        key (str) The cache key.
+        response (Response) The response to cache. Its body must have been read (i.e. not streamed).
+        ttl (int) How long the response stays valid, in seconds.
+        ```
+        """
+        header = {
+            "expires": time() + ttl,
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "url": response.url,
+            "encoding": response.encoding,
+            "headers": dict(response.headers),
+        }
+
+        # Write to a temporary file first, so readers never see a partial entry:
+        with NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as tmp:
+            with gzip.open(tmp, "wb") as f:
+                f.write(dumps(header).encode("utf-8") + b"\n")
+                f.write(response.content)
+        os.replace(tmp.name, self.path(key))
+
+        self.evict()
+
+    def discard(self, key: str) -> None:
+        """
+        Remove an entry from the cache, if it exists.
+        """
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache is within max_size.
+        """
+        with self.lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".gz"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_size:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache.
+        """
+        with self.lock:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith((".gz", ".tmp")):
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+
+CACHE: Optional[ResponseCache] = None
+
+
+def configure_cache(
+    directory: str = DEFAULT_CACHE_DIR,
+    max_size: int = DEFAULT_MAX_SIZE,
+    default_ttl: int = DEFAULT_TTL,
+) -> ResponseCache:
+    """
+    Enable the process-wide response cache.
+
+    Params:
+    ```
+    directory (str) The directory to store responses in. Defaults to ~/.cache/qualysdk.
+    max_size (int) The maximum size of the cache on disk, in bytes. Defaults to 1 GiB.
+    default_ttl (int) The TTL in seconds for endpoints that opt in with use_cache=True. Defaults to 1 day.
+    ```
+
+    Returns:
+    ```
+    ResponseCache - the enabled cache.
+    ```
+    """
+    return set_cache(ResponseCache(directory, max_size=max_size, default_ttl=default_ttl))
+
+
+def set_cache(cache: Optional[ResponseCache]) -> Optional[ResponseCache]:
+    """
+    Use cache as the process-wide response cache, i.e. a ResponseCache subclass. Pass None to disable caching.
+    """
+    global CACHE
+    CACHE = cache
+    return cache
+
+
+def disable_cache() -> None:
+    """
+    Disable the process-wide response cache. Entries already on disk are kept.
+    """
+    set_cache(None)
+
+
+def resolve_cache(
+    module: str, endpoint: str, use_cache: Optional[bool] = None
+) -> Tuple[Optional[ResponseCache], Optional[int]]:
+    """
+    Decide whether a call should use the cache, and with which TTL.
+
+    Params:
+    ```
+    module (str) The module being called.
+    endpoint (str) The endpoint being called.
+    use_cache (Optional[bool]) True to opt in, False to opt out, None to cache only the CACHEABLE_ENDPOINTS.
+    ```
+
+    Returns:
+    ```
+    Tuple[Optional[ResponseCache], Optional[int]] - the cache and TTL to use, or (None, None) to skip the cache.
+    ```
+    """
+    cache = CACHE
+    if cache is None or use_cache is False:
+        return None, None
+    ttl = CACHEABLE_ENDPOINTS.get((module, endpoint))
+    if ttl is None:
+        if not use_cache:
+            return None, None
+        ttl = cache.default_ttl
+    return cache, ttl
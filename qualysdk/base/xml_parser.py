@@ -1,11 +1,52 @@
 """
-xml_parser.py - contains the xml_parser function that parses an XML string into a dictionary.
+xml_parser.py - contains the xml_parser function that parses an XML string into a dictionary,
+and iterparse_xml, which streams selected elements out of a large XML document one at a time.
 """
 
-from lxml.etree import _Comment
+from io import BytesIO
+from typing import Generator, Tuple, Union
+
+from lxml.etree import _Comment, iterparse
 from defusedxml.lxml import fromstring
 
 
+def parse_element(element, attr_prefix="@", cdata_key="#text") -> Union[dict, str]:
+    """
+    Recursively turn an lxml element into a dictionary.
+
+    Params:
+        element (lxml.etree._Element): The element to parse.
+        attr_prefix (str): The prefix to add to attributes.
+        cdata_key (str): The key to use for cdata.
+
+    Returns:
+        Union[dict, str]: The parsed element. Elements with only text are returned as a string.
+    """
+    parsed_dict = {}
+    # Parse attributes
+    for key, value in element.attrib.items():
+        parsed_dict[attr_prefix + key] = value
+    # Parse child elements
+    for child in element:
+        if isinstance(child, _Comment):
+            continue  # Skip comments
+        child_dict = parse_element(child, attr_prefix, cdata_key)
+        if child.tag in parsed_dict:
+            if not isinstance(parsed_dict[child.tag], list):
+                parsed_dict[child.tag] = [parsed_dict[child.tag]]
+            parsed_dict[child.tag].append(child_dict)
+        else:
+            parsed_dict[child.tag] = child_dict
+    # Parse text content
+    text = (element.text or "").strip()
+    if text:
+        if parsed_dict:
+            parsed_dict[cdata_key] = text
+        else:
+            parsed_dict = text
+    return parsed_dict
+
+
 def xml_parser(xml_string, attr_prefix="@", cdata_key="#text"):
     """
     Turn an xml string into a dictionary.
@@ -22,30 +63,51 @@ def xml_parser(xml_string, attr_prefix="@", cdata_key="#text"):
     if isinstance(xml_string, str):
         xml_string = xml_string.encode("utf-8")
 
-    def parse_element(element):
-        parsed_dict = {}
-        # Parse attributes
-        for key, value in element.attrib.items():
-            parsed_dict[attr_prefix + key] = value
-        # Parse child elements
-        for child in element:
-            if isinstance(child, _Comment):
-                continue  # Skip comments
-            child_dict = parse_element(child)
-            if child.tag in parsed_dict:
-                if not isinstance(parsed_dict[child.tag], list):
-                    parsed_dict[child.tag] = [parsed_dict[child.tag]]
-                parsed_dict[child.tag].append(child_dict)
-            else:
-                parsed_dict[child.tag] = child_dict
-        # Parse text content
-        text = (element.text or "").strip()
-        if text:
-            if parsed_dict:
-                parsed_dict[cdata_key] = text
-            else:
-                parsed_dict = text
-        return parsed_dict
-
     root = fromstring(xml_string)
-    return {root.tag: parse_element(root)}
+    return {root.tag: parse_element(root, attr_prefix, cdata_key)}
+
+
+def iterparse_xml(
+    source, tags: dict[str, str], attr_prefix="@", cdata_key="#text"
+) -> Generator[Tuple[str, Union[dict, str]], None, None]:
+    """
+    Stream an XML document, yielding each selected element as soon as its closing tag is read.
+
+    Each yielded element is parsed exactly like xml_parser would parse it, then cleared from
+    the tree along with its already-processed siblings, so peak memory is bounded by the
+    largest single element instead of the whole document.
+
+    Entity resolution, DTD loading and network access are disabled, mirroring defusedxml.
+
+    Params:
+        source (Union[bytes, str, file-like]): The XML document, or a file-like object (i.e. a streamed response body) to read it from.
+        tags (dict[str, str]): A mapping of tag to the tag of its required parent. Only elements whose parent matches are yielded, i.e. {"HOST": "HOST_LIST"}.
+        attr_prefix (str): The prefix to add to attributes.
+        cdata_key (str): The key to use for cdata.
+
+    Yields:
+        Tuple[str, Union[dict, str]]: The tag and the parsed element.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    if isinstance(source, bytes):
+        source = BytesIO(source)
+
+    for _, element in iterparse(
+        source,
+        events=("end",),
+        tag=tuple(tags.keys()),
+        resolve_entities=False,
+        load_dtd=False,
+        no_network=True,
+    ):
+        parent = element.getparent()
+        if parent is None or parent.tag != tags[element.tag]:
+            continue
+
+        yield element.tag, parse_element(element, attr_prefix, cdata_key)
+
+        # Free the element and everything before it:
+        element.clear()
+        while element.getprevious() is not None:
+            del parent[0]
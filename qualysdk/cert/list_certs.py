@@ -2,6 +2,7 @@
 Contains the list_certs function
 """
 
+import logging
 from json import JSONDecodeError
 from typing import Union
 
@@ -11,6 +12,8 @@ from ..base.call_api import call_api
 from ..auth.token import TokenAuth
 from ..exceptions.Exceptions import QualysAPIError
 
+logger = logging.getLogger(__name__)
+
 
 def list_certs(auth: TokenAuth, page_count: Union[int, "all"] = "all", **kwargs) -> dict:
     """
@@ -113,7 +116,7 @@ def list_certs(auth: TokenAuth, page_count: Union[int, "all"] = "all", **kwargs)
         pages_pulled += 1
 
         if page_count != "all" and pages_pulled >= page_count:
-            print(f"Hit user-defined limit of {page_count} pages.")
+            logger.info("Hit user-defined limit of %s pages.", page_count)
             break
 
         if not response_json:
@@ -2,6 +2,7 @@
 calls.py - contains the user-facing functions for most cloud agent API calls.
 """
 
+import logging
 from typing import Union, Literal
 
 from .data_classes.Agent import CloudAgent
@@ -11,6 +12,8 @@ from ..base.xml_parser import xml_parser
 from ..auth.basic import BasicAuth
 from ..base.base_list import BaseList
 
+logger = logging.getLogger(__name__)
+
 TRANSLATION = {
     "inv": "Inventory_Scan",
     "vuln": "Vulnerability_Scan",
@@ -109,10 +112,10 @@ def list_agents(
             results.append(CloudAgent(**agent))
 
         pulled += 1
-        print(f"Pulled page {pulled}...")
+        logger.info("Pulled page %s...", pulled)
 
         if page_count != "all" and pulled >= page_count:
-            print("Page count reached. Returning...")
+            logger.info("Page count reached. Returning...")
             break
 
         if parsed.get("ServiceResponse").get("hasMoreRecords") != "true":
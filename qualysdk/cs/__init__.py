@@ -10,4 +10,5 @@ from .container.container_calls import (
     get_software_on_container,
     get_container_vuln_count,
     get_container_vulns,
+    get_containers_with_vulns,
 )
@@ -2,7 +2,11 @@
 Contains the code to interact with Docker hosts.
 """
 
-from typing import Union
+import logging
+from copy import copy
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Iterator, List, Union
 from urllib.parse import parse_qs
 
 from ..data_classes.container import Container
@@ -11,8 +15,11 @@ from ..data_classes.vulnerability import csVuln
 from ...auth.token import TokenAuth
 from ...base.call_api import call_api
 from ...base.base_list import BaseList
+from ...base.fanout import fan_out, retry_after
 from ...exceptions.Exceptions import *
 
+logger = logging.getLogger(__name__)
+
 
 def list_containers(
     auth: TokenAuth, page_count: Union[int, "all"] = "all", **kwargs
@@ -35,11 +42,23 @@ def list_containers(
         BaseList[Container]: A list of Container objects.
     """
 
+    results = BaseList()
+    for page in _container_pages(auth, page_count, **kwargs):
+        results.extend(page)
+    return results
+
+
+def _container_pages(
+    auth: TokenAuth, page_count: Union[int, "all"] = "all", **kwargs
+) -> Iterator[List[Container]]:
+    """
+    Yield each page of list_containers as a list of Container objects,
+    following the Link header's paginationQuery from one page to the next.
+    """
     # Check if page_count is valid:
     if page_count != "all" and not isinstance(page_count, int):
         raise ValueError("page_count must be an integer or 'all'.")
 
-    results = BaseList()
     pages_pulled = 0
 
     while True:
@@ -63,15 +82,13 @@ def list_containers(
             # If the data is a dict, convert it to a list of dicts:
             data["data"] = [data["data"]]
 
-        # Add the data to the results:
-        for container in data["data"]:
-            results.append(Container(**container))
+        yield [Container(**container) for container in data["data"]]
 
         pages_pulled += 1
 
         # Check if we need to pull more pages:
         if page_count != "all" and pages_pulled >= page_count:
-            print(f"Page count reached. Returning {pages_pulled} pages of containers.")
+            logger.info("Page count reached. Returning %s pages of containers.", pages_pulled)
             break
 
         # Check the response headers for the next page:
@@ -85,8 +102,6 @@ def list_containers(
             ][0]
             kwargs["paginationQuery"] = pagination_query
 
-    return results
-
 
 def get_container_details(auth: TokenAuth, containerSha: str) -> Container:
     """
@@ -146,6 +161,11 @@ def get_software_on_container(auth: TokenAuth, containerSha: str, **kwargs) -> B
     )
 
     # Check for valid response:
+    if response.status_code == 429:
+        raise RateLimitError(
+            f"429 - Container Security rate limit reached. {response.text}",
+            wait=retry_after(response),
+        )
     if response.status_code != 200:
         raise QualysAPIError(response.json())
 
@@ -212,6 +232,11 @@ def get_container_vulns(auth: TokenAuth, containerSha: str, **kwargs) -> BaseLis
         params=params,
     )
     # Check for valid response:
+    if response.status_code == 429:
+        raise RateLimitError(
+            f"429 - Container Security rate limit reached. {response.text}",
+            wait=retry_after(response),
+        )
     if response.status_code != 200:
         raise QualysAPIError(response.json())
     bl = BaseList()
@@ -222,3 +247,170 @@ def get_container_vulns(auth: TokenAuth, containerSha: str, **kwargs) -> BaseLis
             item["containerSha"] = containerSha
             bl.append(csVuln.from_dict(item))
     return bl
+
+
+def _prefetch_pages(pages: Iterator[list], depth: int, stop: Event) -> Iterator[list]:
+    """
+    Pull pages from another thread, staying up to depth pages ahead of the caller,
+    so the next paginationQuery is followed while the current page is processed.
+
+    Errors raised while pulling a page are raised in the calling thread. If the
+    caller stops iterating, stop is set and the pulling thread exits.
+    """
+    queue = Queue(maxsize=depth)
+    # Marks the end of the pages. An exception in its place is raised instead:
+    done = object()
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def pull() -> None:
+        try:
+            for page in pages:
+                if not put(page):
+                    return
+            put(done)
+        except Exception as e:
+            put(e)
+
+    thread = Thread(target=pull, name="ContainerPageThread", daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                page = queue.get(timeout=1)
+            except Empty:
+                if not thread.is_alive() and queue.empty():
+                    break
+                continue
+            if page is done:
+                break
+            if isinstance(page, Exception):
+                raise page
+            yield page
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _for_container(items: BaseList, containerSha: str) -> BaseList:
+    """
+    Give a container its own copies of details pulled from another container of the
+    same image, with containerSha set to its own sha.
+    """
+    if all(item.containerSha == containerSha for item in items):
+        return items
+    copies = BaseList()
+    for item in items:
+        item = copy(item)
+        item.containerSha = containerSha
+        copies.append(item)
+    return copies
+
+
+def get_containers_with_vulns(
+    auth: TokenAuth,
+    page_count: Union[int, "all"] = "all",
+    threads: int = 5,
+    include_software: bool = True,
+    dedupe_by_image: bool = True,
+    prefetch: int = 2,
+    **kwargs,
+) -> BaseList[Container]:
+    """
+    Get containers according to kwargs with their vulnerabilities (and software)
+    populated, pulling the details of many containers at once.
+
+    Pages of containers are pulled by a background thread while a pool of threads
+    pulls each container's vulnerabilities and software, so the page requests and
+    the per-container requests overlap instead of running one after another.
+
+    With dedupe_by_image, the vulnerabilities and software of containers running the
+    same image (same imageSha) are pulled once, from the first of them listed, and
+    copied to the others. Each copy's containerSha is set to its own container's sha.
+    This assumes those containers have not drifted from their image, so containers
+    flagged with drift (Container.has_drift()) are always pulled on their own.
+
+    Containers whose details could not be pulled are logged and returned without them.
+
+    Args:
+        auth (TokenAuth): The authentication token.
+        page_count (Union[int, 'all'] = 'all'): How many pages of containers to retrieve.
+        threads (int): The maximum number of vulnerability/software calls in flight at once. Default is 5.
+        include_software (bool): Whether to also populate Container.softwares. Default is True.
+        dedupe_by_image (bool): Whether to pull details once per image instead of once per container. Default is True.
+        prefetch (int): The number of pages of containers to pull ahead of the detail calls. Default is 2.
+        **kwargs: Any additional arguments to pass to list_containers.
+
+    ## Kwargs:
+
+    - filter (str): A filter to apply to the list using Qualys Container Security QQL.
+    - limit (int): The maximum number of results to return per page.
+
+    Returns:
+        BaseList[Container]: A list of Container objects, in list_containers order.
+    """
+    if page_count != "all" and not isinstance(page_count, int):
+        raise ValueError("page_count must be an integer or 'all'.")
+    if not isinstance(prefetch, int) or prefetch < 1:
+        raise ValueError("prefetch must be an integer greater than 0.")
+
+    kinds = ("vulns", "software") if include_software else ("vulns",)
+    results = BaseList()
+    # Containers sharing details, keyed by imageSha (or sha if not shared):
+    groups: dict[str, list[Container]] = {}
+    details: dict[str, dict[str, BaseList]] = {}
+    stop = Event()
+
+    def calls() -> Iterator[tuple]:
+        # Consumed by fan_out as threads free up, so pages are read as they are needed:
+        for page in _prefetch_pages(_container_pages(auth, page_count, **kwargs), prefetch, stop):
+            for container in page:
+                results.append(container)
+                # drifted containers have their own packages and vulns, so are never shared:
+                shared = dedupe_by_image and not container.has_drift()
+                key = (container.imageSha if shared else None) or container.sha
+                if key in groups:
+                    groups[key].append(container)
+                    continue
+                groups[key] = [container]
+                for kind in kinds:
+                    yield kind, key, container.sha
+
+    def get_details(call: tuple) -> BaseList:
+        kind, _, sha = call
+        if kind == "vulns":
+            return get_container_vulns(auth, sha)
+        return get_software_on_container(auth, sha)
+
+    auth.ensure_pool_size(threads + 1)
+    for (kind, key, _), result in fan_out(
+        get_details,
+        calls(),
+        threads=threads,
+        auth=auth,
+        limiter_key="containersecurity/get_container_vulns",
+        name="ContainerDetailThread",
+    ):
+        details.setdefault(key, {})[kind] = result
+
+    for key, containers in groups.items():
+        found = details.get(key, {})
+        for container in containers:
+            if "vulns" in found:
+                container.vulnerabilities = _for_container(found["vulns"], container.sha)
+            if "software" in found:
+                container.softwares = _for_container(found["software"], container.sha)
+
+    logger.info(
+        "Pulled details of %s containers with %s calls.",
+        len(results),
+        sum(len(found) for found in details.values()),
+    )
+    return results
@@ -2,6 +2,7 @@
 Contains the Container dataclass.
 """
 
+import logging
 from dataclasses import dataclass
 from typing import Union
 from datetime import datetime
@@ -13,6 +14,8 @@ from ...base.base_class import BaseClass
 from ...base.base_list import BaseList
 from ...base import DONT_EXPAND
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Container(BaseClass):
@@ -224,9 +227,9 @@ class Container(BaseClass):
         ]
         for attribute in attributes_to_check:
             if getattr(self, attribute, None):
-                print(
-                    f"The {attribute} attribute does not have a defined structure. "
-                    "Please submit a bug report if you see this message, or a PR with the attribute parsed out."
+                logger.warning(
+                    "The %s attribute does not have a defined structure. Please submit a bug report if you see this message, or a PR with the attribute parsed out.",
+                    attribute,
                 )
 
     def has_drift(self) -> bool:
@@ -71,3 +71,32 @@ class QualysAPIError(Exception):
     def __init__(self, message: str):
         self.message = message
         super().__init__(message)
+
+
+class RateLimitError(QualysAPIError):
+    """
+    Exception for when Qualys rejects a call with HTTP 429.
+
+    wait is the number of seconds Qualys asked to wait before calling again,
+    or None if it did not say.
+    """
+
+    def __init__(self, message: str, wait: float = None):
+        self.wait = wait
+        super().__init__(message)
+
+
+class PartialResultError(QualysAPIError):
+    """
+    Exception for when a threaded pull gave up on some of its work after its retries.
+
+    results is what was pulled. missing is what was not: chunks of host IDs or (id_min, id_max)
+    ranges for host list detections, (provider, resourceType) pairs for TotalCloud snapshots.
+    errors maps items of missing to the exception they failed with, where it is known.
+    """
+
+    def __init__(self, message: str, results=None, missing: list = None, errors: dict = None):
+        self.results = results
+        self.missing = missing or []
+        self.errors = errors or {}
+        super().__init__(message)
@@ -2,17 +2,26 @@
 get_all_assets.py - contains the get_all_assets function for the Global AssetView API (GAV) module.
 """
 
-from typing import Union
+import logging
+from typing import List, Union
 
 from ..base.base_list import BaseList
-from ..base.call_api import call_api
 from ..auth.token import TokenAuth
 from ..exceptions.Exceptions import *
 from .hosts import Host
+from .iter_assets import iter_raw_assets
+from .partition import iter_partitioned_assets
+from .projection import host_builder, include_fields
+
+logger = logging.getLogger(__name__)
 
 
 def get_all_assets(
-    auth: TokenAuth, page_count: Union[int, "all"] = "all", **kwargs
+    auth: TokenAuth,
+    page_count: Union[int, "all"] = "all",
+    partitions: int = 1,
+    fields: List[str] = None,
+    **kwargs,
 ) -> BaseList[Host]:
     """
     Get all assets in the Global AssetView API.
@@ -20,6 +29,8 @@ def get_all_assets(
     Params:
         auth (TokenAuth): The authentication object.
         page_count (Union[int, "all"]): The number of pages to get. If "all", get all pages. Defaults to "all".
+        partitions (int): The number of assetId ranges to pull in parallel, each with its own thread and lastSeenAssetId cursor. page_count then applies per range. Defaults to 1, pulling pages one after another.
+        fields (List[str]): Only pull these Host fields (i.e. ["dnsName", "operatingSystem_osName"]), plus assetId. The narrowest includeFields is sent, and lightweight HostProjection records holding only these fields are returned instead of Hosts.
 
     :Kwargs:
         excludeFields (str): The fields to exclude.
@@ -32,36 +43,15 @@ def get_all_assets(
         BaseList[Hosts]: The response from the API as a BaseList of Hosts objects.
     """
 
-    responses = BaseList()
-    pulled = 0
-
-    while True:
-        # make the request:
-        response = call_api(auth=auth, module="gav", endpoint="get_all_assets", params=kwargs)
-        j = response.json()
-
-        if "responseCode" not in j.keys() or j["responseCode"] == "FAILED":
-            raise QualysAPIError(j["responseMessage"])
-
-        for record in j["assetListData"]["asset"]:
-            responses.append(Host(**record))
-        (
-            print(f"Page {pulled+1} of {page_count} complete.")
-            if page_count != "all"
-            else print(f"Page {pulled+1} complete.")
-        )
-        pulled += 1
-
-        if not j["hasMore"]:
-            print("No more records.")
-            break
-
-        if page_count != "all" and pulled >= page_count:
-            print("Page count reached.")
-            break
+    build = host_builder(fields)
+    if fields is not None:
+        if kwargs.get("includeFields") or kwargs.get("excludeFields"):
+            raise ValueError("fields cannot be combined with includeFields or excludeFields.")
+        kwargs["includeFields"] = include_fields(fields)
 
-        else:
-            kwargs["lastSeenAssetId"] = j["lastSeenAssetId"]
+    if partitions != 1:
+        return BaseList(iter_partitioned_assets(auth, partitions, page_count, fields, **kwargs))
 
-    print("All pages complete.")
+    responses = BaseList(map(build, iter_raw_assets(auth, page_count, **kwargs)))
+    logger.info("All pages complete.")
     return responses
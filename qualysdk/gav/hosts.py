@@ -2,6 +2,7 @@
 hosts.py - contains the dataclass for a Qualys GAV host record.
 """
 
+import logging
 from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Optional, Union
@@ -10,7 +11,9 @@ from frozendict import frozendict
 
 from ..base.base_class import BaseClass
 from ..base.base_list import BaseList
-from ..base import DONT_EXPAND
+from ..base import DONT_EXPAND, LAZY_EXPAND
+
+logger = logging.getLogger(__name__)
 
 SOFTWARE_SCHEMA = frozendict(
     {
@@ -50,6 +53,65 @@ def handle_dict_or_list(data: Union[dict, list[dict]]) -> list[dict]:
     return data
 
 
+# Fields Host converts from ISO strings to datetimes:
+HOST_DT_FIELDS = (
+    "lastModifiedDate",
+    "createdDate",
+    "sensorLastUpdatedDate",
+    "lastBoot",
+)
+
+
+# Nested blocks that Host expands, in order, mapped to the method that expands them.
+# Each method reads its block and rewrites it, along with any fields named after it
+# (i.e. operatingSystem -> operatingSystem_osName):
+HOST_EXPANSIONS = {
+    "businessAppListData": "_expand_business_apps",
+    "operatingSystem": "_expand_operating_system",
+    "hardware": "_expand_hardware",
+    "inventoryListData": "_expand_inventory_list",
+    "userAccountListData": "_expand_user_accounts",
+    "openPortListData": "_expand_open_ports",
+    "volumeListData": "_expand_volumes",
+    "networkInterfaceListData": "_expand_network_interfaces",
+    "softwareListData": "_expand_software",
+    "cloudProvider": "_expand_cloud_provider",
+    "agent": "_expand_agent",
+    "sensor": "_expand_sensor",
+    "container": "_expand_container",
+    "inventory": "_expand_inventory",
+    "activity": "_expand_activity",
+    "tagList": "_expand_tags",
+    "serviceList": "_expand_services",
+    "lastLocation": "_expand_last_location",
+    "criticality": "_expand_criticality",
+    "missingSoftware": "_expand_missing_software",
+    "easmTags": "_expand_easm_tags",
+    "processor": "_expand_processor",
+    "operatingSystem_lifecycle": "_expand_operating_system_lifecycle",
+}
+
+
+# The blocks above that hold lists (software, open ports, volumes, ...), which can be
+# long and are deferred with LAZY_EXPAND. The other blocks only move a handful of
+# values into flat fields, which is cheaper than deferring them:
+LAZY_HOST_EXPANSIONS = frozenset(
+    {
+        "businessAppListData",
+        "inventoryListData",
+        "userAccountListData",
+        "openPortListData",
+        "volumeListData",
+        "networkInterfaceListData",
+        "softwareListData",
+        "tagList",
+        "serviceList",
+        "missingSoftware",
+        "easmTags",
+    }
+)
+
+
 @dataclass
 class Host(BaseClass):
     """
@@ -237,498 +299,567 @@ class Host(BaseClass):
     inventoryListData: Optional[dict] = None
 
     def __post_init__(self):
-        DT_FIELDS = [
-            "lastModifiedDate",
-            "createdDate",
-            "sensorLastUpdatedDate",
-            "lastBoot",
-        ]
-
-        for field in DT_FIELDS:
+        for field in HOST_DT_FIELDS:
             if getattr(self, field) and not isinstance(getattr(self, field), datetime):
                 setattr(self, field, datetime.fromisoformat(getattr(self, field)))
 
         if not DONT_EXPAND.flag:
-            if self.businessAppListData:
-                # EXPERIMENTAL! I DO NOT HAVE ANY BUSINESS APPS!
-                try:
-                    data = handle_dict_or_list(self.businessAppListData["businessApp"])
-                    bl = BaseList()
-                    bl.extend([app.get("name") for app in data])
-                    setattr(self, "businessAppListData", bl)
-                except KeyError:
-                    # Best guesses here...
-                    data = handle_dict_or_list(self.businessAppListData["app"])
-                    bl = BaseList()
-                    bl.extend([app.get("name") for app in data])
-                    setattr(self, "businessAppListData", bl)
-
-            if self.operatingSystem:
-                for field in [
-                    "osName",
-                    "fullName",
-                    "category",
-                    "category1",
-                    "category2",
-                    "productName",
-                    "publisher",
-                    "edition",
-                    "marketVersion",
-                    "version",
-                    "update",
-                    "architecture",
-                    "lifecycle",
-                    "productUrl",
-                    "productFamily",
-                    "release",
-                    "cpeId",
-                    "cpe",
-                    "cpeType",
+            for source, expander in HOST_EXPANSIONS.items():
+                if not getattr(self, source):
+                    continue
+                if LAZY_EXPAND.flag and source in LAZY_HOST_EXPANSIONS:
+                    # expand the block when it is first read:
+                    self._defer_group((source,), getattr(type(self), expander))
+                else:
+                    getattr(self, expander)()
+
+            if self.customAttributes:
+                logger.debug("customAttributes: %s", self.customAttributes)
+
+        if self.softwareComponent:
+            if not isinstance(self.softwareComponent, str):
+                raise Exception("SoftwareComponent must be a string.")
+
+    def _expand_business_apps(self) -> None:
+        """
+        Reduce businessAppListData to a BaseList of app names.
+        """
+        # EXPERIMENTAL! I DO NOT HAVE ANY BUSINESS APPS!
+        try:
+            data = handle_dict_or_list(self.businessAppListData["businessApp"])
+            bl = BaseList()
+            bl.extend([app.get("name") for app in data])
+            setattr(self, "businessAppListData", bl)
+        except KeyError:
+            # Best guesses here...
+            data = handle_dict_or_list(self.businessAppListData["app"])
+            bl = BaseList()
+            bl.extend([app.get("name") for app in data])
+            setattr(self, "businessAppListData", bl)
+
+    def _expand_operating_system(self) -> None:
+        """
+        Flatten operatingSystem into the operatingSystem_* fields.
+        """
+        for field in [
+            "osName",
+            "fullName",
+            "category",
+            "category1",
+            "category2",
+            "productName",
+            "publisher",
+            "edition",
+            "marketVersion",
+            "version",
+            "update",
+            "architecture",
+            "lifecycle",
+            "productUrl",
+            "productFamily",
+            "release",
+            "cpeId",
+            "cpe",
+            "cpeType",
+        ]:
+            if self.operatingSystem.get(field):
+                if self.operatingSystem.get(field) in [
+                    ",",
+                    ",,",
+                    "Not Announced",
                 ]:
-                    if self.operatingSystem.get(field):
-                        if self.operatingSystem.get(field) in [
-                            ",",
-                            ",,",
-                            "Not Announced",
-                        ]:
-                            setattr(self, f"operatingSystem_{field}", None)
-                        else:
-                            setattr(
-                                self,
-                                f"operatingSystem_{field}",
-                                self.operatingSystem[field],
-                            )
-                # we will deal with installDate separately:
-                if self.operatingSystem.get("installDate"):
-                    # Convert installDate to datetime object
+                    setattr(self, f"operatingSystem_{field}", None)
+                else:
                     setattr(
                         self,
-                        "operatingSystem_installDate",
-                        datetime.fromisoformat(self.operatingSystem["installDate"]),
+                        f"operatingSystem_{field}",
+                        self.operatingSystem[field],
                     )
+        # we will deal with installDate separately:
+        if self.operatingSystem.get("installDate"):
+            # Convert installDate to datetime object
+            setattr(
+                self,
+                "operatingSystem_installDate",
+                datetime.fromisoformat(self.operatingSystem["installDate"]),
+            )
+
+        # Set the operatingSystem field to None
+        setattr(self, "operatingSystem", None)
+
+    def _expand_hardware(self) -> None:
+        """
+        Flatten hardware into the hardware_* fields.
+        """
+        for field in [
+            "fullName",
+            "category",
+            "category1",
+            "category2",
+            "manufacturer",
+            "productName",
+            "model",
+            "productUrl",
+            "productFamily",
+        ]:
+            if self.hardware.get(field):
+                if self.hardware.get(field) in [",", ",,", "Not Announced"]:
+                    setattr(self, f"hardware_{field}", None)
+                else:
+                    setattr(self, f"hardware_{field}", self.hardware[field])
+
+        # for field in ["introDate", "gaDate", "eosDate", "obsoleteDate"]:
+        #    if self.hardware.get(field):
+        #        setattr(
+        #            self,
+        #            f"hardware_{field}",
+        #            datetime.fromisoformat(self.hardware[field]),
+        #        )
+
+        if self.hardware.get("lifecycle"):
+            for field in ["introDate", "gaDate", "eosDate", "obsoleteDate"]:
+                if self.hardware["lifecycle"].get(field):
+                    if self.hardware["lifecycle"].get(field) in [
+                        ",",
+                        ",,",
+                        "Not Announced",
+                    ]:
+                        setattr(self, f"hardware_lifecycle_{field}", None)
 
-                # Set the operatingSystem field to None
-                setattr(self, "operatingSystem", None)
-
-            if self.hardware:
-                for field in [
-                    "fullName",
-                    "category",
-                    "category1",
-                    "category2",
-                    "manufacturer",
-                    "productName",
-                    "model",
-                    "productUrl",
-                    "productFamily",
-                ]:
-                    if self.hardware.get(field):
-                        if self.hardware.get(field) in [",", ",,", "Not Announced"]:
-                            setattr(self, f"hardware_{field}", None)
-                        else:
-                            setattr(self, f"hardware_{field}", self.hardware[field])
-
-                # for field in ["introDate", "gaDate", "eosDate", "obsoleteDate"]:
-                #    if self.hardware.get(field):
-                #        setattr(
-                #            self,
-                #            f"hardware_{field}",
-                #            datetime.fromisoformat(self.hardware[field]),
-                #        )
-
-                if self.hardware.get("lifecycle"):
-                    for field in ["introDate", "gaDate", "eosDate", "obsoleteDate"]:
-                        if self.hardware["lifecycle"].get(field):
-                            if self.hardware["lifecycle"].get(field) in [
-                                ",",
-                                ",,",
-                                "Not Announced",
-                            ]:
-                                setattr(self, f"hardware_lifecycle_{field}", None)
-
-                            else:
-                                setattr(
-                                    self,
-                                    f"hardware_lifecycle_{field}",
-                                    datetime.fromisoformat(self.hardware["lifecycle"][field]),
-                                )
-                    for field in ["stage", "lifeCycleConfidence"]:
-                        if self.hardware["lifecycle"].get(field):
-                            setattr(
-                                self,
-                                f"hardware_lifecycle_{field}",
-                                self.hardware["lifecycle"][field],
-                            )
-
-                # Set the hardware field to None
-                setattr(self, "hardware", None)
-
-            if self.inventoryListData:
-                data = handle_dict_or_list(self.inventoryListData["inventory"])
-                bl = BaseList()
-                bl.extend([inv.get("source") for inv in data])
-                setattr(self, "inventoryListData", bl)
-
-            if self.userAccountListData:
-                # Check for a dict or a list of dicts:
-                data = handle_dict_or_list(self.userAccountListData["userAccount"])
-                bl = BaseList()
-                for user in data:
-                    bl.append(user.get("name"))
-                setattr(self, "userAccountListData", bl)
-
-            if self.openPortListData:
-                # Check for a dict or a list of dicts:
-                data = self.openPortListData["openPort"]
-                bl = BaseList()
-                for port in data:
-                    bl.append(
-                        f"{port.get('port')}-{port.get('protocol')} ({port.get('detectedService')})"
+                    else:
+                        setattr(
+                            self,
+                            f"hardware_lifecycle_{field}",
+                            datetime.fromisoformat(self.hardware["lifecycle"][field]),
+                        )
+            for field in ["stage", "lifeCycleConfidence"]:
+                if self.hardware["lifecycle"].get(field):
+                    setattr(
+                        self,
+                        f"hardware_lifecycle_{field}",
+                        self.hardware["lifecycle"][field],
                     )
-                setattr(self, "openPortListData", bl)
 
-            if self.volumeListData:
-                # Check for a dict or a list of dicts:
-                data = handle_dict_or_list(self.volumeListData["volume"])
-                bl = BaseList()
-                for vol in data:
-                    try:
-                        if vol.get("size") == 0:
-                            bl.append(f"{vol.get('name')}: 0.0% filled")
-                            continue
-
-                        percent_filled = (vol.get("size") - vol.get("free")) / vol.get("size") * 100
-                    except ZeroDivisionError:
-                        percent_filled = 0.0
-                    bl.append(f"{vol.get('name')}: {percent_filled:.2f}% filled")
-                setattr(self, "volumeListData", bl)
-
-            if self.networkInterfaceListData:
-                # Check for a dict or a list of dicts:
-                data = handle_dict_or_list(self.networkInterfaceListData["networkInterface"])
-                bl = BaseList()
-                for iface in data:
-                    bl.append(
-                        f"{iface.get('interfaceName').replace('      ', ' ')} - {iface.get('manufacturer')}"
-                    )  # Replace multi-spaces with single spaces for easier reading
-                setattr(self, "networkInterfaceListData", bl)
-
-            if self.softwareListData:
-                data = handle_dict_or_list(self.softwareListData["software"])
-                bl = BaseList()
-                for sw in data:
-                    #                bl.append(
-                    #                    f"{sw.get('fullName')} ({sw.get('category')}) ({sw.get('ignoredReason')})"
-                    #                )
-                    sw_info = {}
-                    for k, v in SOFTWARE_SCHEMA["software"].items():
-                        # If the key doesn't exist, don't add.
-                        # This helps with SQL inserts by not adding
-                        # null values.
-                        if sw.get(k):
-                            if isinstance(v, list):
-                                for sub_k in v:
-                                    if sw[k].get(sub_k):
-                                        sw_info[sub_k] = sw[k][sub_k]
-                            else:
-                                sw_info[k] = sw[k]
-                    bl.append(sw_info)
-                setattr(self, "softwareListData", bl)
-
-            if self.cloudProvider:
-                # A bit different. This is a dictionary with all cloud providers.
-                # The valid one will have a dictionary underneath of it.
-                # First, find the one that is not a NoneType:
-                for provider, data in self.cloudProvider.items():
-                    if data:
-                        cloudProvider = provider
-                        subkeys = list(data.keys())
-                        break
-
-                for subkey in subkeys:
-                    if subkey != "tags":
-                        for attr in [
-                            "accountId",
-                            "availabilityZone",
-                            "hasAgent",
-                            "hostname",
-                            "imageId",
-                            "instanceId",
-                            "instanceState",
-                            "instanceType",
-                            "qualyScanner",
-                            "kernelId",
-                            "privateDNS",
-                            "privateIpAddress",
-                            "publicDNS",
-                            "publicIpAddress",
-                            "spotInstance",
-                            "subnetId",
-                            "vpcId",
-                            "imageOffer",
-                            "imagePublisher",
-                            "imageVersion",
-                            "location",
-                            "macAddress",
-                            "name",
-                            "platform",
-                            "resourceGroupName",
-                            "size",
-                            "state",
-                            "subnet",
-                            "subscriptionId",
-                            "virtualNetwork",
-                            "vmId",
-                        ]:
-                            if self.cloudProvider[cloudProvider].get(subkey).get(attr):
-                                setattr(
-                                    self,
-                                    f"cloudProvider_{attr}",
-                                    self.cloudProvider[cloudProvider][subkey].get(attr),
-                                )
-
-                        # Convert launchdate to datetime object
-                        if self.cloudProvider[cloudProvider].get(subkey).get(
-                            "launchDate"
-                        ) and not isinstance(
-                            self.cloudProvider[cloudProvider][subkey]["launchDate"],
-                            datetime,
-                        ):
-                            setattr(
-                                self,
-                                "cloudProvider_launchDate",
-                                datetime.fromisoformat(
-                                    self.cloudProvider[cloudProvider][subkey]["launchDate"]
-                                ),
-                            )
-
-                        # Parse out region:
-                        if self.cloudProvider[cloudProvider].get(subkey).get(
-                            "region"
-                        ) and not isinstance(
-                            self.cloudProvider[cloudProvider][subkey]["region"], str
-                        ):
-                            setattr(
-                                self,
-                                "cloudProvider_region",
-                                self.cloudProvider[cloudProvider][subkey].get("region").get("code"),
-                            )
-
-                    elif subkey == "tags":
-                        data = handle_dict_or_list(self.cloudProvider[cloudProvider][subkey])
-                        bl = BaseList()
-                        if data:
-                            for tag in data:
-                                s = (
-                                    f"{tag.get('key')}:{tag.get('value')}"
-                                    if tag.get("key")
-                                    else f"{tag.get('name')}:{tag.get('value')}"
-                                )
-                                bl.append(s)
-                            setattr(self, "cloudProvider_tags", bl)
+        # Set the hardware field to None
+        setattr(self, "hardware", None)
 
+    def _expand_inventory_list(self) -> None:
+        """
+        Reduce inventoryListData to a BaseList of inventory sources.
+        """
+        data = handle_dict_or_list(self.inventoryListData["inventory"])
+        bl = BaseList()
+        bl.extend([inv.get("source") for inv in data])
+        setattr(self, "inventoryListData", bl)
+
+    def _expand_user_accounts(self) -> None:
+        """
+        Reduce userAccountListData to a BaseList of user names.
+        """
+        # Check for a dict or a list of dicts:
+        data = handle_dict_or_list(self.userAccountListData["userAccount"])
+        bl = BaseList()
+        for user in data:
+            bl.append(user.get("name"))
+        setattr(self, "userAccountListData", bl)
+
+    def _expand_open_ports(self) -> None:
+        """
+        Reduce openPortListData to a BaseList of "port-protocol (service)" strings.
+        """
+        # Check for a dict or a list of dicts:
+        data = self.openPortListData["openPort"]
+        bl = BaseList()
+        for port in data:
+            bl.append(f"{port.get('port')}-{port.get('protocol')} ({port.get('detectedService')})")
+        setattr(self, "openPortListData", bl)
+
+    def _expand_volumes(self) -> None:
+        """
+        Reduce volumeListData to a BaseList of "name: percent filled" strings.
+        """
+        # Check for a dict or a list of dicts:
+        data = handle_dict_or_list(self.volumeListData["volume"])
+        bl = BaseList()
+        for vol in data:
+            try:
+                if vol.get("size") == 0:
+                    bl.append(f"{vol.get('name')}: 0.0% filled")
+                    continue
+
+                percent_filled = (vol.get("size") - vol.get("free")) / vol.get("size") * 100
+            except ZeroDivisionError:
+                percent_filled = 0.0
+            bl.append(f"{vol.get('name')}: {percent_filled:.2f}% filled")
+        setattr(self, "volumeListData", bl)
+
+    def _expand_network_interfaces(self) -> None:
+        """
+        Reduce networkInterfaceListData to a BaseList of "interface - manufacturer" strings.
+        """
+        # Check for a dict or a list of dicts:
+        data = handle_dict_or_list(self.networkInterfaceListData["networkInterface"])
+        bl = BaseList()
+        for iface in data:
+            bl.append(
+                f"{iface.get('interfaceName').replace('      ', ' ')} - {iface.get('manufacturer')}"
+            )  # Replace multi-spaces with single spaces for easier reading
+        setattr(self, "networkInterfaceListData", bl)
+
+    def _expand_software(self) -> None:
+        """
+        Reduce softwareListData to a BaseList of dicts following SOFTWARE_SCHEMA.
+        """
+        data = handle_dict_or_list(self.softwareListData["software"])
+        bl = BaseList()
+        for sw in data:
+            #                bl.append(
+            #                    f"{sw.get('fullName')} ({sw.get('category')}) ({sw.get('ignoredReason')})"
+            #                )
+            sw_info = {}
+            for k, v in SOFTWARE_SCHEMA["software"].items():
+                # If the key doesn't exist, don't add.
+                # This helps with SQL inserts by not adding
+                # null values.
+                if sw.get(k):
+                    if isinstance(v, list):
+                        for sub_k in v:
+                            if sw[k].get(sub_k):
+                                sw_info[sub_k] = sw[k][sub_k]
                     else:
-                        print(f"Unknown subkey: {subkey}")
-
-                    # Set the cloudProvider field to the valid provider
-                setattr(self, "cloudProvider", cloudProvider)
-
-            if self.agent:
-                for field in [
-                    "version",
-                    "configurationProfile",
-                    "connectedFrom",
-                    "udcManifestAssigned",
-                    "errorStatus",
+                        sw_info[k] = sw[k]
+            bl.append(sw_info)
+        setattr(self, "softwareListData", bl)
+
+    def _expand_cloud_provider(self) -> None:
+        """
+        Flatten the populated cloud provider into the cloudProvider_* fields.
+        """
+        # A bit different. This is a dictionary with all cloud providers.
+        # The valid one will have a dictionary underneath of it.
+        # First, find the one that is not a NoneType:
+        for provider, data in self.cloudProvider.items():
+            if data:
+                cloudProvider = provider
+                subkeys = list(data.keys())
+                break
+
+        for subkey in subkeys:
+            if subkey != "tags":
+                for attr in [
+                    "accountId",
+                    "availabilityZone",
+                    "hasAgent",
+                    "hostname",
+                    "imageId",
+                    "instanceId",
+                    "instanceState",
+                    "instanceType",
+                    "qualyScanner",
+                    "kernelId",
+                    "privateDNS",
+                    "privateIpAddress",
+                    "publicDNS",
+                    "publicIpAddress",
+                    "spotInstance",
+                    "subnetId",
+                    "vpcId",
+                    "imageOffer",
+                    "imagePublisher",
+                    "imageVersion",
+                    "location",
+                    "macAddress",
+                    "name",
+                    "platform",
+                    "resourceGroupName",
+                    "size",
+                    "state",
+                    "subnet",
+                    "subscriptionId",
+                    "virtualNetwork",
+                    "vmId",
                 ]:
-                    if self.agent.get(field):
-                        setattr(self, f"agent_{field}", self.agent[field])
-                if self.agent.get("activations"):
-                    setattr(self, "agent_key", self.agent.get("activations")[0].get("key"))
+                    if self.cloudProvider[cloudProvider].get(subkey).get(attr):
+                        setattr(
+                            self,
+                            f"cloudProvider_{attr}",
+                            self.cloudProvider[cloudProvider][subkey].get(attr),
+                        )
+
+                # Convert launchdate to datetime object
+                if self.cloudProvider[cloudProvider].get(subkey).get(
+                    "launchDate"
+                ) and not isinstance(
+                    self.cloudProvider[cloudProvider][subkey]["launchDate"],
+                    datetime,
+                ):
                     setattr(
                         self,
-                        "agent_status",
-                        self.agent.get("activations")[0].get("status"),
+                        "cloudProvider_launchDate",
+                        datetime.fromisoformat(
+                            self.cloudProvider[cloudProvider][subkey]["launchDate"]
+                        ),
                     )
-                for dt_field in ["lastActivity", "lastCheckedIn", "lastInventory"]:
-                    if self.agent.get(dt_field) and not isinstance(
-                        self.agent.get(dt_field), datetime
-                    ):
-                        if self.agent.get(dt_field) != -1:
-                            setattr(
-                                self,
-                                f"agent_{dt_field}",
-                                datetime.fromtimestamp(self.agent[dt_field] / 1000),
-                            )
-                        else:
-                            setattr(self, f"agent_{dt_field}", None)
-
-                # Set the agent field to None
-                setattr(self, "agent", None)
-
-            if self.sensor:
-                for field in ["activatedForModules", "pendingActivationForModules"]:
-                    bl = BaseList()
-                    if self.sensor.get(field):
-                        bl.extend(self.sensor[field])
-                        setattr(self, f"sensor_{field}", bl)
-                for dt_field in [
-                    "lastVMScan",
-                    "lastComplianceScan",
-                    "lastFullScan",
-                    "lastVmScanDateScanner",
-                    "lastVmScanDateAgent",
-                    "lastPcScanDateScanner",
-                    "lastPcScanDateAgent",
-                    "firstEasmScanDate",
-                    "lastEasmScanDate",
-                ]:
-                    if self.sensor.get(dt_field) and not isinstance(
-                        self.sensor.get(dt_field), datetime
-                    ):
-                        setattr(
-                            self,
-                            f"sensor_{dt_field}",
-                            datetime.fromtimestamp(self.sensor[dt_field] / 1000),
+
+                # Parse out region:
+                if self.cloudProvider[cloudProvider].get(subkey).get("region") and not isinstance(
+                    self.cloudProvider[cloudProvider][subkey]["region"], str
+                ):
+                    setattr(
+                        self,
+                        "cloudProvider_region",
+                        self.cloudProvider[cloudProvider][subkey].get("region").get("code"),
+                    )
+
+            elif subkey == "tags":
+                data = handle_dict_or_list(self.cloudProvider[cloudProvider][subkey])
+                bl = BaseList()
+                if data:
+                    for tag in data:
+                        s = (
+                            f"{tag.get('key')}:{tag.get('value')}"
+                            if tag.get("key")
+                            else f"{tag.get('name')}:{tag.get('value')}"
                         )
+                        bl.append(s)
+                    setattr(self, "cloudProvider_tags", bl)
 
-                # Set the sensor field to None
-                setattr(self, "sensor", None)
+            else:
+                logger.warning("Unknown subkey: %s", subkey)
 
-            if self.container:
-                for field in ["product", "version", "noOfContainers", "noOfImages"]:
-                    if self.container.get(field):
-                        setattr(self, f"container_{field}", self.container[field])
+            # Set the cloudProvider field to the valid provider
+        setattr(self, "cloudProvider", cloudProvider)
 
-                if self.container.get("hasSensor"):
-                    setattr(self, "container_hasSensor", bool(self.container["hasSensor"]))
+    def _expand_agent(self) -> None:
+        """
+        Flatten agent into the agent_* fields.
+        """
+        for field in [
+            "version",
+            "configurationProfile",
+            "connectedFrom",
+            "udcManifestAssigned",
+            "errorStatus",
+        ]:
+            if self.agent.get(field):
+                setattr(self, f"agent_{field}", self.agent[field])
+        if self.agent.get("activations"):
+            setattr(self, "agent_key", self.agent.get("activations")[0].get("key"))
+            setattr(
+                self,
+                "agent_status",
+                self.agent.get("activations")[0].get("status"),
+            )
+        for dt_field in ["lastActivity", "lastCheckedIn", "lastInventory"]:
+            if self.agent.get(dt_field) and not isinstance(self.agent.get(dt_field), datetime):
+                if self.agent.get(dt_field) != -1:
+                    setattr(
+                        self,
+                        f"agent_{dt_field}",
+                        datetime.fromtimestamp(self.agent[dt_field] / 1000),
+                    )
                 else:
-                    setattr(self, "container_hasSensor", False)
+                    setattr(self, f"agent_{dt_field}", None)
 
-                # Set the container field to None
-                setattr(self, "container", None)
+        # Set the agent field to None
+        setattr(self, "agent", None)
 
-            if self.inventory:
-                setattr(self, "inventory_source", self.inventory.get("source"))
-                setattr(
-                    self,
-                    "inventory_created",
-                    datetime.fromtimestamp(self.inventory.get("created") / 1000),
-                )
+    def _expand_sensor(self) -> None:
+        """
+        Flatten sensor into the sensor_* fields.
+        """
+        for field in ["activatedForModules", "pendingActivationForModules"]:
+            bl = BaseList()
+            if self.sensor.get(field):
+                bl.extend(self.sensor[field])
+                setattr(self, f"sensor_{field}", bl)
+        for dt_field in [
+            "lastVMScan",
+            "lastComplianceScan",
+            "lastFullScan",
+            "lastVmScanDateScanner",
+            "lastVmScanDateAgent",
+            "lastPcScanDateScanner",
+            "lastPcScanDateAgent",
+            "firstEasmScanDate",
+            "lastEasmScanDate",
+        ]:
+            if self.sensor.get(dt_field) and not isinstance(self.sensor.get(dt_field), datetime):
                 setattr(
                     self,
-                    "inventory_lastUpdated",
-                    datetime.fromtimestamp(self.inventory.get("lastUpdated") / 1000),
+                    f"sensor_{dt_field}",
+                    datetime.fromtimestamp(self.sensor[dt_field] / 1000),
                 )
 
-                # Set the inventory field to None
-                setattr(self, "inventory", None)
+        # Set the sensor field to None
+        setattr(self, "sensor", None)
 
-            if self.activity:
-                setattr(self, "activity_source", self.activity.get("source"))
-                setattr(
-                    self,
-                    "activity_lastScannedDate",
-                    datetime.fromtimestamp(self.activity.get("lastScannedDate") / 1000),
-                )
+    def _expand_container(self) -> None:
+        """
+        Flatten container into the container_* fields.
+        """
+        for field in ["product", "version", "noOfContainers", "noOfImages"]:
+            if self.container.get(field):
+                setattr(self, f"container_{field}", self.container[field])
 
-                # Set the activity field to None
-                setattr(self, "activity", None)
+        if self.container.get("hasSensor"):
+            setattr(self, "container_hasSensor", bool(self.container["hasSensor"]))
+        else:
+            setattr(self, "container_hasSensor", False)
 
-            if self.tagList:
-                data = handle_dict_or_list(self.tagList["tag"])
-                bl = BaseList()
-                bl.extend([tag.get("tagName") for tag in data])
-                setattr(self, "tagList", bl)
+        # Set the container field to None
+        setattr(self, "container", None)
 
-            if self.serviceList:
-                data = handle_dict_or_list(self.serviceList["service"])
-                bl = BaseList()
-                for service in data:
-                    bl.append(f"{service.get('name')} ({service.get('status')})")
-                setattr(self, "serviceList", bl)
+    def _expand_inventory(self) -> None:
+        """
+        Flatten inventory into the inventory_* fields.
+        """
+        setattr(self, "inventory_source", self.inventory.get("source"))
+        setattr(
+            self,
+            "inventory_created",
+            datetime.fromtimestamp(self.inventory.get("created") / 1000),
+        )
+        setattr(
+            self,
+            "inventory_lastUpdated",
+            datetime.fromtimestamp(self.inventory.get("lastUpdated") / 1000),
+        )
+
+        # Set the inventory field to None
+        setattr(self, "inventory", None)
+
+    def _expand_activity(self) -> None:
+        """
+        Flatten activity into the activity_* fields.
+        """
+        setattr(self, "activity_source", self.activity.get("source"))
+        setattr(
+            self,
+            "activity_lastScannedDate",
+            datetime.fromtimestamp(self.activity.get("lastScannedDate") / 1000),
+        )
 
-            if self.lastLocation and not isinstance(self.lastLocation, str):
-                setattr(self, "lastLocation", self.lastLocation.get("name"))
+        # Set the activity field to None
+        setattr(self, "activity", None)
 
-            if self.criticality:
-                score = self.criticality.get("score")
-                if not score:
-                    score = 0
-                setattr(self, "criticality", score)
+    def _expand_tags(self) -> None:
+        """
+        Reduce tagList to a BaseList of tag names.
+        """
+        data = handle_dict_or_list(self.tagList["tag"])
+        bl = BaseList()
+        bl.extend([tag.get("tagName") for tag in data])
+        setattr(self, "tagList", bl)
 
-            if self.missingSoftware:
-                data = handle_dict_or_list(self.missingSoftware)
-                bl = BaseList()
-                if data:
-                    for sw in data:
-                        full_category = f"{sw.get('category1')} / {sw.get('category2')}"
-                        bl.append(f"{sw.get('name')} ({full_category})")
+    def _expand_services(self) -> None:
+        """
+        Reduce serviceList to a BaseList of "name (status)" strings.
+        """
+        data = handle_dict_or_list(self.serviceList["service"])
+        bl = BaseList()
+        for service in data:
+            bl.append(f"{service.get('name')} ({service.get('status')})")
+        setattr(self, "serviceList", bl)
 
-                    setattr(self, "missingSoftware", bl)
-                else:
-                    setattr(self, "missingSoftware", None)
+    def _expand_last_location(self) -> None:
+        """
+        Reduce lastLocation to its name.
+        """
+        if isinstance(self.lastLocation, str):
+            return
 
-            if self.easmTags:
-                data = handle_dict_or_list(self.tagList)
-                bl = BaseList()
-                bl.extend([tag for tag in data])
-                setattr(self, "easmTags", bl)
+        setattr(self, "lastLocation", self.lastLocation.get("name"))
 
-            if self.customAttributes:
-                print(self.customAttributes)
+    def _expand_criticality(self) -> None:
+        """
+        Reduce criticality to its score.
+        """
+        score = self.criticality.get("score")
+        if not score:
+            score = 0
+        setattr(self, "criticality", score)
 
-            if self.processor and not isinstance(self.processor, str):
-                setattr(self, "processor", self.processor.get("description"))
+    def _expand_missing_software(self) -> None:
+        """
+        Reduce missingSoftware to a BaseList of "name (category)" strings.
+        """
+        data = handle_dict_or_list(self.missingSoftware)
+        bl = BaseList()
+        if data:
+            for sw in data:
+                full_category = f"{sw.get('category1')} / {sw.get('category2')}"
+                bl.append(f"{sw.get('name')} ({full_category})")
+
+            setattr(self, "missingSoftware", bl)
+        else:
+            setattr(self, "missingSoftware", None)
+
+    def _expand_easm_tags(self) -> None:
+        """
+        Convert easmTags to a BaseList.
+        """
+        data = handle_dict_or_list(self.easmTags)
+        bl = BaseList()
+        bl.extend([tag for tag in data])
+        setattr(self, "easmTags", bl)
 
-            if self.operatingSystem_lifecycle:
-                for field in [
-                    "gaDate",
-                    "eolDate",
-                    "eosDate",
-                ]:
-                    if self.operatingSystem_lifecycle.get(field):
-                        if self.operatingSystem_lifecycle.get(field) != "Not Announced":
-                            setattr(
-                                self,
-                                f"operatingSystem_lifecycle_{field}",
-                                datetime.fromisoformat(self.operatingSystem_lifecycle[field]),
-                            )
-                        else:
-                            setattr(self, f"operatingSystem_lifecycle_{field}", None)
-
-                for field in [
-                    "stage",
-                    "lifeCycleConfidence",
-                    "eolSupportStage",
-                    "eosSupportStage",
-                ]:
-                    if self.operatingSystem_lifecycle.get(field):
-                        if self.operatingSystem_lifecycle.get(field) in [
-                            ",",
-                            ",,",
-                            "Not Announced",
-                            " ",
-                        ]:
-                            setattr(self, f"operatingSystem_lifecycle_{field}", None)
-                        setattr(
-                            self,
-                            f"operatingSystem_lifecycle_{field}",
-                            self.operatingSystem_lifecycle[field],
-                        )
+    def _expand_processor(self) -> None:
+        """
+        Reduce processor to its description.
+        """
+        if isinstance(self.processor, str):
+            return
 
-                if self.operatingSystem_lifecycle.get("detectionScore"):
+        setattr(self, "processor", self.processor.get("description"))
+
+    def _expand_operating_system_lifecycle(self) -> None:
+        """
+        Flatten operatingSystem_lifecycle into the operatingSystem_lifecycle_* fields.
+        """
+        for field in [
+            "gaDate",
+            "eolDate",
+            "eosDate",
+        ]:
+            if self.operatingSystem_lifecycle.get(field):
+                if self.operatingSystem_lifecycle.get(field) != "Not Announced":
                     setattr(
                         self,
-                        "operatingSystem_lifecycle_detectionScore",
-                        self.operatingSystem_lifecycle["detectionScore"],
+                        f"operatingSystem_lifecycle_{field}",
+                        datetime.fromisoformat(self.operatingSystem_lifecycle[field]),
                     )
+                else:
+                    setattr(self, f"operatingSystem_lifecycle_{field}", None)
+
+        for field in [
+            "stage",
+            "lifeCycleConfidence",
+            "eolSupportStage",
+            "eosSupportStage",
+        ]:
+            if self.operatingSystem_lifecycle.get(field):
+                if self.operatingSystem_lifecycle.get(field) in [
+                    ",",
+                    ",,",
+                    "Not Announced",
+                    " ",
+                ]:
+                    setattr(self, f"operatingSystem_lifecycle_{field}", None)
+                setattr(
+                    self,
+                    f"operatingSystem_lifecycle_{field}",
+                    self.operatingSystem_lifecycle[field],
+                )
 
-                setattr(self, "operatingSystem_lifecycle", None)
+        if self.operatingSystem_lifecycle.get("detectionScore"):
+            setattr(
+                self,
+                "operatingSystem_lifecycle_detectionScore",
+                self.operatingSystem_lifecycle["detectionScore"],
+            )
 
-        if self.softwareComponent:
-            if not isinstance(self.softwareComponent, str):
-                raise Exception("SoftwareComponent must be a string.")
+        setattr(self, "operatingSystem_lifecycle", None)
 
     def is_cloud_host(self) -> bool:
         """
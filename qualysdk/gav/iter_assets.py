@@ -0,0 +1,80 @@
+"""
+iter_assets.py - contains the iter_raw_assets function for the Global AssetView API (GAV) module.
+
+Yields the asset records of get_all_assets/query_assets as the API returns them, without building
+Host objects, for exporters that read the nested blocks directly (i.e. sql.upload_gav_child_tables).
+get_all_assets, query_assets and each range of a partitioned pull are built on it, so it holds the
+only lastSeenAssetId pagination loop in the module.
+"""
+
+import logging
+from typing import Iterator, Union
+
+from ..base.call_api import call_api
+from ..auth.token import TokenAuth
+from ..exceptions.Exceptions import *
+
+logger = logging.getLogger(__name__)
+
+
+def iter_raw_assets(
+    auth: TokenAuth, page_count: Union[int, "all"] = "all", partitions: int = 1, **kwargs
+) -> Iterator[dict]:
+    """
+    Yield GAV asset records as the raw dicts the API returns, page by page.
+
+    Params:
+        auth (TokenAuth): The authentication object.
+        page_count (Union[int, "all"]): The number of pages to get. If "all", get all pages. Defaults to "all".
+        partitions (int): The number of assetId ranges to pull in parallel, as with get_all_assets. Each range is yielded once it completes. Defaults to 1.
+
+    :Kwargs:
+        filter (str): The Qualys QQL filter to use. If given, the query_assets endpoint is used, otherwise get_all_assets.
+        excludeFields (str): The fields to exclude.
+        includeFields (str): The fields to include.
+        lastSeenAssetId (int): The last seen asset ID. Used for automatic pagination.
+        lastModifiedDate (str): The last modified date.
+        pageSize (int): The number of assets to get per page. Max of 300.
+
+    Yields:
+        dict: An asset record, i.e. {"assetId": 123, "softwareListData": {"software": [...]}, ...}.
+    """
+    if partitions != 1:
+        # imported here, since partition walks each of its ranges with iter_raw_assets:
+        from .partition import iter_partitioned_assets
+
+        yield from iter_partitioned_assets(
+            auth, partitions, page_count, build=lambda record: record, **kwargs
+        )
+        return
+
+    endpoint = "query_assets" if kwargs.get("filter") else "get_all_assets"
+    pulled = 0
+
+    while True:
+        response = call_api(auth=auth, module="gav", endpoint=endpoint, params=kwargs)
+        if not response.text:
+            logger.info("No Results returned.")
+            break
+
+        j = response.json()
+        if "responseCode" not in j.keys() or j["responseCode"] == "FAILED":
+            raise QualysAPIError(j.get("responseMessage", j))
+
+        yield from j["assetListData"]["asset"]
+        pulled += 1
+        (
+            logger.info("Page %s of %s complete.", pulled, page_count)
+            if page_count != "all"
+            else logger.info("Page %s complete.", pulled)
+        )
+
+        if not j["hasMore"]:
+            logger.info("No more records.")
+            break
+
+        if page_count != "all" and pulled >= page_count:
+            logger.info("Page count reached.")
+            break
+
+        kwargs["lastSeenAssetId"] = j["lastSeenAssetId"]
@@ -0,0 +1,236 @@
+"""
+partition.py - contains the keyset partitioning behind get_all_assets and query_assets' partitions kwarg.
+
+The assetId keyspace is split into ranges holding roughly the same number of assets (measured with
+count_assets), and each range is walked by its own thread with its own lastSeenAssetId cursor.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Union
+
+from ..base.base_list import BaseList
+from ..base.call_api import call_api
+from ..auth.token import TokenAuth
+from ..exceptions.Exceptions import *
+from .count_assets import count_assets
+from .hosts import Host
+from .iter_assets import iter_raw_assets
+from .projection import host_builder
+
+logger = logging.getLogger(__name__)
+
+# QQL for an inclusive assetId range:
+ASSET_ID_RANGE = "asset.assetId:[{start} ... {end}]"
+# The last range is left open-ended, so assets created during the pull are not missed:
+ASSET_ID_MAX = 2**63 - 1
+# The keyspace is first counted in this many equal-width buckets per partition:
+BUCKETS_PER_PARTITION = 4
+# Buckets are halved while they hold more than this fraction of a range's share of the assets:
+REBALANCE_TOLERANCE = 0.25
+# Count calls spent halving buckets, per partition:
+REBALANCE_ROUNDS = 8
+
+
+@dataclass
+class AssetIdRange:
+    """
+    An inclusive range of assetIds and the number of assets in it when it was planned.
+    """
+
+    start: int
+    end: int
+    count: int
+
+    def qql(self, filter: str = None) -> str:
+        """
+        The QQL filter for the assets in this range, and in filter if one is given.
+        """
+        qql = ASSET_ID_RANGE.format(start=self.start, end=self.end)
+        return f"({filter}) and {qql}" if filter else qql
+
+
+def _count(auth: TokenAuth, filter: str, start: int, end: int) -> int:
+    return int(count_assets(auth, filter=AssetIdRange(start, end, 0).qql(filter))["count"])
+
+
+def _first_asset_id(auth: TokenAuth, **kwargs) -> Union[int, None]:
+    """
+    The lowest assetId matching kwargs, or None if nothing matches.
+    """
+    params = {
+        k: v for k, v in kwargs.items() if k in ("filter", "lastSeenAssetId", "lastModifiedDate")
+    }
+    params["pageSize"] = 1
+    endpoint = "query_assets" if params.get("filter") else "get_all_assets"
+    response = call_api(auth=auth, module="gav", endpoint=endpoint, params=params)
+    if not response.text:
+        return None
+    j = response.json()
+    if "responseCode" not in j.keys() or j["responseCode"] == "FAILED":
+        raise QualysAPIError(j)
+    assets = j["assetListData"]["asset"]
+    return int(assets[0]["assetId"]) if assets else None
+
+
+def plan_partitions(auth: TokenAuth, partitions: int, **kwargs) -> List[AssetIdRange]:
+    """
+    Split the assetIds matching kwargs into at most partitions ranges holding roughly the same number of assets.
+
+    The keyspace is found from the lowest matching assetId and an upper bound grown until it holds every
+    match. It is counted in equal-width buckets in parallel, the fullest bucket is halved until no bucket
+    holds much of a range's share, and neighbouring buckets are grouped into ranges of about total /
+    partitions assets each.
+
+    Params:
+        auth (TokenAuth): The authentication object.
+        partitions (int): The number of ranges to split into.
+
+    :Kwargs:
+        filter (str): The Qualys QQL filter the assets must match.
+        lastSeenAssetId (int): Only plan assets after this assetId.
+        pageSize (int): The page size the ranges are walked with. Fewer ranges are planned for small inventories.
+
+    Returns:
+        List[AssetIdRange]: The ranges, in assetId order. The last one is open-ended.
+    """
+    filter = kwargs.get("filter")
+    count_kwargs = {k: v for k, v in kwargs.items() if k in ("filter", "lastSeenAssetId")}
+    total = int(count_assets(auth, **count_kwargs)["count"])
+    start = _first_asset_id(auth, **kwargs)
+    if not total or start is None:
+        return []
+
+    # Don't plan more ranges than there are pages:
+    page_size = int(kwargs.get("pageSize", 100))
+    partitions = max(1, min(partitions, -(-total // page_size)))
+    if partitions == 1:
+        return [AssetIdRange(start, ASSET_ID_MAX, total)]
+
+    # Grow the upper bound until the keyspace holds every asset:
+    width = max(total, 1024)
+    while width < ASSET_ID_MAX - start and _count(auth, filter, start, start + width) < total:
+        width *= 4
+    end = min(start + width, ASSET_ID_MAX)
+
+    # Count finer buckets than partitions, so they can be grouped into even ranges:
+    buckets = partitions * BUCKETS_PER_PARTITION
+    step = -(-(end - start + 1) // buckets)
+    bounds = [(s, min(s + step - 1, end)) for s in range(start, end + 1, step)]
+    with ThreadPoolExecutor(max_workers=partitions, thread_name_prefix="GAVPlan") as executor:
+        counts = list(executor.map(lambda b: _count(auth, filter, *b), bounds))
+    ranges = [AssetIdRange(s, e, c) for (s, e), c in zip(bounds, counts)]
+
+    # Halve the fullest bucket until none holds more than REBALANCE_TOLERANCE of a range's share:
+    share = total / partitions
+    for _ in range(partitions * REBALANCE_ROUNDS):
+        i = max(range(len(ranges)), key=lambda x: ranges[x].count)
+        biggest = ranges[i]
+        if biggest.count <= share * REBALANCE_TOLERANCE or biggest.start == biggest.end:
+            break
+        middle = (biggest.start + biggest.end) // 2
+        left = _count(auth, filter, biggest.start, middle)
+        ranges[i : i + 1] = [
+            AssetIdRange(biggest.start, middle, left),
+            AssetIdRange(middle + 1, biggest.end, biggest.count - left),
+        ]
+
+    # Group neighbouring buckets, closing each range where the running total is nearest its share:
+    grouped = [AssetIdRange(ranges[0].start, ranges[0].end, 0)]
+    running = 0
+    for r in ranges:
+        target = len(grouped) * share
+        if (
+            grouped[-1].count
+            and len(grouped) < partitions
+            and abs(running - target) < abs(running + r.count - target)
+        ):
+            grouped.append(AssetIdRange(r.start, r.end, 0))
+        grouped[-1].end = r.end
+        grouped[-1].count += r.count
+        running += r.count
+    ranges = grouped
+
+    # Fold empty ranges into a neighbour, so the ranges still cover the whole keyspace:
+    merged = []
+    for r in ranges:
+        if merged and not (r.count and merged[-1].count):
+            merged[-1] = AssetIdRange(merged[-1].start, r.end, merged[-1].count + r.count)
+        else:
+            merged.append(r)
+    ranges = merged
+    ranges[-1].end = ASSET_ID_MAX
+    logger.info(
+        "Split %s assets into %s assetId ranges of %s assets.",
+        total,
+        len(ranges),
+        ", ".join(str(r.count) for r in ranges),
+    )
+    return ranges
+
+
+def _pull_range(
+    auth: TokenAuth,
+    asset_range: AssetIdRange,
+    page_count: Union[int, "all"],
+    build: Callable[[dict], Host],
+    **kwargs,
+) -> BaseList[Host]:
+    """
+    Walk one range with its own lastSeenAssetId cursor.
+    """
+    kwargs["filter"] = asset_range.qql(kwargs.get("filter"))
+    kwargs.pop("lastSeenAssetId", None)
+    responses = BaseList(map(build, iter_raw_assets(auth, page_count, **kwargs)))
+
+    logger.info(
+        "assetIds %s-%s complete: %s assets.", asset_range.start, asset_range.end, len(responses)
+    )
+    return responses
+
+
+def iter_partitioned_assets(
+    auth: TokenAuth,
+    partitions: int,
+    page_count: Union[int, "all"] = "all",
+    fields: List[str] = None,
+    build: Callable[[dict], Any] = None,
+    **kwargs,
+) -> Iterator[Host]:
+    """
+    Pull the assets matching kwargs with one thread per assetId range, yielding them in assetId order
+    (the same order as a sequential pull) as each range completes.
+
+    Params:
+        auth (TokenAuth): The authentication object.
+        partitions (int): The number of ranges, and threads, to pull with.
+        page_count (Union[int, "all"]): The number of pages to pull per range. Defaults to "all".
+        fields (List[str]): Build HostProjection records of only these fields instead of Hosts. includeFields must already be narrowed to them.
+        build (Callable[[dict], Any]): Build records with this function instead, i.e. to yield the raw asset dicts. Overrides fields.
+
+    :Kwargs:
+        The kwargs of query_assets.
+    """
+    if not isinstance(partitions, int) or partitions < 1:
+        raise ValueError("partitions must be an integer greater than 0.")
+
+    ranges = plan_partitions(auth, partitions, **kwargs)
+    if not ranges:
+        logger.info("No Results returned.")
+        return
+
+    build = build or host_builder(fields)
+    auth.ensure_pool_size(len(ranges))
+    executor = ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix="GAVRange")
+    try:
+        futures = [
+            executor.submit(_pull_range, auth, asset_range, page_count, build, **kwargs)
+            for asset_range in ranges
+        ]
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Stop ranges that haven't started if a range failed or the caller stopped early:
+        executor.shutdown(wait=False, cancel_futures=True)
+    logger.info("All ranges complete.")
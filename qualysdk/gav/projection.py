@@ -0,0 +1,171 @@
+"""
+projection.py - contains the field projection behind get_all_assets and query_assets' fields kwarg.
+
+A projection asks GAV for only the blocks that hold the requested Host fields (through includeFields)
+and returns slotted records holding only those fields.
+"""
+
+from dataclasses import asdict, field, fields, make_dataclass
+from threading import Lock
+from typing import Callable, Dict, Iterable, Tuple
+
+from ..base.serializable_mixin import SerializableMixin
+from .hosts import Host, HOST_DT_FIELDS, HOST_EXPANSIONS
+
+# The values GAV accepts in includeFields, mapped from the response key they populate:
+INCLUDE_FIELDS = {
+    "activity": "activity",
+    "lastLocation": "lastLocation",
+    "address": "address",
+    "lastLoggedOnUser": "lastLoggedOnUser",
+    "agent": "agent",
+    "netbiosName": "netbiosName",
+    "agentId": "agentId",
+    "networkInterfaceListData": "networkInterface",
+    "assetName": "assetName",
+    "openPortListData": "openPort",
+    "biosAssetTag": "biosAssetTag",
+    "operatingSystem": "operatingSystem",
+    "biosDescription": "biosDescription",
+    "processor": "processor",
+    "biosSerialNumber": "biosSerialNumber",
+    "provider": "provider",
+    "cloudProvider": "cloudProvider",
+    "sensor": "sensor",
+    "container": "container",
+    "serviceList": "service",
+    "cpuCount": "cpuCount",
+    "softwareListData": "software",
+    "dnsName": "dnsName",
+    "tagList": "tag",
+    "hardware": "hardware",
+    "timeZone": "timeZone",
+    "hostId": "hostId",
+    "totalMemory": "totalMemory",
+    "inventory": "inventory",
+    "userAccountListData": "userAccount",
+    "isContainerHost": "isContainerHost",
+    "volumeListData": "volume",
+    "lastBoot": "lastBoot",
+}
+
+# includeFields can't be empty, so a projection of fields every asset comes with asks for this one:
+SMALLEST_INCLUDE_FIELD = "assetName"
+
+HOST_FIELDS = {f.name: f for f in fields(Host)}
+
+PROJECTIONS: Dict[Tuple[str, ...], type] = {}
+PROJECTIONS_LOCK = Lock()
+
+
+def source_key(name: str) -> str:
+    """
+    The key of the response record that a Host field is read from. Fields flattened out
+    of a nested block (i.e. operatingSystem_osName) come from the block (operatingSystem).
+    """
+    source = name.split("_", 1)[0]
+    return source if source in HOST_FIELDS else name
+
+
+def _projection_fields(names: Iterable[str]) -> Tuple[str, ...]:
+    if isinstance(names, str):
+        names = names.split(",")
+    names = tuple(dict.fromkeys(["assetId", *(n.strip() for n in names)]))
+    if unknown := [n for n in names if n not in HOST_FIELDS]:
+        raise ValueError(
+            f"Host has no fields named {', '.join(unknown)}. See the GAV Host dataclass for valid fields."
+        )
+    return names
+
+
+def include_fields(names: Iterable[str]) -> str:
+    """
+    The narrowest includeFields value that returns every field in names.
+
+    Params:
+        names (Iterable[str]): Host field names, i.e. ["dnsName", "operatingSystem_osName"].
+
+    Returns:
+        str: A comma-separated includeFields value, i.e. "dnsName,operatingSystem".
+    """
+    include = {
+        INCLUDE_FIELDS[source_key(name)]
+        for name in _projection_fields(names)
+        if source_key(name) in INCLUDE_FIELDS
+    }
+    return ",".join(sorted(include)) or SMALLEST_INCLUDE_FIELD
+
+
+def projection_class(names: Iterable[str]) -> type:
+    """
+    Build (or get the cached) slotted dataclass holding only the given Host fields,
+    plus assetId. Fields keep Host's types and defaults, so SQL, CSV and Parquet
+    exports type the columns the same way.
+
+    Params:
+        names (Iterable[str]): Host field names, i.e. ["dnsName", "operatingSystem_osName"].
+
+    Returns:
+        type: The projection class, named HostProjection.
+    """
+    names = _projection_fields(names)
+    with PROJECTIONS_LOCK:
+        if names in PROJECTIONS:
+            return PROJECTIONS[names]
+        cls = make_dataclass(
+            "HostProjection",
+            [
+                (name, HOST_FIELDS[name].type, field(default=HOST_FIELDS[name].default))
+                for name in names
+            ],
+            bases=(SerializableMixin,),
+            namespace={
+                "to_dict": lambda self: asdict(self),
+                "__int__": lambda self: self.assetId,
+                # The class is built at runtime, so pickle it by its fields:
+                "__reduce__": lambda self: (
+                    _rebuild_projection,
+                    (names, tuple(getattr(self, name) for name in names)),
+                ),
+                "__module__": __name__,
+            },
+            slots=True,
+        )
+        PROJECTIONS[names] = cls
+        return cls
+
+
+def _rebuild_projection(names: Tuple[str, ...], values: tuple) -> object:
+    """
+    Unpickle a projection record.
+    """
+    return projection_class(names)(*values)
+
+
+def host_builder(names: Iterable[str] = None) -> Callable[[dict], object]:
+    """
+    Get the function that builds a record from a response's asset dict: Host if names
+    is None, otherwise the projection of names.
+
+    Only the keys the projected fields are read from are passed to Host, so only their
+    blocks are parsed and expanded.
+    """
+    if names is None:
+        return lambda record: Host(**record)
+
+    cls = projection_class(names)
+    projected = tuple(f.name for f in fields(cls))
+    sources = tuple(dict.fromkeys(source_key(name) for name in projected))
+    # Fields Host copies as-is can skip building a Host altogether:
+    plain = all(
+        source == name and source not in HOST_EXPANSIONS and source not in HOST_DT_FIELDS
+        for name, source in zip(projected, map(source_key, projected))
+    )
+
+    def build(record: dict) -> object:
+        if plain:
+            return cls(*(record.get(name, HOST_FIELDS[name].default) for name in projected))
+        host = Host(**{key: record[key] for key in sources if key in record})
+        return cls(*(getattr(host, name) for name in projected))
+
+    return build
@@ -4,17 +4,26 @@ query_assets.py - contains the query_assets function for the Global AssetView AP
 Gets all assets that satisfy a Qualys Query Language (QQL) filter.
 """
 
-from typing import Union
+import logging
+from typing import List, Union
 
 from ..base.base_list import BaseList
-from ..base.call_api import call_api
 from ..auth.token import TokenAuth
 from ..exceptions.Exceptions import *
 from .hosts import Host
+from .iter_assets import iter_raw_assets
+from .partition import iter_partitioned_assets
+from .projection import host_builder, include_fields
+
+logger = logging.getLogger(__name__)
 
 
 def query_assets(
-    auth: TokenAuth, page_count: Union["all", int] = "all", **kwargs
+    auth: TokenAuth,
+    page_count: Union["all", int] = "all",
+    partitions: int = 1,
+    fields: List[str] = None,
+    **kwargs,
 ) -> BaseList[Host]:
     """
     Queries GAV inventory for assets that satisfy a Qualys Query Language (QQL) filter.
@@ -22,6 +31,8 @@ def query_assets(
     Params:
         auth (TokenAuth): The authentication object.
         page_count (int): The number of pages to get. Defaults to 'all'.
+        partitions (int): The number of assetId ranges to pull in parallel, each with its own thread and lastSeenAssetId cursor. page_count then applies per range. Defaults to 1, pulling pages one after another.
+        fields (List[str]): Only pull these Host fields (i.e. ["dnsName", "operatingSystem_osName"]), plus assetId. The narrowest includeFields is sent, and lightweight HostProjection records holding only these fields are returned instead of Hosts.
 
     ## Kwargs:
 
@@ -36,41 +47,15 @@ def query_assets(
         BaseList[Host]: BaseList of Host objects.
     """
 
-    responses = BaseList()
-    pulled = 0
-
-    while True:
-        # make the request:
-        response = call_api(auth=auth, module="gav", endpoint="query_assets", params=kwargs)
-        # if there is no response, break the loop
-        if not response.text:
-            print("No Results returned.")
-            break
-
-        j = response.json()
-
-        if "responseCode" not in j.keys() or j["responseCode"] == "FAILED":
-            raise QualysAPIError(j)
-
-        for record in j["assetListData"]["asset"]:
-            responses.append(Host(**record))
-        (
-            print(f"Page {pulled+1} of {page_count} complete.")
-            if page_count != "all"
-            else print(f"Page {pulled+1} complete.")
-        )
-        pulled += 1
-
-        if not j["hasMore"]:
-            print("No more records.")
-            break
-
-        if page_count != "all" and pulled >= page_count:
-            print("Page count reached.")
-            break
+    build = host_builder(fields)
+    if fields is not None:
+        if kwargs.get("includeFields") or kwargs.get("excludeFields"):
+            raise ValueError("fields cannot be combined with includeFields or excludeFields.")
+        kwargs["includeFields"] = include_fields(fields)
 
-        else:
-            kwargs["lastSeenAssetId"] = j["lastSeenAssetId"]
+    if partitions != 1:
+        return BaseList(iter_partitioned_assets(auth, partitions, page_count, fields, **kwargs))
 
-    print("All pages complete.")
+    responses = BaseList(map(build, iter_raw_assets(auth, page_count, **kwargs)))
+    logger.info("All pages complete.")
     return responses
@@ -6,6 +6,7 @@ patches themselves and patching jobs.
 from .jobs import (
     list_jobs,
     get_job_results,
+    iter_job_results,
     get_job_runs,
     create_job,
     delete_job,
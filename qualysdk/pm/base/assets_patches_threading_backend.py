@@ -2,8 +2,9 @@
 Contains the threading backend for /assets and /patches endpoints
 """
 
+import logging
 from typing import Literal, Union
-from threading import Lock, Thread
+from threading import Thread
 
 from ..data_classes.Patch import Patch
 from ..data_classes.PMAsset import Asset
@@ -13,6 +14,8 @@ from ...base.call_api import call_api
 from ...base.base_list import BaseList
 from ...exceptions.Exceptions import QualysAPIError
 
+logger = logging.getLogger(__name__)
+
 
 def _threading_backend(
     auth: TokenAuth,
@@ -55,7 +58,6 @@ def _threading_backend(
             raise ValueError("Invalid data_type. Must be 'PATCH' or 'ASSET'.")
 
     platform = platform.title()
-    LOCK = Lock()
 
     if kwargs.get("pageSize"):
         check_page_size_limit(kwargs["pageSize"])
@@ -133,17 +135,14 @@ def _threading_backend(
         pulled += 1
 
         if pulled % 5 == 0:
-            with LOCK:
-                print(f"{platform} Thread has pulled {pulled} pages so far.")
+            logger.info("%s Thread has pulled %s pages so far.", platform, pulled)
 
         if page_count != "all" and pulled >= page_count:
-            with LOCK:
-                print(f"{platform} Thread has hit user-defined page limit of {page_count}.")
+            logger.info("%s Thread has hit user-defined page limit of %s.", platform, page_count)
             break
 
         if len(j) < params["pageSize"]:
-            with LOCK:
-                print(f"{platform} Thread has reached the end of the list.")
+            logger.info("%s Thread has reached the end of the list.", platform)
             break
 
     return
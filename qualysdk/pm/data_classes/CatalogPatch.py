@@ -1,3 +1,4 @@
+import logging
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Union
@@ -6,6 +7,8 @@ from ...base.base_class import BaseClass
 from ...base.base_list import BaseList
 from ...base import DONT_EXPAND
 
+logger = logging.getLogger(__name__)
+
 DT_FIELDS = [
     "syncDateTime",
     "modifiedDate",
@@ -102,7 +105,7 @@ class CatalogPatch(BaseClass):
                     setattr(self, field, BaseList(getattr(self, field)))
 
             if self.notification:
-                print(
+                logger.warning(
                     "CatalogPatch's notification attribute is currently not parsed and is set to a string. Please submit a PR adding the functionality to parse this attribute."
                 )
                 setattr(self, "notification", str(self.notification))
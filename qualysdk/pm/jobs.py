@@ -4,18 +4,21 @@ Management jobs in Qualys.
 """
 
 from __future__ import annotations
-from typing import Union, Literal, overload, Sequence
+import logging
+from typing import Union, Literal, overload, Sequence, Generator
 from json import JSONDecodeError
 from threading import Thread, Lock, current_thread
-from queue import Queue
 
 from .data_classes import *
 from .base.page_limit import check_page_size_limit
 from ..base.call_api import call_api
 from ..base.base_list import BaseList
+from ..base.fanout import fan_out, retry_after
 from ..auth.token import TokenAuth
 from ..exceptions.Exceptions import *
 
+logger = logging.getLogger(__name__)
+
 
 def manage_jobs(
     auth: TokenAuth,
@@ -69,6 +72,11 @@ def manage_jobs(
         override_method=method,
     )
 
+    if call_data.status_code == 429:
+        raise RateLimitError(
+            f"429 - PM rate limit reached. {call_data.text}", wait=retry_after(call_data)
+        )
+
     if call_data.status_code not in range(200, 299):
         try:
             err_data = call_data.json()
@@ -132,8 +140,11 @@ def _list_jobs_backend(
             pages_pulled += 1
             kwargs["pageNumber"] = pages_pulled
             if pages_pulled >= page_count:
-                print(
-                    f"{current_thread().name} - Hit user-defined limit of {page_count} pages for platform={platform}."
+                logger.info(
+                    "%s - Hit user-defined limit of %s pages for platform=%s.",
+                    current_thread().name,
+                    page_count,
+                    platform,
                 )
                 break
         else:
@@ -192,7 +203,7 @@ def list_jobs(
                 ),
             ]
 
-            print("Spawned threads for both Windows and Linux jobs...")
+            logger.info("Spawned threads for both Windows and Linux jobs...")
 
             for thread in threads:
                 thread.start()
@@ -227,13 +238,16 @@ def get_job_results(auth: TokenAuth, jobId: str, **kwargs) -> JobResultSummary:
 # Overload 2 for list/BaseList of PMJob
 @overload
 def get_job_results(
-    auth: TokenAuth, jobId: Union[list[PMJob], BaseList[PMJob]], **kwargs
+    auth: TokenAuth,
+    jobId: Union[list[PMJob], BaseList[PMJob]],
+    threads: int = 5,
+    **kwargs,
 ) -> BaseList[JobResultSummary]:
     ...
 
 
 def get_job_results(
-    auth: TokenAuth, jobId: Union[str, Sequence[PMJob]], **kwargs
+    auth: TokenAuth, jobId: Union[str, Sequence[PMJob]], threads: int = 5, **kwargs
 ) -> Union[JobResultSummary, BaseList[JobResultSummary]]:
     """
     Returns the results of a Patch Management job, or
@@ -243,6 +257,7 @@ def get_job_results(
         auth (TokenAuth): The authentication object.
         jobId (Union[str, BaseList[PMJob]]): The ID of the job to get results for.
         If a list of PMJob objects is passed, the function will thread the requests.
+        threads (int): The maximum number of jobs to get results for at once when a list is passed. Default is 5.
 
     ## Kwargs:
 
@@ -254,62 +269,61 @@ def get_job_results(
         Union[JobResultSummary, BaseList[JobResultSummary]]: The response from the
         API as a JobResultSummary object or a BaseList of JobResultSummary objects.
     """
-    lock = Lock()
     if isinstance(jobId, str):
-        kwargs["placeholder"] = f"/{jobId}/deploymentjobresult/summary"
-        kwargs_no_bl = kwargs.copy()
-        kwargs_no_bl.pop("_response_bl", None)
-        result = manage_jobs(auth=auth, method="POST", _use_singular_in_url=True, **kwargs_no_bl)
-        if not kwargs.get("_response_bl") and kwargs.get("_response_bl") != BaseList():
-            return JobResultSummary.from_dict(result.json())
-        else:
-            with lock:
-                kwargs["_response_bl"].extend([JobResultSummary.from_dict(result.json())])
-            return
+        result = manage_jobs(
+            auth=auth,
+            method="POST",
+            _use_singular_in_url=True,
+            placeholder=f"/{jobId}/deploymentjobresult/summary",
+            **kwargs,
+        )
+        return JobResultSummary.from_dict(result.json())
 
     elif isinstance(jobId, (list, BaseList)) and all(
         isinstance(job, (PMJob, str)) for job in jobId
     ):
-        # Shared resource for threads to return results
-        kwargs["_response_bl"] = BaseList()
-        threads = []
-        print(f"Spawning threads for {len(jobId)} jobs...")
-        q = Queue()
-        for job in jobId:
-            if isinstance(job, PMJob):
-                q.put(job.id)
-            else:
-                q.put(job)
-
-        # Each thread will pop a job from the queue and process it.
-        # at no point should the threads list have a len > 5.
-        while not q.empty():
-            if len(threads) < 5:
-                job = q.get()
-                thread = Thread(
-                    target=get_job_results,
-                    args=(auth, job),
-                    kwargs=kwargs,
-                    name=f"JobResultThread-{job}",
-                )
-                thread.start()
-                threads.append(thread)
-            else:
-                for thread in threads:
-                    thread.join()
-                threads = []
+        return BaseList(iter_job_results(auth, jobId, threads=threads, **kwargs))
 
-            with lock:
-                if q.qsize() % 25 == 0:
-                    print(f"Requests left in queue: {q.qsize()}")
+    else:
+        raise ValueError("jobId must be a string, or a list/BaseList of PMJob objects or strings.")
 
-        for thread in threads:
-            thread.join()
 
-        return kwargs["_response_bl"]
+def iter_job_results(
+    auth: TokenAuth, jobIds: Sequence[Union[PMJob, str]], threads: int = 5, **kwargs
+) -> Generator[JobResultSummary, None, None]:
+    """
+    Yield the results of many Patch Management jobs as they are pulled,
+    with at most threads calls in flight at once.
 
-    else:
-        raise ValueError("jobId must be a string, or a list/BaseList of PMJob objects or strings.")
+    If Qualys rate limits a call, every thread pauses and the job is tried again.
+    Jobs whose results cannot be pulled are logged and skipped.
+
+    Args:
+        auth (TokenAuth): The authentication object.
+        jobIds (Sequence[Union[PMJob, str]]): The jobs, or job IDs, to get results for.
+        threads (int): The maximum number of jobs to get results for at once. Default is 5.
+
+    ## Kwargs:
+
+        - jobInstanceId (str): The ID of a specific instance of a job.
+        - pageSize (int): The number of results to return per page. Default is 10.
+        - sort (str): The field to sort results by.
+
+    Yields:
+        JobResultSummary: The results of each job, in the order they are pulled.
+    """
+    ids = [job.id if isinstance(job, PMJob) else job for job in jobIds]
+    logger.info("Pulling results for %s jobs with up to %s threads...", len(ids), threads)
+
+    for _, result in fan_out(
+        lambda job: get_job_results(auth, job, **kwargs),
+        ids,
+        threads=threads,
+        auth=auth,
+        limiter_key="pm/deploymentjob",
+        name="JobResultThread",
+    ):
+        yield result
 
 
 def get_job_runs(
@@ -2,10 +2,8 @@
 Contains user-facing functions for interacting with the /pm/v*/patchcatalog* endpoints
 """
 
+import logging
 from typing import Union, Literal, overload
-from queue import Queue
-from threading import Thread, Lock
-from datetime import datetime
 
 from .data_classes.CatalogPatch import CatalogPatch, PackageDetail
 from .data_classes.AssociatedProduct import AssociatedProduct
@@ -13,7 +11,10 @@ from .data_classes.ProductVulnCount import ProductVulnCount
 from ..base.base_list import BaseList
 from ..auth.token import TokenAuth
 from ..base.call_api import call_api
-from ..exceptions.Exceptions import QualysAPIError
+from ..base.fanout import fan_out, retry_after
+from ..exceptions.Exceptions import QualysAPIError, RateLimitError
+
+logger = logging.getLogger(__name__)
 
 
 @overload
@@ -21,6 +22,7 @@ def get_patch_catalog(
     auth: TokenAuth,
     patchId: Union[int, str],
     platform: Literal["windows", "linux"] = "windows",
+    use_cache: bool = None,
     **kwargs,
 ) -> BaseList[CatalogPatch]:
     ...
@@ -31,6 +33,7 @@ def get_patch_catalog(
     auth: TokenAuth,
     patchId: Union[BaseList[str, int], list[str, int]],
     platform: Literal["windows", "linux"] = "windows",
+    use_cache: bool = None,
     **kwargs,
 ) -> BaseList[CatalogPatch]:
     ...
@@ -40,6 +43,7 @@ def get_patch_catalog(
     auth: TokenAuth,
     patchId: str,
     platform: Literal["windows", "linux"] = "windows",
+    use_cache: bool = None,
     **kwargs,
 ) -> BaseList[CatalogPatch]:
     """
@@ -50,6 +54,7 @@ def get_patch_catalog(
     Args:
         auth (TokenAuth): The authentication object.
         platform (Literal['windows', 'linux']): The platform to filter by. Default is 'windows'.
+        use_cache (bool): Whether to use the response cache, if enabled with configure_cache. Defaults to None, which caches catalog entries for a day.
 
     ## Kwargs:
 
@@ -94,6 +99,7 @@ def get_patch_catalog(
             "get_patch_catalog",
             jsonbody={"patchUuid": patchId[:1000]},
             params=params,
+            use_cache=use_cache,
         )
 
         if result.status_code not in range(200, 299):
@@ -109,7 +115,7 @@ def get_patch_catalog(
 
         pulled += 1
         if pulled % 5 == 0:
-            print(f"Pulled {pulled} chunks of 1K patch catalog entries")
+            logger.info("Pulled %s chunks of 1K patch catalog entries", pulled)
 
     return results
 
@@ -155,81 +161,86 @@ def _get_products_or_packages_in_patch(
         )
 
 
-def _thread_worker(
-    auth: TokenAuth,
-    endpoint: Literal["products", "packages"],
-    patchQueue: Queue,
-    responses: BaseList,
-    LOCK: Lock,
-    tracker: datetime,
-    error_flag: bool,
-    **kwargs,
-):
+def _pull_patch(
+    auth: TokenAuth, endpoint: Literal["products", "packages"], patchId: str, **kwargs
+) -> list[Union[AssociatedProduct, PackageDetail]]:
     """
-    Worker function for threading in get_packages_in_linux_patch and get_products_in_windows_patch.
+    Pull every page of products or packages associated with a single patch.
+    Called by get_packages_in_linux_patch and get_products_in_windows_patch through fan_out.
 
     Args:
         auth (TokenAuth): The authentication object.
         endpoint (Literal['products', 'packages']): The endpoint to call.
-        patchQueue (Queue): The queue of patch IDs.
-        responses (BaseList): The list to append responses to.
-        LOCK (Lock): The threading lock.
-        tracker (datetime): The datetime object to track time.
-        error_flag (bool): The flag to track errors across threads.
+        patchId (str): The patch ID.
 
     ## Kwargs:
 
             - any other kwargs from the calling function
+
+    Returns:
+        list[Union[AssociatedProduct, PackageDetail]]: The products or packages of the patch.
     """
+    results = []
+    if endpoint == "packages":
+        # Each patch is paged through on its own, from the user's starting page:
+        kwargs["pageNumber"] = kwargs.get("pageNumber") or 0
+    while True:
+        response = _get_products_or_packages_in_patch(auth, endpoint, patchId=patchId, **kwargs)
+        if response.status_code == 429:
+            raise RateLimitError(
+                f"Qualys has rate limited you on patch {patchId}.", wait=retry_after(response)
+            )
+        if response.status_code not in range(200, 299):
+            if response.text:
+                raise QualysAPIError(response.json())
+            raise QualysAPIError(
+                f"Qualys returned status code {response.status_code}. {response.text}"
+            )
+        j = response.json()
+        for obj in j:
+            obj["patchId"] = patchId
+            if endpoint == "products":
+                results.append(AssociatedProduct(**obj))
+            elif endpoint == "packages":
+                results.append(PackageDetail(**obj))
+        if "pageNumber" in kwargs:
+            kwargs["pageNumber"] += 1
+        # Kind of a weird if statement admittedly, but we
+        # do this to compensate for Windows patches endpoint
+        # not having any kwargs, specifically pageNumber/pageSize:
+        if (len(j) < kwargs.get("pageSize", 10)) or not j:
+            break
+    return results
 
-    kwargs = {} if not kwargs else kwargs
-
-    if not kwargs.get("pageNumber") and endpoint == "packages":
-        kwargs["pageNumber"] = 0
-    try:  # use error_flag to prevent multiple threads from printing the same error. We can also return what we have so far if an error occurs.
-        while not patchQueue.empty():
-            # We dont need to differentiate the kwarg here, backend will handle it
-            if error_flag:
-                print("Error flag is set. Returning what was collected so far...")
-                return
-            kwargs["patchId"] = patchQueue.get_nowait()
-            while True:
-                response = _get_products_or_packages_in_patch(auth, endpoint, **kwargs)
-                if response.status_code not in range(200, 299):
-                    if response.text:
-                        raise QualysAPIError(response.json())
-                    elif response.status_code == 429:
-                        raise QualysAPIError("Qualys has rate limited you. Please try again later.")
-                    else:
-                        raise QualysAPIError(
-                            f"Qualys returned status code {response.status_code}. {response.text}"
-                        )
-                j = response.json()
-                for obj in j:
-                    obj["patchId"] = kwargs["patchId"]
-                    if endpoint == "products":
-                        responses.append(AssociatedProduct(**obj))
-                    elif endpoint == "packages":
-                        responses.append(PackageDetail(**obj))
-                # Or handles initial page number
-                if kwargs.get("pageNumber") or kwargs.get("pageNumber") == 0:
-                    kwargs["pageNumber"] += 1
-                # Kind of a weird if statement admittedly, but we
-                # do this to compensate for Windows patches endpoint
-                # not having any kwargs, specifically pageNumber/pageSize:
-                if (len(j) < kwargs.get("pageSize", 10)) or not j:
-                    break
-            # Depending on the patches and the len() of their associated
-            # patches/products list, this print may fire at inconsistent intervals
-            with LOCK:
-                # Use lastReportedTime for printing how far we are every ~15 seconds
-                if (datetime.now() - tracker).seconds >= 15:
-                    print(f"{len(responses)} {endpoint} processed...")
-                    tracker = datetime.now()
-    except Exception as e:
-        with LOCK:
-            error_flag = True
-            print(f"Error in thread: {e} Returning what was collected so far...")
+
+def _fan_out_patches(
+    auth: TokenAuth,
+    endpoint: Literal["products", "packages"],
+    patchIds: list[str],
+    threads: int,
+    **kwargs,
+) -> BaseList[Union[AssociatedProduct, PackageDetail]]:
+    """
+    Pull the products or packages of many patches, with at most threads patches in flight at once.
+    Stops at the first error that is not a rate limit, returning what was collected so far.
+    """
+    responses = BaseList()
+    for _, results in fan_out(
+        lambda patchId: _pull_patch(auth, endpoint, patchId, **kwargs),
+        patchIds,
+        threads=threads,
+        auth=auth,
+        limiter_key=(
+            "pm/get_packages_in_linux_patch"
+            if endpoint == "packages"
+            else "pm/get_products_in_windows_patch"
+        ),
+        on_error="stop",
+        name="Linux-Thread" if endpoint == "packages" else "Windows-Thread",
+    ):
+        responses.extend(results)
+    logger.info("%s %s processed.", len(responses), endpoint)
+    return responses
 
 
 def validate_threads_and_patches(patchId, threads):
@@ -289,35 +300,7 @@ def get_packages_in_linux_patch(
     """
 
     patchId = validate_threads_and_patches(patchId, threads)
-    LOCK = Lock()
-    patchQueue = Queue()
-    timeTracker = datetime.now()
-    error_in_thread = False
-    for patch in patchId:
-        patchQueue.put(patch)
-    responses = BaseList()
-    threadsList = []
-    for i in range(threads):
-        t = Thread(
-            target=_thread_worker,
-            args=(
-                auth,
-                "packages",
-                patchQueue,
-                responses,
-                LOCK,
-                timeTracker,
-                error_in_thread,
-            ),
-            kwargs=kwargs,
-            name=f"Linux-Thread-{i}",
-        )
-        t.start()
-        threadsList.append(t)
-    for t in threadsList:
-        t.join()
-
-    return responses
+    return _fan_out_patches(auth, "packages", patchId, threads, **kwargs)
 
 
 @overload
@@ -356,34 +339,7 @@ def get_products_in_windows_patch(
     """
 
     patchId = validate_threads_and_patches(patchId, threads)
-    LOCK = Lock()
-    patchQueue = Queue()
-    timeTracker = datetime.now()
-    error_in_thread = False
-    for patch in patchId:
-        patchQueue.put(patch)
-    responses = BaseList()
-    threadsList = []
-    for i in range(threads):
-        t = Thread(
-            target=_thread_worker,
-            args=(
-                auth,
-                "products",
-                patchQueue,
-                responses,
-                LOCK,
-                timeTracker,
-                error_in_thread,
-            ),
-            name=f"Windows-Thread-{i}",
-        )
-        t.start()
-        threadsList.append(t)
-    for t in threadsList:
-        t.join()
-
-    return responses
+    return _fan_out_patches(auth, "products", patchId, threads)
 
 
 from typing import Union, List, Literal, overload
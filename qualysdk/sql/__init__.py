@@ -3,6 +3,7 @@ SQL server integration for qualysdk
 """
 
 from .base import db_connect, upload_json
+from .watermarks import WatermarkStore
 from .vmdr import (
     upload_vmdr_ags,
     upload_vmdr_kb,
@@ -20,9 +21,11 @@ from .vmdr import (
     upload_vmdr_kb_qvs,
     upload_vmdr_activity_log,
     upload_vmdr_cve_hld,
+    upsert_vmdr_hld,
+    sync_vmdr_hld,
 )
 
-from .gav import upload_gav_hosts
+from .gav import upload_gav_hosts, upload_gav_child_tables
 
 from .totalcloud import (
     upload_totalcloud_aws_connectors,
@@ -57,6 +60,7 @@ from .totalcloud import (
     upload_totalcloud_azure_vm,
     upload_totalcloud_azure_webapp,
     upload_totalcloud_azure_storageaccount,
+    upload_totalcloud_inventory,
 )
 
 from .cloud_agent import upload_cloud_agents
@@ -2,17 +2,22 @@
 base.py - contains the base functionality for the SQL module of qualysdk.
 """
 
+import logging
 from datetime import datetime, timedelta
-from dataclasses import dataclass
-from typing import Literal
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Literal, Callable, Iterable, Union
 from json import dumps
 from ipaddress import IPv4Address, IPv6Address, IPv4Network, IPv6Network
+from io import StringIO
 
 from pandas import DataFrame
-from sqlalchemy import create_engine, Connection, types
+from sqlalchemy import create_engine, Connection, types, inspect, table, column
 
 from ..base.base_list import BaseList
 
+logger = logging.getLogger(__name__)
+
 IP_TYPES = (IPv4Address, IPv6Address, IPv4Network, IPv6Network)
 DT_TYPES = (datetime, timedelta)
 
@@ -102,12 +107,259 @@ def upload_data(
         df[col] = df[col].dt.tz_localize(None)
 
     # Upload the data:
-    print(f"Uploading {len(df)} rows to {table}...")
-    df.to_sql(table, cnxn, if_exists="append", index=False, dtype=dtype, chunksize=4000)
+    logger.info("Uploading %s rows to %s...", len(df), table)
+    method, chunksize = bulk_insert_method(cnxn)
+    df.to_sql(
+        table,
+        cnxn,
+        if_exists="append",
+        index=False,
+        dtype=dtype,
+        chunksize=chunksize,
+        method=method,
+    )
 
     return len(df)
 
 
+def delete_rows(
+    cnxn: Connection, table_name: str, column_name: str, keys: Iterable, chunk_size: int = 1000
+) -> int:
+    """
+    Delete the rows of a SQL table whose column_name is in keys. Used to upsert
+    data by deleting the old version of each row before appending the new one.
+
+    Keys are deleted in chunks so no statement exceeds a backend's parameter limit
+    (i.e. 2100 on MSSQL). Does nothing if the table does not exist yet.
+
+    Args:
+        cnxn (Connection): The Connection object to the SQL database.
+        table_name (str): The name of the table to delete from.
+        column_name (str): The name of the key column.
+        keys (Iterable): The key values of the rows to delete.
+        chunk_size (int): The number of keys per DELETE statement. Defaults to 1000.
+
+    Returns:
+        int: The number of rows deleted.
+    """
+    if not inspect(cnxn).has_table(table_name):
+        return 0
+
+    keys = list(dict.fromkeys(keys))
+    target = table(table_name, column(column_name))
+    deleted = 0
+    for i in range(0, len(keys), chunk_size):
+        result = cnxn.execute(
+            target.delete().where(target.c[column_name].in_(keys[i : i + chunk_size]))
+        )
+        deleted += result.rowcount
+    return deleted
+
+
+def _quote(name: str) -> str:
+    """
+    Quote an identifier for PostgreSQL/SQLite.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _table_name(pd_table, quote: Callable[[str], str] = _quote) -> str:
+    """
+    Get the quoted, schema-qualified name of a pandas SQLTable.
+    """
+    if pd_table.schema:
+        return f"{quote(pd_table.schema)}.{quote(pd_table.name)}"
+    return quote(pd_table.name)
+
+
+def _copy_row(row: Iterable) -> str:
+    """
+    Format a row as a line of COPY CSV. NULLs are written as an unquoted \\N
+    and every other value is quoted, so an empty string stays an empty string.
+    """
+    return (
+        ",".join(
+            r"\N" if value is None else '"' + str(value).replace('"', '""') + '"' for value in row
+        )
+        + "\n"
+    )
+
+
+def _postgresql_copy(pd_table, conn: Connection, keys: list, data_iter: Iterable) -> int:
+    """
+    pandas to_sql method that streams rows into PostgreSQL with COPY FROM STDIN.
+    """
+    buffer = StringIO()
+    buffer.writelines(map(_copy_row, data_iter))
+    buffer.seek(0)
+    columns = ", ".join(_quote(k) for k in keys)
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {_table_name(pd_table)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+        return cursor.rowcount
+
+
+def _mssql_bulk_copy(pd_table, conn: Connection, keys: list, data_iter: Iterable) -> int:
+    """
+    pandas to_sql method that loads rows into MSSQL with pymssql's bulk_copy (BCP).
+    Falls back to a regular executemany if the installed pymssql has no bulk_copy.
+    """
+    rows = list(data_iter)
+    dbapi_conn = conn.connection.dbapi_connection
+    if not hasattr(dbapi_conn, "bulk_copy"):
+        return _executemany(pd_table, conn, keys, rows, "%s")
+
+    # bulk_copy maps values by column ordinal, so look up where
+    # each key lives in the (possibly pre-existing) table:
+    name = f"{pd_table.schema}.{pd_table.name}" if pd_table.schema else pd_table.name
+    cursor = dbapi_conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT name, column_id FROM sys.columns WHERE object_id = OBJECT_ID(%s)", (name,)
+        )
+        ordinals = dict(cursor.fetchall())
+    finally:
+        cursor.close()
+    dbapi_conn.bulk_copy(name, rows, column_ids=[ordinals[k] for k in keys])
+    return len(rows)
+
+
+def _executemany(
+    pd_table, conn: Connection, keys: list, data_iter: Iterable, placeholder: str
+) -> int:
+    """
+    Insert rows with a single DBAPI executemany, bypassing SQLAlchemy's per-row processing.
+    """
+    columns = ", ".join(_quote(k) for k in keys)
+    values = ", ".join(placeholder for _ in keys)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.executemany(
+            f"INSERT INTO {_table_name(pd_table)} ({columns}) VALUES ({values})", data_iter
+        )
+        return cursor.rowcount
+    finally:
+        cursor.close()
+
+
+def _mysql_executemany(pd_table, conn: Connection, keys: list, data_iter: Iterable) -> int:
+    """
+    pandas to_sql method for MySQL/MariaDB. pymysql rewrites an INSERT executemany into
+    batched multi-row INSERT statements.
+    """
+
+    def quote(name: str) -> str:
+        return "`" + str(name).replace("`", "``") + "`"
+
+    columns = ", ".join(quote(k) for k in keys)
+    values = ", ".join("%s" for _ in keys)
+    with conn.connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {_table_name(pd_table, quote)} ({columns}) VALUES ({values})",
+            list(data_iter),
+        )
+        return cursor.rowcount
+
+
+def _sqlite_executemany(pd_table, conn: Connection, keys: list, data_iter: Iterable) -> int:
+    """
+    pandas to_sql method for SQLite. Datetimes are written in the same format
+    SQLAlchemy uses, so previously uploaded rows still sort and compare correctly.
+    """
+    rows = (
+        tuple(v.strftime("%Y-%m-%d %H:%M:%S.%f") if isinstance(v, datetime) else v for v in row)
+        for row in data_iter
+    )
+    return _executemany(pd_table, conn, keys, rows, "?")
+
+
+def bulk_insert_method(cnxn: Connection) -> tuple[Union[Callable, None], int]:
+    """
+    Pick the fastest pandas to_sql insertion method for the connection's database type,
+    as created by db_connect:
+
+    - postgresql: COPY FROM STDIN
+    - mssql: BCP via pymssql's bulk_copy
+    - mysql: batched multi-row INSERTs via pymysql's executemany
+    - sqlite: a single DBAPI executemany
+
+    Each chunk is loaded inside the transaction pandas opens for to_sql.
+
+    Args:
+        cnxn (Connection): The Connection object to the SQL database.
+
+    Returns:
+        tuple[Union[Callable, None], int]: The to_sql method (None for pandas' default) and the chunksize to use with it.
+    """
+    match (cnxn.dialect.name, cnxn.dialect.driver):
+        case ("postgresql", "psycopg2"):
+            return _postgresql_copy, 100000
+        case ("mssql", "pymssql"):
+            return _mssql_bulk_copy, 100000
+        case ("mysql" | "mariadb", "pymysql"):
+            return _mysql_executemany, 10000
+        case ("sqlite", _):
+            return _sqlite_executemany, 100000
+        case _:
+            return None, 4000
+
+
+# Fields that prepare_dataclass/dataclasses_to_frame convert with str():
+TO_STR_FIELDS = [
+    "IP_SET",
+    "APPLIANCE_IDS",
+    "DNS_LIST",
+    "HOST_IDS",
+    "NETBIOS_LIST",
+    "ASSIGNED_USER_IDS",
+    "ASSIGNED_UNIT_IDS",
+    "EC2_IDS",
+    "COMMENTS",
+    "DOMAIN_LIST",
+    "BUGTRAQ_LIST",
+    "SOFTWARE_LIST",
+    "VENDOR_REFERENCE_LIST",
+    "CVE_LIST",
+    "THREAT_INTELLIGENCE",
+    "COMPLIANCE_LIST",
+    "TAGS",
+    "CLOUD_PROVIDER_TAGS",
+    "IP",
+    "IPV6",
+    "QDS",
+    "QDS_FACTORS",
+    "QIDS",
+    "ASSET_GROUP_TITLE",
+    "ASSET_GROUP_TITLE_LIST",
+    "TARGET",
+    "OPTION_PROFILES",
+    "REPORT_TEMPLATES",
+    "REMEDIATION_POLICIES",
+    "DISTRIBUTION_GROUPS",
+]
+
+# Fields that are flattened with flatten_dict_to_string when they hold a dict:
+DICT_FIELDS = [
+    "CORRELATION",
+    "CVSS",
+    "CVSS_V3",
+    "PCI_REASONS",
+    "DISCOVERY",
+    "CHANGE_LOG",
+    "USER_DEF",
+    "TRURISK_SCORE_FACTORS",
+    "VLANS",
+    "ML_VERSION",
+    "VULNSIGS_VERSION",
+    "OPTION_PROFILE",
+    "STATUS",
+    "DETAILS",
+    "USER",
+]
+
+
 def prepare_dataclass(dataclass: dataclass) -> dict:
     """
     Prepare the dataclass for insertion into a SQL database
@@ -121,57 +373,6 @@ def prepare_dataclass(dataclass: dataclass) -> dict:
         dict: The dataclass converted to a dictionary.
     """
 
-    TO_STR_FIELDS = [
-        "IP_SET",
-        "APPLIANCE_IDS",
-        "DNS_LIST",
-        "HOST_IDS",
-        "NETBIOS_LIST",
-        "ASSIGNED_USER_IDS",
-        "ASSIGNED_UNIT_IDS",
-        "EC2_IDS",
-        "COMMENTS",
-        "DOMAIN_LIST",
-        "BUGTRAQ_LIST",
-        "SOFTWARE_LIST",
-        "VENDOR_REFERENCE_LIST",
-        "CVE_LIST",
-        "THREAT_INTELLIGENCE",
-        "COMPLIANCE_LIST",
-        "TAGS",
-        "CLOUD_PROVIDER_TAGS",
-        "IP",
-        "IPV6",
-        "QDS",
-        "QDS_FACTORS",
-        "QIDS",
-        "ASSET_GROUP_TITLE",
-        "ASSET_GROUP_TITLE_LIST",
-        "TARGET",
-        "OPTION_PROFILES",
-        "REPORT_TEMPLATES",
-        "REMEDIATION_POLICIES",
-        "DISTRIBUTION_GROUPS",
-    ]
-
-    DICT_FIELDS = [
-        "CORRELATION",
-        "CVSS",
-        "CVSS_V3",
-        "PCI_REASONS",
-        "DISCOVERY",
-        "CHANGE_LOG",
-        "USER_DEF",
-        "TRURISK_SCORE_FACTORS",
-        "VLANS",
-        "ML_VERSION",
-        "VULNSIGS_VERSION",
-        "OPTION_PROFILE",
-        "STATUS",
-        "DETAILS",
-        "USER",
-    ]
-
     # Iterate over the attrs of the dataclass and convert them to the appropriate format for SQL insertion.
 
     for attr in dataclass.__dataclass_fields__.keys():
@@ -194,6 +395,108 @@ def prepare_dataclass(dataclass: dataclass) -> dict:
     return sql_dict
 
 
+SQL_PRIMITIVES = frozenset((str, int, float, bool, datetime))
+
+
+def _convert_plain(value):
+    """
+    Column rule for regular fields. Matches prepare_dataclass's failsafe pass.
+    """
+    if not value:
+        return None
+    return value if type(value) in SQL_PRIMITIVES else str(value)
+
+
+def _convert_to_str(value):
+    """
+    Column rule for TO_STR_FIELDS.
+    """
+    if not value:
+        return None
+    return str(value) or None
+
+
+def _convert_dict(value):
+    """
+    Column rule for DICT_FIELDS.
+    """
+    if not value:
+        return None
+    if isinstance(value, dict):
+        return flatten_dict_to_string(value) or None
+    return _convert_plain(value)
+
+
+# Compiled (column names, getters, rules) per dataclass, built on first use:
+COLUMN_EXTRACTORS: dict[type, tuple] = {}
+
+
+def column_extractor(cls: type) -> tuple[tuple, tuple, tuple]:
+    """
+    Get the compiled column extractor for a dataclass: its column names, a getter
+    per column, and the conversion rule prepare_dataclass would apply to that column.
+
+    Args:
+        cls (type): The dataclass type.
+
+    Returns:
+        tuple[tuple, tuple, tuple]: The column names, getters and rules.
+    """
+    try:
+        return COLUMN_EXTRACTORS[cls]
+    except KeyError:
+        pass
+
+    names, getters, rules = [], [], []
+    for f in fields(cls):
+        names.append(f.name)
+        getters.append(attrgetter(f.name))
+        if f.name in TO_STR_FIELDS:
+            rules.append(_convert_to_str)
+        elif f.name in DICT_FIELDS:
+            rules.append(_convert_dict)
+        else:
+            rules.append(_convert_plain)
+
+    COLUMN_EXTRACTORS[cls] = (tuple(names), tuple(getters), tuple(rules))
+    return COLUMN_EXTRACTORS[cls]
+
+
+def dataclasses_to_frame(data: Iterable) -> DataFrame:
+    """
+    Build a DataFrame from a list of dataclasses, converting values exactly like
+    prepare_dataclass does, without mutating the objects or deep copying them.
+
+    Each column is built in one pass over the objects using the compiled rules from
+    column_extractor, so the cost scales linearly with rows * columns.
+
+    Args:
+        data (Iterable): The dataclasses to convert, i.e. a BaseList.
+
+    Returns:
+        DataFrame: One row per dataclass, one column per field.
+    """
+    data = data if isinstance(data, list) else list(data)
+    if not data:
+        return DataFrame()
+
+    classes = {type(obj) for obj in data}
+    if len(classes) == 1:
+        names, getters, rules = column_extractor(classes.pop())
+        columns = {
+            name: list(map(rule, map(getter, data)))
+            for name, getter, rule in zip(names, getters, rules)
+        }
+        return DataFrame(columns)
+
+    # Mixed types. Build rows so columns are the union of every type's fields:
+    rows = []
+    for obj in data:
+        names, getters, rules = column_extractor(type(obj))
+        rows.append({name: rule(getter(obj)) for name, getter, rule in zip(names, getters, rules)})
+    return DataFrame(rows)
+
+
 def flatten_dict_to_string(d, parent_key="") -> str:
     """
     Format dictionary fields to a string for SQL insertion.
@@ -267,8 +570,16 @@ def upload_json(
         df[col] = df[col].apply(lambda x: dumps(x) if isinstance(x, (dict, list, BaseList)) else x)
 
     # Upload the data:
-    print(f"Uploading {len(df)} rows to {table_name}...")
+    logger.info("Uploading %s rows to %s...", len(df), table_name)
+    method, chunksize = bulk_insert_method(cnxn)
     with cnxn.begin():
-        df.to_sql(table_name, cnxn, if_exists="append", index=False, chunksize=4000)
+        df.to_sql(
+            table_name,
+            cnxn,
+            if_exists="append",
+            index=False,
+            chunksize=chunksize,
+            method=method,
+        )
 
     return len(df)
@@ -2,6 +2,7 @@
 Contains the functions to upload supported Certificate View API pulls to SQL DBs.
 """
 
+import logging
 from datetime import datetime
 
 from pandas import DataFrame, concat
@@ -11,6 +12,8 @@ from sqlalchemy.dialects.mysql import TEXT
 from .base import upload_data, prepare_dataclass
 from ..base.base_list import BaseList
 
+logger = logging.getLogger(__name__)
+
 
 def upload_cert_certs(
     certs: BaseList,
@@ -134,7 +137,7 @@ def upload_cert_certs(
 
     certs_uploaded = upload_data(certs_df, certs_table_name, cnxn, COLS, override_import_dt)
 
-    print(f"Uploaded {certs_uploaded} to {certs_table_name}. Moving to assets...")
+    logger.info("Uploaded %s to %s. Moving to assets...", certs_uploaded, certs_table_name)
 
     COLS = {
         "id": types.Integer(),
@@ -151,6 +154,6 @@ def upload_cert_certs(
 
     assets_uploaded = upload_data(assets_df, assets_table_name, cnxn, COLS, override_import_dt)
 
-    print(f"Uploaded {assets_uploaded} to {assets_table_name}.")
+    logger.info("Uploaded %s to %s.", assets_uploaded, assets_table_name)
 
     return certs_uploaded
@@ -4,11 +4,10 @@ cloud_agent.py - Contains the functions to upload supported cloud_agent API pull
 
 from datetime import datetime
 
-from pandas import DataFrame
 from sqlalchemy import Connection, types
 from sqlalchemy.dialects.mysql import TEXT
 
-from .base import upload_data, prepare_dataclass
+from .base import upload_data, dataclasses_to_frame
 from ..base.base_list import BaseList
 
 
@@ -115,7 +114,7 @@ def upload_cloud_agents(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(host) for host in hosts])
+    df = dataclasses_to_frame(hosts)
 
     # Drop cols that are parsed out into other fields:
     df.drop(
@@ -4,11 +4,10 @@ Contains the functions to upload supported Container Security API pulls to SQL D
 
 from datetime import datetime
 
-from pandas import DataFrame
 from sqlalchemy import Connection, types
 from sqlalchemy.dialects.mysql import TEXT
 
-from .base import upload_data, prepare_dataclass
+from .base import upload_data, dataclasses_to_frame
 from ..base.base_list import BaseList
 
 
@@ -95,7 +94,7 @@ def upload_cs_containers(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(container) for container in containers])
+    df = dataclasses_to_frame(containers)
 
     # Drop cols that are parsed out into other fields:
     df.drop(
@@ -148,7 +147,7 @@ def upload_cs_software(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(software) for software in software])
+    df = dataclasses_to_frame(software)
 
     # Drop cols that are parsed out into other fields:
     df.drop(
@@ -222,7 +221,7 @@ def upload_cs_vulns(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(vuln) for vuln in vulns])
+    df = dataclasses_to_frame(vulns)
     # Drop cols that are parsed out into other fields:
     df.drop(
         columns=["cvssInfo", "cvss3Info"],
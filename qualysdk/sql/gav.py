@@ -2,15 +2,21 @@
 Contains the functions to upload supported GAV API pulls to SQL DBs.
 """
 
+import logging
+from contextlib import nullcontext
 from datetime import datetime
+from operator import methodcaller
+from typing import Callable, Iterable
 
-from pandas import DataFrame
-from sqlalchemy import Connection, types
+from pandas import DataFrame, to_datetime
+from sqlalchemy import Connection, Index, MetaData, Table, types
 from sqlalchemy.dialects.mysql import TEXT
 
-from .base import upload_data, prepare_dataclass
+from .base import upload_data, dataclasses_to_frame
 from ..base.base_list import BaseList
 
+logger = logging.getLogger(__name__)
+
 
 # For the softwareListData column, we need to parse build a string containing
 # certain fields from the softwareListData object:
@@ -354,7 +360,7 @@ def upload_gav_hosts(
             host.inventoryListData = BaseList([i for i in host.inventoryListData if i != "Unknown"])
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(host) for host in hosts])
+    df = dataclasses_to_frame(hosts)
 
     # Drop cols that are parsed out into other fields:
     df.drop(
@@ -374,3 +380,240 @@ def upload_gav_hosts(
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, COLS, override_import_dt)
+
+
+# Text columns that are indexed need a length, since MySQL can't index TEXT:
+_KEY = types.String(255)
+_TEXT = types.String().with_variant(TEXT(charset="utf8"), "mysql", "mariadb")
+
+# The child tables written by upload_gav_child_tables. Each one is read from a list in a
+# raw asset record (source -> item key), and holds one row per item, keyed by assetId.
+# columns maps each column to its path in the item and its type. Every table is indexed
+# on assetId and on index_columns:
+GAV_CHILD_TABLES = {
+    "asset_software": {
+        "source": "softwareListData",
+        "item": "software",
+        "columns": {
+            "productName": (("productName",), _KEY),
+            "version": (("version",), _KEY),
+            "publisher": (("publisher",), _KEY),
+            "fullName": (("fullName",), _TEXT),
+            "category": (("category",), _TEXT),
+            "softwareType": (("softwareType",), _TEXT),
+            "isIgnored": (("isIgnored",), types.Boolean()),
+            "ignoredReason": (("ignoredReason",), _TEXT),
+            "installPath": (("installPath",), _TEXT),
+            "lastUpdated": (("lastUpdated",), types.DateTime()),
+            "cpeId": (("cpeId",), _TEXT),
+            "cpe": (("cpe",), _TEXT),
+            "lifecycle_stage": (("lifecycle", "stage"), _TEXT),
+            "lifecycle_eolDate": (("lifecycle", "eolDate"), types.DateTime()),
+            "lifecycle_eosDate": (("lifecycle", "eosDate"), types.DateTime()),
+        },
+        "index_columns": ("productName", "version"),
+    },
+    "asset_ports": {
+        "source": "openPortListData",
+        "item": "openPort",
+        "columns": {
+            "port": (("port",), types.Integer()),
+            "protocol": (("protocol",), _KEY),
+            "detectedService": (("detectedService",), _KEY),
+            "description": (("description",), _TEXT),
+            "firstFound": (("firstFound",), types.DateTime()),
+            "lastUpdated": (("lastUpdated",), types.DateTime()),
+        },
+        "index_columns": ("port", "protocol"),
+    },
+    "asset_volumes": {
+        "source": "volumeListData",
+        "item": "volume",
+        "columns": {
+            "name": (("name",), _KEY),
+            "size": (("size",), types.BigInteger()),
+            "free": (("free",), types.BigInteger()),
+        },
+        "index_columns": ("name",),
+    },
+    "asset_interfaces": {
+        "source": "networkInterfaceListData",
+        "item": "networkInterface",
+        "columns": {
+            "interfaceName": (("interfaceName",), _TEXT),
+            "macAddress": (("macAddress",), _KEY),
+            "addressIpV4": (("addressIpV4",), _KEY),
+            "addressIpV6": (("addressIpV6",), _KEY),
+            "manufacturer": (("manufacturer",), _TEXT),
+            "gatewayAddress": (("gatewayAddress",), _TEXT),
+            "dnsAddress": (("dnsAddress",), _TEXT),
+            "hostname": (("hostname",), _TEXT),
+        },
+        "index_columns": ("macAddress", "addressIpV4"),
+    },
+}
+
+# Rows buffered per child table before they are bulk inserted:
+CHILD_TABLE_BATCH_SIZE = 50000
+
+
+# Values Qualys fills unknown fields with, uploaded as NULL:
+_PLACEHOLDERS = ["", ",", ",,", "Not Announced"]
+
+
+def _child_getter(path: tuple) -> Callable[[dict], object]:
+    """
+    Build the function that reads a column's value from an item. Top-level keys are
+    read with a C-level dict.get, since most columns are one.
+    """
+    if len(path) == 1:
+        return methodcaller("get", path[0])
+
+    def get(item: dict):
+        value = item
+        for key in path:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+
+    return get
+
+
+_CHILD_GETTERS = {
+    name: tuple(_child_getter(path) for path, _ in spec["columns"].values())
+    for name, spec in GAV_CHILD_TABLES.items()
+}
+
+
+def gav_child_rows(asset: dict) -> dict[str, list[tuple]]:
+    """
+    Extract the child table rows of one raw GAV asset record, as returned by gav.iter_raw_assets.
+
+    Args:
+        asset (dict): The raw asset record.
+
+    Returns:
+        dict[str, list[tuple]]: The rows of each table in GAV_CHILD_TABLES, as (assetId, *columns) tuples.
+    """
+    asset_id = asset.get("assetId")
+    rows = {}
+    for name, spec in GAV_CHILD_TABLES.items():
+        block = asset.get(spec["source"])
+        items = block.get(spec["item"]) if isinstance(block, dict) else None
+        if isinstance(items, dict):
+            items = [items]
+        getters = _CHILD_GETTERS[name]
+        rows[name] = [(asset_id, *[get(item) for get in getters]) for item in items or ()]
+    return rows
+
+
+def _upload_child_rows(
+    name: str, rows: list, cnxn: Connection, table_name: str, import_dt: datetime
+) -> int:
+    spec = GAV_CHILD_TABLES[name]
+    df = DataFrame(rows, columns=["assetId", *spec["columns"]])
+    dtype = {"assetId": types.BigInteger()}
+    for column, (_, column_type) in spec["columns"].items():
+        dtype[column] = column_type
+        if isinstance(column_type, types.DateTime):
+            df[column] = to_datetime(df[column], utc=True, errors="coerce").dt.tz_localize(None)
+        elif isinstance(column_type, types.String):
+            df[column] = df[column].where(~df[column].isin(_PLACEHOLDERS))
+    return upload_data(df, table_name, cnxn, dtype, override_import_dt=import_dt)
+
+
+def _create_child_indexes(cnxn: Connection, table_name: str, columns: tuple) -> None:
+    """
+    Index table_name on assetId and on columns, skipping indexes that already exist.
+    """
+    table = Table(table_name, MetaData(), autoload_with=cnxn)
+    with cnxn.begin() if not cnxn.in_transaction() else nullcontext():
+        for indexed in (("assetId",), columns):
+            Index(f"ix_{table_name}_{'_'.join(indexed)}", *(table.c[c] for c in indexed)).create(
+                cnxn, checkfirst=True
+            )
+
+
+def upload_gav_child_tables(
+    assets: Iterable[dict],
+    cnxn: Connection,
+    table_prefix: str = "gav_",
+    hosts_table_name: str = None,
+    batch_size: int = CHILD_TABLE_BATCH_SIZE,
+    create_indexes: bool = True,
+    override_import_dt: datetime = None,
+) -> dict[str, int]:
+    """
+    Upload the software, open ports, volumes and network interfaces of raw GAV asset records
+    to normalized child tables keyed by assetId, in one streaming pass:
+
+    - asset_software: one row per installed product, indexed on (productName, version)
+    - asset_ports: one row per open port, indexed on (port, protocol)
+    - asset_volumes: one row per volume, indexed on name
+    - asset_interfaces: one row per network interface, indexed on (macAddress, addressIpV4)
+
+    Every table is also indexed on assetId, which joins to the assetId column of gav_hosts.
+    Rows are bulk inserted batch_size at a time, so assets can be an iterator over millions
+    of records, i.e. gav.iter_raw_assets(auth, includeFields="software,openPort,volume,networkInterface").
+
+    Args:
+        assets (Iterable[dict]): Raw GAV asset records, as yielded by gav.iter_raw_assets.
+        cnxn (Connection): The Connection object to the SQL database.
+        table_prefix (str): The prefix of the child table names. Defaults to 'gav_', i.e. 'gav_asset_software'.
+        hosts_table_name (str): If given, the assets are also built into Hosts and uploaded to this table with upload_gav_hosts, in the same pass.
+        batch_size (int): The number of rows to buffer per table before inserting them. Defaults to 50000.
+        create_indexes (bool): Whether to create the indexes once the rows are uploaded. Defaults to True.
+        override_import_dt (datetime): If provided, will override the import_datetime column with this value.
+
+    Returns:
+        dict[str, int]: The number of rows uploaded to each table, by table name.
+    """
+    # Imported here, as qualysdk.base imports this package before qualysdk.gav exists:
+    from ..gav.hosts import Host
+
+    import_dt = override_import_dt or datetime.now()
+    table_names = {name: f"{table_prefix}{name}" for name in GAV_CHILD_TABLES}
+    buffers = {name: [] for name in GAV_CHILD_TABLES}
+    uploaded = {table_name: 0 for table_name in table_names.values()}
+    hosts = BaseList()
+    if hosts_table_name:
+        uploaded[hosts_table_name] = 0
+
+    def flush(name: str) -> None:
+        if buffers[name]:
+            uploaded[table_names[name]] += _upload_child_rows(
+                name, buffers[name], cnxn, table_names[name], import_dt
+            )
+            buffers[name] = []
+
+    def flush_hosts() -> None:
+        nonlocal hosts
+        if hosts:
+            uploaded[hosts_table_name] += upload_gav_hosts(
+                hosts, cnxn, hosts_table_name, override_import_dt=import_dt
+            )
+            hosts = BaseList()
+
+    for asset in assets:
+        for name, rows in gav_child_rows(asset).items():
+            buffers[name].extend(rows)
+            if len(buffers[name]) >= batch_size:
+                flush(name)
+        if hosts_table_name:
+            hosts.append(Host(**asset))
+            if len(hosts) >= batch_size // 10:
+                flush_hosts()
+
+    for name in GAV_CHILD_TABLES:
+        flush(name)
+    if hosts_table_name:
+        flush_hosts()
+
+    if create_indexes:
+        for name, spec in GAV_CHILD_TABLES.items():
+            if uploaded[table_names[name]]:
+                _create_child_indexes(cnxn, table_names[name], spec["index_columns"])
+        logger.info("Indexes created on %s.", ", ".join(table_names.values()))
+
+    return uploaded
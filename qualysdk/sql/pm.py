@@ -2,15 +2,18 @@
 Contains the functions to upload supported Patch Management API pulls to SQL DBs.
 """
 
+import logging
 from datetime import datetime
 
 from pandas import DataFrame, concat
 from sqlalchemy import Connection, types
 from sqlalchemy.dialects.mysql import TEXT
 
-from .base import upload_data, prepare_dataclass
+from .base import upload_data, prepare_dataclass, dataclasses_to_frame
 from ..base.base_list import BaseList
 
+logger = logging.getLogger(__name__)
+
 
 def upload_pm_jobs(
     jobs: BaseList,
@@ -102,7 +105,7 @@ def upload_pm_jobs(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(job) for job in jobs])
+    df = dataclasses_to_frame(jobs)
 
     # Drop cols that are parsed out into other fields:
     df.drop(
@@ -180,7 +183,7 @@ def upload_pm_job_results(
         job_results_df, jobs_table_name, cnxn, COLS, override_import_dt
     )
 
-    print(f"Uploaded {job_summaries_uploaded} to {jobs_table_name}. Moving to assets...")
+    logger.info("Uploaded %s to %s. Moving to assets...", job_summaries_uploaded, jobs_table_name)
 
     COLS = {
         "id": types.String().with_variant(TEXT(charset="utf8"), "mysql", "mariadb"),
@@ -262,7 +265,7 @@ def upload_pm_job_runs(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(run) for run in runs])
+    df = dataclasses_to_frame(runs)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, COLS, override_import_dt)
@@ -298,7 +301,7 @@ def upload_pm_cves(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(qid) for qid in qids])
+    df = dataclasses_to_frame(qids)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, COLS, override_import_dt)
@@ -357,7 +360,7 @@ def upload_pm_patches(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(patch) for patch in patches])
+    df = dataclasses_to_frame(patches)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, COLS, override_import_dt)
@@ -412,7 +415,7 @@ def upload_pm_assets(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(asset) for asset in assets])
+    df = dataclasses_to_frame(assets)
 
     # Drop the hardware column:
     df.drop(columns=["hardware"], inplace=True)
@@ -518,7 +521,7 @@ def upload_pm_patch_catalog(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(patch) for patch in patches])
+    df = dataclasses_to_frame(patches)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, COLS, override_import_dt)
@@ -550,7 +553,7 @@ def upload_pm_windows_products(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(product) for product in products])
+    df = dataclasses_to_frame(products)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, COLS, override_import_dt)
@@ -583,7 +586,7 @@ def upload_pm_linux_packages(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(package) for package in packages])
+    df = dataclasses_to_frame(packages)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, COLS, override_import_dt)
@@ -632,7 +635,7 @@ class ProductVulnCount(BaseClass):
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(count) for count in counts])
+    df = dataclasses_to_frame(counts)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, COLS, override_import_dt)
@@ -4,11 +4,10 @@ Contains the functions to upload supported tagging API pulls to SQL DBs.
 
 from datetime import datetime
 
-from pandas import DataFrame
 from sqlalchemy import Connection, types
 from sqlalchemy.dialects.mysql import TEXT
 
-from .base import upload_data, prepare_dataclass
+from .base import upload_data, dataclasses_to_frame
 from ..base.base_list import BaseList
 
 
@@ -51,7 +50,7 @@ def upload_tagging_tags(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(tag) for tag in tags])
+    df = dataclasses_to_frame(tags)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, COLS, override_import_dt)
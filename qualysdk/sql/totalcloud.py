@@ -4,11 +4,10 @@ totalcloud.py - Contains the functions to upload supported GAV API pulls to SQL
 
 from datetime import datetime
 
-from pandas import DataFrame
 from sqlalchemy import Connection, types
 from sqlalchemy.dialects.mysql import TEXT
 
-from .base import upload_data, prepare_dataclass
+from .base import upload_data, dataclasses_to_frame
 from ..base.base_list import BaseList
 
 BASE_AWS_FIELDS = {
@@ -83,7 +82,7 @@ def upload_totalcloud_aws_connectors(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(connector) for connector in connectors])
+    df = dataclasses_to_frame(connectors)
 
     # Upload the data:
     return upload_data(
@@ -145,7 +144,7 @@ def upload_totalcloud_azure_connectors(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(connector) for connector in connectors])
+    df = dataclasses_to_frame(connectors)
 
     # Upload the data:
     return upload_data(
@@ -203,7 +202,7 @@ def upload_totalcloud_gcp_connectors(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(connector) for connector in connectors])
+    df = dataclasses_to_frame(connectors)
 
     # Upload the data:
     return upload_data(
@@ -272,7 +271,7 @@ def upload_totalcloud_control_metadata(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(control) for control in controls])
+    df = dataclasses_to_frame(controls)
 
     # Drop the evaluation column:
     df.drop(columns=["evaluation"], inplace=True)
@@ -380,7 +379,7 @@ def upload_totalcloud_aws_ec2(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(ec2) for ec2 in ec2s])
+    df = dataclasses_to_frame(ec2s)
 
     # Drop vulnerabilityStats, iamInstanceProfileRoleDetails, iamInstanceProfile columns:
     df.drop(
@@ -436,7 +435,7 @@ def upload_totalcloud_aws_s3(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(bucket) for bucket in buckets])
+    df = dataclasses_to_frame(buckets)
 
     # Upload the data:
     return upload_data(
@@ -486,7 +485,7 @@ def upload_totalcloud_aws_acl(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(acl) for acl in acls])
+    df = dataclasses_to_frame(acls)
 
     # Upload the data:
     return upload_data(
@@ -585,7 +584,7 @@ def upload_totalcloud_aws_rds(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(rd) for rd in rds])
+    df = dataclasses_to_frame(rds)
 
     # Drop the subnetGroup, endpoint columns:
     df.drop(columns=["subnetGroup", "endpoint"], inplace=True)
@@ -678,7 +677,7 @@ def upload_totalcloud_aws_iamuser(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(iam_user) for iam_user in iam_users])
+    df = dataclasses_to_frame(iam_users)
 
     # Drop the userDto column:
     df.drop(columns=["userDto"], inplace=True)
@@ -726,7 +725,7 @@ def upload_totalcloud_aws_vpc(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(vpc) for vpc in vpcs])
+    df = dataclasses_to_frame(vpcs)
 
     # Upload the data:
     return upload_data(
@@ -775,7 +774,7 @@ def upload_totalcloud_aws_securitygroup(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(security_group) for security_group in security_groups])
+    df = dataclasses_to_frame(security_groups)
 
     # Upload the data:
     return upload_data(
@@ -860,7 +859,7 @@ def upload_totalcloud_aws_lambda(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(lambda_) for lambda_ in lambdas])
+    df = dataclasses_to_frame(lambdas)
 
     # Upload the data:
     return upload_data(
@@ -909,7 +908,7 @@ def upload_totalcloud_aws_subnet(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(subnet) for subnet in subnets])
+    df = dataclasses_to_frame(subnets)
 
     # Upload the data:
     return upload_data(
@@ -951,7 +950,7 @@ def upload_totalcloud_aws_internetgateway(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(internet_gateway) for internet_gateway in internet_gateways])
+    df = dataclasses_to_frame(internet_gateways)
 
     # Upload the data:
     return upload_data(
@@ -1016,7 +1015,7 @@ def upload_totalcloud_aws_loadbalancer(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(load_balancer) for load_balancer in load_balancers])
+    df = dataclasses_to_frame(load_balancers)
 
     # Change the _type column to type:
     df.rename(columns={"_type": "type"}, inplace=True)
@@ -1066,7 +1065,7 @@ def upload_totalcloud_aws_routetable(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(route_table) for route_table in route_tables])
+    df = dataclasses_to_frame(route_tables)
 
     # Upload the data:
     return upload_data(
@@ -1117,7 +1116,7 @@ def upload_totalcloud_aws_ebsvolume(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(ebs_volume) for ebs_volume in ebs_volumes])
+    df = dataclasses_to_frame(ebs_volumes)
 
     # Upload the data:
     return upload_data(
@@ -1175,7 +1174,7 @@ def upload_totalcloud_aws_autoscalinggroup(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(asg) for asg in asgs])
+    df = dataclasses_to_frame(asgs)
 
     # Upload the data:
     return upload_data(
@@ -1244,7 +1243,7 @@ def upload_totalcloud_aws_ekscluster(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(eks_cluster) for eks_cluster in eks_clusters])
+    df = dataclasses_to_frame(eks_clusters)
 
     # Drop the associations, resoucesVpcConfig, identity, logging columns:
     df.drop(
@@ -1327,7 +1326,7 @@ def upload_totalcloud_aws_eksnodegroup(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(eks_nodegroup) for eks_nodegroup in eks_nodegroups])
+    df = dataclasses_to_frame(eks_nodegroups)
 
     # Drop the associations, scalingConfig, launchTemplate columns:
     df.drop(columns=["associations", "scalingConfig", "launchTemplate"], inplace=True)
@@ -1391,7 +1390,7 @@ def upload_totalcloud_aws_fargateprofile(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(fargate_profile) for fargate_profile in fargate_profiles])
+    df = dataclasses_to_frame(fargate_profiles)
 
     # Drop the associations column:
     df.drop(columns=["associations"], inplace=True)
@@ -1460,7 +1459,7 @@ def upload_totalcloud_aws_vpcendpoint(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(vpc_endpoint) for vpc_endpoint in vpc_endpoints])
+    df = dataclasses_to_frame(vpc_endpoints)
 
     # Upload the data:
     return upload_data(
@@ -1522,9 +1521,7 @@ def upload_totalcloud_aws_vpcendpointservice(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame(
-        [prepare_dataclass(vpc_endpoint_service) for vpc_endpoint_service in vpc_endpoint_services]
-    )
+    df = dataclasses_to_frame(vpc_endpoint_services)
 
     # Upload the data:
     return upload_data(
@@ -1577,7 +1574,7 @@ def upload_totalcloud_aws_iamgroup(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(iam_group) for iam_group in iam_groups])
+    df = dataclasses_to_frame(iam_groups)
 
     # Upload the data:
     return upload_data(
@@ -1641,7 +1638,7 @@ def upload_totalcloud_aws_iampolicy(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(iam_policy) for iam_policy in iam_policies])
+    df = dataclasses_to_frame(iam_policies)
 
     # Change the _type column to type:
     df.rename(columns={"_type": "type"}, inplace=True)
@@ -1720,7 +1717,7 @@ def upload_totalcloud_aws_iamrole(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(iam_role) for iam_role in iam_roles])
+    df = dataclasses_to_frame(iam_roles)
 
     # Drop the PermissionsBoundary, AssumeRolePolicyDocument columns:
     df.drop(columns=["PermissionsBoundary", "AssumeRolePolicyDocument"], inplace=True)
@@ -1784,9 +1781,7 @@ def upload_totalcloud_aws_sagemakernotebook(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame(
-        [prepare_dataclass(sagemaker_notebook) for sagemaker_notebook in sagemaker_notebooks]
-    )
+    df = dataclasses_to_frame(sagemaker_notebooks)
 
     # Upload the data:
     return upload_data(
@@ -1888,12 +1883,7 @@ def upload_totalcloud_aws_cloudfrontdistribution(
     COLS.update(BASE_AWS_FIELDS)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame(
-        [
-            prepare_dataclass(cloudfront_distribution)
-            for cloudfront_distribution in cloudfront_distributions
-        ]
-    )
+    df = dataclasses_to_frame(cloudfront_distributions)
 
     # Drop the defaultCacheBehavior, geoRestriction columns:
     df.drop(columns=["defaultCacheBehavior", "geoRestriction"], inplace=True)
@@ -1946,9 +1936,7 @@ def upload_totalcloud_remediation_activities(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame(
-        [prepare_dataclass(remediation_activity) for remediation_activity in remediation_activities]
-    )
+    df = dataclasses_to_frame(remediation_activities)
 
     # Upload the data:
     return upload_data(
@@ -2029,7 +2017,7 @@ def upload_totalcloud_azure_vm(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(vm) for vm in vms])
+    df = dataclasses_to_frame(vms)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, dtype=COLS, override_import_dt=override_import_dt)
@@ -2098,7 +2086,7 @@ def upload_totalcloud_azure_webapp(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(webapp) for webapp in webapps])
+    df = dataclasses_to_frame(webapps)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, dtype=COLS, override_import_dt=override_import_dt)
@@ -2186,10 +2174,71 @@ def upload_totalcloud_azure_storageaccount(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(storageaccount) for storageaccount in storageaccounts])
+    df = dataclasses_to_frame(storageaccounts)
 
     # Drop the columns we parsed out:
     df.drop(columns=["blob", "file", "resourceIdentity", "networkAcls"], inplace=True)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, dtype=COLS, override_import_dt=override_import_dt)
+
+
+# (provider, resourceType) from totalcloud.get_inventory to the function that uploads it:
+INVENTORY_UPLOADERS = {
+    ("aws", "EC2_INSTANCE"): upload_totalcloud_aws_ec2,
+    ("aws", "BUCKET"): upload_totalcloud_aws_s3,
+    ("aws", "NETWORK_ACL"): upload_totalcloud_aws_acl,
+    ("aws", "RDS"): upload_totalcloud_aws_rds,
+    ("aws", "IAM_USER"): upload_totalcloud_aws_iamuser,
+    ("aws", "VPC"): upload_totalcloud_aws_vpc,
+    ("aws", "VPC_SECURITY_GROUP"): upload_totalcloud_aws_securitygroup,
+    ("aws", "LAMBDA"): upload_totalcloud_aws_lambda,
+    ("aws", "SUBNET"): upload_totalcloud_aws_subnet,
+    ("aws", "INTERNET_GATEWAY"): upload_totalcloud_aws_internetgateway,
+    ("aws", "LOAD_BALANCER"): upload_totalcloud_aws_loadbalancer,
+    ("aws", "ROUTE_TABLE"): upload_totalcloud_aws_routetable,
+    ("aws", "EBS"): upload_totalcloud_aws_ebsvolume,
+    ("aws", "AUTO_SCALING_GROUP"): upload_totalcloud_aws_autoscalinggroup,
+    ("aws", "EKS_CLUSTER"): upload_totalcloud_aws_ekscluster,
+    ("aws", "EKS_NODEGROUP"): upload_totalcloud_aws_eksnodegroup,
+    ("aws", "EKS_FARGATE_PROFILE"): upload_totalcloud_aws_fargateprofile,
+    ("aws", "VPC_ENDPOINT"): upload_totalcloud_aws_vpcendpoint,
+    ("aws", "VPC_ENDPOINT_SERVICE"): upload_totalcloud_aws_vpcendpointservice,
+    ("aws", "IAM_GROUP"): upload_totalcloud_aws_iamgroup,
+    ("aws", "IAM_POLICY"): upload_totalcloud_aws_iampolicy,
+    ("aws", "IAM_ROLE"): upload_totalcloud_aws_iamrole,
+    ("aws", "SAGEMAKER_NOTEBOOK"): upload_totalcloud_aws_sagemakernotebook,
+    ("aws", "CLOUDFRONT_DISTRIBUTION"): upload_totalcloud_aws_cloudfrontdistribution,
+    ("azure", "VIRTUAL_MACHINE"): upload_totalcloud_azure_vm,
+    ("azure", "WEB_APP"): upload_totalcloud_azure_webapp,
+    ("azure", "STORAGE_ACCOUNT"): upload_totalcloud_azure_storageaccount,
+}
+
+
+def upload_totalcloud_inventory(
+    provider: str,
+    resourceType: str,
+    data: BaseList,
+    cnxn: Connection,
+    override_import_dt: datetime = None,
+) -> int:
+    """
+    Upload data from totalcloud.get_inventory to SQL, with the uploader for its
+    provider and resource type and that uploader's default table name.
+
+    Args:
+        provider (str): The cloud provider the data was pulled from, i.e. 'aws'.
+        resourceType (str): The resource type as Qualys names it, i.e. 'EC2_INSTANCE'.
+        data (BaseList): The BaseList of resources to upload.
+        cnxn (Connection): The Connection object to the SQL database.
+        override_import_dt (datetime): Use the passed datetime instead of generating one to upload to the database.
+
+    Returns:
+        int: The number of rows uploaded.
+    """
+    uploader = INVENTORY_UPLOADERS.get((provider.lower(), resourceType.upper()))
+    if uploader is None:
+        raise ValueError(
+            f"No SQL uploader for {provider} {resourceType}. Supported resource types are: {sorted(INVENTORY_UPLOADERS)}"
+        )
+    return uploader(data, cnxn, override_import_dt=override_import_dt)
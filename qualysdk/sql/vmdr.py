@@ -2,15 +2,22 @@
 vmdr.py - Contains the functions to upload supported VMDR API pulls to SQL DBs.
 """
 
-from datetime import datetime
+import logging
+from contextlib import nullcontext
+from datetime import datetime, timezone
 
 from pandas import DataFrame
 from sqlalchemy import Connection, types
 from sqlalchemy.dialects.mysql import TEXT
 from sqlalchemy.dialects.mssql import DATETIME2
 
-from .base import upload_data, prepare_dataclass
+from .base import upload_data, dataclasses_to_frame, delete_rows
+from .watermarks import WatermarkStore, subscription_key, DEFAULT_STATE_FILE
 from ..base.base_list import BaseList
+from ..auth.basic import BasicAuth
+from ..exceptions.Exceptions import PartialResultError
+
+logger = logging.getLogger(__name__)
 
 
 def upload_vmdr_ags(
@@ -77,7 +84,7 @@ def upload_vmdr_ags(
         "CLOUD_ACCOUNT_ID": types.String().with_variant(TEXT(charset="utf8"), "mysql", "mariadb"),
     }
 
-    df = DataFrame([prepare_dataclass(ag) for ag in ags])
+    df = dataclasses_to_frame(ags)
 
     # Upload the data:
     return upload_data(df, table_name, cnxn, dtype=COLS, override_import_dt=override_import_dt)
@@ -141,7 +148,7 @@ def upload_vmdr_kb(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(kb) for kb in kbs])
+    df = dataclasses_to_frame(kbs)
 
     # Upload the data:
     return upload_data(
@@ -239,7 +246,7 @@ def upload_vmdr_hosts(
     }
 
     # Remove METADATA and DNS_DATA from the dataclass. They're parsed out already from dataclass initialization.
-    df = DataFrame([prepare_dataclass(host) for host in hosts])
+    df = dataclasses_to_frame(hosts)
 
     df.drop(columns=["METADATA", "DNS_DATA", "DETECTION_LIST"], inplace=True)
 
@@ -327,7 +334,9 @@ def upload_vmdr_hld(
     hosts_uploaded = upload_vmdr_hosts(
         hld, cnxn, hosts_table_name, override_import_dt=override_import_dt
     )
-    print(f"Uploaded {hosts_uploaded} hosts to {hosts_table_name}. Moving to detections...")
+    logger.info(
+        "Uploaded %s hosts to %s. Moving to detections...", hosts_uploaded, hosts_table_name
+    )
 
     COLS = {
         "UNIQUE_VULN_ID": types.BigInteger(),
@@ -357,7 +366,7 @@ def upload_vmdr_hld(
     detections = BaseList(detections)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(detection) for detection in detections])
+    df = dataclasses_to_frame(detections)
 
     # Set QDS to an integer:
     df["QDS"] = df["QDS"].apply(lambda x: int(x) if x else None)
@@ -372,6 +381,172 @@ def upload_vmdr_hld(
     )
 
 
+def upsert_vmdr_hld(
+    hld: BaseList,
+    cnxn: Connection,
+    vulns_table_name: str = "vmdr_hld_detections",
+    hosts_table_name: str = "vmdr_hld_hosts_list",
+    override_import_dt: datetime = None,
+) -> int:
+    """
+    Upsert data from vmdr.get_hld() into the tables written by upload_vmdr_hld.
+
+    Hosts are matched on ID and detections on UNIQUE_VULN_ID. Any existing row for a
+    host or detection in hld is deleted, then the new rows are appended, all in one
+    transaction. Detections that Qualys reports as Fixed replace their open row,
+    so they are marked Fixed in the table.
+
+    Args:
+        hld (BaseList): The Host List to upsert.
+        cnxn (Connection): The Connection object to the SQL database.
+        vulns_table_name (str): The name of the detections table. Defaults to 'vmdr_hld_detections'.
+        hosts_table_name (str): The name of the hosts table. Defaults to 'vmdr_hld_hosts_list'.
+        override_import_dt (datetime): Use the passed datetime instead of generating one to upload to the database.
+
+    Returns:
+        int: The number of detection rows uploaded.
+    """
+
+    if not hld:
+        logger.info("No hosts to upsert.")
+        return 0
+
+    host_ids = [int(host.ID) for host in hld]
+    vuln_ids = [
+        int(detection.UNIQUE_VULN_ID)
+        for host in hld
+        if host.DETECTION_LIST
+        for detection in host.DETECTION_LIST
+    ]
+
+    # Join the caller's transaction if there is one, like pandas does:
+    with cnxn.begin() if not cnxn.in_transaction() else nullcontext():
+        deleted_hosts = delete_rows(cnxn, hosts_table_name, "ID", host_ids)
+        deleted_vulns = delete_rows(cnxn, vulns_table_name, "UNIQUE_VULN_ID", vuln_ids)
+        logger.info(
+            "Replacing %s rows in %s and %s rows in %s...",
+            deleted_hosts,
+            hosts_table_name,
+            deleted_vulns,
+            vulns_table_name,
+        )
+        return upload_vmdr_hld(
+            hld,
+            cnxn,
+            vulns_table_name=vulns_table_name,
+            hosts_table_name=hosts_table_name,
+            override_import_dt=override_import_dt,
+        )
+
+
+def sync_vmdr_hld(
+    auth: BasicAuth,
+    cnxn: Connection,
+    state_file: str = DEFAULT_STATE_FILE,
+    vulns_table_name: str = "vmdr_hld_detections",
+    hosts_table_name: str = "vmdr_hld_hosts_list",
+    full: bool = False,
+    override_import_dt: datetime = None,
+    **kwargs,
+) -> int:
+    """
+    Incrementally sync vmdr.get_hld() into SQL.
+
+    The first sync of a subscription (or any sync with full=True) pulls every host. Later
+    syncs only pull detections updated since the previous successful sync, including
+    ones that have been Fixed, and upsert them with upsert_vmdr_hld. The high-water mark
+    is kept per subscription in a local SQLite state file, and is only advanced once
+    every host was pulled and the upload has succeeded. If get_hld gives up on some hosts,
+    what was pulled is still upserted and the PartialResultError is raised.
+
+    Args:
+        auth (BasicAuth): The authentication object.
+        cnxn (Connection): The Connection object to the SQL database.
+        state_file (str): The path to the SQLite state file. Defaults to 'qualysdk_state.db'.
+        vulns_table_name (str): The name of the detections table. Defaults to 'vmdr_hld_detections'.
+        hosts_table_name (str): The name of the hosts table. Defaults to 'vmdr_hld_hosts_list'.
+        full (bool): If True, ignore the stored watermark and pull every host. Defaults to False.
+        override_import_dt (datetime): Use the passed datetime instead of generating one to upload to the database.
+        **kwargs: Additional keyword arguments to pass to vmdr.get_hld(), i.e. threads, show_qds.
+
+    Returns:
+        int: The number of detection rows uploaded.
+    """
+
+    # Imported here, as qualysdk.base imports this package before qualysdk.vmdr exists:
+    from ..vmdr.get_host_list_detections import get_hld
+
+    if "detection_updated_since" in kwargs:
+        raise ValueError(
+            "detection_updated_since is managed by sync_vmdr_hld. Use full=True to ignore the stored watermark."
+        )
+
+    store = WatermarkStore(state_file)
+    subscription = subscription_key(auth)
+    state = None if full else store.get(subscription, "vmdr_hld")
+
+    # Taken before the pull, so detections updated while it runs are picked up next time:
+    started = datetime.now(timezone.utc)
+
+    if state:
+        logger.info(
+            "Delta sync for %s: pulling detections updated since %s...",
+            subscription,
+            state["detection_updated_since"],
+        )
+        kwargs["detection_updated_since"] = state["detection_updated_since"]
+        kwargs.setdefault("status", "New,Active,Re-Opened,Fixed")
+    else:
+        logger.info("Full sync for %s: pulling all hosts...", subscription)
+
+    try:
+        hld = get_hld(auth, **kwargs)
+    except PartialResultError as e:
+        # Keep what was pulled, but leave the watermark where it was so the
+        # hosts that were missed are pulled again by the next sync:
+        uploaded = upsert_vmdr_hld(
+            e.results,
+            cnxn,
+            vulns_table_name=vulns_table_name,
+            hosts_table_name=hosts_table_name,
+            override_import_dt=override_import_dt,
+        )
+        logger.error(
+            "Sync incomplete: %s detection rows uploaded, but %s chunk(s) of hosts were not pulled. The watermark was not advanced.",
+            uploaded,
+            len(e.missing),
+        )
+        raise
+
+    uploaded = upsert_vmdr_hld(
+        hld,
+        cnxn,
+        vulns_table_name=vulns_table_name,
+        hosts_table_name=hosts_table_name,
+        override_import_dt=override_import_dt,
+    )
+
+    host_ids = [int(host.ID) for host in hld]
+    store.set(
+        subscription,
+        "vmdr_hld",
+        {
+            "detection_updated_since": started.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "id_min": min(host_ids) if host_ids else None,
+            "id_max": max(host_ids) if host_ids else None,
+            "hosts": len(host_ids),
+            "detections": uploaded,
+            "full": not state,
+        },
+    )
+    logger.info(
+        "Sync complete. Next sync will pull detections updated since %s.",
+        started.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    )
+
+    return uploaded
+
+
 def upload_vmdr_scanners(
     scanners: BaseList,
     cnxn: Connection,
@@ -456,7 +631,7 @@ def upload_vmdr_scanners(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(scanner) for scanner in scanners])
+    df = dataclasses_to_frame(scanners)
 
     # Drop the CLOUD_INFO and EC2_INFO columns:
     df.drop(columns=["CLOUD_INFO"], inplace=True)
@@ -508,7 +683,7 @@ def upload_vmdr_static_search_lists(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(searchlist) for searchlist in searchlists])
+    df = dataclasses_to_frame(searchlists)
 
     # Upload the data:
     return upload_data(
@@ -567,7 +742,7 @@ def upload_vmdr_dynamic_search_lists(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(searchlist) for searchlist in searchlists])
+    df = dataclasses_to_frame(searchlists)
 
     # Upload the data:
     return upload_data(
@@ -638,7 +813,7 @@ def upload_vmdr_users(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(user) for user in users])
+    df = dataclasses_to_frame(users)
 
     # Drop contact_info, assigned_asset_groups,
     # permissions, notifications:
@@ -703,7 +878,7 @@ def upload_vmdr_scan_list(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(scan) for scan in scans])
+    df = dataclasses_to_frame(scans)
 
     # Drop the STATUS column, as it is parsed out into STATE:
     df.drop(columns=["STATUS"], inplace=True)
@@ -750,7 +925,7 @@ def upload_vmdr_report_list(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(report) for report in reports])
+    df = dataclasses_to_frame(reports)
 
     # Drop the STATUS column, as it is parsed out into STATE:
     df.drop(columns=["STATUS"], inplace=True)
@@ -800,7 +975,7 @@ def upload_vmdr_scheduled_report_list(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(report) for report in reports])
+    df = dataclasses_to_frame(reports)
 
     # Drop TIME_ZONE column, as it is parsed out into TIME_ZONE_CODE and TIME_ZONE_DETAILS:
     df.drop(columns=["TIME_ZONE"], inplace=True)
@@ -930,7 +1105,7 @@ def upload_vmdr_kb_qvs(
         "rti": types.String().with_variant(TEXT(charset="utf8"), "mysql", "mariadb"),  # BaseList
     }
 
-    df = DataFrame([prepare_dataclass(qv) for qv in qvs])
+    df = dataclasses_to_frame(qvs)
 
     df.drop(columns=["contributingFactors", "base"], inplace=True)
 
@@ -974,7 +1149,7 @@ def upload_vmdr_activity_log(
     }
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(log) for log in activity_log])
+    df = dataclasses_to_frame(activity_log)
 
     # Upload the data:
     return upload_data(
@@ -1027,7 +1202,9 @@ def upload_vmdr_cve_hld(
     hosts_uploaded = upload_vmdr_hosts(
         hld, cnxn, hosts_table_name, override_import_dt=override_import_dt
     )
-    print(f"Uploaded {hosts_uploaded} hosts to {hosts_table_name}. Moving to detections...")
+    logger.info(
+        "Uploaded %s hosts to %s. Moving to detections...", hosts_uploaded, hosts_table_name
+    )
 
     COLS = {
         "UNIQUE_VULN_ID": types.BigInteger(),
@@ -1064,7 +1241,7 @@ def upload_vmdr_cve_hld(
     detections = BaseList(detections)
 
     # Convert the BaseList to a DataFrame:
-    df = DataFrame([prepare_dataclass(detection) for detection in detections])
+    df = dataclasses_to_frame(detections)
 
     # Upload the data:
     return upload_data(
@@ -4,11 +4,10 @@ Contains the functions to upload supported Container Security API pulls to SQL D
 
 from datetime import datetime
 
-from pandas import DataFrame
 from sqlalchemy import Connection, types
 from sqlalchemy.dialects.mysql import TEXT
 
-from .base import upload_data, prepare_dataclass
+from .base import upload_data, dataclasses_to_frame
 from ..base.base_list import BaseList
 
 
@@ -120,7 +119,7 @@ def upload_was_webapps(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(webapp) for webapp in webapps])
+    df = dataclasses_to_frame(webapps)
 
     # Drop any columns that we parsed out:
     df.drop(
@@ -227,7 +226,7 @@ def upload_was_authentication_records(
                     record.redact_password()
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(record) for record in authRecords])
+    df = dataclasses_to_frame(authRecords)
 
     # Drop any columns that we parsed out:
     df.drop(
@@ -350,7 +349,7 @@ def upload_was_findings(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(finding) for finding in findings])
+    df = dataclasses_to_frame(findings)
 
     # Drop any columns that we parsed out:
     df.drop(
@@ -441,7 +440,7 @@ def upload_was_scans(
     }
 
     # Prepare the dataclass for insertion:
-    df = DataFrame([prepare_dataclass(scan) for scan in scans])
+    df = dataclasses_to_frame(scans)
 
     # Drop any columns that we parsed out:
     df.drop(
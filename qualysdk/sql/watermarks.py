@@ -0,0 +1,112 @@
+"""
+watermarks.py - contains the WatermarkStore class, which persists the high-water marks
+used by the incremental (delta) sync functions in a local SQLite state file.
+"""
+
+import sqlite3
+from datetime import datetime, timezone
+from json import dumps, loads
+from threading import Lock
+from typing import Union
+
+from ..auth.basic import BasicAuth
+from ..auth.token import TokenAuth
+
+DEFAULT_STATE_FILE = "qualysdk_state.db"
+
+
+class WatermarkStore:
+    """
+    Local SQLite store of sync state. Each row is keyed by subscription
+    (see subscription_key) and stream (i.e. 'vmdr_hld'), and holds a JSON
+    document of the watermarks recorded by the last successful sync.
+
+    The state file is kept separate from the destination database so that
+    it can be used with any supported SQL backend.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATE_FILE):
+        self.path = path
+        self.lock = Lock()
+        self.execute("""
+            CREATE TABLE IF NOT EXISTS watermarks (
+                subscription TEXT NOT NULL,
+                stream TEXT NOT NULL,
+                state TEXT NOT NULL,
+                updated TEXT NOT NULL,
+                PRIMARY KEY (subscription, stream)
+            )
+            """)
+
+    def execute(self, query: str, params: tuple = ()) -> list:
+        """
+        Run a query against the state file in its own transaction and return its rows.
+        """
+        with self.lock:
+            conn = sqlite3.connect(self.path)
+            try:
+                with conn:
+                    return conn.execute(query, params).fetchall()
+            finally:
+                conn.close()
+
+    def get(self, subscription: str, stream: str) -> Union[dict, None]:
+        """
+        Get the state recorded for a subscription and stream.
+
+        Args:
+            subscription (str): The subscription key.
+            stream (str): The name of the synced data set.
+
+        Returns:
+            Union[dict, None]: The recorded state, or None if the stream has never been synced.
+        """
+        rows = self.execute(
+            "SELECT state FROM watermarks WHERE subscription = ? AND stream = ?",
+            (subscription, stream),
+        )
+        return loads(rows[0][0]) if rows else None
+
+    def set(self, subscription: str, stream: str, state: dict) -> None:
+        """
+        Record the state for a subscription and stream, replacing any previous state.
+
+        Args:
+            subscription (str): The subscription key.
+            stream (str): The name of the synced data set.
+            state (dict): The JSON-serializable state to record.
+        """
+        self.execute(
+            "INSERT OR REPLACE INTO watermarks (subscription, stream, state, updated) VALUES (?, ?, ?, ?)",
+            (subscription, stream, dumps(state), datetime.now(timezone.utc).isoformat()),
+        )
+
+    def clear(self, subscription: str, stream: str = None) -> None:
+        """
+        Forget the state of a subscription, so its next sync is a full pull.
+
+        Args:
+            subscription (str): The subscription key.
+            stream (str): The stream to forget. If not provided, all streams of the subscription are forgotten.
+        """
+        if stream:
+            self.execute(
+                "DELETE FROM watermarks WHERE subscription = ? AND stream = ?",
+                (subscription, stream),
+            )
+        else:
+            self.execute("DELETE FROM watermarks WHERE subscription = ?", (subscription,))
+
+
+def subscription_key(auth: Union[BasicAuth, TokenAuth]) -> str:
+    """
+    Build the key that identifies a subscription in the WatermarkStore.
+
+    Args:
+        auth (Union[BasicAuth, TokenAuth]): The authentication object.
+
+    Returns:
+        str: The key, formatted as 'username@platform'.
+    """
+    platform = auth.override_platform["api_url"] if auth.override_platform else auth.platform
+    return f"{auth.username}@{platform}"
@@ -2,6 +2,7 @@
 Contains the middleware API call formatting for tagging APIs
 """
 
+import logging
 from typing import Union, overload
 
 from .base.kwarg_validation import validate_kwargs
@@ -10,6 +11,8 @@ from ..base.call_api import call_api
 from ..auth.basic import BasicAuth
 from ..base.base_list import BaseList
 
+logger = logging.getLogger(__name__)
+
 
 def call_tags_api(auth: BasicAuth, endpoint: str, payload: dict):
     """
@@ -179,7 +182,7 @@ def get_tags(auth: BasicAuth, **kwargs) -> BaseList:
         response = call_tags_api(auth, "get_tags", jsonpayload)
         data = response.get("ServiceResponse", {}).get("data", {})
         if not data:
-            print("No data found in response. Exiting...")
+            logger.info("No data found in response. Exiting...")
             return results
         if isinstance(data, dict):
             data = [data]
@@ -195,11 +198,11 @@ def get_tags(auth: BasicAuth, **kwargs) -> BaseList:
                     "value": response.get("ServiceResponse", {}).get("lastId"),
                 }
             )
-            print("Pagination detected, fetching more results...")
+            logger.info("Pagination detected, fetching more results...")
         else:
             has_more = False
 
-    print("No more results to fetch. Exiting...")
+    logger.info("No more results to fetch. Exiting...")
     return results
 
 
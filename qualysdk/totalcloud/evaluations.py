@@ -3,6 +3,7 @@ Contains functions to pull stats on control IDs on resources,
 evaluations per account, and resources evaluated for a control.
 """
 
+import logging
 from typing import Literal, Union
 
 from ..base.call_api import call_api
@@ -12,6 +13,8 @@ from ..exceptions.Exceptions import *
 from .data_classes.Evaluation import Evaluation, AccountLevelEvaluation
 from .data_classes.Controls import AccountLevelControl
 
+logger = logging.getLogger(__name__)
+
 
 def get_evaluation(
     auth: BasicAuth,
@@ -102,7 +105,7 @@ def get_account_evaluation(
         raise QualysAPIError("No data found for the requested account ID.")
 
     if j.get("empty"):
-        print(f"No data found for account {accountId}")
+        logger.info("No data found for account %s", accountId)
         return responses
 
     # Normalize to list
@@ -168,7 +171,7 @@ def get_resources_evaluated_by_control(
         raise QualysAPIError("No data found for the requested account ID.")
 
     if j.get("empty"):
-        print(f"No data found for account {accountId}")
+        logger.info("No data found for account %s", accountId)
         return responses
 
     # Normalize to list
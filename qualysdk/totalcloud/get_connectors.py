@@ -2,6 +2,7 @@
 Interact with connectors for a given cloud provider.
 """
 
+import logging
 from typing import Union, Literal
 
 from ..base.call_api import call_api
@@ -10,6 +11,8 @@ from ..auth.token import BasicAuth
 from ..exceptions.Exceptions import *
 from .data_classes.Connectors import AWSConnector, AzureConnector
 
+logger = logging.getLogger(__name__)
+
 
 def get_connectors(
     auth: BasicAuth,
@@ -78,7 +81,7 @@ def get_connectors(
         j = response.json()
 
         if len(j["content"]) == 0:
-            print("No connectors found.")
+            logger.info("No connectors found.")
             break
 
         # Iterate through the records in the response and create Connector objects
@@ -90,7 +93,7 @@ def get_connectors(
                     responses.append(AzureConnector(**record))
 
         # Print a message indicating the current page was retrieved successfully
-        print(f"Page {currentPage+1} of {provider} connectors retrieved successfully.")
+        logger.info("Page %s of %s connectors retrieved successfully.", currentPage + 1, provider)
         currentPage += 1
 
         # Break the loop if all pages are retrieved or the requested number of pages are retrieved
@@ -98,7 +101,9 @@ def get_connectors(
             break
 
     # Print a message indicating all pages have been retrieved
-    print(f"All pages complete. {str(len(responses))} {provider} connector records retrieved.")
+    logger.info(
+        "All pages complete. %s %s connector records retrieved.", str(len(responses)), provider
+    )
 
     return responses
 
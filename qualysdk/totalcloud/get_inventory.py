@@ -2,9 +2,10 @@
 Pull resources from a cloud provider account.
 """
 
-from threading import Lock, Thread, current_thread
+import logging
 from queue import Queue
-from typing import Literal, Union
+from threading import Event, Lock, Thread, current_thread
+from typing import Iterable, Iterator, Literal, Tuple, Union
 
 from ..base.call_api import call_api
 from ..base.base_list import BaseList
@@ -14,8 +15,11 @@ from .data_classes.AWSResources import *
 from .data_classes.AzureResources import *
 from .data_classes.resource_mappings import *
 
+logger = logging.getLogger(__name__)
 
-termination_flag = False
+# Qualys returns at most 200 pages of 50 resources per resource type:
+MAX_PAGES = 200
+PAGE_SIZE = 50
 
 
 def fetch_page(
@@ -23,16 +27,15 @@ def fetch_page(
     provider: str,
     resourceType: str,
     pageNo: int,
-    results: BaseList,
-    lock: Lock,
-    page_count: Union[int, "all"],
     **kwargs,
-):
+) -> Tuple[Union[list, None], bool]:
     """
-    Worker function to fetch a single page of resources.
-    """
-    global termination_flag
+    Fetch a single page of resources.
 
+    Returns:
+        Tuple[Union[list, None], bool]: The page's resources, or None if the page is past
+        the end of the inventory, and whether Qualys reported it as the last page.
+    """
     kwargs["placeholder"] = resourceType
     kwargs["cloudprovider"] = provider
 
@@ -53,6 +56,10 @@ def fetch_page(
         params=kwargs,
     )
 
+    if response.status_code == 502 and "INTERNAL_SERVER_ERROR" in response.text:
+        # We have reached the end of the pages
+        return None, True
+
     if response.status_code not in [200, 400, 404]:
         if not response.text:
             raise QualysAPIError(
@@ -61,122 +68,163 @@ def fetch_page(
         else:
             raise QualysAPIError(response.json())
 
-    # Check for empty response or invalid page count
-    if (
-        not response.text
-        or response.status_code in [400, 404]
-        or (page_count != "all" and pageNo >= 199)
-    ):
-        with lock:
-            termination_flag = True
-        return
+    # Check for empty response or a page past the end
+    if not response.text or response.status_code in [400, 404]:
+        return None, True
 
     j = response.json()
 
     if j.get("empty", True):
-        with lock:
-            termination_flag = True
-        return
-
-    with lock:
-        for i in j["content"]:
-            resource_class = resource_map.get(resourceType, None)
-            if resource_class:
-                if "type" in i.keys():
-                    i["_type"] = i.pop("type")
-                i = resource_class(**i)
-            else:
-                raise ValueError(
-                    f"Invalid resource type {resourceType} for provider {provider}. Valid resource types are:\n{VALID_RESOURCETYPES[provider]}"
-                )
-            results.append(i)
-
-        if (pageNo + 1) % 20 == 0:
-            print(
-                f"({current_thread().name}) Page {pageNo+1} of {provider}-{resourceType} retrieved successfully."
-            )
-
-        if "INTERNAL_SERVER_ERROR" in response.text and response.status_code == 502:
-            # We have reached the end of the pages
-            with lock:
-                termination_flag = True
-
-
-def worker(
-    auth,
-    provider,
-    resourceType,
-    results,
-    queue,
-    lock,
-    page_count,
-    **kwargs,
-):
-    global termination_flag
-
-    while True:
-        if termination_flag:
-            break
+        return None, True
 
-        pageNo = queue.get()
-        if pageNo is None:
-            break
-
-        fetch_page(
-            auth,
-            provider,
-            resourceType,
-            pageNo,
-            results,
-            lock,
-            page_count,
-            **kwargs,
+    resource_class = resource_map.get(resourceType, None)
+    if not resource_class:
+        raise ValueError(
+            f"Invalid resource type {resourceType} for provider {provider}. Valid resource types are:\n{VALID_RESOURCETYPES[provider]}"
         )
-        queue.task_done()
 
+    resources = []
+    for i in j["content"]:
+        if "type" in i.keys():
+            i["_type"] = i.pop("type")
+        resources.append(resource_class(**i))
 
-def check_termination_or_empty(queue):
-    return queue.empty() or termination_flag
+    return resources, bool(j.get("last")) or len(j["content"]) < kwargs.get("pageSize", PAGE_SIZE)
 
 
-def get_inventory(
-    auth: BasicAuth,
-    provider: Literal["aws", "azure"],
-    resourceType: str,
-    page_count: Union[int, "all"] = "all",
-    thread_count: int = 5,
-    **kwargs,
-) -> BaseList:
+class InventoryFetch:
+    """
+    The state of pulling one resource type from one provider: which pages have been
+    handed out, which page is known to be past the end, the pages pulled so far and
+    the first error. Every call to get_inventory/get_inventories has its own, so
+    several inventories can be pulled at once in one process. stop is shared by
+    the fetches of one call, and set once any of them fails if fail_fast is True.
+
+    Pages are handed out in order. Once a page comes back empty or marked as the
+    last one, no pages past it are handed out, so at most one page per thread is
+    requested past the end of the inventory.
     """
-    Get resources from a cloud provider account.
 
-    Args:
-        auth (BasicAuth): The authentication object.
-        provider (Literal["aws", "azure"]): The cloud provider to get resources from.
-        resourceType (str): The type of resource to get.
-        page_count (Union[int, "all"]): The number of pages to return. MAX VALUE IS 200. If 'all', return all pages. Default is 'all'.
-        thread_count (int): The number of threads to use for fetching data.
+    def __init__(
+        self,
+        auth: BasicAuth,
+        provider: str,
+        resourceType: str,
+        page_count: Union[int, "all"],
+        stop: Event,
+        fail_fast: bool = True,
+        **kwargs,
+    ):
+        self.auth = auth
+        self.provider = provider
+        self.resourceType = resourceType
+        self.kwargs = kwargs
+        self.stop = stop
+        self.fail_fast = fail_fast
+        self.lock = Lock()
+        self.next_page = 0
+        self.end = MAX_PAGES if page_count == "all" else page_count
+        self.in_flight = 0
+        self.pages = {}
+        self.error = None
+        self.finished = False
+
+    def claim(self) -> Union[int, None]:
+        """
+        Hand out the next page to pull, or None if there is none left.
+        """
+        with self.lock:
+            if self.error is not None or self.stop.is_set() or self.next_page >= self.end:
+                return None
+            pageNo = self.next_page
+            self.next_page += 1
+            self.in_flight += 1
+            return pageNo
+
+    def _finish(self) -> bool:
+        """
+        Mark the fetch finished if every page has been pulled or it failed. Must be
+        called with lock held. Returns True only to the caller that finished it.
+        """
+        if self.finished or self.in_flight:
+            return False
+        if self.next_page >= self.end or self.error is not None:
+            self.finished = True
+            return True
+        return False
+
+    def pull(self, pageNo: int) -> bool:
+        """
+        Pull a page handed out by claim() and store its resources.
+
+        Returns:
+            bool: Whether this page finished the fetch.
+        """
+        try:
+            resources, last = fetch_page(
+                self.auth, self.provider, self.resourceType, pageNo, **self.kwargs
+            )
+        except Exception as e:
+            with self.lock:
+                self.in_flight -= 1
+                if self.error is None:
+                    self.error = e
+                finished = self._finish()
+            if self.fail_fast:
+                # The call raises this error, so the other targets can stop too:
+                self.stop.set()
+            logger.error(
+                "(%s) Error on page %s of %s-%s: %s",
+                current_thread().name,
+                pageNo + 1,
+                self.provider,
+                self.resourceType,
+                e,
+            )
+            return finished
 
-     ## Kwargs:
+        with self.lock:
+            self.in_flight -= 1
+            if resources is None:
+                self.end = min(self.end, pageNo)
+            else:
+                self.pages[pageNo] = resources
+                if last:
+                    self.end = min(self.end, pageNo + 1)
+            finished = self._finish()
+
+        if resources and (pageNo + 1) % 20 == 0:
+            logger.info(
+                "(%s) Page %s of %s-%s retrieved successfully.",
+                current_thread().name,
+                pageNo + 1,
+                self.provider,
+                self.resourceType,
+            )
+        return finished
 
-         sort (Literal['lastSyncedOn:asc', 'lastSyncedOn:desc']): Sort the resources by lastSyncedOn in ascending or descending order.
-         updated (str): Filter resources by the last updated date. Format is Qualys QQL, like [2024-01-01 ... 2024-12-31], [2024-01-01 ... now-1m] (month), 2024-01-01, etc.
-         filter (str): Filter resources by providing a Qualys QQL query.
+    def results(self) -> BaseList:
+        """
+        The resources pulled, in page order. Pages past the end are dropped,
+        in case one was pulled while another thread found the end.
+        """
+        results = BaseList()
+        for pageNo in sorted(self.pages):
+            if pageNo < self.end:
+                results.extend(self.pages[pageNo])
+        return results
 
 
-    Returns:
-        BaseList: The response from the API as a BaseList of Resource objects.
+def _resolve_target(provider: str, resourceType: str) -> Tuple[str, str]:
     """
+    Validate a provider and resource type, resolving common names (i.e. "ec2").
 
-    global termination_flag
-    termination_flag = False
-
-    # Validate provider
+    Returns:
+        Tuple[str, str]: The lowercase provider and the Qualys resource type.
+    """
     provider = provider.lower()
     resourceType = resourceType.upper()
 
-    kwargs["pageSize"] = 50
-
     if provider not in ["aws", "azure"]:
         raise ValueError("Invalid provider. Must be 'aws' or 'azure'.")
 
@@ -191,7 +239,10 @@ def get_inventory(
         raise ValueError(
             f"Invalid resource type for provider {provider}. Valid resource types are: {VALID_RESOURCETYPES[provider]}"
         )
+    return provider, resourceType
+
 
+def _validate_counts(page_count: Union[int, "all"], thread_count: int) -> Union[int, "all"]:
     if page_count != "all" and (not isinstance(page_count, int)):
         raise ValueError("page_count must be an integer <= 200 or 'all'.")
 
@@ -203,37 +254,151 @@ def get_inventory(
 
     if not isinstance(thread_count, int) or thread_count < 1:
         raise ValueError("thread_count must be an integer >= 1.")
+    return page_count
 
-    results = BaseList()
-    page_queue = Queue()
-    lock = Lock()
-
-    # Pre-fill the queue with page numbers
-    for i in range(200) if page_count == "all" else range(page_count):
-        page_queue.put(i)
-
-    # Start worker threads
-    threads = []
-    for _ in range(thread_count):
-        t = Thread(
-            target=worker,
-            args=(auth, provider, resourceType, results, page_queue, lock, page_count),
-            kwargs=kwargs,
-        )
-        threads.append(t)
 
+def iter_completed(fetches: list, thread_count: int, stop: Event) -> Iterator[InventoryFetch]:
+    """
+    Pull every page of every fetch with thread_count threads, yielding each fetch in the
+    calling thread as soon as it is finished, so its results can be handed off while the
+    others are still pulled. Each thread takes a page from the fetch with the fewest pages
+    in flight, so resource types are pulled side by side.
+
+    Fetches that were stopped before they finished are not yielded.
+    """
+    pick_lock = Lock()
+    done = Queue()
+    running = [thread_count]
+
+    def next_page():
+        with pick_lock:
+            for fetch in sorted(fetches, key=lambda f: f.in_flight):
+                pageNo = fetch.claim()
+                if pageNo is not None:
+                    return fetch, pageNo
+        return None
+
+    def worker():
+        try:
+            while (job := next_page()) is not None:
+                fetch, pageNo = job
+                if fetch.pull(pageNo):
+                    done.put(fetch)
+        finally:
+            with pick_lock:
+                running[0] -= 1
+                if not running[0]:
+                    # The last thread out wakes the caller up for good:
+                    done.put(None)
+
+    threads = [
+        Thread(target=worker, name=f"InventoryThread-{i}", daemon=True) for i in range(thread_count)
+    ]
     for t in threads:
         t.start()
+    try:
+        while (fetch := done.get()) is not None:
+            yield fetch
+    except BaseException:
+        # i.e. KeyboardInterrupt, or the caller stopped iterating.
+        # Threads finish their current page and exit:
+        stop.set()
+        raise
+    finally:
+        for t in threads:
+            t.join()
 
-    # Wait for the queue to be empty, or the termination flag to be set
-    while not check_termination_or_empty(page_queue):
-        pass
 
-    # Stop the worker threads
-    for _ in range(thread_count):
-        page_queue.put(None)
-    for t in threads:
-        t.join()
+def get_inventory(
+    auth: BasicAuth,
+    provider: Literal["aws", "azure"],
+    resourceType: str,
+    page_count: Union[int, "all"] = "all",
+    thread_count: int = 5,
+    **kwargs,
+) -> BaseList:
+    """
+    Get resources from a cloud provider account.
+
+    Args:
+        auth (BasicAuth): The authentication object.
+        provider (Literal["aws", "azure"]): The cloud provider to get resources from.
+        resourceType (str): The type of resource to get.
+        page_count (Union[int, "all"]): The number of pages to return. MAX VALUE IS 200. If 'all', return all pages. Default is 'all'.
+        thread_count (int): The number of threads to use for fetching data.
+
+     ## Kwargs:
+
+         sort (Literal['lastSyncedOn:asc', 'lastSyncedOn:desc']): Sort the resources by lastSyncedOn in ascending or descending order.
+         updated (str): Filter resources by the last updated date. Format is Qualys QQL, like [2024-01-01 ... 2024-12-31], [2024-01-01 ... now-1m] (month), 2024-01-01, etc.
+         filter (str): Filter resources by providing a Qualys QQL query.
+
+
+    Returns:
+        BaseList: The response from the API as a BaseList of Resource objects.
+    """
+    return get_inventories(
+        auth,
+        [(provider, resourceType)],
+        page_count=page_count,
+        thread_count=thread_count,
+        **kwargs,
+    )[_resolve_target(provider, resourceType)]
+
+
+def get_inventories(
+    auth: BasicAuth,
+    targets: Iterable[Tuple[Literal["aws", "azure"], str]],
+    page_count: Union[int, "all"] = "all",
+    thread_count: int = 5,
+    **kwargs,
+) -> dict[Tuple[str, str], BaseList]:
+    """
+    Get several resource types, across providers, in parallel with one pool of threads.
 
-    # print(f"{str(len(results))} {provider} {resourceType} records retrieved.")
+    Args:
+        auth (BasicAuth): The authentication object.
+        targets (Iterable[Tuple[Literal["aws", "azure"], str]]): (provider, resourceType) pairs to get, i.e. [("aws", "ec2"), ("azure", "vm")].
+        page_count (Union[int, "all"]): The number of pages to return per target. MAX VALUE IS 200. If 'all', return all pages. Default is 'all'.
+        thread_count (int): The number of threads shared by all targets.
+
+     ## Kwargs:
+
+         sort (Literal['lastSyncedOn:asc', 'lastSyncedOn:desc']): Sort the resources by lastSyncedOn in ascending or descending order.
+         updated (str): Filter resources by the last updated date. Format is Qualys QQL.
+         filter (str): Filter resources by providing a Qualys QQL query. Applied to every target.
+
+    Returns:
+        dict[Tuple[str, str], BaseList]: The resources of each target, keyed by (provider, resourceType)
+        with the provider in lowercase and the resource type as Qualys names it, i.e. ("aws", "EC2_INSTANCE").
+    """
+    page_count = _validate_counts(page_count, thread_count)
+    resolved = list(dict.fromkeys(_resolve_target(*target) for target in targets))
+    if not resolved:
+        return {}
+
+    kwargs["pageSize"] = PAGE_SIZE
+    auth.ensure_pool_size(thread_count)
+
+    stop = Event()
+    fetches = [
+        InventoryFetch(auth, provider, resourceType, page_count, stop, **kwargs)
+        for provider, resourceType in resolved
+    ]
+    for _ in iter_completed(fetches, thread_count, stop):
+        pass
+
+    for fetch in fetches:
+        if fetch.error is not None:
+            raise fetch.error
+
+    results = {}
+    for fetch in fetches:
+        results[(fetch.provider, fetch.resourceType)] = fetch.results()
+        logger.info(
+            "%s %s %s records retrieved.",
+            len(results[(fetch.provider, fetch.resourceType)]),
+            fetch.provider,
+            fetch.resourceType,
+        )
     return results
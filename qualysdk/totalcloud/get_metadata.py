@@ -2,6 +2,7 @@
 Contains function to pull details on all cloud controls Qualys checks for.
 """
 
+import logging
 from typing import Union
 
 from ..base.call_api import call_api
@@ -10,14 +11,19 @@ from ..auth.token import BasicAuth
 from ..exceptions.Exceptions import *
 from .data_classes.Controls import Control
 
+logger = logging.getLogger(__name__)
 
-def get_control_metadata(auth: BasicAuth, page_count: Union[int, "all"] = "all", **kwargs):
+
+def get_control_metadata(
+    auth: BasicAuth, page_count: Union[int, "all"] = "all", use_cache: bool = None, **kwargs
+):
     """
     Get controls Qualys checks a cloud provider for.
 
     Args:
         auth (BasicAuth): The authentication object.
         page_count (int): The number of pages to return. If 'all', return all pages. Default is 'all'.
+        use_cache (bool): Whether to use the response cache, if enabled with configure_cache. Defaults to None, which caches control metadata for a day.
 
     ## Kwargs:
 
@@ -92,6 +98,7 @@ def get_control_metadata(auth: BasicAuth, page_count: Union[int, "all"] = "all",
             endpoint="get_control_metadata",
             params=kwargs,
             headers={"accept": "application/json"},
+            use_cache=use_cache,
         )
 
         if response.status_code != 200:
@@ -102,7 +109,7 @@ def get_control_metadata(auth: BasicAuth, page_count: Union[int, "all"] = "all",
         j = response.json()
 
         if len(j["control"]) == 0:
-            print("No controls found.")
+            logger.info("No controls found.")
             break
 
         # Iterate through the records in the response and create Connector objects
@@ -110,7 +117,7 @@ def get_control_metadata(auth: BasicAuth, page_count: Union[int, "all"] = "all",
             responses.append(Control.from_dict(record))
 
         # Print a message indicating the current page was retrieved successfully
-        print(f"Page {currentPage+1} of controls retrieved successfully.")
+        logger.info("Page %s of controls retrieved successfully.", currentPage + 1)
         currentPage += 1
 
         # Break the loop if all pages are retrieved or the requested number of pages are retrieved
@@ -118,6 +125,6 @@ def get_control_metadata(auth: BasicAuth, page_count: Union[int, "all"] = "all",
             break
 
     # Print a message indicating all pages have been retrieved
-    print(f"All pages complete. {str(len(responses))} control records retrieved.")
+    logger.info("All pages complete. %s control records retrieved.", str(len(responses)))
 
     return responses
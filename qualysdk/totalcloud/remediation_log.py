@@ -2,6 +2,7 @@
 Contains the get_remediation_activities function for Totalcloud
 """
 
+import logging
 from typing import Union, Literal
 
 from ..base.call_api import call_api
@@ -10,6 +11,8 @@ from ..auth.token import BasicAuth
 from ..exceptions.Exceptions import *
 from .data_classes.RemediationActivity import RemediationActivity
 
+logger = logging.getLogger(__name__)
+
 
 def get_remediation_activities(
     auth: BasicAuth,
@@ -72,7 +75,7 @@ def get_remediation_activities(
             raise QualysAPIError(f"{j['errorCode']}, {j['message']}")
 
         if "content" not in j.keys() or not j["pageable"].get("empty"):
-            print("No content in response")
+            logger.info("No content in response")
             break
 
         data = j["content"]
@@ -85,7 +88,7 @@ def get_remediation_activities(
         if page_count != "all":
             pulled_pages += 1
             if pulled_pages >= page_count:
-                print("Reached page limit of", page_count)
+                logger.info("Reached page limit of %s", page_count)
                 break
 
     return bl
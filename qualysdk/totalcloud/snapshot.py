@@ -0,0 +1,212 @@
+"""
+snapshot.py - contains snapshot_inventory, which pulls every resource type of one or more
+cloud providers with one shared pool of threads and hands each finished resource type to a sink.
+"""
+
+import logging
+from datetime import datetime
+from os import makedirs, path
+from threading import Event
+from typing import Callable, Iterable, Literal, Tuple, Union
+
+from ..auth.token import BasicAuth
+from ..base.base_list import BaseList
+from ..base.csv_export import write_csv
+from ..base.json_export import write_json
+from ..exceptions.Exceptions import PartialResultError
+from .get_inventory import (
+    PAGE_SIZE,
+    InventoryFetch,
+    _resolve_target,
+    _validate_counts,
+    iter_completed,
+)
+from .data_classes.resource_mappings import VALID_RESOURCETYPES, resource_map
+
+logger = logging.getLogger(__name__)
+
+# Called with (provider, resourceType, resources) as each resource type finishes:
+Sink = Callable[[str, str, BaseList], None]
+
+
+def supported_resource_types(provider: str) -> list:
+    """
+    The resource types of a provider that the SDK has a dataclass for, in the order of VALID_RESOURCETYPES.
+    """
+    provider = provider.lower()
+    if provider not in VALID_RESOURCETYPES:
+        raise ValueError("Invalid provider. Must be 'aws' or 'azure'.")
+    prefix = "AWS" if provider == "aws" else "Azure"
+    return [
+        resourceType
+        for resourceType in VALID_RESOURCETYPES[provider]
+        if resourceType in resource_map and resource_map[resourceType].__name__.startswith(prefix)
+    ]
+
+
+def _snapshot_targets(
+    providers: list, resource_types: Union[Iterable[str], None]
+) -> list[Tuple[str, str]]:
+    """
+    Resolve providers and resource types to (provider, resourceType) pairs. Each resource type
+    is pulled from every provider it is supported for.
+    """
+    supported = {provider.lower(): supported_resource_types(provider) for provider in providers}
+    if resource_types is None:
+        return [(provider, rt) for provider, types in supported.items() for rt in types]
+
+    targets = []
+    for name in resource_types:
+        matched = False
+        for provider, types in supported.items():
+            try:
+                target = _resolve_target(provider, name)
+            except ValueError:
+                continue
+            if target[1] in types:
+                targets.append(target)
+                matched = True
+        if not matched:
+            raise ValueError(
+                f"Resource type {name} is not supported for {list(supported)}. Supported resource types are: {supported}"
+            )
+    return list(dict.fromkeys(targets))
+
+
+def sql_sink(cnxn, override_import_dt: datetime = None) -> Sink:
+    """
+    A sink that uploads each resource type to its table with sql.upload_totalcloud_inventory.
+    Every table gets the same import datetime, so the whole snapshot can be queried as one.
+
+    Args:
+        cnxn (Connection): The Connection object to the SQL database, from sql.db_connect.
+        override_import_dt (datetime): The import datetime to use. Defaults to when the sink is created.
+    """
+    from ..sql.totalcloud import upload_totalcloud_inventory
+
+    import_dt = override_import_dt or datetime.now()
+
+    def sink(provider: str, resourceType: str, resources: BaseList) -> None:
+        upload_totalcloud_inventory(
+            provider, resourceType, resources, cnxn, override_import_dt=import_dt
+        )
+
+    return sink
+
+
+def file_sink(directory: str, file_format: Literal["csv", "json", "parquet"] = "csv") -> Sink:
+    """
+    A sink that writes each resource type to <directory>/<provider>_<resourcetype>.<file_format>.
+
+    Args:
+        directory (str): The directory to write to. Created if it does not exist.
+        file_format (Literal["csv", "json", "parquet"]): The file format. Parquet requires pyarrow. Defaults to "csv".
+    """
+    if file_format not in ("csv", "json", "parquet"):
+        raise ValueError("file_format must be 'csv', 'json' or 'parquet'.")
+    makedirs(directory, exist_ok=True)
+
+    def sink(provider: str, resourceType: str, resources: BaseList) -> None:
+        file_path = path.join(directory, f"{provider}_{resourceType.lower()}.{file_format}")
+        if file_format == "csv":
+            write_csv(resources, file_path)
+        elif file_format == "json":
+            write_json(resources.serialized(), file_path)
+        else:
+            from ..base.arrow_export import write_parquet
+
+            write_parquet(resources, file_path)
+
+    return sink
+
+
+def snapshot_inventory(
+    auth: BasicAuth,
+    providers: Iterable[Literal["aws", "azure"]] = ("aws", "azure"),
+    resource_types: Iterable[str] = None,
+    sink: Sink = None,
+    page_count: Union[int, "all"] = "all",
+    thread_count: int = 10,
+    **kwargs,
+) -> dict[Tuple[str, str], Union[BaseList, int]]:
+    """
+    Pull every resource type of one or more cloud providers with one shared pool of threads.
+    Each resource type is handed to sink as soon as its last page is pulled, and then dropped,
+    so only the resource types still being pulled are held in memory.
+
+    A resource type that fails does not stop the others. Once every other resource type is
+    done, a PartialResultError is raised. Its results attribute holds what this function would
+    have returned, and its missing and errors attributes the failed (provider, resourceType)
+    pairs and their exceptions.
+
+    Args:
+        auth (BasicAuth): The authentication object.
+        providers (Iterable[Literal["aws", "azure"]]): The cloud providers to pull from. Defaults to both.
+        resource_types (Iterable[str]): The resource types to pull from each provider they are supported for. Common names like "ec2" work. Defaults to every resource type the SDK supports.
+        sink (Callable[[str, str, BaseList], None]): Called with (provider, resourceType, resources) in the calling thread as each resource type finishes, i.e. sql_sink(cnxn) or file_sink("out"). If None, the resources are returned.
+        page_count (Union[int, "all"]): The number of pages to pull per resource type. MAX VALUE IS 200. Default is 'all'.
+        thread_count (int): The number of threads shared by all resource types. Defaults to 10.
+
+     ## Kwargs:
+
+         sort (Literal['lastSyncedOn:asc', 'lastSyncedOn:desc']): Sort the resources by lastSyncedOn in ascending or descending order.
+         updated (str): Filter resources by the last updated date. Format is Qualys QQL.
+         filter (str): Filter resources by providing a Qualys QQL query. Applied to every resource type.
+
+    Returns:
+        dict[Tuple[str, str], Union[BaseList, int]]: Keyed by (provider, resourceType), i.e. ("aws", "EC2_INSTANCE").
+        The resources if no sink was given, otherwise the number of resources handed to the sink.
+    """
+    page_count = _validate_counts(page_count, thread_count)
+    if isinstance(providers, str):
+        providers = [providers]
+    if isinstance(resource_types, str):
+        resource_types = [resource_types]
+    providers = list(providers)
+    targets = _snapshot_targets(providers, resource_types)
+    if not targets:
+        return {}
+
+    kwargs["pageSize"] = PAGE_SIZE
+    auth.ensure_pool_size(thread_count)
+
+    stop = Event()
+    fetches = [
+        InventoryFetch(auth, provider, resourceType, page_count, stop, fail_fast=False, **kwargs)
+        for provider, resourceType in targets
+    ]
+    logger.info(
+        "Starting snapshot of %s resource types with %s threads.", len(fetches), thread_count
+    )
+
+    results = {}
+    failed = {}
+    for fetch in iter_completed(fetches, thread_count, stop):
+        key = (fetch.provider, fetch.resourceType)
+        if fetch.error is not None:
+            failed[key] = fetch.error
+            continue
+        resources = fetch.results()
+        # The sink gets the only reference to the pages from here on:
+        fetch.pages = {}
+        logger.info("%s %s %s records retrieved.", len(resources), *key)
+        if sink is None:
+            results[key] = resources
+            continue
+        try:
+            sink(fetch.provider, fetch.resourceType, resources)
+        except Exception as e:
+            logger.error("Error handing %s %s to the sink: %s", *key, e)
+            failed[key] = e
+            continue
+        results[key] = len(resources)
+
+    if failed:
+        raise PartialResultError(
+            f"{len(failed)} of {len(fetches)} resource types failed: "
+            + "; ".join(f"{p} {rt}: {e}" for (p, rt), e in failed.items()),
+            results=results,
+            missing=list(failed),
+            errors=failed,
+        )
+    return results
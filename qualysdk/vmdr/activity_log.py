@@ -2,6 +2,7 @@
 activity_log.py - Contains the user-facing functionality for interacting with the Qualys VMDR Activity Log API.
 """
 
+import logging
 from urllib.parse import parse_qs
 from re import compile, DOTALL
 from csv import DictReader
@@ -12,6 +13,8 @@ from ..auth.basic import BasicAuth
 from ..base.base_list import BaseList
 from ..vmdr.data_classes.activity_log import ActivityLog
 
+logger = logging.getLogger(__name__)
+
 
 def extract_sections(csv_data: str) -> tuple[Union[str, None], Union[str, None]]:
     """
@@ -79,14 +82,14 @@ def get_activity_log(
             headers={"X-Requested-With": "qualysdk SDK"},
         )
         if response.status_code != 200:
-            print("No data returned.")
+            logger.info("No data returned.")
             return responses
 
         # Rip the data out of the header/footer/warning comments:
         data, pagination_data = extract_sections(response.text)
 
         if not data:
-            print("No data returned.")
+            logger.info("No data returned.")
             return responses
 
         data = DictReader(data.splitlines())
@@ -107,15 +110,17 @@ def get_activity_log(
             # Look for the id_max parameter and update the params:
             if "id_max" in url_params:
                 params["id_max"] = url_params["id_max"][0].strip().replace('"', "")
-                print(f"Pagination detected. Pulling next page with id_max: {params['id_max']}")
+                logger.info(
+                    "Pagination detected. Pulling next page with id_max: %s", params["id_max"]
+                )
             else:
-                print("No more pages to pull.")
+                logger.info("No more pages to pull.")
                 break
 
         pulled += 1
 
         if page_count != "all" and pulled >= page_count:
-            print("Page count reached.")
+            logger.info("Page count reached.")
             break
 
     return responses
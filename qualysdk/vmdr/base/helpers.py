@@ -2,20 +2,29 @@
 Helper functions for multithreading get_hld and get_host_list functions.
 """
 
-from queue import Queue, Empty
-from typing import Union, List, Literal
-from threading import current_thread, Lock
+import logging
+import re
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from html import unescape
+from itertools import chain
+from multiprocessing import get_context
+from queue import Queue, Empty, Full
+from typing import Union, List, Literal, Generator, Tuple
+from threading import current_thread, Event
+from time import perf_counter
 from urllib.parse import urlparse, parse_qs
 from os import cpu_count
 
 from ..data_classes.hosts import VMDRID, VMDRHost
 from ...exceptions import QualysAPIError
 from ...base.call_api import call_api
-from ...base.xml_parser import xml_parser
+from ...base.xml_parser import xml_parser, iterparse_xml
 from ...auth.basic import BasicAuth
 from ...base.base_list import BaseList
+from ...base import DONT_EXPAND, LAZY_EXPAND
+from ...base.metrics import record, wire_bytes
 
-LOCK = Lock()
+logger = logging.getLogger(__name__)
 
 
 def prepare_args(
@@ -25,6 +34,7 @@ def prepare_args(
     page_count: Union[int, "all"],
     chunk_count: Union[int, "all"],
     ids: str = None,
+    sharding: Literal["id_list", "id_range"] = "id_list",
 ) -> dict:
     """
     Performs necessary checks for thread count, CPU count, rate
@@ -37,6 +47,7 @@ def prepare_args(
         page_count (Union[int, 'all']): The number of pages to retrieve.
         chunk_count (Union[int, 'all']): The number of chunks to retrieve.
         ids (str): A comma-separated string of host IDs to use. If specified, this will be used instead of pulling the full set.
+        sharding (Literal["id_list", "id_range"]): How the work will be split between threads.
 
     Returns:
         None
@@ -59,25 +70,32 @@ def prepare_args(
 
     # Make sure the user hasn't set threads to more than the cpu count
     if threads > cpu_count():
-        with LOCK:
-            print(
-                f"Warning: The number of threads ({threads}) is greater than the number of CPUs ({cpu_count()}). This may cause performance issues."
-            )
+        logger.warning(
+            "The number of threads (%s) is greater than the number of CPUs (%s). This may cause performance issues.",
+            threads,
+            cpu_count(),
+        )
 
     # Second, get concurrency rate limit from auth object. NOTE: eventually, auth class should have an attribute for this.
     rl = auth.get_ratelimit()
     if threads > rl["X-Concurrency-Limit-Limit"]:
-        with LOCK:
-            print(
-                f"Warning: The number of threads ({threads}) is greater than the concurrency rate limit ({rl['X-Concurrency-Limit-Limit']}). Setting threads to {rl['X-Concurrency-Limit-Limit']}."
-            )
+        logger.warning(
+            "The number of threads (%s) is greater than the concurrency rate limit (%s). Setting threads to %s.",
+            threads,
+            rl["X-Concurrency-Limit-Limit"],
+            rl["X-Concurrency-Limit-Limit"],
+        )
         threads = rl["X-Concurrency-Limit-Limit"]
 
-    (
-        print("Pulling/creating queue for full ID list...")
-        if not ids
-        else print(f"Pulling/creating queue for user-specified IDs: {ids}...")
-    )
+    # Size the keep-alive connection pool so each thread gets its own connection:
+    auth.ensure_pool_size(threads)
+
+    if ids:
+        logger.info("Pulling/creating queue for user-specified IDs: %s...", ids)
+    elif sharding == "id_range":
+        logger.info("Probing host ID span to create queue of ID ranges...")
+    else:
+        logger.info("Pulling/creating queue for full ID list...")
 
 
 def normalize_id_list(id_list):
@@ -147,8 +165,7 @@ def create_id_queue(auth: BasicAuth, chunk_size: int = 100, ids: str = None) ->
 
     if not id_list:
         raise QualysAPIError("No IDs returned from API.")
-    with LOCK:
-        print(f"ID set pulled. Total IDs: {len(id_list)}")
+    logger.info("ID set pulled. Total IDs: %s", len(id_list))
 
     id_queue = Queue()
 
@@ -166,8 +183,7 @@ def create_id_queue(auth: BasicAuth, chunk_size: int = 100, ids: str = None) ->
             new_queue.put(id_list[i : i + 1])
         id_queue = new_queue
 
-    with LOCK:
-        print(f"Queue created with {id_queue.qsize()} chunks")
+    logger.info("Queue created with %s chunks", id_queue.qsize())
 
     return id_queue
 
@@ -175,6 +191,7 @@ def create_id_queue(auth: BasicAuth, chunk_size: int = 100, ids: str = None) ->
 def hld_backend(
     auth: BasicAuth,
     page_count: Union[int, "all"] = "all",
+    pool: Executor = None,
     **kwargs,
 ) -> List:
     """
@@ -183,6 +200,7 @@ def hld_backend(
     Params:
         auth (BasicAuth): The BasicAuth object containing the username and password.
         page_count (Union[int, "all"]): The number of pages to retrieve. Defaults to "all".
+        pool (Executor): If specified, the process pool to parse pages in. See iter_hld_pipeline.
         **kwargs: Additional keyword arguments to pass to the API. See below.
 
     Kwargs:
@@ -276,176 +294,390 @@ def hld_backend(
     kwargs["show_results"] = 1
     kwargs["output_format"] = "XML"
 
-    responses = BaseList()
+    return BaseList(iter_hld_backend(auth, "get_hld", page_count, pool=pool, **kwargs))
+
+
+def get_cve_hld_backend(
+    auth: BasicAuth,
+    page_count: Union[int, "all"] = "all",
+    pool: Executor = None,
+    **kwargs,
+) -> List:
+    """
+    Backend for CVE Host List Detection.
+    """
+
+    # Set the kwargs
+    kwargs["action"] = "list"
+
+    return BaseList(iter_hld_backend(auth, "get_cve_hld", page_count, pool=pool, **kwargs))
+
+
+def iter_hld_backend(
+    auth: BasicAuth,
+    endpoint: Literal["get_hld", "get_cve_hld"],
+    page_count: Union[int, "all"] = "all",
+    pool: Executor = None,
+    **kwargs,
+) -> Generator[VMDRHost, None, None]:
+    """
+    iter_hld_backend - stream hosts and their detections from the get_hld or get_cve_hld endpoint.
+
+    Each page is parsed with an iterparse-based streaming parser as the response body arrives,
+    so one VMDRHost is yielded per <HOST> element and peak memory is bounded by a single host
+    rather than a whole page. Pagination via the <WARNING> URL's id_min is handled transparently.
+
+    Params:
+        auth (BasicAuth): The BasicAuth object containing the username and password.
+        endpoint (Literal["get_hld", "get_cve_hld"]): The endpoint to call.
+        page_count (Union[int, "all"]): The number of pages to retrieve. Defaults to "all".
+        pool (Executor): If specified, pages are downloaded whole and parsed in this process pool instead. See iter_hld_pipeline.
+        **kwargs: The kwargs to pass to the API. See hld_backend for the full list.
+
+    Yields:
+        VMDRHost: A host with its DETECTION_LIST attribute populated.
+    """
+
+    if pool is not None:
+        yield from iter_hld_pipeline(auth, endpoint, page_count, pool, kwargs)
+        return
+
     pulled = 0
 
     while True:
-        with LOCK:
-            print(
-                f"{current_thread().name} - Pulling page {pulled+1} for ids {kwargs.get('ids')}. KWARGS: {kwargs}"
-            )
+        logger.debug(
+            "%s - Pulling page %s for ids %s. KWARGS: %s",
+            current_thread().name,
+            pulled + 1,
+            kwargs.get("ids"),
+            kwargs,
+        )
 
-        # make the request:
+        # make the request. get_hld takes POST data, get_cve_hld takes URL params:
         response = call_api(
             auth=auth,
             module="vmdr",
-            endpoint="get_hld",
-            payload=kwargs,
+            endpoint=endpoint,
+            payload=kwargs if endpoint == "get_hld" else None,
+            params=kwargs if endpoint == "get_cve_hld" else None,
             headers={"X-Requested-With": "qualysdk SDK"},
+            stream=True,
         )
 
         if response.status_code != 200:
-            with LOCK:
-                print(f"{current_thread().name} - No data returned on page {pulled}")
+            response.close()
+            logger.info("%s - No data returned on page %s", current_thread().name, pulled)
             pulled += 1
             if pulled != "all":
                 if pulled == page_count:
-                    with LOCK:
-                        print(f"{current_thread().name} - Pulled all pages.")
+                    logger.info("%s - Pulled all pages.", current_thread().name)
                     break
                 else:
                     continue
 
-        # cleaned = remove_problem_characters(response.text)
-        xml = xml_parser(response.content)
-
-        # check if there is no host list
-        if "HOST_LIST" not in xml["HOST_LIST_VM_DETECTION_OUTPUT"]["RESPONSE"]:
-            with LOCK:
-                print(f"{current_thread().name} - No host list returned.")
-        else:
-            # check if ["HOST_LIST_VM_DETECTION_OUTPUT"]["RESPONSE"]["HOST_LIST"]["HOST"] is a list of dictionaries
-            # or just a dictionary. if it is just one, put it inside a list
-            if not isinstance(
-                xml["HOST_LIST_VM_DETECTION_OUTPUT"]["RESPONSE"]["HOST_LIST"]["HOST"],
-                list,
-            ):
-                xml["HOST_LIST_VM_DETECTION_OUTPUT"]["RESPONSE"]["HOST_LIST"]["HOST"] = [
-                    xml["HOST_LIST_VM_DETECTION_OUTPUT"]["RESPONSE"]["HOST_LIST"]["HOST"]
-                ]
-
-            for host in xml["HOST_LIST_VM_DETECTION_OUTPUT"]["RESPONSE"]["HOST_LIST"]["HOST"]:
-                host_obj = VMDRHost.from_dict(host)
-                responses.append(host_obj)
+        next_id_min = yield from iter_hld_page(response, endpoint)
 
         pulled += 1
         if page_count != "all":
             if pulled == page_count:
                 break
 
-        if "WARNING" in xml["HOST_LIST_VM_DETECTION_OUTPUT"]["RESPONSE"]:
-            if "URL" in xml["HOST_LIST_VM_DETECTION_OUTPUT"]["RESPONSE"]["WARNING"]:
-                # get the id_min parameter from the URL to pass into kwargs:
-                payload = parse_qs(
-                    urlparse(
-                        xml["HOST_LIST_VM_DETECTION_OUTPUT"]["RESPONSE"]["WARNING"]["URL"]
-                    ).query
-                )
-                with LOCK:
-                    print(
-                        f"{current_thread().name} (get_hld) - Pagination detected. Pulling next page with id_min: {payload['id_min'][0]}"
-                    )
-                kwargs["id_min"] = payload["id_min"][0]
-
-            else:
-                break
-        else:
+        if not next_id_min:
             break
 
-    return responses
+        logger.debug(
+            "%s (%s) - Pagination detected. Pulling next page with id_min: %s",
+            current_thread().name,
+            endpoint,
+            next_id_min,
+        )
+        kwargs["id_min"] = next_id_min
 
 
-def get_cve_hld_backend(
+def iter_hld_pipeline(
     auth: BasicAuth,
-    page_count: Union[int, "all"] = "all",
-    **kwargs,
-) -> List:
-    """
-    Backend for CVE Host List Detection.
+    endpoint: Literal["get_hld", "get_cve_hld"],
+    page_count: Union[int, "all"],
+    pool: Executor,
+    kwargs: dict,
+) -> Generator[VMDRHost, None, None]:
     """
+    iter_hld_pipeline - the parse_workers version of iter_hld_backend.
 
-    # Set the kwargs
-    kwargs["action"] = "list"
+    The calling thread only downloads pages. Each page is parsed in the process pool,
+    and the next page is requested as soon as the current one is downloaded, so parsing
+    uses every core the pool has instead of competing with the download threads for the GIL.
 
-    responses = BaseList()
-    pulled = 0
+    Params:
+        auth (BasicAuth): The BasicAuth object containing the username and password.
+        endpoint (Literal["get_hld", "get_cve_hld"]): The endpoint to call.
+        page_count (Union[int, "all"]): The number of pages to retrieve.
+        pool (Executor): The process pool to parse pages in.
+        kwargs (dict): The kwargs to pass to the API. See hld_backend for the full list.
 
-    while True:
-        with LOCK:
-            print(
-                f"{current_thread().name} - Pulling page {pulled+1} for ids {kwargs.get('ids')}. KWARGS: {kwargs}"
+    Yields:
+        VMDRHost: A host with its DETECTION_LIST attribute populated.
+    """
+    pulled = 0
+    pending = None
+    try:
+        while True:
+            logger.debug(
+                "%s - Pulling page %s for ids %s. KWARGS: %s",
+                current_thread().name,
+                pulled + 1,
+                kwargs.get("ids"),
+                kwargs,
             )
+            future, next_id_min = fetch_hld_page(auth, endpoint, pool, kwargs)
 
-        # make the request:
-        response = call_api(
-            auth=auth,
-            module="vmdr",
-            endpoint="get_cve_hld",
-            params=kwargs,
-            headers={"X-Requested-With": "qualysdk SDK"},
-        )
+            # Hand off the previous page while this one is parsed:
+            if pending is not None:
+                yield from collect_hld_page(pending, endpoint)
+            pending = future
 
-        if response.status_code != 200:
-            with LOCK:
-                print(f"{current_thread().name} - No data returned on page {pulled}")
             pulled += 1
-            if pulled != "all":
-                if pulled == page_count:
-                    with LOCK:
-                        print(f"{current_thread().name} - Pulled all pages.")
-                    break
-                else:
-                    continue
+            if page_count != "all" and pulled == page_count:
+                break
+            if not next_id_min:
+                break
 
-        # cleaned = remove_problem_characters(response.text)
-        xml = xml_parser(response.content)
+            logger.debug(
+                "%s (%s) - Pagination detected. Pulling next page with id_min: %s",
+                current_thread().name,
+                endpoint,
+                next_id_min,
+            )
+            kwargs["id_min"] = next_id_min
 
-        # check if there is no host list
-        if "HOST_LIST" not in xml["HOST_LIST_CVE_VM_DETECTION_OUTPUT"]["RESPONSE"]:
-            with LOCK:
-                print(f"{current_thread().name} - No host list returned.")
-        else:
-            # check if ["HOST_LIST_CVE_VM_DETECTION_OUTPUT"]["RESPONSE"]["HOST_LIST"]["HOST"] is a list of dictionaries
-            # or just a dictionary. if it is just one, put it inside a list
-            if not isinstance(
-                xml["HOST_LIST_CVE_VM_DETECTION_OUTPUT"]["RESPONSE"]["HOST_LIST"]["HOST"],
-                list,
-            ):
-                xml["HOST_LIST_CVE_VM_DETECTION_OUTPUT"]["RESPONSE"]["HOST_LIST"]["HOST"] = [
-                    xml["HOST_LIST_CVE_VM_DETECTION_OUTPUT"]["RESPONSE"]["HOST_LIST"]["HOST"]
-                ]
+        hosts, pending = collect_hld_page(pending, endpoint), None
+        yield from hosts
+    finally:
+        if pending is not None:
+            pending.cancel()
 
-            for host in xml["HOST_LIST_CVE_VM_DETECTION_OUTPUT"]["RESPONSE"]["HOST_LIST"]["HOST"]:
-                # Ensure compatability:
-                host["DETECTION_LIST"] = host.pop("CVE_DETECTION_LIST")
-                host_obj = VMDRHost.from_dict(host)
-                responses.append(host_obj)
 
-        pulled += 1
-        if page_count != "all":
-            if pulled == page_count:
-                break
+def iter_hld_xml(
+    source, endpoint: Literal["get_hld", "get_cve_hld"], stats: dict = None
+) -> Generator[VMDRHost, None, Union[str, None]]:
+    """
+    iter_hld_xml - stream the hosts out of one get_hld or get_cve_hld page.
 
-        if "WARNING" in xml["HOST_LIST_CVE_VM_DETECTION_OUTPUT"]["RESPONSE"]:
-            if "URL" in xml["HOST_LIST_CVE_VM_DETECTION_OUTPUT"]["RESPONSE"]["WARNING"]:
-                # get the id_min parameter from the URL to pass into kwargs:
-                params = parse_qs(
-                    urlparse(
-                        xml["HOST_LIST_CVE_VM_DETECTION_OUTPUT"]["RESPONSE"]["WARNING"]["URL"]
-                    ).query
-                )
-                with LOCK:
-                    print(
-                        f"{current_thread().name} (get_hld) - Pagination detected. Pulling next page with id_min: {params['id_min'][0]}"
-                    )
-                kwargs["id_min"] = params["id_min"][0]
+    Params:
+        source (Union[bytes, file-like]): The page's XML, or a file-like object to read it from.
+        endpoint (Literal["get_hld", "get_cve_hld"]): The endpoint that was called.
+        stats (dict): If specified, the time spent parsing XML and building hosts, and the number of hosts built, are added to it. See new_page_stats.
 
-            else:
+    Yields:
+        VMDRHost: A host with its DETECTION_LIST attribute populated.
+
+    Returns:
+        Union[str, None]: The URL of the next page, or None if this is the last page.
+    """
+    if stats is None:
+        stats = new_page_stats()
+    next_url = None
+    start = perf_counter()
+    for tag, element in iterparse_xml(source, {"HOST": "HOST_LIST", "WARNING": "RESPONSE"}):
+        parsed = perf_counter()
+        stats["parse_seconds"] += parsed - start
+        if tag == "WARNING":
+            if isinstance(element, dict) and "URL" in element:
+                next_url = element["URL"]
+            start = perf_counter()
+            continue
+
+        if endpoint == "get_cve_hld":
+            # Ensure compatability:
+            element["DETECTION_LIST"] = element.pop("CVE_DETECTION_LIST", None)
+        host = VMDRHost.from_dict(element)
+        stats["build_seconds"] += perf_counter() - parsed
+        stats["records_built"] += 1
+        yield host
+        # Time spent by the consumer is not counted:
+        start = perf_counter()
+    stats["parse_seconds"] += perf_counter() - start
+    return next_url
+
+
+def new_page_stats() -> dict:
+    """
+    new_page_stats - the per-page timings filled in by iter_hld_xml.
+    """
+    return {"parse_seconds": 0.0, "build_seconds": 0.0, "records_built": 0}
+
+
+def record_page_stats(stats: dict, endpoint: Literal["get_hld", "get_cve_hld"]) -> None:
+    """
+    record_page_stats - report a page's timings to the metrics registry, if metrics are enabled.
+    """
+    for name, value in stats.items():
+        record(name, value, "vmdr", endpoint)
+
+
+def iter_hld_page(
+    response, endpoint: Literal["get_hld", "get_cve_hld"]
+) -> Generator[VMDRHost, None, Union[str, None]]:
+    """
+    iter_hld_page - stream the hosts out of one streamed get_hld or get_cve_hld response.
+
+    Params:
+        response (requests.Response): A 200 response made with stream=True. It is always closed.
+        endpoint (Literal["get_hld", "get_cve_hld"]): The endpoint that was called.
+
+    Yields:
+        VMDRHost: A host with its DETECTION_LIST attribute populated.
+
+    Returns:
+        Union[str, None]: The id_min of the next page, or None if this is the last page.
+    """
+
+    host_count = 0
+    stats = new_page_stats()
+    try:
+        # Let urllib3 handle any gzip/deflate encoding while lxml reads the stream:
+        response.raw.decode_content = True
+        hosts = iter_hld_xml(response.raw, endpoint, stats)
+        while True:
+            try:
+                host = next(hosts)
+            except StopIteration as done:
+                next_url = done.value
                 break
-        else:
-            break
+            host_count += 1
+            yield host
+    finally:
+        record("bytes_received", wire_bytes(response), "vmdr", endpoint)
+        record_page_stats(stats, endpoint)
+        response.close()
 
-    return responses
+    # check if there is no host list
+    if not host_count:
+        logger.info("%s - No host list returned.", current_thread().name)
+
+    if not next_url:
+        return None
+
+    # get the id_min parameter from the URL:
+    return parse_qs(urlparse(next_url).query)["id_min"][0]
+
+
+def parse_hld_page(
+    content: bytes, endpoint: Literal["get_hld", "get_cve_hld"], flags: Tuple[bool, bool]
+) -> Tuple[BaseList, dict]:
+    """
+    parse_hld_page - parse the hosts out of a get_hld or get_cve_hld page. Runs in
+    the parse_workers process pool, which is why the expansion flags are passed in
+    rather than read from DONT_EXPAND/LAZY_EXPAND.
+
+    Params:
+        content (bytes): The page's XML.
+        endpoint (Literal["get_hld", "get_cve_hld"]): The endpoint that was called.
+        flags (Tuple[bool, bool]): The DONT_EXPAND and LAZY_EXPAND flags of the calling process.
+
+    Returns:
+        Tuple[BaseList, dict]: The page's hosts, with their DETECTION_LIST attribute populated, and its timings.
+    """
+    DONT_EXPAND.flag, LAZY_EXPAND.flag = flags
+    stats = new_page_stats()
+    return BaseList(iter_hld_xml(content, endpoint, stats)), stats
+
+
+def collect_hld_page(future: Future, endpoint: Literal["get_hld", "get_cve_hld"]) -> BaseList:
+    """
+    collect_hld_page - wait for a page submitted by fetch_hld_page and report its timings,
+    which were measured in the worker process.
+
+    Returns:
+        BaseList: The page's hosts.
+    """
+    hosts, stats = future.result()
+    record_page_stats(stats, endpoint)
+    return hosts
+
+
+# The <WARNING> holding the next page's URL, which follows the host list:
+NEXT_PAGE_RE = re.compile(
+    rb"<WARNING>.*?<URL>\s*(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?\s*</URL>", re.DOTALL
+)
+
+
+def next_page_id_min(content: bytes) -> Union[str, None]:
+    """
+    next_page_id_min - find the id_min of the next page in a get_hld or get_cve_hld page
+    without parsing it, so the next page can be requested while this one is parsed.
+
+    Params:
+        content (bytes): The page's XML.
+
+    Returns:
+        Union[str, None]: The id_min of the next page, or None if this is the last page.
+    """
+    # Only look past the host list, since detection results can contain any text:
+    match = NEXT_PAGE_RE.search(content, max(content.rfind(b"</HOST_LIST>"), 0))
+    if not match:
+        return None
+    next_url = unescape(match.group(1).decode("utf-8"))
+    return parse_qs(urlparse(next_url).query)["id_min"][0]
+
+
+def fetch_hld_page(
+    auth: BasicAuth, endpoint: Literal["get_hld", "get_cve_hld"], pool: Executor, kwargs: dict
+) -> Tuple[Future, Union[str, None]]:
+    """
+    fetch_hld_page - download one get_hld or get_cve_hld page and hand it to the parse_workers
+    process pool.
+
+    Params:
+        auth (BasicAuth): The BasicAuth object containing the username and password.
+        endpoint (Literal["get_hld", "get_cve_hld"]): The endpoint to call.
+        pool (Executor): The process pool to parse the page in.
+        kwargs (dict): The kwargs to pass to the API.
+
+    Returns:
+        Tuple[Future, Union[str, None]]: A future for the page (see collect_hld_page) and the id_min of the next page.
+
+    Raises:
+        QualysAPIError: If the call does not return a 200.
+    """
+    response = call_api(
+        auth=auth,
+        module="vmdr",
+        endpoint=endpoint,
+        payload=kwargs if endpoint == "get_hld" else None,
+        params=kwargs if endpoint == "get_cve_hld" else None,
+        headers={"X-Requested-With": "qualysdk SDK"},
+    )
+    if response.status_code != 200:
+        raise QualysAPIError(f"HTTP {response.status_code} from {endpoint}.")
+
+    content = response.content
+    future = pool.submit(parse_hld_page, content, endpoint, (DONT_EXPAND.flag, LAZY_EXPAND.flag))
+    return future, next_page_id_min(content)
+
+
+def create_parse_pool(parse_workers: Union[int, None]) -> Union[ProcessPoolExecutor, None]:
+    """
+    create_parse_pool - create the process pool that parses get_hld/get_cve_hld pages
+    for the parse_workers kwarg.
+
+    Params:
+        parse_workers (Union[int, None]): The number of processes. If None, no pool is created.
+
+    Returns:
+        Union[ProcessPoolExecutor, None]: The pool, or None.
+    """
+    if parse_workers is None:
+        return None
+    if not isinstance(parse_workers, int) or parse_workers < 1:
+        raise ValueError("parse_workers must be None or an integer above 0.")
+
+    logger.info(
+        "Starting %s parse %s", parse_workers, "processes." if parse_workers > 1 else "process."
+    )
+    # Worker processes are spawned rather than forked, as forking
+    # while the download threads hold locks can deadlock the children:
+    return ProcessPoolExecutor(max_workers=parse_workers, mp_context=get_context("spawn"))
 
 
 def thread_worker(
@@ -456,6 +688,8 @@ def thread_worker(
     chunk_count: Union[int, "all"],
     endpoint_called: Literal["get_hld", "get_host_list", "get_cve_hld"],
     kwargs,
+    pool: Executor = None,
+    failures: list = None,
 ):
     """
     thread_worker - the worker function for get_hld/hld_backend functions.
@@ -468,6 +702,8 @@ def thread_worker(
         chunk_count (Union[int, "all"]): The number of chunks to retrieve. Defaults to "all".
         endpoint_called (Union['get_hld', 'get_host_list', 'get_cve_hld']): The function that was called.
         **kwargs: Additional keyword arguments to pass to the API. See get_hld() for details.
+        pool (Executor): The parse_workers process pool, if any. Not used for get_host_list.
+        failures (list): If specified, the IDs of a chunk the thread gave up on are appended to it. They are left on id_queue.
     """
     if "retries" in kwargs.keys():
         RETRIES = kwargs.pop("retries")
@@ -484,14 +720,14 @@ def thread_worker(
                     id_queue.get_nowait()
                 )  # nowait allows us to check if the queue is empty without blocking
             except Empty:
-                with LOCK:
-                    print(f"{current_thread().name} - Queue is empty. Terminating thread.")
+                logger.info("%s - Queue is empty. Terminating thread.", current_thread().name)
                 id_queue.task_done()
                 break
 
+            record("work_queue_depth", id_queue.qsize(), "vmdr", endpoint_called)
+
             if not ids:
-                with LOCK:
-                    print(f"{current_thread().name} - No IDs to pull. Terminating thread.")
+                logger.info("%s - No IDs to pull. Terminating thread.", current_thread().name)
                 id_queue.task_done()
                 break
 
@@ -501,57 +737,453 @@ def thread_worker(
                 kwargs["ids"] = ids[0]
 
             if endpoint_called == "get_hld":
-                responses.extend(hld_backend(auth, page_count=page_count, **kwargs))
+                responses.extend(hld_backend(auth, page_count=page_count, pool=pool, **kwargs))
             elif endpoint_called == "get_host_list":
                 responses.extend(get_host_list_backend(auth, page_count=page_count, **kwargs))
             elif endpoint_called == "get_cve_hld":
-                responses.extend(get_cve_hld_backend(auth, page_count=page_count, **kwargs))
+                responses.extend(
+                    get_cve_hld_backend(auth, page_count=page_count, pool=pool, **kwargs)
+                )
             else:
                 id_queue.put_nowait(ids)
                 id_queue.task_done()
                 raise ValueError("endpoint_called must be either 'get_hld' or 'get_host_list'.")
             id_queue.task_done()
-            with LOCK:
-                print(f"{current_thread().name} ({endpoint_called}) - Chunk complete.")
+            logger.info("%s (%s) - Chunk complete.", current_thread().name, endpoint_called)
             pages_pulled += 1
             chunks_pulled += 1
             # check if the queue is empty, or if the threads are done (via pulled var)
             if id_queue.empty():
-                with LOCK:
-                    print(
-                        f"{current_thread().name} ({endpoint_called}) - Queue is empty. Terminating thread."
-                    )
+                logger.info(
+                    "%s (%s) - Queue is empty. Terminating thread.",
+                    current_thread().name,
+                    endpoint_called,
+                )
                 break
             if pages_pulled == page_count:
-                with LOCK:
-                    print(
-                        f"{current_thread().name} - Thread has pulled all pages. Terminating thread."
-                    )
+                logger.info(
+                    "%s - Thread has pulled all pages. Terminating thread.", current_thread().name
+                )
                 break
             if chunks_pulled == chunk_count:
-                with LOCK:
-                    print(
-                        f"{current_thread().name} - Thread has pulled all chunks. Terminating thread."
-                    )
+                logger.info(
+                    "%s - Thread has pulled all chunks. Terminating thread.", current_thread().name
+                )
                 break
         except Exception as e:
             # If anything goes bad, put the ids back in the queue
             # and try again.
-            with LOCK:
-                print(
-                    f"{current_thread().name} - Error: {e}. Attempting to requeue {len(ids)} IDs ({min(ids)}-{max(ids)})."
+            logger.error(
+                "%s - Error: %s. Attempting to requeue %s IDs (%s-%s).",
+                current_thread().name,
+                e,
+                len(ids),
+                min(ids),
+                max(ids),
+            )
+            id_queue.put_nowait(ids)
+            logger.info(
+                "%s - IDs (%s-%s) requeued. Attempting again.",
+                current_thread().name,
+                min(ids),
+                max(ids),
+            )
+            record("retries", 1, "vmdr", endpoint_called)
+            attempts += 1
+            if attempts > RETRIES:
+                logger.error(
+                    "%s - Reached maximum attempts (%s). Terminating thread.",
+                    current_thread().name,
+                    RETRIES,
                 )
-                id_queue.put_nowait(ids)
-                print(
-                    f"{current_thread().name} - IDs ({min(ids)}-{max(ids)}) requeued. Attempting again."
+                if failures is not None:
+                    failures.append(ids)
+                break
+
+
+# Sentinel each stream_worker puts on the output queue when it exits:
+WORKER_DONE = object()
+
+
+def put_with_backpressure(out_queue: Queue, item, stop_event: Event) -> bool:
+    """
+    Put item on a bounded queue, blocking while it is full.
+
+    Returns False without putting the item if stop_event is set while waiting,
+    i.e. because the consumer stopped iterating.
+    """
+    while not stop_event.is_set():
+        try:
+            out_queue.put(item, timeout=0.5)
+            return True
+        except Full:
+            continue
+    return False
+
+
+def stream_worker(
+    auth: BasicAuth,
+    id_queue: Queue,
+    out_queue: Queue,
+    stop_event: Event,
+    page_count: Union[int, "all"],
+    chunk_count: Union[int, "all"],
+    endpoint_called: Literal["get_hld", "get_cve_hld"],
+    kwargs,
+    pool: Executor = None,
+    failures: list = None,
+):
+    """
+    stream_worker - the worker function for iter_hld/iter_cve_hld.
+
+    Works like thread_worker, but puts each host on out_queue as soon as it is parsed
+    instead of collecting a whole chunk. out_queue should be bounded so a slow consumer
+    applies backpressure to the workers. If a chunk fails part way through, only the IDs
+    above the last host already handed off are requeued, so hosts are never duplicated.
+
+    Params:
+        auth (BasicAuth): The BasicAuth object containing the username and password.
+        id_queue (Queue): The queue of host IDs to pull.
+        out_queue (Queue): The bounded queue to put VMDRHost objects on.
+        stop_event (Event): Set by the consumer to make the worker exit early.
+        page_count (Union[int, "all"]): The number of pages to retrieve per chunk.
+        chunk_count (Union[int, "all"]): The number of chunks to retrieve.
+        endpoint_called (Literal['get_hld', 'get_cve_hld']): The endpoint to call.
+        **kwargs: Additional keyword arguments to pass to the API. See get_hld() for details.
+        pool (Executor): The parse_workers process pool, if any.
+        failures (list): If specified, the IDs the thread gave up on are appended to it. They are left on id_queue.
+    """
+    # Each worker gets its own copy, as "ids" is set per chunk:
+    kwargs = dict(kwargs)
+    RETRIES = kwargs.pop("retries", 3)
+    attempts = 0
+    chunks_pulled = 0
+
+    try:
+        while not stop_event.is_set():
+            try:
+                ids = id_queue.get_nowait()
+            except Empty:
+                logger.info("%s - Queue is empty. Terminating thread.", current_thread().name)
+                break
+            record("work_queue_depth", id_queue.qsize(), "vmdr", endpoint_called)
+
+            if len(ids) != 1:
+                kwargs["ids"] = f"{ids[0]}-{ids[-1]}"
+            else:
+                kwargs["ids"] = ids[0]
+
+            last_id = None
+            hosts = iter_hld_backend(auth, endpoint_called, page_count, pool=pool, **kwargs)
+            try:
+                for host in hosts:
+                    if not put_with_backpressure(out_queue, host, stop_event):
+                        return
+                    last_id = host.ID
+            except Exception as e:
+                # Only requeue the IDs that were not already handed off:
+                remaining = [i for i in ids if last_id is None or int(i) > int(last_id)]
+                logger.error(
+                    "%s - Error: %s. Attempting to requeue %s IDs.",
+                    current_thread().name,
+                    e,
+                    len(remaining),
+                )
+                if remaining:
+                    id_queue.put_nowait(remaining)
+                record("retries", 1, "vmdr", endpoint_called)
+                attempts += 1
+                if attempts > RETRIES:
+                    logger.error(
+                        "%s - Reached maximum attempts (%s). Terminating thread.",
+                        current_thread().name,
+                        RETRIES,
+                    )
+                    if failures is not None and remaining:
+                        failures.append(remaining)
+                    break
+                continue
+            finally:
+                hosts.close()
+
+            logger.info("%s (%s) - Chunk complete.", current_thread().name, endpoint_called)
+            chunks_pulled += 1
+            if chunks_pulled == chunk_count:
+                logger.info(
+                    "%s - Thread has pulled all chunks. Terminating thread.", current_thread().name
+                )
+                break
+    finally:
+        # Always tell the consumer this worker is finished. Gives up
+        # if the consumer has stopped, so the thread cannot hang:
+        put_with_backpressure(out_queue, WORKER_DONE, stop_event)
+
+
+class RangeQueue(Queue):
+    """
+    RangeQueue - a queue of (id_min, id_max) host ID ranges.
+
+    Workers call task_done() only after any ranges they split off have been put,
+    so pending() only reaches 0 once every range has been pulled.
+    """
+
+    def pending(self) -> int:
+        """
+        The number of ranges that are queued or still being pulled.
+        """
+        with self.mutex:
+            return self.unfinished_tasks
+
+
+def first_host_id(auth: BasicAuth, id_min: int = None, id_max: int = None) -> Union[int, None]:
+    """
+    first_host_id - get the lowest host ID in [id_min, id_max] with a single one-ID host list call.
+
+    Params:
+        auth (BasicAuth): The BasicAuth object containing the username and password.
+        id_min (int): The lower bound, inclusive. If not specified, there is no lower bound.
+        id_max (int): The upper bound, inclusive. If not specified, there is no upper bound.
+
+    Returns:
+        Union[int, None]: The lowest host ID in the range, or None if there are no hosts in it.
+    """
+    bounds = {k: v for k, v in (("id_min", id_min), ("id_max", id_max)) if v is not None}
+    res = get_host_list_backend(auth, page_count=1, details=None, truncation_limit=1, **bounds)
+    return int(res[0].ID) if res else None
+
+
+def probe_id_range(
+    auth: BasicAuth, id_min: int = None, id_max: int = None, precision: int = 64
+) -> tuple[int, int]:
+    """
+    probe_id_range - find the span of host IDs in a subscription without pulling the ID list.
+
+    The lowest ID takes one call. An upper bound is then found by doubling the probe ID
+    until no hosts are left above it, and tightened with a binary search until it is
+    within 1/precision of the span. Every probe is a host list call for a single ID,
+    so this takes a few dozen tiny calls even for subscriptions with millions of hosts.
+
+    Params:
+        auth (BasicAuth): The BasicAuth object containing the username and password.
+        id_min (int): Only consider IDs greater than or equal to this value.
+        id_max (int): Only consider IDs less than or equal to this value. If specified, it is used as the upper bound as-is.
+        precision (int): How tight the upper bound should be. Defaults to 64.
+
+    Returns:
+        tuple[int, int]: The lowest host ID and an upper bound that no host ID exceeds.
+    """
+
+    low = first_host_id(auth, id_min=id_min, id_max=id_max)
+    if low is None:
+        raise QualysAPIError("No IDs returned from API.")
+    if id_max is not None:
+        return low, int(id_max)
+
+    start = low
+
+    # Double the probe until no host has an ID at or above it:
+    probe = max(2 * low, low + 1)
+    while (found := first_host_id(auth, id_min=probe)) is not None:
+        low = found
+        probe = max(2 * found, found + 1)
+    high = probe - 1
+
+    # low is a host ID and no ID is above high. Narrow the gap:
+    while high - low > max((high - start) // precision, 1):
+        mid = (low + high + 1) // 2
+        found = first_host_id(auth, id_min=mid, id_max=high)
+        if found is None:
+            high = mid - 1
+        else:
+            low = found
+
+    logger.info("Host IDs span %s-%s.", start, high)
+    return start, high
+
+
+def create_range_queue(
+    auth: BasicAuth, shards: int, id_min: int = None, id_max: int = None
+) -> RangeQueue:
+    """
+    create_range_queue - split the subscription's host ID span into shards equal-width
+    (id_min, id_max) ranges, without pulling the ID list.
+
+    Params:
+        auth (BasicAuth): The BasicAuth object containing the username and password.
+        shards (int): The number of ranges to start with. Workers split busy ranges further as they go.
+        id_min (int): Only include IDs greater than or equal to this value.
+        id_max (int): Only include IDs less than or equal to this value.
+
+    Returns:
+        RangeQueue: A queue of (id_min, id_max) tuples, both inclusive.
+    """
+
+    low, high = probe_id_range(auth, id_min=id_min, id_max=id_max)
+    width = max((high - low + 1) // shards, 1)
+
+    range_queue = RangeQueue()
+    start = low
+    while start <= high:
+        end = high if high - start < 2 * width - 1 else start + width - 1
+        range_queue.put((start, end))
+        start = end + 1
+
+    logger.info("Queue created with %s ID ranges", range_queue.qsize())
+
+    return range_queue
+
+
+def range_worker(
+    auth: BasicAuth,
+    range_queue: RangeQueue,
+    responses: BaseList,
+    threads: int,
+    page_count: Union[int, "all"],
+    chunk_count: Union[int, "all"],
+    endpoint_called: Literal["get_hld", "get_cve_hld"],
+    kwargs,
+    pool: Executor = None,
+    failures: list = None,
+):
+    """
+    range_worker - the worker function for get_hld/get_cve_hld with sharding="id_range".
+
+    Pulls (id_min, id_max) ranges off range_queue. When a range has more hosts than fit on
+    one page and fewer ranges are queued than there are threads, the rest of the range
+    is split in half and the upper half is queued for an idle worker. Each page is only
+    added to responses once it has been fully read, so a failed page is retried whole.
+
+    Params:
+        auth (BasicAuth): The BasicAuth object containing the username and password.
+        range_queue (RangeQueue): The queue of ID ranges to pull.
+        responses (BaseList): The list of responses to append to.
+        threads (int): The number of worker threads. Used to decide when to split a range.
+        page_count (Union[int, "all"]): The number of pages to retrieve per range.
+        chunk_count (Union[int, "all"]): The number of ranges to retrieve per thread.
+        endpoint_called (Literal['get_hld', 'get_cve_hld']): The endpoint to call.
+        **kwargs: Additional keyword arguments to pass to the API. See get_hld() for details.
+        pool (Executor): If specified, pages are parsed in this process pool, and a range's hosts are
+            only added to responses once all of its pages are parsed.
+        failures (list): If specified, the (id_min, id_max) range the thread gave up on is appended to it.
+    """
+    # Each worker gets its own copy, as id_min/id_max are set per range:
+    kwargs = dict(kwargs)
+    RETRIES = kwargs.pop("retries", 3)
+    attempts = 0
+    chunks_pulled = 0
+
+    while True:
+        try:
+            id_min, id_max = range_queue.get(timeout=0.5)
+        except Empty:
+            if not range_queue.pending():
+                logger.info("%s - All ranges pulled. Terminating thread.", current_thread().name)
+                break
+            continue
+        record("work_queue_depth", range_queue.qsize(), "vmdr", endpoint_called)
+
+        range_start = id_min
+        futures = []
+        try:
+            pages_pulled = 0
+            while True:
+                kwargs["id_min"], kwargs["id_max"] = id_min, id_max
+                logger.debug(
+                    "%s - Pulling page %s for ids %s-%s.",
+                    current_thread().name,
+                    pages_pulled + 1,
+                    id_min,
+                    id_max,
                 )
+                if pool is not None:
+                    future, next_id_min = fetch_hld_page(auth, endpoint_called, pool, kwargs)
+                    futures.append(future)
+                else:
+                    response = call_api(
+                        auth=auth,
+                        module="vmdr",
+                        endpoint=endpoint_called,
+                        payload=kwargs if endpoint_called == "get_hld" else None,
+                        params=kwargs if endpoint_called == "get_cve_hld" else None,
+                        headers={"X-Requested-With": "qualysdk SDK"},
+                        stream=True,
+                    )
+                    if response.status_code != 200:
+                        response.close()
+                        raise QualysAPIError(
+                            f"HTTP {response.status_code} for ids {id_min}-{id_max}."
+                        )
+
+                    page = iter_hld_page(response, endpoint_called)
+                    hosts = BaseList()
+                    while True:
+                        try:
+                            hosts.append(next(page))
+                        except StopIteration as done:
+                            next_id_min = done.value
+                            break
+                    responses.extend(hosts)
+
+                pages_pulled += 1
+                if not next_id_min or pages_pulled == page_count:
+                    break
+                id_min = int(next_id_min)
+
+                # The range is busy. Hand the upper half of what is left to an idle worker:
+                if range_queue.qsize() < threads and id_max > id_min:
+                    mid = (id_min + id_max) // 2
+                    range_queue.put((mid + 1, id_max))
+                    logger.info(
+                        "%s (%s) - Splitting busy range. Queued ids %s-%s.",
+                        current_thread().name,
+                        endpoint_called,
+                        mid + 1,
+                        id_max,
+                    )
+                    id_max = mid
+
+            # Pages parsed by the pool are only added once every page of the range is parsed:
+            responses.extend(
+                chain.from_iterable(collect_hld_page(future, endpoint_called) for future in futures)
+            )
+            logger.info("%s (%s) - Range complete.", current_thread().name, endpoint_called)
+            chunks_pulled += 1
+        except Exception as e:
+            # Requeue whatever is left of the range and try again. With a pool,
+            # none of the range's pages have been added, so requeue all of it:
+            if futures:
+                for future in futures:
+                    future.cancel()
+                id_min = range_start
+            record("retries", 1, "vmdr", endpoint_called)
             attempts += 1
+            logger.error("%s - Error: %s.", current_thread().name, e)
             if attempts > RETRIES:
-                with LOCK:
-                    print(
-                        f"{current_thread().name} - Reached maximum attempts ({RETRIES}). Terminating thread."
-                    )
+                logger.error(
+                    "%s - Reached maximum attempts (%s). Dropping ids %s-%s and terminating thread.",
+                    current_thread().name,
+                    RETRIES,
+                    id_min,
+                    id_max,
+                )
+                if failures is not None:
+                    failures.append((id_min, id_max))
                 break
+            range_queue.put((id_min, id_max))
+            logger.info(
+                "%s - IDs (%s-%s) requeued. Attempting again.",
+                current_thread().name,
+                id_min,
+                id_max,
+            )
+        finally:
+            range_queue.task_done()
+
+        if chunks_pulled == chunk_count:
+            logger.info(
+                "%s - Thread has pulled all chunks. Terminating thread.", current_thread().name
+            )
+            break
 
 
 def get_host_list_backend(auth: BasicAuth, page_count: Union[int, "all"] = "all", **kwargs) -> list:
@@ -641,10 +1273,9 @@ def get_host_list_backend(auth: BasicAuth, page_count: Union[int, "all"] = "all"
     if kwargs.get("truncation_limit") and (
         kwargs["truncation_limit"] in [0, "0"] and kwargs["details"] not in ["None", None]
     ):
-        with LOCK:
-            print(
-                "[!] Warning: You have specified to pull all data with no pagination. This is generally not recommended, as it uses lots of resources and take a long time to complete. Please consider specifying a page_count or truncation_limit to avoid this issue."
-            )
+        logger.warning(
+            "You have specified to pull all data with no pagination. This is generally not recommended, as it uses lots of resources and take a long time to complete. Please consider specifying a page_count or truncation_limit to avoid this issue."
+        )
 
     while True:
         # make the request:
@@ -656,8 +1287,7 @@ def get_host_list_backend(auth: BasicAuth, page_count: Union[int, "all"] = "all"
             headers={"X-Requested-With": "qualysdk SDK"},
         )
         if response.status_code != 200:
-            with LOCK:
-                print("No data returned.")
+            logger.info("No data returned.")
             return responses
 
         xml = xml_parser(response.content)
@@ -666,8 +1296,7 @@ def get_host_list_backend(auth: BasicAuth, page_count: Union[int, "all"] = "all"
             "HOST_LIST" not in xml["HOST_LIST_OUTPUT"]["RESPONSE"]
             and "ID_SET" not in xml["HOST_LIST_OUTPUT"]["RESPONSE"]
         ):
-            with LOCK:
-                print("No host list returned.")
+            logger.info("No host list returned.")
             return
 
         # If details is none, ID_SET will be returned instead of HOST_LIST
@@ -703,16 +1332,16 @@ def get_host_list_backend(auth: BasicAuth, page_count: Union[int, "all"] = "all"
         pulled += 1
 
         if page_count != "all" and pulled >= page_count:
-            with LOCK:
-                print(f"{current_thread().name} Page count reached.")
+            logger.info("%s Page count reached.", current_thread().name)
             break
 
         if "WARNING" in xml["HOST_LIST_OUTPUT"]["RESPONSE"]:
             if "URL" in xml["HOST_LIST_OUTPUT"]["RESPONSE"]["WARNING"]:
-                with LOCK:
-                    print(
-                        f"{current_thread().name} (get_host_list) Pagination detected. Pulling next page from url: {xml['HOST_LIST_OUTPUT']['RESPONSE']['WARNING']['URL']}"
-                    )
+                logger.debug(
+                    "%s (get_host_list) Pagination detected. Pulling next page from url: %s",
+                    current_thread().name,
+                    xml["HOST_LIST_OUTPUT"]["RESPONSE"]["WARNING"]["URL"],
+                )
                 # get the id_min parameter from the URL to pass into kwargs:
                 payload = parse_qs(
                     urlparse(xml["HOST_LIST_OUTPUT"]["RESPONSE"]["WARNING"]["URL"]).query
@@ -5,15 +5,13 @@ detection.py - contains the Detection and CVEDetection dataclasses for the Qualy
 from dataclasses import dataclass, field
 from typing import *
 from datetime import datetime
-from warnings import catch_warnings, simplefilter
-
-from bs4 import BeautifulSoup
 
 from .qds_factor import QDSFactor
 from .qds import QDS as qds
 from ...base.base_list import BaseList
 from ...base.base_class import BaseClass
-from ...base import DONT_EXPAND
+from ...base import DONT_EXPAND, LAZY_EXPAND
+from ...base.html_text import html_to_text
 
 
 def parse_datetime_fields(obj, DATETIME_FIELDS: list[str]) -> None:
@@ -23,15 +21,13 @@ def parse_datetime_fields(obj, DATETIME_FIELDS: list[str]) -> None:
 
 
 def parse_html_fields(obj, HTML_FIELDS: list[str]) -> None:
-    with catch_warnings():
-        simplefilter("ignore")  # ignore the warning about the html.parser
-        for field in HTML_FIELDS:
-            if getattr(obj, field, None):
-                setattr(
-                    obj,
-                    field,
-                    BeautifulSoup(getattr(obj, field), "html.parser").get_text(),
-                )
+    for field in HTML_FIELDS:
+        if getattr(obj, field, None):
+            if LAZY_EXPAND.flag:
+                # convert the HTML when the field is first read:
+                obj._defer(field, html_to_text)
+            else:
+                setattr(obj, field, html_to_text(getattr(obj, field)))
 
 
 def parse_int_fields(obj, INT_FIELDS: List[str]) -> None:
@@ -12,7 +12,45 @@ from .tag import Tag, CloudTag
 from .detection import Detection, CVEDetection
 from ...base.base_list import BaseList
 from ...base.base_class import BaseClass
-from ...base import DONT_EXPAND
+from ...base import DONT_EXPAND, LAZY_EXPAND
+
+# for each tuple, [0] is the dataclass attribute name (minus the CLOUD_ prefix),
+# [1] is how it is represented in the METADATA dict of each cloud provider.
+CLOUD_METADATA_KEYS = {
+    "EC2": [
+        ("GROUP_NAME", "groupName"),
+        ("INSTANCE_STATE", "instanceState"),
+        ("INSTANCE_TYPE", "latest/meta-data/instance-type"),
+        ("IS_SPOT_INSTANCE", "isSpotInstance"),
+        (
+            "ARCHITECTURE",
+            "latest/dynamic/instance-identity/document/architecture",
+        ),
+        ("IMAGE_ID", "latest/dynamic/instance-identity/document/imageId"),
+        ("REGION", "latest/dynamic/instance-identity/document/region"),
+        ("AMI_ID", "latest/meta-data/ami-id"),
+        ("PUBLIC_HOSTNAME", "latest/meta-data/public-hostname"),
+        ("PUBLIC_IPV4", "latest/meta-data/public-ipv4"),
+        (
+            "ACCOUNT_ID",
+            "latest/dynamic/instance-identity/document/accountId",
+        ),
+    ],
+    "AZURE": [
+        ("PUBLIC_IPV4", "latest/meta-data/public-ipv4"),
+        ("INSTANCE_STATE", "state"),
+        ("GROUP_NAME", "resourceGroupName"),
+        ("INSTANCE_TYPE", "vmSize"),
+        ("REGION", "location"),
+        ("ACCOUNT_ID", "subscriptionId"),
+    ],
+    # "GCP": not implemented as i have no access to a GCP environment.
+}
+
+# The fields VMDRHost._expand_metadata reads and writes:
+CLOUD_METADATA_FIELDS = ("METADATA",) + tuple(
+    dict.fromkeys(f"CLOUD_{key[0]}" for keys in CLOUD_METADATA_KEYS.values() for key in keys)
+)
 
 
 @dataclass(order=True)
@@ -307,6 +345,9 @@ class VMDRHost(BaseClass):
         """
         Pull up nested dict values as attributes, convert IPs,
         put tags in a BaseList and convert strings to datetime objects.
+
+        With LAZY_EXPAND set, the tag lists, cloud metadata and detections
+        are expanded when they are first read instead.
         """
         DNS_DATA_FIELDS = ["HOSTNAME", "DOMAIN", "FQDN"]
         DATETIME_FIELDS = [
@@ -317,7 +358,6 @@ class VMDRHost(BaseClass):
             "LAST_VULN_SCAN_DATETIME",
             "LAST_VM_SCANNED_DATE",
             "LAST_VM_AUTH_SCANNED_DATE",
-            "LAST_VM_AUTH_SCANNED_DATE",
             "LAST_COMPLIANCE_SCAN_DATETIME",
             "LAST_VULN_SCAN_DATE",
             "LAST_ACTIVITY",
@@ -331,6 +371,21 @@ class VMDRHost(BaseClass):
             "TRURISK_SCORE",
             "ASSET_CRITICALITY_SCORE",
         ]
+        # nested blocks and the methods that expand them, in order:
+        EXPANSIONS = {
+            "TRURISK_SCORE_FACTORS": VMDRHost._expand_trurisk_score_factors,
+            "TAGS": VMDRHost._expand_tags,
+            "CLOUD_PROVIDER_TAGS": VMDRHost._expand_cloud_provider_tags,
+            "METADATA": VMDRHost._expand_metadata,
+            "DETECTION_LIST": VMDRHost._expand_detections,
+        }
+        # the blocks that LAZY_EXPAND defers. The rest are cheaper to expand than to defer:
+        LAZY_EXPANSIONS = {
+            "TAGS": ("TAGS",),
+            "CLOUD_PROVIDER_TAGS": ("CLOUD_PROVIDER_TAGS",),
+            "METADATA": CLOUD_METADATA_FIELDS,
+            "DETECTION_LIST": ("DETECTION_LIST",),
+        }
 
         if not DONT_EXPAND.flag:
             if self.DNS_DATA:
@@ -347,125 +402,117 @@ class VMDRHost(BaseClass):
             if getattr(self, DATE_FIELD) and not isinstance(getattr(self, DATE_FIELD), datetime):
                 setattr(self, DATE_FIELD, datetime.fromisoformat(getattr(self, DATE_FIELD)))
 
+        for INT_FIELD in INT_FIELDS:
+            if getattr(self, INT_FIELD) and not isinstance(getattr(self, INT_FIELD), int):
+                setattr(self, INT_FIELD, int(getattr(self, INT_FIELD)))
+
         if not DONT_EXPAND.flag:
-            if self.TRURISK_SCORE_FACTORS:
-                s = ""
-                for sev_level in self.TRURISK_SCORE_FACTORS.get("VULN_COUNT"):
-                    s += f"sev_{sev_level.get('@qds_severity')}: {sev_level.get('#text')}, "
-                # Pinch off the trailing comma and space:
-                s = s[:-2]
-                self.TRURISK_SCORE_FACTORS = s
-
-            if self.TAGS:
-                # if 'TAG' key's value is a list, it is a list of tag dicts. if it is a single tag dict, it is just a single tag.
-                if isinstance(self.TAGS["TAG"], list):
-                    self.TAGS = BaseList([Tag.from_dict(tag) for tag in self.TAGS["TAG"]])
-                else:  # if it is a single tag dict:
-                    self.TAGS = BaseList([Tag.from_dict(self.TAGS["TAG"])])
-
-            if self.CLOUD_PROVIDER_TAGS:
-                # if 'CLOUD_TAG' key's value is a list, it is a list of tag dicts. if it is a single tag dict, it is just a single tag.
-                if isinstance(self.CLOUD_PROVIDER_TAGS["CLOUD_TAG"], list):
-                    self.CLOUD_PROVIDER_TAGS = BaseList(
-                        [CloudTag.from_dict(tag) for tag in self.CLOUD_PROVIDER_TAGS["CLOUD_TAG"]]
-                    )
-                else:  # if it is a single tag dict:
-                    self.CLOUD_PROVIDER_TAGS = BaseList(
-                        [CloudTag.from_dict(self.CLOUD_PROVIDER_TAGS["CLOUD_TAG"])]
-                    )
+            for source, expander in EXPANSIONS.items():
+                if not getattr(self, source):
+                    continue
+                if LAZY_EXPAND.flag and source in LAZY_EXPANSIONS:
+                    # expand the block when one of its fields is first read:
+                    self._defer_group(LAZY_EXPANSIONS[source], expander)
+                else:
+                    expander(self)
 
-            # CLOUD SPECIFIC FIELDS:
-            if self.METADATA:
-                match self.CLOUD_PROVIDER:
-                    case "AWS":
-                        key_selector = "EC2"
-                    case "Azure":
-                        key_selector = "AZURE"
-                    case "GCP":
-                        key_selector = "GCP"
-                    case _:
-                        # Fallback in the off-chance that cloud provider is blank but there
-                        # is still metadata. This has happened once or twice in testing.
-                        # Using a walrus operator for the ensuing match statement:
-                        if meta_key := list(self.METADATA.keys()):
-                            match meta_key[0]:
-                                case "EC2":
-                                    key_selector = "EC2"
-                                case "AZURE":
-                                    key_selector = "AZURE"
-                                case "GCP":
-                                    key_selector = "GCP"
-                                case _:
-                                    raise ValueError(
-                                        f"Cloud provider {self.METADATA.keys()[0]} (inferred from metadata) is not supported."
-                                    )
-                        else:
-                            raise ValueError(
-                                f"Cloud provider {self.CLOUD_PROVIDER} is not supported."
-                            )
+        if not self._is_deferred("METADATA"):
+            # deferred metadata is normalized when it is expanded:
+            self._normalize_cloud_fields()
+
+    def _expand_trurisk_score_factors(self) -> None:
+        """
+        Reduce TRURISK_SCORE_FACTORS to a "sev_<level>: <count>, ..." string.
+        """
+        s = ""
+        for sev_level in self.TRURISK_SCORE_FACTORS.get("VULN_COUNT"):
+            s += f"sev_{sev_level.get('@qds_severity')}: {sev_level.get('#text')}, "
+        # Pinch off the trailing comma and space:
+        s = s[:-2]
+        self.TRURISK_SCORE_FACTORS = s
+
+    def _expand_tags(self) -> None:
+        """
+        Convert TAGS to a BaseList of Tag objects.
+        """
+        # if 'TAG' key's value is a list, it is a list of tag dicts. if it is a single tag dict, it is just a single tag.
+        if isinstance(self.TAGS["TAG"], list):
+            self.TAGS = BaseList([Tag.from_dict(tag) for tag in self.TAGS["TAG"]])
+        else:  # if it is a single tag dict:
+            self.TAGS = BaseList([Tag.from_dict(self.TAGS["TAG"])])
 
-                # for each tuple, [0] is the dataclass attribute name, [1] is how it is represented in the metadata dict.
-                VALID_EC2_KEYS = [
-                    ("GROUP_NAME", "groupName"),
-                    ("INSTANCE_STATE", "instanceState"),
-                    ("INSTANCE_TYPE", "latest/meta-data/instance-type"),
-                    ("IS_SPOT_INSTANCE", "isSpotInstance"),
-                    (
-                        "ARCHITECTURE",
-                        "latest/dynamic/instance-identity/document/architecture",
-                    ),
-                    ("IMAGE_ID", "latest/dynamic/instance-identity/document/imageId"),
-                    ("REGION", "latest/dynamic/instance-identity/document/region"),
-                    ("AMI_ID", "latest/meta-data/ami-id"),
-                    ("PUBLIC_HOSTNAME", "latest/meta-data/public-hostname"),
-                    ("PUBLIC_IPV4", "latest/meta-data/public-ipv4"),
-                    (
-                        "ACCOUNT_ID",
-                        "latest/dynamic/instance-identity/document/accountId",
-                    ),
-                ]
-                VALID_AZURE_KEYS = [
-                    ("PUBLIC_IPV4", "latest/meta-data/public-ipv4"),
-                    ("INSTANCE_STATE", "state"),
-                    ("GROUP_NAME", "resourceGroupName"),
-                    ("INSTANCE_TYPE", "vmSize"),
-                    ("REGION", "location"),
-                    ("ACCOUNT_ID", "subscriptionId"),
-                ]
-                VALID_GCP_KEYS = ...
-                # map key_selector to the valid keys list:
-                VALID_KEYS = {
-                    "EC2": VALID_EC2_KEYS,
-                    "AZURE": VALID_AZURE_KEYS,
-                    # "GCP": VALID_GCP_KEYS #not implemented as i have no access to a GCP environment.
-                }
-
-                for key in VALID_KEYS[key_selector]:
-                    # check for if self.METADATA[key_selector]['ATTRIBUTE'] is a list of dicts. if not, it is just a single dict.
-                    if isinstance(self.METADATA[key_selector]["ATTRIBUTE"], list):
-                        for item in self.METADATA[key_selector]["ATTRIBUTE"]:
-                            if item["NAME"] == key[1]:
-                                setattr(
-                                    self,
-                                    f"CLOUD_{key[0]}",
-                                    (item["VALUE"] if item["VALUE"] not in ["", {}, []] else None),
-                                )  # if item['VALUE'] seems to leave behind empties, hence the list
-                                break
-                    else:
-                        if (
-                            self.METADATA[key_selector]["ATTRIBUTE"]["NAME"]
-                            and self.METADATA[key_selector]["ATTRIBUTE"]["NAME"] == key
-                        ):
-                            setattr(
-                                self,
-                                f"CLOUD_{key[0]}",
-                                self.METADATA[key_selector]["ATTRIBUTE"]["VALUE"],
+    def _expand_cloud_provider_tags(self) -> None:
+        """
+        Convert CLOUD_PROVIDER_TAGS to a BaseList of CloudTag objects.
+        """
+        # if 'CLOUD_TAG' key's value is a list, it is a list of tag dicts. if it is a single tag dict, it is just a single tag.
+        if isinstance(self.CLOUD_PROVIDER_TAGS["CLOUD_TAG"], list):
+            self.CLOUD_PROVIDER_TAGS = BaseList(
+                [CloudTag.from_dict(tag) for tag in self.CLOUD_PROVIDER_TAGS["CLOUD_TAG"]]
+            )
+        else:  # if it is a single tag dict:
+            self.CLOUD_PROVIDER_TAGS = BaseList(
+                [CloudTag.from_dict(self.CLOUD_PROVIDER_TAGS["CLOUD_TAG"])]
+            )
+
+    def _expand_metadata(self) -> None:
+        """
+        Pull the CLOUD_* fields out of the cloud provider's METADATA block and normalize them.
+        """
+        match self.CLOUD_PROVIDER:
+            case "AWS":
+                key_selector = "EC2"
+            case "Azure":
+                key_selector = "AZURE"
+            case "GCP":
+                key_selector = "GCP"
+            case _:
+                # Fallback in the off-chance that cloud provider is blank but there
+                # is still metadata. This has happened once or twice in testing.
+                # Using a walrus operator for the ensuing match statement:
+                if meta_key := list(self.METADATA.keys()):
+                    match meta_key[0]:
+                        case "EC2":
+                            key_selector = "EC2"
+                        case "AZURE":
+                            key_selector = "AZURE"
+                        case "GCP":
+                            key_selector = "GCP"
+                        case _:
+                            raise ValueError(
+                                f"Cloud provider {self.METADATA.keys()[0]} (inferred from metadata) is not supported."
                             )
+                else:
+                    raise ValueError(f"Cloud provider {self.CLOUD_PROVIDER} is not supported.")
+
+        for key in CLOUD_METADATA_KEYS[key_selector]:
+            # check for if self.METADATA[key_selector]['ATTRIBUTE'] is a list of dicts. if not, it is just a single dict.
+            if isinstance(self.METADATA[key_selector]["ATTRIBUTE"], list):
+                for item in self.METADATA[key_selector]["ATTRIBUTE"]:
+                    if item["NAME"] == key[1]:
+                        setattr(
+                            self,
+                            f"CLOUD_{key[0]}",
+                            (item["VALUE"] if item["VALUE"] not in ["", {}, []] else None),
+                        )  # if item['VALUE'] seems to leave behind empties, hence the list
+                        break
+            else:
+                if (
+                    self.METADATA[key_selector]["ATTRIBUTE"]["NAME"]
+                    and self.METADATA[key_selector]["ATTRIBUTE"]["NAME"] == key
+                ):
+                    setattr(
+                        self,
+                        f"CLOUD_{key[0]}",
+                        self.METADATA[key_selector]["ATTRIBUTE"]["VALUE"],
+                    )
 
-        for INT_FIELD in INT_FIELDS:
-            if getattr(self, INT_FIELD) and not isinstance(getattr(self, INT_FIELD), int):
-                setattr(self, INT_FIELD, int(getattr(self, INT_FIELD)))
+        self._normalize_cloud_fields()
 
+    def _normalize_cloud_fields(self) -> None:
+        """
+        Convert CLOUD_PUBLIC_IPV4 to an IPv4Address and CLOUD_IS_SPOT_INSTANCE to a bool.
+        """
         if self.CLOUD_PUBLIC_IPV4 and not isinstance(self.CLOUD_PUBLIC_IPV4, IPv4Address):
             # Bug Fix: for some reason Qualys will do things like /1.2.3.4?
             # It also will return some strange XML/HTML 404 text on occasion...? Hence check below.
@@ -477,34 +524,35 @@ class VMDRHost(BaseClass):
         if self.CLOUD_IS_SPOT_INSTANCE:
             self.CLOUD_IS_SPOT_INSTANCE = bool(self.CLOUD_IS_SPOT_INSTANCE)
 
-        # check for a detections list and convert it to a BaseList of Detection objects (used in hld):
-        if not DONT_EXPAND.flag:
-            if self.DETECTION_LIST:
-                detections_bl = BaseList()
-                # Probe if the data is for QIDs or CVEs:
-                VULN_TYPE = "QID"
-                if "CVE_DETECTION" in self.DETECTION_LIST.keys():
-                    VULN_TYPE = "CVE"
-                    data = self.DETECTION_LIST["CVE_DETECTION"]
-                else:
-                    data = self.DETECTION_LIST["DETECTION"]
-
-                if isinstance(data, dict):
-                    data = [data]
-
-                for detection in data:
-                    # Append the host's ID attr to the detection dictionary
-                    # to allow for a relationship:
-                    detection["ID"] = self.ID
-                    if VULN_TYPE == "QID":
-                        detections_bl.append(Detection.from_dict(detection))
-                    else:
-                        detection["CVSS_31"] = detection.pop("CVSS3.1")
-                        detection["CVSS_31_BASE"] = detection.pop("CVSS3.1_BASE", None)
-                        detection["CVSS_31_TEMPORAL"] = detection.pop("CVSS3.1_TEMPORAL", None)
-                        detections_bl.append(CVEDetection.from_dict(detection))
-
-                self.DETECTION_LIST = detections_bl
+    def _expand_detections(self) -> None:
+        """
+        Convert DETECTION_LIST to a BaseList of Detection or CVEDetection objects (used in hld).
+        """
+        detections_bl = BaseList()
+        # Probe if the data is for QIDs or CVEs:
+        VULN_TYPE = "QID"
+        if "CVE_DETECTION" in self.DETECTION_LIST.keys():
+            VULN_TYPE = "CVE"
+            data = self.DETECTION_LIST["CVE_DETECTION"]
+        else:
+            data = self.DETECTION_LIST["DETECTION"]
+
+        if isinstance(data, dict):
+            data = [data]
+
+        for detection in data:
+            # Append the host's ID attr to the detection dictionary
+            # to allow for a relationship:
+            detection["ID"] = self.ID
+            if VULN_TYPE == "QID":
+                detections_bl.append(Detection.from_dict(detection))
+            else:
+                detection["CVSS_31"] = detection.pop("CVSS3.1")
+                detection["CVSS_31_BASE"] = detection.pop("CVSS3.1_BASE", None)
+                detection["CVSS_31_TEMPORAL"] = detection.pop("CVSS3.1_TEMPORAL", None)
+                detections_bl.append(CVEDetection.from_dict(detection))
+
+        self.DETECTION_LIST = detections_bl
 
     def __str__(self) -> str:
         """
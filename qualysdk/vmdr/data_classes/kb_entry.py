@@ -7,9 +7,6 @@ This class is used to represent a single entry in the Qualys KnowledgeBase (KB).
 from dataclasses import dataclass, field
 from typing import *
 from datetime import datetime
-from warnings import catch_warnings, simplefilter
-
-from bs4 import BeautifulSoup
 
 from .bugtraq import Bugtraq
 from .software import Software
@@ -19,7 +16,8 @@ from .threat_intel import ThreatIntel
 from .compliance import Compliance
 from ...base.base_list import BaseList
 from ...base.base_class import BaseClass
-from ...base import DONT_EXPAND
+from ...base import DONT_EXPAND, LAZY_EXPAND
+from ...base.html_text import html_to_text_with_links
 
 
 @dataclass(order=True)
@@ -192,22 +190,13 @@ class KBEntry(BaseClass):
             if getattr(self, bool_field) and not isinstance(getattr(self, bool_field), bool):
                 setattr(self, bool_field, bool(getattr(self, bool_field)))
 
-        with catch_warnings():
-            simplefilter("ignore")  # ignore the warning about the html.parser
-            for html_field in HTML_FIELDS:
-                if getattr(self, html_field):
-                    soup = BeautifulSoup(getattr(self, html_field), "html.parser")
-                    for a_tag in soup.find_all("a"):
-                        if a_tag.has_attr("href"):
-                            a_tag.replace_with(a_tag["href"])
-                    setattr(self, html_field, soup.get_text())
-                    # setattr(
-                    #    self,
-                    #    html_field,
-                    #    BeautifulSoup(
-                    #        getattr(self, html_field), "html.parser"
-                    #    ).get_text(),
-                    # )
+        # strip the HTML, replacing links with their URLs:
+        for html_field in HTML_FIELDS:
+            if getattr(self, html_field):
+                if LAZY_EXPAND.flag:
+                    self._defer(html_field, html_to_text_with_links)
+                else:
+                    setattr(self, html_field, html_to_text_with_links(getattr(self, html_field)))
 
         # convert the lists to BaseList objects:
         if not DONT_EXPAND.flag:
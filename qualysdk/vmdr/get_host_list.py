@@ -2,6 +2,7 @@
 get_host_list.py - call the VMDR host list API.
 """
 
+import logging
 from typing import Union
 from threading import Thread
 
@@ -10,6 +11,8 @@ from .base.helpers import create_id_queue, thread_worker, prepare_args
 from ..exceptions.Exceptions import *
 from ..base.base_list import BaseList
 
+logger = logging.getLogger(__name__)
+
 
 def get_host_list(
     auth: BasicAuth,
@@ -109,7 +112,9 @@ def get_host_list(
     )
 
     id_queue = create_id_queue(auth, chunk_size=chunk_size, ids=kwargs.get("ids", None))
-    print(f"Starting get_host_list with {threads} {'threads.' if threads > 1 else 'thread.'}")
+    logger.info(
+        "Starting get_host_list with %s %s", threads, "threads." if threads > 1 else "thread."
+    )
 
     threads_list = []
 
@@ -134,5 +139,5 @@ def get_host_list(
     for thread in threads_list:
         thread.join()
 
-    print("All threads have completed. Returning responses.")
+    logger.info("All threads have completed. Returning responses.")
     return responses
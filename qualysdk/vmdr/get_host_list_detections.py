@@ -4,14 +4,140 @@ get_host_list_detections.py - contains the get_host_list_detections function for
 This endpoint is used to get a list of hosts and their QID detections. The function is multithreaded and uses the hld_backend function to pull the data.
 """
 
-from typing import Union
-from threading import Thread
-
-from .base.helpers import create_id_queue, thread_worker, prepare_args
+import logging
+from typing import Union, Generator, Literal
+from threading import Thread, Event
+from queue import Empty, Queue
+
+from .base.helpers import (
+    create_id_queue,
+    thread_worker,
+    prepare_args,
+    stream_worker,
+    WORKER_DONE,
+    create_range_queue,
+    range_worker,
+    create_parse_pool,
+)
+from .data_classes.hosts import VMDRHost
 from ..base.base_list import BaseList
+from ..base.metrics import record
 from ..auth.token import BasicAuth
 from ..exceptions.Exceptions import *
 
+logger = logging.getLogger(__name__)
+
+
+def _unpulled(id_queue: Queue, failures: list) -> list:
+    """
+    The chunks of IDs a worker gave up on that no other worker pulled afterwards.
+    They were requeued, so they are whatever is left on id_queue.
+    """
+    if not failures:
+        return []
+    missing = []
+    while True:
+        try:
+            missing.append(id_queue.get_nowait())
+        except Empty:
+            return missing
+
+
+def _raise_if_partial(endpoint: str, missing: list, results: BaseList = None) -> None:
+    if not missing:
+        return
+    raise PartialResultError(
+        f"{endpoint} gave up on {len(missing)} chunk(s) of hosts after its retries, so the results are partial.",
+        results=results,
+        missing=missing,
+    )
+
+
+def _run_workers(
+    auth: BasicAuth,
+    endpoint: Literal["get_hld", "get_cve_hld"],
+    chunk_size: int,
+    threads: int,
+    page_count: Union[int, "all"],
+    chunk_count: Union[int, "all"],
+    sharding: Literal["id_list", "id_range"],
+    parse_workers: Union[int, None],
+    kwargs: dict,
+) -> BaseList:
+    """
+    Shared backend for get_hld and get_cve_hld. Queues the work per the sharding
+    strategy, runs the worker threads and collects their hosts.
+
+    Raises PartialResultError, holding the hosts that were pulled, if a worker gave
+    up on some of the hosts after its retries.
+    """
+    if sharding not in ("id_list", "id_range"):
+        raise ValueError("sharding must be 'id_list' or 'id_range'.")
+
+    responses = BaseList()
+    failures = []
+    pool = create_parse_pool(parse_workers)
+
+    if sharding == "id_range" and not kwargs.get("ids"):
+        range_queue = create_range_queue(
+            auth,
+            shards=threads * 4,
+            id_min=kwargs.pop("id_min", None),
+            id_max=kwargs.pop("id_max", None),
+        )
+        target = range_worker
+        args = (
+            auth,
+            range_queue,
+            responses,
+            threads,
+            page_count,
+            chunk_count,
+            endpoint,
+            kwargs,
+            pool,
+            failures,
+        )
+        id_queue = None
+    else:
+        id_queue = create_id_queue(auth, chunk_size=chunk_size, ids=kwargs.get("ids", None))
+        target = thread_worker
+        args = (
+            auth,
+            id_queue,
+            responses,
+            page_count,
+            chunk_count,
+            endpoint,
+            kwargs,
+            pool,
+            failures,
+        )
+
+    logger.info(
+        "Starting %s with %s %s", endpoint, threads, "threads." if threads > 1 else "thread."
+    )
+
+    threads_list = []
+
+    try:
+        for i in range(threads):
+            thread = Thread(target=target, args=args)
+            threads_list.append(thread)
+            thread.start()
+
+        for thread in threads_list:
+            thread.join()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    # Dropped ranges are not requeued, so every failure is missing:
+    missing = failures if id_queue is None else _unpulled(id_queue, failures)
+    _raise_if_partial(endpoint, missing, responses)
+    logger.info("All threads have completed. Returning responses.")
+    return responses
+
 
 def get_hld(
     auth: BasicAuth,
@@ -19,6 +145,8 @@ def get_hld(
     threads: int = 5,
     page_count: Union[int, "all"] = "all",
     chunk_count: Union[int, "all"] = "all",
+    sharding: Literal["id_list", "id_range"] = "id_list",
+    parse_workers: int = None,
     **kwargs,
 ) -> BaseList:
     """
@@ -29,7 +157,9 @@ def get_hld(
         chunk_size (int): The size of each chunk. Defaults to 3000.
         threads (int): The number of threads to use. Defaults to 5.
         page_count (Union[int, "all"]): The number of pages to retrieve. Defaults to "all".
-        chunk_count (Union[int, "all"]): The number of chunks to retrieve. Defaults to "all".
+        chunk_count (Union[int, "all"]): The number of chunks to retrieve. Defaults to "all". With sharding="id_range", the number of ID ranges each thread retrieves.
+        sharding (Literal["id_list", "id_range"]): How to split the work between threads. "id_list" pulls every host ID up front and queues chunks of chunk_size IDs. "id_range" probes the span of host IDs with a few tiny calls, queues id_min/id_max ranges and splits busy ranges as it goes, so threads start pulling detections immediately. chunk_size is ignored with "id_range", as is sharding when ids is passed. Defaults to "id_list".
+        parse_workers (int): If specified, threads only download pages, and pages are parsed by a pool of parse_workers processes. Use on multi-core machines when parsing, not the API, is the bottleneck. Defaults to None (threads parse the pages they download).
         **kwargs: Additional keyword arguments to pass to the API.
 
     Kwargs:
@@ -115,6 +245,9 @@ def get_hld(
 
     Returns:
         BaseList: A list of VMDRHost objects, with their DETECTIONS attribute populated.
+
+    Raises:
+        PartialResultError: If a thread gave up on some hosts after its retries. Its results attribute holds the hosts that were pulled.
     """
 
     prepare_args(
@@ -124,36 +257,20 @@ def get_hld(
         page_count=page_count,
         chunk_count=chunk_count,
         ids=kwargs.get("ids"),
+        sharding=sharding,
     )
 
-    id_queue = create_id_queue(auth, chunk_size=chunk_size, ids=kwargs.get("ids", None))
-    print(f"Starting get_hld with {threads} {'threads.' if threads > 1 else 'thread.'}")
-
-    threads_list = []
-
-    responses = BaseList()
-
-    for i in range(threads):
-        thread = Thread(
-            target=thread_worker,
-            args=(
-                auth,
-                id_queue,
-                responses,
-                page_count,
-                chunk_count,
-                "get_hld",
-                kwargs,
-            ),
-        )
-        threads_list.append(thread)
-        thread.start()
-
-    for thread in threads_list:
-        thread.join()
-
-    print("All threads have completed. Returning responses.")
-    return responses
+    return _run_workers(
+        auth,
+        "get_hld",
+        chunk_size,
+        threads,
+        page_count,
+        chunk_count,
+        sharding,
+        parse_workers,
+        kwargs,
+    )
 
 
 def get_cve_hld(
@@ -162,6 +279,8 @@ def get_cve_hld(
     threads: int = 5,
     page_count: Union[int, "all"] = "all",
     chunk_count: Union[int, "all"] = "all",
+    sharding: Literal["id_list", "id_range"] = "id_list",
+    parse_workers: int = None,
     **kwargs,
 ) -> BaseList:
     """
@@ -172,7 +291,9 @@ def get_cve_hld(
         chunk_size (int): The size of each chunk. Defaults to 3000.
         threads (int): The number of threads to use. Defaults to 5.
         page_count (Union[int, "all"]): The number of pages to retrieve. Defaults to "all".
-        chunk_count (Union[int, "all"]): The number of chunks to retrieve. Defaults to "all".
+        chunk_count (Union[int, "all"]): The number of chunks to retrieve. Defaults to "all". With sharding="id_range", the number of ID ranges each thread retrieves.
+        sharding (Literal["id_list", "id_range"]): How to split the work between threads. "id_list" pulls every host ID up front and queues chunks of chunk_size IDs. "id_range" probes the span of host IDs with a few tiny calls, queues id_min/id_max ranges and splits busy ranges as it goes, so threads start pulling detections immediately. chunk_size is ignored with "id_range", as is sharding when ids is passed. Defaults to "id_list".
+        parse_workers (int): If specified, threads only download pages, and pages are parsed by a pool of parse_workers processes. Use on multi-core machines when parsing, not the API, is the bottleneck. Defaults to None (threads parse the pages they download).
         **kwargs: Additional keyword arguments to pass to the API.
 
     Kwargs:
@@ -222,8 +343,62 @@ def get_cve_hld(
 
     Returns:
         BaseList: A list of VMDRHost objects, with their DETECTIONS attribute populated.
+
+    Raises:
+        PartialResultError: If a thread gave up on some hosts after its retries. Its results attribute holds the hosts that were pulled.
     """
 
+    prepare_args(
+        auth=auth,
+        chunk_size=chunk_size,
+        threads=threads,
+        page_count=page_count,
+        chunk_count=chunk_count,
+        ids=kwargs.get("ids"),
+        sharding=sharding,
+    )
+
+    return _run_workers(
+        auth,
+        "get_cve_hld",
+        chunk_size,
+        threads,
+        page_count,
+        chunk_count,
+        sharding,
+        parse_workers,
+        kwargs,
+    )
+
+
+def _iter_backend(
+    auth: BasicAuth,
+    endpoint: Literal["get_hld", "get_cve_hld"],
+    chunk_size: int,
+    threads: int,
+    page_count: Union[int, "all"],
+    chunk_count: Union[int, "all"],
+    batch_size: Union[int, None],
+    queue_size: int,
+    parse_workers: Union[int, None],
+    kwargs: dict,
+) -> Generator[Union[VMDRHost, BaseList[VMDRHost]], None, None]:
+    """
+    Shared backend for iter_hld and iter_cve_hld.
+
+    Worker threads put hosts on a bounded queue as soon as they are parsed. When the
+    queue is full the workers block, so memory stays bounded by queue_size hosts no
+    matter how large the subscription is. If the caller stops iterating early, the
+    workers are told to stop and are joined.
+
+    Raises PartialResultError once every host has been yielded if a worker gave up
+    on some of the hosts after its retries.
+    """
+    if not isinstance(queue_size, int) or queue_size < 1:
+        raise ValueError("queue_size must be an integer above 0.")
+    if batch_size is not None and (not isinstance(batch_size, int) or batch_size < 1):
+        raise ValueError("batch_size must be None or an integer above 0.")
+
     prepare_args(
         auth=auth,
         chunk_size=chunk_size,
@@ -234,30 +409,152 @@ def get_cve_hld(
     )
 
     id_queue = create_id_queue(auth, chunk_size=chunk_size, ids=kwargs.get("ids", None))
-    print(f"Starting get_cve_hld with {threads} {'threads.' if threads > 1 else 'thread.'}")
+    logger.info(
+        "Starting iter_%s with %s %s",
+        endpoint[4:],
+        threads,
+        "threads." if threads > 1 else "thread.",
+    )
 
+    out_queue = Queue(maxsize=queue_size)
+    stop_event = Event()
     threads_list = []
-
-    responses = BaseList()
+    failures = []
+    pool = create_parse_pool(parse_workers)
 
     for i in range(threads):
         thread = Thread(
-            target=thread_worker,
+            target=stream_worker,
             args=(
                 auth,
                 id_queue,
-                responses,
+                out_queue,
+                stop_event,
                 page_count,
                 chunk_count,
-                "get_cve_hld",
+                endpoint,
                 kwargs,
+                pool,
+                failures,
             ),
+            daemon=True,
         )
         threads_list.append(thread)
         thread.start()
 
-    for thread in threads_list:
-        thread.join()
+    finished = 0
+    batch = BaseList()
+    try:
+        while finished < len(threads_list):
+            host = out_queue.get()
+            record("output_queue_depth", out_queue.qsize(), "vmdr", endpoint)
+            if host is WORKER_DONE:
+                finished += 1
+                continue
+            if batch_size is None:
+                yield host
+                continue
+            batch.append(host)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = BaseList()
+        if batch:
+            yield batch
+        _raise_if_partial(f"iter_{endpoint[4:]}", _unpulled(id_queue, failures))
+        logger.info("All threads have completed.")
+    finally:
+        stop_event.set()
+        for thread in threads_list:
+            thread.join()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def iter_hld(
+    auth: BasicAuth,
+    chunk_size: int = 3000,
+    threads: int = 5,
+    page_count: Union[int, "all"] = "all",
+    chunk_count: Union[int, "all"] = "all",
+    batch_size: int = None,
+    queue_size: int = 1000,
+    parse_workers: int = None,
+    **kwargs,
+) -> Generator[Union[VMDRHost, BaseList[VMDRHost]], None, None]:
+    """
+    iter_hld - generator version of get_hld. Yields hosts and their QID detections as soon as any
+    worker thread parses them, instead of returning one BaseList at the end.
 
-    print("All threads have completed. Returning responses.")
-    return responses
+    Hosts are handed from the worker threads to the caller through a queue holding at most
+    queue_size hosts. When it is full, the workers wait for the caller to catch up, so the
+    whole subscription is never held in memory at once.
+
+    Params:
+        auth (BasicAuth): The BasicAuth object containing the username and password.
+        chunk_size (int): The size of each chunk. Defaults to 3000.
+        threads (int): The number of threads to use. Defaults to 5.
+        page_count (Union[int, "all"]): The number of pages to retrieve. Defaults to "all".
+        chunk_count (Union[int, "all"]): The number of chunks to retrieve. Defaults to "all".
+        batch_size (int): If specified, yield BaseLists of up to batch_size hosts instead of single hosts. Defaults to None.
+        queue_size (int): The maximum number of parsed hosts waiting to be consumed. Defaults to 1000.
+        parse_workers (int): If specified, threads only download pages, and pages are parsed by a pool of parse_workers processes. Defaults to None.
+        **kwargs: Additional keyword arguments to pass to the API. Accepts the same kwargs as get_hld().
+
+    Yields:
+        Union[VMDRHost, BaseList[VMDRHost]]: A VMDRHost with its DETECTION_LIST attribute populated, or a BaseList of them if batch_size is specified.
+    """
+    yield from _iter_backend(
+        auth,
+        "get_hld",
+        chunk_size,
+        threads,
+        page_count,
+        chunk_count,
+        batch_size,
+        queue_size,
+        parse_workers,
+        kwargs,
+    )
+
+
+def iter_cve_hld(
+    auth: BasicAuth,
+    chunk_size: int = 3000,
+    threads: int = 5,
+    page_count: Union[int, "all"] = "all",
+    chunk_count: Union[int, "all"] = "all",
+    batch_size: int = None,
+    queue_size: int = 1000,
+    parse_workers: int = None,
+    **kwargs,
+) -> Generator[Union[VMDRHost, BaseList[VMDRHost]], None, None]:
+    """
+    iter_cve_hld - generator version of get_cve_hld. Yields hosts and their CVE detections as soon as any
+    worker thread parses them, instead of returning one BaseList at the end.
+
+    Params:
+        auth (BasicAuth): The BasicAuth object containing the username and password.
+        chunk_size (int): The size of each chunk. Defaults to 3000.
+        threads (int): The number of threads to use. Defaults to 5.
+        page_count (Union[int, "all"]): The number of pages to retrieve. Defaults to "all".
+        chunk_count (Union[int, "all"]): The number of chunks to retrieve. Defaults to "all".
+        batch_size (int): If specified, yield BaseLists of up to batch_size hosts instead of single hosts. Defaults to None.
+        queue_size (int): The maximum number of parsed hosts waiting to be consumed. Defaults to 1000.
+        parse_workers (int): If specified, threads only download pages, and pages are parsed by a pool of parse_workers processes. Defaults to None.
+        **kwargs: Additional keyword arguments to pass to the API. Accepts the same kwargs as get_cve_hld().
+
+    Yields:
+        Union[VMDRHost, BaseList[VMDRHost]]: A VMDRHost with its DETECTION_LIST attribute populated, or a BaseList of them if batch_size is specified.
+    """
+    yield from _iter_backend(
+        auth,
+        "get_cve_hld",
+        chunk_size,
+        threads,
+        page_count,
+        chunk_count,
+        batch_size,
+        queue_size,
+        parse_workers,
+        kwargs,
+    )
@@ -4,6 +4,7 @@ query_kb.py - contains the query_kb function for the qualysdk package.
 This function is used to query the Qualys KnowledgeBase (KB), which is a database of vulnerabilities and their details.
 """
 
+import logging
 from typing import overload, Union
 from urllib.parse import parse_qs, urlparse
 
@@ -15,8 +16,10 @@ from ..auth.token import BasicAuth
 from ..base.xml_parser import xml_parser
 from ..exceptions.Exceptions import QualysAPIError
 
+logger = logging.getLogger(__name__)
 
-def query_kb(auth: BasicAuth, **kwargs) -> BaseList[KBEntry]:
+
+def query_kb(auth: BasicAuth, use_cache: bool = None, **kwargs) -> BaseList[KBEntry]:
     """
     Query the Qualys KnowledgeBase (KB) for vulnerabilities matching the kiven kwargs.
 
@@ -27,6 +30,7 @@ def query_kb(auth: BasicAuth, **kwargs) -> BaseList[KBEntry]:
 
     Params:
         auth (BasicAuth) The authentication object.
+        use_cache (bool) Whether to use the response cache, if enabled with configure_cache. Defaults to None, which caches the KB for a day.
 
     ## Kwargs:
 
@@ -75,6 +79,7 @@ def query_kb(auth: BasicAuth, **kwargs) -> BaseList[KBEntry]:
             endpoint="query_kb",
             params=kwargs,
             headers={"X-Requested-With": "qualysdk SDK"},
+            use_cache=use_cache,
         )
         if response.status_code != 200:
             raise Exception(f"Error: {response.status_code} - {response.text}")
@@ -89,12 +94,13 @@ def query_kb(auth: BasicAuth, **kwargs) -> BaseList[KBEntry]:
             responses.append(KBEntry.from_dict(e))  # append entry
 
         pulled += 1
-        print(f"Page {pulled} complete.")
+        logger.info("Page %s complete.", pulled)
         # KB API normally does not paginate, but if it does
         if "WARNING" in xml["KNOWLEDGE_BASE_VULN_LIST_OUTPUT"]["RESPONSE"]:
             if "URL" in xml["KNOWLEDGE_BASE_VULN_LIST_OUTPUT"]["RESPONSE"]["WARNING"]:
-                print(
-                    f"Pagination detected. Pulling next page from url: {xml['KNOWLEDGE_BASE_VULN_LIST_OUTPUT']['RESPONSE']['WARNING']['URL']}"
+                logger.info(
+                    "Pagination detected. Pulling next page from url: %s",
+                    xml["KNOWLEDGE_BASE_VULN_LIST_OUTPUT"]["RESPONSE"]["WARNING"]["URL"],
                 )
                 # parse the url to get the query params
                 ps = parse_qs(
@@ -114,16 +120,22 @@ def query_kb(auth: BasicAuth, **kwargs) -> BaseList[KBEntry]:
 
 
 @overload
-def get_kb_qvs(auth: BasicAuth, cve: str = "", **kwargs) -> BaseList[KBQVS]:
+def get_kb_qvs(
+    auth: BasicAuth, cve: str = "", use_cache: bool = None, **kwargs
+) -> BaseList[KBQVS]:
     ...
 
 
 @overload
-def get_kb_qvs(auth: BasicAuth, cve: list[str] = [], **kwargs) -> BaseList[KBQVS]:
+def get_kb_qvs(
+    auth: BasicAuth, cve: list[str] = [], use_cache: bool = None, **kwargs
+) -> BaseList[KBQVS]:
     ...
 
 
-def get_kb_qvs(auth: BasicAuth, cve: Union[str, list[str]] = "", **kwargs) -> BaseList[KBQVS]:
+def get_kb_qvs(
+    auth: BasicAuth, cve: Union[str, list[str]] = "", use_cache: bool = None, **kwargs
+) -> BaseList[KBQVS]:
     """
     Download Qualys KB QVS (Qualys Vulnerability Score) data for 1+ CVEs.
 
@@ -133,6 +145,7 @@ def get_kb_qvs(auth: BasicAuth, cve: Union[str, list[str]] = "", **kwargs) -> Ba
     ## Params:
         - auth (BasicAuth) The authentication object.
         - cve (Union[str, list[str]]): The CVE(s) to download QVS data for. By default, pulls all CVEs.
+        - use_cache (bool): Whether to use the response cache, if enabled with configure_cache. Defaults to None, which caches QVS data for a day.
         - **kwargs: Additional filters/parameters to pass to the API. See below for details.
 
     ## Kwargs:
@@ -166,6 +179,7 @@ def get_kb_qvs(auth: BasicAuth, cve: Union[str, list[str]] = "", **kwargs) -> Ba
         endpoint="get_kb_qvs",
         params=kwargs,
         headers={"X-Requested-With": "qualysdk SDK"},
+        use_cache=use_cache,
     )
     # TODO: Format has changed... need to update this
     response = response.json()
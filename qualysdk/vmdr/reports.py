@@ -2,6 +2,7 @@
 reports.py - contains functions to work with reports in VMDR.
 """
 
+import logging
 from typing import Literal, Union
 from os.path import join, exists
 from os import mkdir
@@ -17,6 +18,8 @@ from ..base import xml_parser
 from ..base.base_list import BaseList
 from ..exceptions.Exceptions import *
 
+logger = logging.getLogger(__name__)
+
 
 def manage_scheduled_reports(
     auth: BasicAuth,
@@ -179,12 +182,13 @@ def get_report_list(auth: BasicAuth, **kwargs) -> BaseList[VMDRReport]:
     return bl
 
 
-def get_template_list(auth: BasicAuth) -> BaseList[ReportTemplate]:
+def get_template_list(auth: BasicAuth, use_cache: bool = None) -> BaseList[ReportTemplate]:
     """
     Get the list of report templates in your subscription.
 
     Parameters:
         auth: Required[BasicAuth] - The BasicAuth object.
+        use_cache: Optional[bool] - Whether to use the response cache, if enabled with configure_cache. Defaults to None, which caches the template list for a day.
 
     Returns:
         BaseList[ReportTemplate] - A list of ReportTemplate objects.
@@ -195,6 +199,7 @@ def get_template_list(auth: BasicAuth) -> BaseList[ReportTemplate]:
         module="vmdr",
         endpoint="get_template_list",
         headers={"X-Requested-With": "qualysdk SDK"},
+        use_cache=use_cache,
     )
 
     data = xml_parser(response.text)
@@ -317,7 +322,7 @@ def fetch_report(
     # Match the file format and load into the appropriate object
     match file_format:
         case "csv":
-            print("Detected CSV format. Returning DataFrame.")
+            logger.info("Detected CSV format. Returning DataFrame.")
             # Check for a summarization header. If it exists, skip it.
             # We can delete everything before "\r\n\r\n\r\n"
             content = response.text
@@ -339,24 +344,26 @@ def fetch_report(
             return_data = True
 
         case "xml":
-            print("Detected XML format. Returning DataFrame.")
+            logger.info("Detected XML format. Returning DataFrame.")
             data = DataFrame.from_dict(xml_parser(response.text))
             return_data = True
 
         case _:
-            print(
-                f"Detected {file_format} format. Writing to {join(curr_dir, 'output', f'{id}.{file_format}')}"
+            logger.info(
+                "Detected %s format. Writing to %s",
+                file_format,
+                join(curr_dir, "output", f"{id}.{file_format}"),
             )
             write_out = True
 
     if write_out:
         if not exists(join(curr_dir, "output")):
             mkdir(join(curr_dir, "output"))
-            print(f"Created output directory at {join(curr_dir, 'output')}")
+            logger.info("Created output directory at %s", join(curr_dir, "output"))
 
         with open(join(curr_dir, "output", f"{id}.{file_format}"), "wb") as f:
             f.write(response.content)
-            print(f"Wrote report to {join(curr_dir, 'output', f'{id}.{file_format}')}")
+            logger.info("Wrote report to %s", join(curr_dir, "output", f"{id}.{file_format}"))
 
     if return_data:
         return data
@@ -412,7 +419,7 @@ def get_scheduled_report_list(auth: BasicAuth, **kwargs) -> BaseList[VMDRReport]
         for report in reports:
             bl.append(VMDRScheduledReport.from_dict(report))
     except KeyError:
-        print("No reports found.")
+        logger.info("No reports found.")
 
     return bl
 
@@ -2,6 +2,7 @@
 users.py - contains functions to interact with VMDR user management APIs.
 """
 
+import logging
 from typing import Union, Literal
 
 from ..auth import BasicAuth
@@ -10,6 +11,8 @@ from ..base.base_list import BaseList
 from .data_classes.user import User
 from ..exceptions import *
 
+logger = logging.getLogger(__name__)
+
 
 def get_user_list(auth: BasicAuth, **kwargs) -> BaseList[User]:
     """
@@ -46,7 +49,7 @@ def get_user_list(auth: BasicAuth, **kwargs) -> BaseList[User]:
         raise QualysAPIError(user_list["USER_LIST_OUTPUT"]["ERROR"]["#text"])
 
     if "USER" not in user_list["USER_LIST_OUTPUT"]["USER_LIST"].keys():
-        print("No users found.")
+        logger.info("No users found.")
         return bl
 
     # Check for single user
@@ -2,6 +2,7 @@
 Contains user-facing functions for interacting with authentication records in WAS
 """
 
+import logging
 from typing import Union, Literal, List, Dict, Optional
 
 from .data_classes.WebAppAuthRecord import WebAppAuthRecord
@@ -16,6 +17,9 @@ from ..base.call_api import call_api
 from ..auth.basic import BasicAuth
 from ..exceptions.Exceptions import QualysAPIError
 from ..base.base_list import BaseList
+from .base.verbose import pull_details
+
+logger = logging.getLogger(__name__)
 
 
 def call_auth_api(auth: BasicAuth, endpoint: str, payload: dict) -> Union[int, WebAppAuthRecord]:
@@ -190,7 +194,7 @@ def get_authentication_records(
             )
 
         if serviceResponse.get("count") == "0":
-            print(f"No web applications found on page {pageNo}. Exiting.")
+            logger.info("No web applications found on page %s. Exiting.", pageNo)
             break
 
         data = serviceResponse.get("data")
@@ -205,14 +209,17 @@ def get_authentication_records(
             # Create the objects:
             appList.append(WebAppAuthRecord.from_dict(record))
 
-        print(
-            f"Retrieved {serviceResponse.get('count')} auth records on page {pageNo}. Running total: {len(appList)}"
+        logger.info(
+            "Retrieved %s auth records on page %s. Running total: %s",
+            serviceResponse.get("count"),
+            pageNo,
+            len(appList),
         )
 
         pageNo += 1
 
         if page_count != "all" and pageNo >= page_count:
-            print(f"Reached page_count limit. Returning {pageNo} page(s).")
+            logger.info("Reached page_count limit. Returning %s page(s).", pageNo)
             break
 
         # Check for pagination:
@@ -256,7 +263,7 @@ def get_authentication_record_details(
         data = data.get("WebAppAuthRecord")
         return WebAppAuthRecord.from_dict(data)
     else:
-        print(f"No data found for web application ID {recordId}. Exiting.")
+        logger.info("No data found for web application ID %s. Exiting.", recordId)
 
 
 def get_authentication_records_verbose(
@@ -266,16 +273,14 @@ def get_authentication_records_verbose(
     Uses ```was.get_authentication_records()``` and ```was.get_authentication_record_details()``` to return a ```BaseList``` of ```WebAppAuthRecord```s with
     all attributes populated.
 
-    This function is multi-threaded, placing all ```WebAppAuthRecords``` found
-    from ```was.get_authentication_records()``` into a queue and then spawning threads to pull the details one
-    by one.
-
-    The details threads wait for work to be added to the queue and then pull
-    the details for each ```WebAppAuthRecord.id```.
+    This function is multi-threaded: after ```was.get_authentication_records()``` returns, up to ```thread_count```
+    threads pull the details of each ```WebAppAuthRecord.id```. Fewer calls are kept in flight while
+    Qualys slows down or rate limits them, failed calls are retried, and records whose details
+    still can't be pulled are logged and left out. Details are returned in the order listed.
 
     Args:
         auth (BasicAuth): The authentication object.
-        thread_count (int): The number of threads to spawn. Defaults to 5.
+        thread_count (int): The maximum number of detail calls in flight. Defaults to 5.
 
     ## Kwargs:
 
@@ -309,72 +314,25 @@ def get_authentication_records_verbose(
     # Check thread_count for a valid value:
     if not isinstance(thread_count, int) or thread_count < 1:
         raise ValueError("thread_count must be an integer >= 1.")
-
-    # Set up Queue and List, with some cheeky as-needed imports:
-    from queue import Queue
-    from threading import Thread, Lock, current_thread
-
-    q = Queue()
-    authList = BaseList()
-    LOCK = Lock()
-    threads = []
+    auth.ensure_pool_size(thread_count)
 
     # Get the auth records:
-    print(f"({current_thread().name}) Getting base auth record list...")
+    logger.info("Getting base auth record list...")
     authrecords = get_authentication_records(auth, **kwargs)
 
-    print(
-        f"({current_thread().name}) Pulled {len(authrecords)} auth records. Starting {thread_count} thread(s) for details pull.."
+    logger.info(
+        "Pulled %s auth records. Pulling details with up to %s thread(s)...",
+        len(authrecords),
+        thread_count,
+    )
+    return pull_details(
+        auth,
+        authrecords,
+        get_authentication_record_details,
+        thread_count,
+        "was/call_auth_api",
+        "auth record",
     )
-
-    # Add the auth records to the queue:
-    for record in authrecords:
-        q.put(record)
-
-    def worker():
-        while True:
-            try:
-                # Exit condition 1: Queue is empty
-                if q.empty():
-                    with LOCK:
-                        print(f"({current_thread().name}) Queue is empty. Thread exiting.")
-                        break
-
-                authrecord = q.get()
-                # Exit condition 2: authrecord is None (because Queue is empty)
-                if not authrecord:
-                    with LOCK:
-                        print(f"({current_thread().name}) Queue is empty. Thread exiting.")
-                        q.task_done()
-                    break
-
-                details = get_authentication_record_details(auth, authrecord.id)
-                authList.append(details)
-                q.task_done()
-                with LOCK:
-                    if len(authList) % 10 == 0:
-                        print(
-                            f"({current_thread().name}) Pulled {len(authList)} auth record details so far..."
-                        )
-
-            except Exception as e:
-                with LOCK:
-                    print(f"[ERROR - THREAD EXITING] ({current_thread().name}) Error: {e}")
-                q.task_done()
-                break
-
-    # Start the threads:
-    for i in range(thread_count):
-        t = Thread(target=worker)
-        threads.append(t)
-        t.start()
-
-    # Wait for the threads to finish:
-    for t in threads:
-        t.join()
-
-    print(f"Pulled {len(authList)} auth record details.")
-    return authList
 
 
 """
@@ -517,7 +475,7 @@ def create_authentication_record(
         data = data.get("WebAppAuthRecord")
         return WebAppAuthRecord.from_dict(data)
     else:
-        print("No data found. Exiting.")
+        logger.info("No data found. Exiting.")
 
 
 def delete_authentication_record(auth: BasicAuth, **kwargs) -> list[str]:
@@ -596,7 +554,7 @@ def delete_authentication_record(auth: BasicAuth, **kwargs) -> list[str]:
         raise QualysAPIError(f"API response returned error: {serviceResponse.get('responseCode')}")
 
     if serviceResponse.get("count") == "0":
-        print("No auth records found. Exiting.")
+        logger.info("No auth records found. Exiting.")
         return []
 
     deleted = []
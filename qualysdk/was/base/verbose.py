@@ -0,0 +1,63 @@
+"""
+Code shared by the WAS *_verbose functions, which list records and then pull each one's details
+"""
+
+import logging
+from typing import Any, Callable, Iterable
+
+from ...auth.basic import BasicAuth
+from ...base.base_list import BaseList
+from ...base.fanout import fan_out
+
+logger = logging.getLogger(__name__)
+
+# Times a detail call is retried after an error that is not a rate limit:
+DETAIL_RETRIES = 2
+
+
+def pull_details(
+    auth: BasicAuth,
+    records: Iterable,
+    get_details: Callable[[BasicAuth, Any], Any],
+    thread_count: int,
+    limiter_key: str,
+    label: str,
+) -> BaseList:
+    """
+    Pull the details of every record by its id, with at most thread_count calls in flight.
+
+    Calls are spread with fan_out: fewer are kept in flight while Qualys slows down or rate
+    limits them, failed calls are retried DETAIL_RETRIES times, and records whose details
+    still can't be pulled are logged and left out. Details are returned in the order of records.
+
+    Args:
+        auth (BasicAuth): The authentication object.
+        records (Iterable): The records from the list call, i.e. WebApps from get_webapps().
+        get_details (Callable[[BasicAuth, Any], Any]): The details call, i.e. get_webapp_details.
+        thread_count (int): The maximum number of detail calls in flight.
+        limiter_key (str): The "module/endpoint" get_details calls, i.e. "was/call_webapp_api".
+        label (str): What the records are called in log messages, i.e. "webapp".
+
+    Returns:
+        BaseList: The details of each record.
+    """
+    detailList = BaseList()
+    for _, details in fan_out(
+        lambda recordId: get_details(auth, recordId),
+        (record.id for record in records),
+        threads=thread_count,
+        auth=auth,
+        limiter_key=limiter_key,
+        name=f"WAS-{label.title().replace(' ', '')}-Thread",
+        ordered=True,
+        retries=DETAIL_RETRIES,
+        adaptive=True,
+    ):
+        # get_*_details returns None for records deleted since they were listed:
+        if details is not None:
+            detailList.append(details)
+            if len(detailList) % 100 == 0:
+                logger.info("Pulled %s %s details so far...", len(detailList), label)
+
+    logger.info("Pulled %s %s details.", len(detailList), label)
+    return detailList
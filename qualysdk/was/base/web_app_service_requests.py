@@ -10,7 +10,8 @@ import xmltodict
 from requests import Response
 
 from ...base.xml_parser import xml_parser
-from ...exceptions.Exceptions import QualysAPIError
+from ...base.fanout import retry_after
+from ...exceptions.Exceptions import QualysAPIError, RateLimitError
 
 
 def is_valid_regex(s: str) -> bool:
@@ -132,6 +133,11 @@ def validate_response(response: Response) -> dict:
     Returns:
         dict: The parsed XML response.
     """
+    if response.status_code == 429:
+        raise RateLimitError(
+            f"429 - WAS rate limit reached. {response.text}", wait=retry_after(response)
+        )
+
     parsed = xml_parser(response.text)
 
     if response.status_code != 200:
@@ -2,6 +2,7 @@
 Work with Qualys WAS findings
 """
 
+import logging
 from typing import Union
 
 from .data_classes.Finding import WASFinding
@@ -12,6 +13,9 @@ from ..base.call_api import call_api
 from .base.web_app_service_requests import validate_response
 from ..exceptions.Exceptions import QualysAPIError
 from ..base.base_list import BaseList
+from .base.verbose import pull_details
+
+logger = logging.getLogger(__name__)
 
 
 def call_findings_api(
@@ -243,7 +247,7 @@ def get_findings(
             )
 
         if serviceResponse.get("count") == "0":
-            print(f"No findings found on page {pageNo}. Exiting.")
+            logger.info("No findings found on page %s. Exiting.", pageNo)
             break
 
         data = serviceResponse.get("data")
@@ -258,14 +262,17 @@ def get_findings(
             # Create the objects:
             findingList.append(WASFinding.from_dict(finding))
 
-        print(
-            f"Retrieved {serviceResponse.get('count')} WAS findings on page {pageNo}. Running total: {len(findingList)}"
+        logger.info(
+            "Retrieved %s WAS findings on page %s. Running total: %s",
+            serviceResponse.get("count"),
+            pageNo,
+            len(findingList),
         )
 
         pageNo += 1
 
         if page_count != "all" and pageNo >= page_count:
-            print(f"Reached page_count limit. Returning {pageNo} page(s).")
+            logger.info("Reached page_count limit. Returning %s page(s).", pageNo)
             break
 
         # Check for pagination:
@@ -321,16 +328,14 @@ def get_findings_verbose(auth: BasicAuth, thread_count: int = 5, **kwargs) -> Ba
     Uses ```was.get_findings()``` and ```was.get_finding_details()``` to return a ```BaseList``` of ```WASFinding```s with
     all attributes populated.
 
-    This function is multi-threaded, placing all ```WASFinding``` objects found
-    from ```was.get_findings()``` into a queue and then spawning threads to pull the details one
-    by one.
-
-    The details threads wait for work to be added to the queue and then pull
-    the details for each ```WASFinding.id```.
+    This function is multi-threaded: after ```was.get_findings()``` returns, up to ```thread_count```
+    threads pull the details of each ```WASFinding.id```. Fewer calls are kept in flight while
+    Qualys slows down or rate limits them, failed calls are retried, and records whose details
+    still can't be pulled are logged and left out. Details are returned in the order listed.
 
     Args:
         auth (BasicAuth): The authentication object.
-        thread_count (int): The number of threads to spawn. Defaults to 5.
+        thread_count (int): The maximum number of detail calls in flight. Defaults to 5.
 
     ## Kwargs:
 
@@ -395,69 +400,17 @@ def get_findings_verbose(auth: BasicAuth, thread_count: int = 5, **kwargs) -> Ba
     # Check thread_count for a valid value:
     if not isinstance(thread_count, int) or thread_count < 1:
         raise ValueError("thread_count must be an integer >= 1.")
-
-    # Set up Queue and List, with some cheeky as-needed imports:
-    from queue import Queue
-    from threading import Thread, Lock, current_thread
-
-    q = Queue()
-    findingList = BaseList()
-    LOCK = Lock()
-    threads = []
+    auth.ensure_pool_size(thread_count)
 
     # Get the findings:
-    print(f"({current_thread().name}) Getting base finding list...")
+    logger.info("Getting base finding list...")
     findings = get_findings(auth, **kwargs)
 
-    print(
-        f"({current_thread().name}) Pulled {len(findings)} findings. Starting {thread_count} thread(s) for details pull.."
+    logger.info(
+        "Pulled %s findings. Pulling details with up to %s thread(s)...",
+        len(findings),
+        thread_count,
+    )
+    return pull_details(
+        auth, findings, get_finding_details, thread_count, "was/call_findings_api", "finding"
     )
-
-    # Add the findings to the queue:
-    for record in findings:
-        q.put(record)
-
-    def worker():
-        while True:
-            try:
-                # Exit condition 1: Queue is empty
-                if q.empty():
-                    with LOCK:
-                        print(f"({current_thread().name}) Queue is empty. Thread exiting.")
-                        break
-
-                finding = q.get()
-                # Exit condition 2: authrecord is None (because Queue is empty)
-                if not finding:
-                    with LOCK:
-                        print(f"({current_thread().name}) Queue is empty. Thread exiting.")
-                        q.task_done()
-                    break
-
-                details = get_finding_details(auth, finding.id)
-                findingList.append(details)
-                q.task_done()
-                with LOCK:
-                    if len(findingList) % 10 == 0:
-                        print(
-                            f"({current_thread().name}) Pulled {len(findingList)} finding details so far..."
-                        )
-
-            except Exception as e:
-                with LOCK:
-                    print(f"[ERROR - THREAD EXITING] ({current_thread().name}) Error: {e}")
-                q.task_done()
-                break
-
-    # Start the threads:
-    for i in range(thread_count):
-        t = Thread(target=worker)
-        threads.append(t)
-        t.start()
-
-    # Wait for the threads to finish:
-    for t in threads:
-        t.join()
-
-    print(f"Pulled {len(findingList)} finding details.")
-    return findingList
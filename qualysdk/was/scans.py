@@ -2,6 +2,7 @@
 Contains functions to interact with scans in the Qualys WAS module.
 """
 
+import logging
 from typing import Union, Literal
 from os import path, makedirs
 
@@ -16,6 +17,9 @@ from ..base.call_api import call_api
 from ..auth.basic import BasicAuth
 from ..exceptions.Exceptions import QualysAPIError
 from ..base.base_list import BaseList
+from .base.verbose import pull_details
+
+logger = logging.getLogger(__name__)
 
 
 def call_scan_api(
@@ -220,7 +224,7 @@ def get_scans(
             )
 
         if serviceResponse.get("count") == "0":
-            print(f"No scans found on page {pageNo}. Exiting.")
+            logger.info("No scans found on page %s. Exiting.", pageNo)
             break
 
         data = serviceResponse.get("data")
@@ -235,14 +239,17 @@ def get_scans(
             # Create the objects:
             scanList.append(WASScan.from_dict(scan))
 
-        print(
-            f"Retrieved {serviceResponse.get('count')} WAS scans on page {pageNo}. Running total: {len(scanList)}"
+        logger.info(
+            "Retrieved %s WAS scans on page %s. Running total: %s",
+            serviceResponse.get("count"),
+            pageNo,
+            len(scanList),
         )
 
         pageNo += 1
 
         if page_count != "all" and pageNo >= page_count:
-            print(f"Reached page_count limit. Returning {pageNo} page(s).")
+            logger.info("Reached page_count limit. Returning %s page(s).", pageNo)
             break
 
         # Check for pagination:
@@ -298,16 +305,14 @@ def get_scans_verbose(auth: BasicAuth, thread_count: int = 5, **kwargs) -> BaseL
     Uses ```was.get_scans()``` and ```was.get_scan_details()``` to return a ```BaseList``` of ```WASScan```s with
     all attributes populated.
 
-    This function is multi-threaded, placing all ```WASScan``` found
-    from ```was.get_scans()``` into a queue and then spawning threads to pull the details one
-    by one.
-
-    The details threads wait for work to be added to the queue and then pull
-    the details for each ```WASScan.id```.
+    This function is multi-threaded: after ```was.get_scans()``` returns, up to ```thread_count```
+    threads pull the details of each ```WASScan.id```. Fewer calls are kept in flight while
+    Qualys slows down or rate limits them, failed calls are retried, and records whose details
+    still can't be pulled are logged and left out. Details are returned in the order listed.
 
     Args:
         auth (BasicAuth): The authentication object.
-        thread_count (int): The number of threads to spawn. Defaults to 5.
+        thread_count (int): The maximum number of detail calls in flight. Defaults to 5.
 
     ## Kwargs:
 
@@ -344,72 +349,18 @@ def get_scans_verbose(auth: BasicAuth, thread_count: int = 5, **kwargs) -> BaseL
     # Check thread_count for a valid value:
     if not isinstance(thread_count, int) or thread_count < 1:
         raise ValueError("thread_count must be an integer >= 1.")
-
-    # Set up Queue and List, with some cheeky as-needed imports:
-    from queue import Queue
-    from threading import Thread, Lock, current_thread
-
-    q = Queue()
-    scanList = BaseList()
-    LOCK = Lock()
-    threads = []
+    auth.ensure_pool_size(thread_count)
 
     # Get the scans:
-    print(f"({current_thread().name}) Getting base scan list...")
+    logger.info("Getting base scan list...")
     scans = get_scans(auth, **kwargs)
 
-    print(
-        f"({current_thread().name}) Pulled {len(scans)} scans. Starting {thread_count} thread(s) for details pull.."
+    logger.info(
+        "Pulled %s scans. Pulling details with up to %s thread(s)...",
+        len(scans),
+        thread_count,
     )
-
-    # Add the scans to the queue:
-    for scan in scans:
-        q.put(scan)
-
-    def worker():
-        while True:
-            try:
-                # Exit condition 1: Queue is empty
-                if q.empty():
-                    with LOCK:
-                        print(f"({current_thread().name}) Queue is empty. Thread exiting.")
-                        break
-
-                scan = q.get()
-                # Exit condition 2: scan is None (because Queue is empty)
-                if not scan:
-                    with LOCK:
-                        print(f"({current_thread().name}) Queue is empty. Thread exiting.")
-                        q.task_done()
-                    break
-
-                details = get_scan_details(auth, scan.id)
-                scanList.append(details)
-                q.task_done()
-                with LOCK:
-                    if len(scanList) % 10 == 0:
-                        print(
-                            f"({current_thread().name}) Pulled {len(scanList)} scan details so far..."
-                        )
-
-            except Exception as e:
-                with LOCK:
-                    print(f"[ERROR - THREAD EXITING] ({current_thread().name}) Error: {e}")
-                q.task_done()
-                break
-
-    # Start the threads:
-    for i in range(thread_count):
-        t = Thread(target=worker)
-        threads.append(t)
-        t.start()
-
-    # Wait for the threads to finish:
-    for t in threads:
-        t.join()
-
-    print(f"Pulled {len(scanList)} scan details.")
-    return scanList
+    return pull_details(auth, scans, get_scan_details, thread_count, "was/call_scans_api", "scan")
 
 
 def launch_scan(
@@ -628,7 +579,7 @@ def delete_scan(auth: BasicAuth, **kwargs) -> list[int]:
     if isinstance(scans, dict):
         scans = [scans]
     if len(scans) == 0:
-        print("No scans found to delete...")
+        logger.info("No scans found to delete...")
     for scan in scans:
         deleted.append(int(scan.get("id")))
 
@@ -665,6 +616,6 @@ def get_scan_results(auth: BasicAuth, scanId: Union[str, int], writeToFile: str
 
         with open(writeToFile, "w") as f:
             f.write(unparse(parsed, pretty=True))
-            print(f"Results written to {writeToFile}")
+            logger.info("Results written to %s", writeToFile)
 
     return parsed.get("WasScan")
@@ -2,6 +2,7 @@
 Contains functions to interact with Web applications in the Qualys WAS module.
 """
 
+import logging
 from typing import Union
 
 from .data_classes.WebApp import WebApp
@@ -12,6 +13,9 @@ from ..base.call_api import call_api
 from ..auth.basic import BasicAuth
 from ..exceptions.Exceptions import QualysAPIError
 from ..base.base_list import BaseList
+from .base.verbose import pull_details
+
+logger = logging.getLogger(__name__)
 
 
 def call_webapp_api(auth: BasicAuth, endpoint: str, payload: dict) -> Union[int, WebApp]:
@@ -191,7 +195,7 @@ def get_webapps(
             )
 
         if serviceResponse.get("count") == "0":
-            print(f"No web applications found on page {pageNo}. Exiting.")
+            logger.info("No web applications found on page %s. Exiting.", pageNo)
             break
 
         data = serviceResponse.get("data")
@@ -206,14 +210,17 @@ def get_webapps(
             # Create the objects:
             appList.append(WebApp.from_dict(webapp))
 
-        print(
-            f"Retrieved {serviceResponse.get('count')} web applications on page {pageNo}. Running total: {len(appList)}"
+        logger.info(
+            "Retrieved %s web applications on page %s. Running total: %s",
+            serviceResponse.get("count"),
+            pageNo,
+            len(appList),
         )
 
         pageNo += 1
 
         if page_count != "all" and pageNo >= page_count:
-            print(f"Reached page_count limit. Returning {pageNo} page(s).")
+            logger.info("Reached page_count limit. Returning %s page(s).", pageNo)
             break
 
         # Check for pagination:
@@ -256,7 +263,7 @@ def get_webapp_details(auth: BasicAuth, webappId: Union[int, str]) -> Union[WebA
         data = data.get("WebApp")
         return WebApp.from_dict(data)
     else:
-        print(f"No data found for web application ID {webappId}. Exiting.")
+        logger.info("No data found for web application ID %s. Exiting.", webappId)
 
 
 def get_webapps_verbose(auth: BasicAuth, thread_count: int = 5, **kwargs) -> BaseList[WebApp]:
@@ -264,16 +271,14 @@ def get_webapps_verbose(auth: BasicAuth, thread_count: int = 5, **kwargs) -> Bas
     Uses ```was.get_webapps()``` and ```was.get_webapp_details()``` to return a ```BaseList``` of ```WebApp```s with
     all attributes populated.
 
-    This function is multi-threaded, placing all ```WebApps``` found
-    from ```was.get_webapps()``` into a queue and then spawning threads to pull the details one
-    by one.
-
-    The details threads wait for work to be added to the queue and then pull
-    the details for each ```WebApp.id```.
+    This function is multi-threaded: after ```was.get_webapps()``` returns, up to ```thread_count```
+    threads pull the details of each ```WebApp.id```. Fewer calls are kept in flight while
+    Qualys slows down or rate limits them, failed calls are retried, and records whose details
+    still can't be pulled are logged and left out. Details are returned in the order listed.
 
     Args:
         auth (BasicAuth): The authentication object.
-        thread_count (int): The number of threads to spawn. Defaults to 5.
+        thread_count (int): The maximum number of detail calls in flight. Defaults to 5.
 
     ## Kwargs:
 
@@ -307,72 +312,20 @@ def get_webapps_verbose(auth: BasicAuth, thread_count: int = 5, **kwargs) -> Bas
     # Check thread_count for a valid value:
     if not isinstance(thread_count, int) or thread_count < 1:
         raise ValueError("thread_count must be an integer >= 1.")
-
-    # Set up Queue and List, with some cheeky as-needed imports:
-    from queue import Queue
-    from threading import Thread, Lock, current_thread
-
-    q = Queue()
-    appList = BaseList()
-    LOCK = Lock()
-    threads = []
+    auth.ensure_pool_size(thread_count)
 
     # Get the webapps:
-    print(f"({current_thread().name}) Getting base Webapp list...")
+    logger.info("Getting base Webapp list...")
     webapps = get_webapps(auth, **kwargs)
 
-    print(
-        f"({current_thread().name}) Pulled {len(webapps)} webapps. Starting {thread_count} thread(s) for details pull.."
+    logger.info(
+        "Pulled %s webapps. Pulling details with up to %s thread(s)...",
+        len(webapps),
+        thread_count,
+    )
+    return pull_details(
+        auth, webapps, get_webapp_details, thread_count, "was/call_webapp_api", "webapp"
     )
-
-    # Add the webapps to the queue:
-    for webapp in webapps:
-        q.put(webapp)
-
-    def worker():
-        while True:
-            try:
-                # Exit condition 1: Queue is empty
-                if q.empty():
-                    with LOCK:
-                        print(f"({current_thread().name}) Queue is empty. Thread exiting.")
-                        break
-
-                webapp = q.get()
-                # Exit condition 2: webapp is None (because Queue is empty)
-                if not webapp:
-                    with LOCK:
-                        print(f"({current_thread().name}) Queue is empty. Thread exiting.")
-                        q.task_done()
-                    break
-
-                details = get_webapp_details(auth, webapp.id)
-                appList.append(details)
-                q.task_done()
-                with LOCK:
-                    if len(appList) % 10 == 0:
-                        print(
-                            f"({current_thread().name}) Pulled {len(appList)} webapp details so far..."
-                        )
-
-            except Exception as e:
-                with LOCK:
-                    print(f"[ERROR - THREAD EXITING] ({current_thread().name}) Error: {e}")
-                q.task_done()
-                break
-
-    # Start the threads:
-    for i in range(thread_count):
-        t = Thread(target=worker)
-        threads.append(t)
-        t.start()
-
-    # Wait for the threads to finish:
-    for t in threads:
-        t.join()
-
-    print(f"Pulled {len(appList)} webapp details.")
-    return appList
 
 
 def create_webapp(auth: BasicAuth, name: str, url: str, **kwargs) -> WebApp:
@@ -428,7 +381,7 @@ def create_webapp(auth: BasicAuth, name: str, url: str, **kwargs) -> WebApp:
         data = data.get("WebApp")
         return WebApp.from_dict(data)
     else:
-        print("No data found. Exiting.")
+        logger.info("No data found. Exiting.")
 
 
 def update_webapp(auth: BasicAuth, webappId: Union[int, str], **kwargs) -> str:
@@ -490,7 +443,7 @@ def update_webapp(auth: BasicAuth, webappId: Union[int, str], **kwargs) -> str:
         data = data.get("WebApp")
         return f"WebaApp {data} updated successfully."
     else:
-        print("No data found. Exiting.")
+        logger.info("No data found. Exiting.")
 
 
 def delete_webapp(auth: BasicAuth, removeFromSubscription: bool = True, **kwargs) -> list[str]:
@@ -571,7 +524,7 @@ def delete_webapp(auth: BasicAuth, removeFromSubscription: bool = True, **kwargs
         raise QualysAPIError(f"API response returned error: {serviceResponse.get('responseCode')}")
 
     if serviceResponse.get("count") == "0":
-        print("No applicable web apps found. Exiting.")
+        logger.info("No applicable web apps found. Exiting.")
         return []
 
     deleted = []
@@ -662,7 +615,7 @@ def purge_webapp(auth: BasicAuth, **kwargs) -> list[str]:
         raise QualysAPIError(f"API response returned error: {serviceResponse.get('responseCode')}")
 
     if serviceResponse.get("count") == "0":
-        print("No applicable web apps found. Exiting.")
+        logger.info("No applicable web apps found. Exiting.")
         return []
 
     deleted = []
@@ -716,8 +669,8 @@ def get_selenium_script(
         raise QualysAPIError(f"API response returned error: {serviceResponse.get('responseCode')}")
 
     data = serviceResponse.get("data")
-    print(
-        "[WARNING] Code to parse data from this endpoint is not yet implemented. Please submit a PR. Returning raw data..."
+    logger.warning(
+        "Code to parse data from this endpoint is not yet implemented. Please submit a PR. Returning raw data..."
     )
     return data
     # if data.get("SeleniumScript"):
@@ -0,0 +1,58 @@
+"""
+Regression checks for LazyFieldsMixin: copies of an instance with deferred
+fields must each convert those fields on their own.
+"""
+
+import copy
+import pickle
+
+import pytest
+
+from qualysdk import LAZY_EXPAND
+from qualysdk.gav.hosts import Host
+from qualysdk.vmdr.data_classes.detection import Detection
+
+COPIERS = {
+    "copy": copy.copy,
+    "deepcopy": copy.deepcopy,
+    "pickle": lambda obj: pickle.loads(pickle.dumps(obj)),
+}
+
+
+@pytest.fixture(autouse=True)
+def lazy_expand():
+    LAZY_EXPAND.flag = True
+    yield
+    LAZY_EXPAND.flag = False
+
+
+def make_detection() -> Detection:
+    return Detection(UNIQUE_VULN_ID=1, QID=2, RESULTS="<p>hi <b>there</b></p>")
+
+
+def make_host() -> Host:
+    return Host(assetId=1, softwareListData={"software": [{"productName": "openssl"}]})
+
+
+@pytest.mark.parametrize("copier", COPIERS.values(), ids=COPIERS.keys())
+@pytest.mark.parametrize("original_first", [True, False])
+def test_detection_copies_convert_deferred_fields(copier, original_first):
+    original = make_detection()
+    assert original._is_deferred("RESULTS")
+    duplicate = copier(original)
+
+    first, second = (original, duplicate) if original_first else (duplicate, original)
+    assert first.RESULTS == "hi there"
+    assert second.RESULTS == "hi there"
+
+
+@pytest.mark.parametrize("copier", COPIERS.values(), ids=COPIERS.keys())
+@pytest.mark.parametrize("original_first", [True, False])
+def test_host_copies_convert_deferred_groups(copier, original_first):
+    original = make_host()
+    assert original._is_deferred("softwareListData")
+    duplicate = copier(original)
+
+    first, second = (original, duplicate) if original_first else (duplicate, original)
+    assert first.softwareListData == [{"productName": "openssl"}]
+    assert second.softwareListData == [{"productName": "openssl"}]